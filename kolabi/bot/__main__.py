@@ -195,6 +195,24 @@ def add_runtime_options(parser: argparse.ArgumentParser) -> None:
         default=2,
         help="Maximum live REST commands concurrently waiting on the platform; use 0 for unlimited.",
     )
+    parser.add_argument(
+        "--rest-batch-window",
+        type=float,
+        default=0.0,
+        help="Seconds to coalesce cancels/head placements per route into one batch call; 0 disables.",
+    )
+    parser.add_argument(
+        "--rest-batch-max",
+        type=int,
+        default=10,
+        help="Maximum commands sent in one coalesced batch call.",
+    )
+    parser.add_argument(
+        "--rest-weight-headroom",
+        type=float,
+        default=0.8,
+        help="Fraction of each venue REST weight budget Ogun may spend per route; 0 disables.",
+    )
 
 
 def add_single_order_options(parser: argparse.ArgumentParser) -> None:
@@ -370,6 +388,9 @@ def build_service(args: argparse.Namespace) -> BotService:
             max_active_pairs=getattr(args, "max_active_pairs", 4),
             rest_min_interval_seconds=getattr(args, "rest_min_interval", 0.1),
             rest_max_inflight=getattr(args, "rest_max_inflight", 2),
+            rest_batch_window_seconds=getattr(args, "rest_batch_window", 0.0),
+            rest_batch_max_size=getattr(args, "rest_batch_max", 10),
+            rest_weight_headroom=getattr(args, "rest_weight_headroom", 0.8),
             rest_audit_retention_minutes=getattr(
                 args,
                 "rest_audit_retention_minutes",
@@ -11,11 +11,13 @@ Role: interpreter shell.
 """
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta, timezone
 from enum import StrEnum
 from typing import Iterable
 
+from kolabi.bot.dedupe import AttemptDedupe
 from kolabi.bot.domain import (
     ChainDependencyToken,
     EggMove,
@@ -27,10 +29,12 @@ from kolabi.bot.domain import (
     TailState,
 )
 from kolabi.bot.horus import plan_runtime_commands
-from kolabi.bot.isis import step_strategy
+from kolabi.bot.isis import step_strategy_changes
 from kolabi.bot.pricing import pair_window_is_open
 from kolabi.shared.core.runtime_types import DragonSong, RuntimeCommandKind, Symbol
 
+CHRONOS_NOTICE_LIMIT = 1000
+
 
 class ChronosNoticeKind(StrEnum):
     DUPLICATE_EVENT_IGNORED = "DuplicateEventIgnored"
@@ -77,12 +81,27 @@ class Chronos:
 
     state: StrategyState
     pending_timeout: timedelta = timedelta(seconds=30)
-    notices: list[ChronosNotice] = field(default_factory=list)
+    # Only the latest notices are kept; older ones are already logged.
+    notices: deque[ChronosNotice] = field(
+        default_factory=lambda: deque(maxlen=CHRONOS_NOTICE_LIMIT)
+    )
     pending: dict[str, PendingEggMove] = field(default_factory=dict)
     pending_repeats: dict[str, PendingRepeat] = field(default_factory=dict)
-    _seen_event_keys: set[tuple[str, str]] = field(default_factory=set)
-    _seen_fallback_keys: set[tuple[str, str, int]] = field(default_factory=set)
-    _seen_command_keys: set[tuple[str, str, str | None]] = field(default_factory=set)
+    _seen_event_keys: AttemptDedupe[str] = field(default_factory=AttemptDedupe)
+    _seen_fallback_keys: AttemptDedupe[tuple[str, int]] = field(
+        default_factory=AttemptDedupe
+    )
+    _seen_command_keys: AttemptDedupe[tuple[str, str | None]] = field(
+        default_factory=AttemptDedupe
+    )
+    # Paires remplacees depuis le dernier `drain_changed_pairs`, dans l'ordre.
+    _changed_pairs: dict[str, None] = field(default_factory=dict)
+
+    def drain_changed_pairs(self) -> tuple[str, ...]:
+        """Retourne puis oublie les paires dont l'etat a change."""
+        changed = tuple(self._changed_pairs)
+        self._changed_pairs.clear()
+        return changed
 
     def process_events(
         self,
@@ -127,7 +146,7 @@ class Chronos:
         emitted: list[DragonSong] = []
         for event in selected:
             emitted.extend(self.process_event(event, now=current_time))
-        return self._dedupe_commands(emitted)
+        return self._dedupe_commands(emitted, now=current_time)
 
     def process_event(
         self,
@@ -145,20 +164,27 @@ class Chronos:
         pair_name = resolve_pair_name(self.state, event) or event.pair_name
         event_key = self._event_key(pair_name, event)
         if event_key is not None:
+            attempt = _pair_attempt(self.state, event_key[0])
             if len(event_key) == 2:
-                key = (event_key[0], event_key[1])
-                if key in self._seen_event_keys:
-                    self._record_duplicate(pair_name, event, current_time)
-                    return ()
-                self._seen_event_keys.add(key)
+                duplicate = self._seen_event_keys.seen(
+                    event_key[0], attempt, event_key[1], now=current_time
+                )
             else:
-                fallback_key = (event_key[0], event_key[1], int(event_key[2]))
-                if fallback_key in self._seen_fallback_keys:
-                    self._record_duplicate(pair_name, event, current_time)
-                    return ()
-                self._seen_fallback_keys.add(fallback_key)
+                duplicate = self._seen_fallback_keys.seen(
+                    event_key[0],
+                    attempt,
+                    (event_key[1], int(event_key[2])),
+                    now=current_time,
+                )
+            if duplicate:
+                self._record_duplicate(pair_name, event, current_time)
+                return ()
 
-        self.state, intents = step_strategy(self.state, _with_target_pair(event, pair_name))
+        self.state, intents, changed = step_strategy_changes(
+            self.state,
+            _with_target_pair(event, pair_name),
+        )
+        self._changed_pairs.update(dict.fromkeys(changed))
         pair_state = self.state.pairs.get(pair_name) if pair_name is not None else None
         commands = () if pair_state is None else plan_runtime_commands(
             pair_state,
@@ -218,7 +244,7 @@ class Chronos:
                     next_attempt=pending.next_attempt,
                 )
             )
-        return self._dedupe_commands(emitted)
+        return self._dedupe_commands(emitted, now=current_time)
 
     def _record_duplicate(
         self,
@@ -263,17 +289,21 @@ class Chronos:
     def _dedupe_commands(
         self,
         commands: Iterable[DragonSong],
+        *,
+        now: datetime | None = None,
     ) -> tuple[DragonSong, ...]:
+        current_time = now or datetime.now(timezone.utc)
         per_pair: dict[str, DragonSong] = {}
         for command in commands:
             pair_name = _command_pair_name(command)
             if pair_name is None:
                 continue
             attempt = _pair_attempt(self.state, pair_name)
-            command_key = (f"{pair_name}:{attempt}", f"{command.kind}:{command.reason}", _command_dedupe_value(command))
-            if command_key in self._seen_command_keys:
+            command_key = (f"{command.kind}:{command.reason}", _command_dedupe_value(command))
+            if self._seen_command_keys.seen(
+                pair_name, attempt, command_key, now=current_time
+            ):
                 continue
-            self._seen_command_keys.add(command_key)
             previous = per_pair.get(pair_name)
             if previous is None or _command_precedence(command) >= _command_precedence(previous):
                 per_pair[pair_name] = command
@@ -319,8 +349,9 @@ class Chronos:
         if replacements:
             self.state = replace(
                 self.state,
-                pairs={**self.state.pairs, **replacements},
+                pairs=self.state.pair_table.with_pairs(replacements),
             )
+            self._changed_pairs.update(dict.fromkeys(replacements))
         return ()
 
     def _schedule_or_activate_repeat(
@@ -395,8 +426,9 @@ class Chronos:
         )
         self.state = replace(
             self.state,
-            pairs={**self.state.pairs, pair_name: reset_state},
+            pairs=self.state.pair_table.with_pair(pair_name, reset_state),
         )
+        self._changed_pairs[pair_name] = None
         return ()
 
 
@@ -0,0 +1,95 @@
+"""Deadline scheduler for the runtime supervisor loop.
+
+Purpose: let the runtime sleep until the next due deadline or the next event
+instead of polling every deadline table on a fixed tick.
+Inputs: hashable keys (one per deadline mechanism) with their next due time
+and an injectable clock.
+Outputs: the earliest due time, due keys and the wait before the next one.
+Side effects: none outside the in-memory heap.
+Important types: `DeadlineScheduler`.
+Role: functional core helper.
+
+Scheduling a key again replaces its previous due time; old heap entries are
+dropped lazily when they reach the top. Keys due at the same instant come out
+in registration order, so firing order does not depend on hashing.
+"""
+from __future__ import annotations
+
+import heapq
+from datetime import datetime, timezone
+from typing import Callable, Generic, Hashable, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class DeadlineScheduler(Generic[_K]):
+    """Min-heap of `(due_at, key)` with one live due time per key."""
+
+    def __init__(self, *, clock: Callable[[], datetime] = utc_now) -> None:
+        self.clock = clock
+        self._heap: list[tuple[datetime, int, _K]] = []
+        self._live: dict[_K, tuple[datetime, int]] = {}
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def schedule(self, key: _K, due_at: datetime | None) -> None:
+        """Set the due time of `key`; `None` cancels it."""
+        if due_at is None:
+            self.cancel(key)
+            return
+        current = self._live.get(key)
+        if current is not None and current[0] == due_at:
+            return
+        self._sequence += 1
+        self._live[key] = (due_at, self._sequence)
+        heapq.heappush(self._heap, (due_at, self._sequence, key))
+
+    def cancel(self, key: _K) -> None:
+        self._live.pop(key, None)
+        if not self._live:
+            self._heap.clear()
+
+    def next_due(self) -> datetime | None:
+        """Earliest live due time, or None when nothing is scheduled."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime | None = None) -> tuple[_K, ...]:
+        """Remove and return the keys due at `now`, earliest first."""
+        current_time = self.clock() if now is None else now
+        due: list[_K] = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > current_time:
+                return tuple(due)
+            _due_at, _sequence, key = heapq.heappop(self._heap)
+            del self._live[key]
+            due.append(key)
+
+    def seconds_until_next(
+        self,
+        now: datetime | None = None,
+        *,
+        cap: float | None = None,
+    ) -> float | None:
+        """Seconds to wait for the next due key, bounded by `cap`."""
+        due_at = self.next_due()
+        if due_at is None:
+            return cap
+        current_time = self.clock() if now is None else now
+        wait = max(0.0, (due_at - current_time).total_seconds())
+        return wait if cap is None else min(wait, cap)
+
+    def _drop_stale(self) -> None:
+        heap = self._heap
+        while heap:
+            due_at, sequence, key = heap[0]
+            if self._live.get(key) == (due_at, sequence):
+                return
+            heapq.heappop(heap)
@@ -0,0 +1,97 @@
+"""Bounded dedupe memory for long-lived runtime loops.
+
+Purpose: remember which events and commands were already handled for a pair
+attempt without letting the memory grow over a multi-day run.
+Inputs: a scope (pair name), the pair attempt index, a hashable key and the
+current time.
+Outputs: duplicate verdicts.
+Side effects: none outside the in-memory structure.
+Important types: `AttemptDedupe`.
+Role: functional core helper.
+
+Keys live in one generation per `(scope, attempt)`. Starting a newer attempt
+retires generations older than the last `generations` attempts, so keys of
+closed attempts are dropped. Inside a generation the keys form an insertion
+ring: the oldest keys leave once the generation holds `max_keys` entries or
+once they were last seen more than `max_age` ago. A key seen again moves to
+the young end of the ring, so an event that keeps repeating (the same market
+snapshot read on every poll) is never evicted while it repeats.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Generic, Hashable, TypeVar
+
+_K = TypeVar("_K", bound=Hashable)
+
+DEFAULT_DEDUPE_MAX_KEYS = 4096
+DEFAULT_DEDUPE_MAX_AGE = timedelta(hours=24)
+DEFAULT_DEDUPE_GENERATIONS = 2
+
+
+class AttemptDedupe(Generic[_K]):
+    """Size-, age- and attempt-bounded set of already handled keys."""
+
+    def __init__(
+        self,
+        *,
+        max_keys: int = DEFAULT_DEDUPE_MAX_KEYS,
+        max_age: timedelta | None = DEFAULT_DEDUPE_MAX_AGE,
+        generations: int = DEFAULT_DEDUPE_GENERATIONS,
+    ) -> None:
+        self.max_keys = max(1, int(max_keys))
+        self.max_age = max_age
+        self.generations = max(1, int(generations))
+        self._scopes: dict[str, dict[int, OrderedDict[_K, datetime]]] = {}
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return sum(
+            len(keys)
+            for attempts in self._scopes.values()
+            for keys in attempts.values()
+        )
+
+    def seen(self, scope: str, attempt: int, key: _K, *, now: datetime) -> bool:
+        """Return True when `key` was already handled; otherwise remember it."""
+        keys = self._generation(scope, attempt)
+        self._expire(keys, now)
+        if key in keys:
+            keys[key] = now
+            keys.move_to_end(key)
+            return True
+        keys[key] = now
+        while len(keys) > self.max_keys:
+            keys.popitem(last=False)
+            self.evicted += 1
+        return False
+
+    def forget(self, scope: str) -> None:
+        """Drop every generation of `scope` (pair closed for good)."""
+        attempts = self._scopes.pop(scope, None)
+        if attempts:
+            self.evicted += sum(len(keys) for keys in attempts.values())
+
+    def _generation(self, scope: str, attempt: int) -> OrderedDict[_K, datetime]:
+        attempts = self._scopes.setdefault(scope, {})
+        keys = attempts.get(attempt)
+        if keys is not None:
+            return keys
+        keys = OrderedDict()
+        attempts[attempt] = keys
+        if len(attempts) > self.generations:
+            for retired in sorted(attempts)[: len(attempts) - self.generations]:
+                self.evicted += len(attempts.pop(retired))
+        return keys
+
+    def _expire(self, keys: OrderedDict[_K, datetime], now: datetime) -> None:
+        if self.max_age is None:
+            return
+        horizon = now - self.max_age
+        while keys:
+            oldest = next(iter(keys.values()))
+            if oldest >= horizon:
+                return
+            keys.popitem(last=False)
+            self.evicted += 1
@@ -7,7 +7,7 @@ Outputs: typed domain records and pure classification helpers.
 Side effects: none.
 Important types: `StrategySpec`, `OrderPairSpec`, `OrderState`, `TailMode`,
 `OrderReason`, `ExecutionOutcome`, `EggMove`, `PairCycleState`,
-`StrategyState`.
+`PairTable`, `StrategyState`.
 Role: pure logic.
 Transitional: yes, legacy pair properties remain available while the active
 runtime shell still consumes historic names.
@@ -19,7 +19,7 @@ from datetime import datetime
 from decimal import Decimal
 from enum import StrEnum
 from types import MappingProxyType
-from typing import Mapping, Protocol
+from typing import Iterable, Iterator, Mapping, Protocol, cast
 
 from kolabi.shared.core.runtime_types import Side
 
@@ -367,6 +367,102 @@ class PairIntent:
     kind: PairIntentKind
 
 
+PAIR_TABLE_FANOUT = 32
+
+
+class PairTable(Mapping[str, PairCycleState]):
+    """Immutable pair map whose versions share untouched buckets.
+
+    Pairs are spread over `PAIR_TABLE_FANOUT` hash buckets. `with_pair` copies
+    one bucket and the bucket tuple instead of the whole map, so one reducer
+    step costs O(pairs / fanout). Iteration keeps insertion order.
+    """
+
+    __slots__ = ("_names", "_buckets")
+
+    _names: tuple[str, ...]
+    _buckets: tuple[dict[str, PairCycleState], ...]
+
+    def __init__(
+        self,
+        pairs: Mapping[str, PairCycleState] | Iterable[tuple[str, PairCycleState]] = (),
+    ) -> None:
+        buckets: list[dict[str, PairCycleState]] = [{} for _ in range(PAIR_TABLE_FANOUT)]
+        names: list[str] = []
+        items = pairs.items() if isinstance(pairs, Mapping) else pairs
+        for name, pair_state in items:
+            bucket = buckets[hash(name) % PAIR_TABLE_FANOUT]
+            if name not in bucket:
+                names.append(name)
+            bucket[name] = pair_state
+        self._names = tuple(names)
+        self._buckets = tuple(buckets)
+
+    @classmethod
+    def _from_parts(
+        cls,
+        names: tuple[str, ...],
+        buckets: tuple[dict[str, PairCycleState], ...],
+    ) -> PairTable:
+        table = cls.__new__(cls)
+        table._names = names
+        table._buckets = buckets
+        return table
+
+    def __getitem__(self, name: str) -> PairCycleState:
+        return self._buckets[hash(name) % PAIR_TABLE_FANOUT][name]
+
+    def get(
+        self,
+        name: str,
+        default: PairCycleState | None = None,
+    ) -> PairCycleState | None:
+        return self._buckets[hash(name) % PAIR_TABLE_FANOUT].get(name, default)
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        return name in self._buckets[hash(name) % PAIR_TABLE_FANOUT]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"PairTable({dict(self.items())!r})"
+
+    def __reduce__(self) -> tuple[object, ...]:
+        return (PairTable, (tuple(self.items()),))
+
+    def with_pair(self, name: str, pair_state: PairCycleState) -> PairTable:
+        """Return a new table where `name` maps to `pair_state`."""
+        return self.with_pairs(((name, pair_state),))
+
+    def with_pairs(
+        self,
+        pairs: Mapping[str, PairCycleState] | Iterable[tuple[str, PairCycleState]],
+    ) -> PairTable:
+        """Return a new table with `pairs` set; untouched buckets are shared."""
+        buckets = list(self._buckets)
+        copied: set[int] = set()
+        added: list[str] = []
+        items = pairs.items() if isinstance(pairs, Mapping) else pairs
+        for name, pair_state in items:
+            index = hash(name) % PAIR_TABLE_FANOUT
+            if index not in copied:
+                buckets[index] = dict(buckets[index])
+                copied.add(index)
+            if name not in buckets[index]:
+                added.append(name)
+            buckets[index][name] = pair_state
+        if not copied:
+            return self
+        names = self._names + tuple(added) if added else self._names
+        return PairTable._from_parts(names, tuple(buckets))
+
+
 @dataclass(frozen=True)
 class StrategyState:
     """Persistent strategy memory owned by the Chronos supervisor layer."""
@@ -378,8 +474,13 @@ class StrategyState:
     last_event_ts: datetime | None = None
 
     def __post_init__(self) -> None:
-        if not isinstance(self.pairs, MappingProxyType):
-            object.__setattr__(self, "pairs", MappingProxyType(dict(self.pairs)))
+        if not isinstance(self.pairs, PairTable):
+            object.__setattr__(self, "pairs", PairTable(self.pairs))
+
+    @property
+    def pair_table(self) -> PairTable:
+        """`pairs` with its persistent type, for `with_pair` updates."""
+        return cast(PairTable, self.pairs)
 
 
 @dataclass(frozen=True)
@@ -3,7 +3,8 @@
 Purpose: route one already-targeted event to one pair, delegate lifecycle
 semantics to `step_pair`, and emit ordered pair intents without side effects.
 Inputs: immutable `StrategyState` and one already-targeted `EggMove`.
-Outputs: updated `StrategyState` and ordered `PairIntent` values.
+Outputs: updated `StrategyState`, ordered `PairIntent` values and, through
+`step_strategy_changes`, the names of the pairs the step replaced.
 Side effects: none.
 Important types: `StrategyState`, `PairCycleState`, `EggMove`, `PairIntent`.
 Role: pure logic.
@@ -12,7 +13,12 @@ from __future__ import annotations
 
 from dataclasses import replace
 
-from kolabi.bot.domain import EggMove, PairCycleState, PairIntent, StrategyState
+from kolabi.bot.domain import (
+    EggMove,
+    PairCycleState,
+    PairIntent,
+    StrategyState,
+)
 from kolabi.bot.pair_cycle import step_pair
 
 
@@ -21,13 +27,26 @@ def step_strategy(
     event: EggMove,
 ) -> tuple[StrategyState, tuple[PairIntent, ...]]:
     """Route un evenement deja cible vers une paire et retourne les intents emis."""
+    next_state, intents, _changed = step_strategy_changes(state, event)
+    return next_state, intents
+
+
+def step_strategy_changes(
+    state: StrategyState,
+    event: EggMove,
+) -> tuple[StrategyState, tuple[PairIntent, ...], frozenset[str]]:
+    """Comme `step_strategy`, plus les noms des paires remplacees par le pas.
+
+    La table des paires est persistante: seules les paires de ce jeu ont
+    change, les autres restent les memes objets que dans `state`.
+    """
     pair_name = event.pair_name
     if pair_name is None:
-        return replace(state), ()
+        return replace(state), (), frozenset()
 
     pair_state = state.pairs.get(pair_name)
     if pair_state is None:
-        return replace(state), ()
+        return replace(state), (), frozenset()
 
     next_pair_state, intents = step_pair(pair_state, event)
     next_pair_state = _pair_state_with_supervisor_metadata(
@@ -37,11 +56,11 @@ def step_strategy(
     )
     next_state = replace(
         state,
-        pairs={**state.pairs, pair_name: next_pair_state},
+        pairs=state.pair_table.with_pair(pair_name, next_pair_state),
         last_event_id=event.event_id,
         last_event_ts=event.occurred_at,
     )
-    return next_state, intents
+    return next_state, intents, frozenset((pair_name,))
 
 
 def _pair_state_with_supervisor_metadata(
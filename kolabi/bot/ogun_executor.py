@@ -4,29 +4,54 @@ Purpose: execute DragonSong commands against an async exchange-agnostic port.
 Inputs: DragonSong values and an ExchangePort implementation.
 Outputs: typed order acknowledgements.
 Side effects: exchange calls through the injected ExchangePort.
-Important types: DragonSong, ExchangePort, OrderAck.
+Important types: DragonSong, ExchangePort, BatchExchangePort, OrderAck.
 Role: async interpreter shell.
+
+With a `RestBatchPolicy` window and a port exposing `BatchExchangePort`,
+cancels and head placements for the same route wait up to the window in one
+lane, then fly as a single gate ticket and a single `execute_batch` call; each
+waiter gets its own acknowledgement back. A failed batch cancel falls back to
+the per-command retry path; placements still get exactly one attempt.
+
+The REST flight gate keeps one lane per rate-limit route. A port exposing
+`rate_limit_lane(command)` maps each command to an `(exchange, market_type,
+account_scope)` key and an optional `TokenBucket`; the interval, inflight cap
+and `_flight_priority` ordering then apply inside that lane only, and a ticket
+also waits until its bucket holds the command's weight. A slow Kraken lane no
+longer delays a Binance cancel. Ports without it share one lane as before.
 """
 from __future__ import annotations
 
 import asyncio
 import heapq
-from dataclasses import dataclass
-from typing import Awaitable, Callable, TypeVar, assert_never
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable, TypeVar, assert_never, cast
 
 from kolabi.shared.core.models import OrderAck
 from kolabi.shared.core.runtime_types import (
     AmendHeadCommand,
     AmendTailCommand,
+    BatchExchangePort,
     CancelCommand,
     DragonSong,
     ExchangePort,
     PlaceHeadCommand,
     PlaceTailCommand,
 )
+from kolabi.shared.rate_limits import (
+    AMEND,
+    CANCEL,
+    CANCEL_BATCH,
+    PLACE,
+    PLACE_BATCH,
+    TokenBucket,
+)
 
 _T = TypeVar("_T")
 
+RateLimitLane = Callable[[DragonSong], tuple[Hashable, TokenBucket | None]]
+
 
 @dataclass(frozen=True)
 class RetryPolicy:
@@ -40,11 +65,39 @@ class RestFlightPolicy:
     max_inflight: int = 0
 
 
+@dataclass(frozen=True)
+class RestBatchPolicy:
+    window_seconds: float = 0.0
+    max_size: int = 10
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0 and self.max_size > 1
+
+
+@dataclass
+class _BatchLane:
+    items: list[tuple[DragonSong, asyncio.Future[OrderAck | None]]] = field(
+        default_factory=list
+    )
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+@dataclass
+class _FlightLane:
+    bucket: TokenBucket | None = None
+    queue: list[tuple[int, int, _FlightTicket]] = field(default_factory=list)
+    inflight: int = 0
+    next_launch_at: float = 0.0
+
+
 @dataclass(frozen=True)
 class _FlightTicket:
     priority: int
     sequence: int
     command: DragonSong
+    lane: _FlightLane
+    cost: float = 0.0
 
 
 class RestFlightGate:
@@ -54,41 +107,69 @@ class RestFlightGate:
     controls when Ogun lets those commands touch the exchange.
     """
 
-    def __init__(self, policy: RestFlightPolicy | None = None) -> None:
+    def __init__(
+        self,
+        policy: RestFlightPolicy | None = None,
+        *,
+        lane_for: RateLimitLane | None = None,
+    ) -> None:
         self.policy = policy or RestFlightPolicy()
+        self._lane_for = lane_for
         self._condition = asyncio.Condition()
-        self._queue: list[tuple[int, int, _FlightTicket]] = []
+        self._lanes: dict[Hashable, _FlightLane] = {}
         self._sequence = 0
-        self._inflight = 0
-        self._next_launch_at = 0.0
 
     async def fly(
         self,
         command: DragonSong,
         dispatch: Callable[[], Awaitable[_T]],
+        *,
+        items: int = 1,
     ) -> _T:
-        if not self.enabled:
+        lane = self._lane_of(command)
+        if lane is None:
             return await dispatch()
-        ticket = await self._enqueue(command)
+        ticket = await self._enqueue(command, lane, items)
         await self._await_turn(ticket)
         try:
             return await dispatch()
         finally:
-            await self._release()
+            await self._release(ticket)
 
     @property
     def enabled(self) -> bool:
         return self.policy.min_interval_seconds > 0 or self.policy.max_inflight > 0
 
-    async def _enqueue(self, command: DragonSong) -> _FlightTicket:
+    def _lane_of(self, command: DragonSong) -> _FlightLane | None:
+        key: Hashable = None
+        bucket: TokenBucket | None = None
+        if self._lane_for is not None:
+            key, bucket = self._lane_for(command)
+        if bucket is None and not self.enabled:
+            return None
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = _FlightLane(bucket=bucket)
+            self._lanes[key] = lane
+        return lane
+
+    async def _enqueue(
+        self, command: DragonSong, lane: _FlightLane, items: int
+    ) -> _FlightTicket:
         async with self._condition:
             self._sequence += 1
             ticket = _FlightTicket(
                 priority=_flight_priority(command),
                 sequence=self._sequence,
                 command=command,
+                lane=lane,
+                cost=(
+                    0.0
+                    if lane.bucket is None
+                    else lane.bucket.cost(_rate_limit_operation(command, items), items)
+                ),
             )
-            heapq.heappush(self._queue, (ticket.priority, ticket.sequence, ticket))
+            heapq.heappush(lane.queue, (ticket.priority, ticket.sequence, ticket))
             self._condition.notify_all()
             return ticket
 
@@ -111,36 +192,44 @@ class RestFlightGate:
                         pass
         except asyncio.CancelledError:
             if claimed:
-                await self._release()
+                await self._release(ticket)
             else:
                 await self._remove_ticket(ticket)
             raise
 
     def _launch_delay_for(self, ticket: _FlightTicket) -> float | None:
-        if not self._queue or self._queue[0][2] is not ticket:
+        lane = ticket.lane
+        if not lane.queue or lane.queue[0][2] is not ticket:
             return None
-        if self.policy.max_inflight > 0 and self._inflight >= self.policy.max_inflight:
+        if self.policy.max_inflight > 0 and lane.inflight >= self.policy.max_inflight:
             return None
         loop_time = asyncio.get_running_loop().time()
-        return max(0.0, self._next_launch_at - loop_time)
+        delay = max(0.0, lane.next_launch_at - loop_time)
+        if lane.bucket is not None:
+            delay = max(delay, lane.bucket.delay_for(ticket.cost))
+        return delay
 
     def _claim(self, ticket: _FlightTicket) -> None:
-        popped = heapq.heappop(self._queue)[2]
+        lane = ticket.lane
+        popped = heapq.heappop(lane.queue)[2]
         if popped is not ticket:
             raise RuntimeError("REST flight gate queue corruption")
-        self._inflight += 1
+        lane.inflight += 1
         interval = max(0.0, self.policy.min_interval_seconds)
-        self._next_launch_at = asyncio.get_running_loop().time() + interval
+        lane.next_launch_at = asyncio.get_running_loop().time() + interval
+        if lane.bucket is not None:
+            lane.bucket.take(ticket.cost)
 
-    async def _release(self) -> None:
+    async def _release(self, ticket: _FlightTicket) -> None:
         async with self._condition:
-            self._inflight = max(0, self._inflight - 1)
+            ticket.lane.inflight = max(0, ticket.lane.inflight - 1)
             self._condition.notify_all()
 
     async def _remove_ticket(self, ticket: _FlightTicket) -> None:
         async with self._condition:
-            self._queue = [entry for entry in self._queue if entry[2] is not ticket]
-            heapq.heapify(self._queue)
+            lane = ticket.lane
+            lane.queue = [entry for entry in lane.queue if entry[2] is not ticket]
+            heapq.heapify(lane.queue)
             self._condition.notify_all()
 
 
@@ -154,14 +243,106 @@ class OgunExecutor:
         retry_policy: RetryPolicy | None = None,
         flight_policy: RestFlightPolicy | None = None,
         flight_gate: RestFlightGate | None = None,
+        batch_policy: RestBatchPolicy | None = None,
     ) -> None:
         self.port = port
         self.retry_policy = retry_policy or RetryPolicy()
-        self.flight_gate = flight_gate or RestFlightGate(flight_policy)
+        self.flight_gate = flight_gate or RestFlightGate(
+            flight_policy, lane_for=getattr(port, "rate_limit_lane", None)
+        )
+        self.batch_policy = batch_policy or RestBatchPolicy()
+        self._lanes: dict[Hashable, _BatchLane] = {}
+        self._lane_tasks: set[asyncio.Task[None]] = set()
 
     async def execute(self, command: DragonSong) -> OrderAck:
+        key = self._batch_key(command)
+        if key is not None:
+            ack = await self._join_lane(key, command)
+            if ack is not None:
+                return ack
         return await self.flight_gate.fly(command, lambda: self._execute_with_retries(command))
 
+    def _batch_key(self, command: DragonSong) -> Hashable | None:
+        if not self.batch_policy.enabled:
+            return None
+        if not isinstance(command, (CancelCommand, PlaceHeadCommand)):
+            return None
+        batch_key = getattr(self.port, "batch_key", None)
+        if batch_key is None:
+            return None
+        route_key = batch_key(command)
+        return None if route_key is None else (type(command), route_key)
+
+    async def _join_lane(self, key: Hashable, command: DragonSong) -> OrderAck | None:
+        """Wait for the route batch; None sends the caller to the per-command path."""
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = _BatchLane()
+            self._lanes[key] = lane
+            task = asyncio.create_task(self._flush_lane(key, lane))
+            self._lane_tasks.add(task)
+            task.add_done_callback(self._lane_tasks.discard)
+        future: asyncio.Future[OrderAck | None] = (
+            asyncio.get_running_loop().create_future()
+        )
+        lane.items.append((command, future))
+        if len(lane.items) >= self.batch_policy.max_size:
+            self._close_lane(key, lane)
+        try:
+            return await future
+        except Exception:
+            if isinstance(command, CancelCommand):
+                # Cancels are idempotent, so the per-command retry path replays them.
+                return None
+            raise
+
+    def _close_lane(self, key: Hashable, lane: _BatchLane) -> None:
+        if self._lanes.get(key) is lane:
+            del self._lanes[key]
+        lane.full.set()
+
+    async def _flush_lane(self, key: Hashable, lane: _BatchLane) -> None:
+        try:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(
+                    lane.full.wait(), timeout=self.batch_policy.window_seconds
+                )
+        except asyncio.CancelledError:
+            self._close_lane(key, lane)
+            for _, future in lane.items:
+                future.cancel()
+            raise
+        self._close_lane(key, lane)
+        items = [(command, future) for command, future in lane.items if not future.done()]
+        if len(items) <= 1:
+            for _, future in items:
+                future.set_result(None)
+            return
+        commands = [command for command, _ in items]
+        port = cast(BatchExchangePort, self.port)
+        results: list[OrderAck | Exception]
+        try:
+            results = await self.flight_gate.fly(
+                commands[0], lambda: port.execute_batch(commands), items=len(commands)
+            )
+            if len(results) != len(commands):
+                raise RuntimeError(
+                    f"batch returned {len(results)} results for {len(commands)} commands"
+                )
+        except asyncio.CancelledError:
+            for _, future in items:
+                future.cancel()
+            raise
+        except Exception as exc:
+            results = [exc] * len(commands)
+        for (_, future), result in zip(items, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
     async def _execute_with_retries(self, command: DragonSong) -> OrderAck:
         attempts = self._attempts_for(command)
         delay = max(0.0, self.retry_policy.base_delay_seconds)
@@ -205,3 +386,11 @@ def _flight_priority(command: DragonSong) -> int:
     if isinstance(command, PlaceHeadCommand):
         return 3
     assert_never(command)
+
+
+def _rate_limit_operation(command: DragonSong, items: int) -> str:
+    if isinstance(command, CancelCommand):
+        return CANCEL_BATCH if items > 1 else CANCEL
+    if isinstance(command, (PlaceHeadCommand, PlaceTailCommand)):
+        return PLACE_BATCH if items > 1 else PLACE
+    return AMEND
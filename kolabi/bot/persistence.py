@@ -6,6 +6,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from kolabi.bot.domain import OrderPairSpec
@@ -81,28 +82,30 @@ class TailTelemetryRecorder:
             return
         session: Session = self._sessionmaker()
         try:
-            session.add_all(
+            # Un seul INSERT multi-lignes (insertmanyvalues) sans objets ORM.
+            session.execute(
+                insert(TailTelemetry),
                 [
-                    TailTelemetry(
-                        exchange=row.exchange,
-                        environment=row.environment,
-                        market_type=row.market_type,
-                        account_scope=row.account_scope,
-                        strategy_id=row.strategy_id,
-                        pair_name=row.pair_name,
-                        symbol=row.symbol,
-                        head_state=row.head_state,
-                        tail_state=row.tail_state,
-                        tail_mode=row.tail_mode,
-                        reference_price=row.reference_price,
-                        stop_price=row.stop_price,
-                        initial_distance=row.initial_distance,
-                        current_distance=row.current_distance,
-                        last_tail_update_at=row.last_tail_update_at,
-                        recorded_at=row.recorded_at,
-                    )
+                    {
+                        "exchange": row.exchange,
+                        "environment": row.environment,
+                        "market_type": row.market_type,
+                        "account_scope": row.account_scope,
+                        "strategy_id": row.strategy_id,
+                        "pair_name": row.pair_name,
+                        "symbol": row.symbol,
+                        "head_state": row.head_state,
+                        "tail_state": row.tail_state,
+                        "tail_mode": row.tail_mode,
+                        "reference_price": row.reference_price,
+                        "stop_price": row.stop_price,
+                        "initial_distance": row.initial_distance,
+                        "current_distance": row.current_distance,
+                        "last_tail_update_at": row.last_tail_update_at,
+                        "recorded_at": row.recorded_at,
+                    }
                     for row in rows
-                ]
+                ],
             )
             session.commit()
             self._prune_tail_telemetry_if_due(session, rows)
@@ -4,22 +4,29 @@ The report uses the runtime log as the lifecycle timeline and, by default,
 uses the local private account DB as the canonical source for fills, fees, and
 maker/taker roles.  This keeps post-run journals reproducible from data already
 on disk, without depending on an exchange UI or other external witness.
+
+Logs are read line by line. With `--checkpoint`, the parsed state and the byte
+offset it covers are pickled to a local file so the next run only parses the
+appended tail; `--follow` keeps the parser and DB engine open and re-renders
+the report whenever the log grows.
 """
 
 from __future__ import annotations
 
 import argparse
 import os
+import pickle
 import re
 import sys
+import time
 from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from decimal import Decimal, ROUND_HALF_UP
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence, TextIO
+from typing import BinaryIO, Callable, Iterable, Mapping, Sequence, TextIO
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import Engine, create_engine, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
@@ -281,6 +288,9 @@ _EVENT_RE = re.compile(
 )
 _ENV_REF_RE = re.compile(r"\$\{([^}]+)\}")
 _USD_FEE_CURRENCIES = {"", "usd", "usdt", "zfusd"}
+_EVENT_MARKER = b"): "
+_CHECKPOINT_VERSION = 1
+_FINGERPRINT_BYTES = 256
 
 
 def parse_log_file(path: str | Path) -> dict[PairKey, PairLifecycle]:
@@ -295,10 +305,27 @@ def parse_log_text(text: str) -> dict[PairKey, PairLifecycle]:
     return parse_run_log_text(text).lifecycles
 
 
-def parse_run_log_file(path: str | Path) -> RunLogSnapshot:
-    """Parse a Kolabi runtime log file into all reportable run state."""
+def parse_run_log_file(
+    path: str | Path,
+    *,
+    checkpoint: str | Path | None = None,
+) -> RunLogSnapshot:
+    """Parse a Kolabi runtime log file into all reportable run state.
 
-    return parse_run_log_text(Path(path).read_text(encoding="utf-8", errors="replace"))
+    With `checkpoint`, parsing resumes from the saved offset when the file is
+    still the same log, and the new offset is saved before an unterminated last
+    line is parsed, so a line still being written is read again next time.
+    """
+
+    parser = (
+        RunLogParser() if checkpoint is None else RunLogParser.load_checkpoint(checkpoint)
+    )
+    pending = parser.read_file(path)
+    if checkpoint is not None:
+        parser.save_checkpoint(checkpoint)
+    if pending:
+        parser.feed_line(pending.decode("utf-8", errors="replace"))
+    return parser.snapshot()
 
 
 def parse_run_log_text(text: str) -> RunLogSnapshot:
@@ -314,22 +341,102 @@ def parse_run_log_text(text: str) -> RunLogSnapshot:
     amendment-diff calculations.
     """
 
-    lifecycles: dict[PairKey, PairLifecycle] = {}
-    tail_telemetry: dict[PairKey, TailTelemetry] = {}
-    latent_attempts: dict[PairKey, LatentAttempt] = {}
-    market_snapshot: MarketSnapshot | None = None
-    last_log_at: datetime | None = None
+    parser = RunLogParser()
     for raw_line in text.splitlines():
-        match = _EVENT_RE.match(raw_line)
+        parser.feed_line(raw_line)
+    return parser.snapshot()
+
+
+class RunLogParser:
+    """Incremental runtime-log parser behind `parse_run_log_file`.
+
+    `offset` counts the bytes of complete lines already parsed.  `read_file`
+    only reads past it, and `save_checkpoint` / `load_checkpoint` persist the
+    parsed state with that offset.  A checkpoint is dropped when the log was
+    rotated or truncated: other inode, shorter file, or different bytes just
+    before the offset.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self.lifecycles: dict[PairKey, PairLifecycle] = {}
+        self.tail_telemetry: dict[PairKey, TailTelemetry] = {}
+        self.latent_attempts: dict[PairKey, LatentAttempt] = {}
+        self.market_snapshot: MarketSnapshot | None = None
+        self.last_log_at: datetime | None = None
+        self.offset = 0
+        self._identity: tuple[int, int] | None = None
+        self._fingerprint = b""
+
+    @classmethod
+    def load_checkpoint(cls, path: str | Path) -> RunLogParser:
+        """Return the parser saved at `path`, or a fresh one when it is unusable."""
+
+        try:
+            with Path(path).open("rb") as handle:
+                saved = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            return cls()
+        if not isinstance(saved, dict) or saved.get("version") != _CHECKPOINT_VERSION:
+            return cls()
+        parser = cls()
+        parser.__dict__.update(saved["state"])
+        return parser
+
+    def save_checkpoint(self, path: str | Path) -> None:
+        """Write the parsed state atomically next to the log offset it covers."""
+
+        target = Path(path)
+        partial = target.with_name(target.name + ".tmp")
+        with partial.open("wb") as handle:
+            pickle.dump(
+                {"version": _CHECKPOINT_VERSION, "state": dict(self.__dict__)},
+                handle,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(partial, target)
+
+    def read_file(self, path: str | Path) -> bytes:
+        """Parse complete lines appended since `offset`.
+
+        Returns the unterminated trailing bytes, which are left unparsed.
+        """
+
+        with Path(path).open("rb") as handle:
+            stat = os.fstat(handle.fileno())
+            identity = (stat.st_dev, stat.st_ino)
+            if self._identity is not None and (
+                identity != self._identity or not self._same_prefix(handle, stat.st_size)
+            ):
+                self._reset()
+            self._identity = identity
+            handle.seek(self.offset)
+            for raw_line in handle:
+                if not raw_line.endswith(b"\n"):
+                    return raw_line
+                # Cheap bytes pre-filter: every event line has `(pair): `.
+                if _EVENT_MARKER in raw_line:
+                    self.feed_line(raw_line.decode("utf-8", errors="replace"))
+                self.offset += len(raw_line)
+                self._fingerprint = raw_line[-_FINGERPRINT_BYTES:]
+        return b""
+
+    def feed_line(self, raw_line: str) -> None:
+        """Apply one runtime log line to the parsed state."""
+
+        match = _EVENT_RE.match(raw_line.rstrip("\r\n"))
         if match is None:
-            continue
+            return
         log_time = _parse_log_utc(match.group("log_ts"))
-        if last_log_at is None or log_time > last_log_at:
-            last_log_at = log_time
+        if self.last_log_at is None or log_time > self.last_log_at:
+            self.last_log_at = log_time
         key = _parse_pair_key(match.group("pair"))
         if key is None:
-            continue
-        lifecycle = lifecycles.setdefault(key, PairLifecycle(key=key))
+            return
+        latent_attempts = self.latent_attempts
+        lifecycle = self.lifecycles.setdefault(key, PairLifecycle(key=key))
         event = match.group("event")
         body = match.group("body")
         if event == "HEAD_SENT":
@@ -340,12 +447,12 @@ def parse_run_log_text(text: str) -> RunLogSnapshot:
         elif event == "AMEND_SENT":
             _parse_amend_sent(lifecycle, body, log_time)
         elif event == "METRICS":
-            parsed_market = _parse_tail_metrics(tail_telemetry, key, body, log_time)
+            parsed_market = _parse_tail_metrics(self.tail_telemetry, key, body, log_time)
             if parsed_market is not None and (
-                market_snapshot is None
-                or parsed_market.recorded_at >= market_snapshot.recorded_at
+                self.market_snapshot is None
+                or parsed_market.recorded_at >= self.market_snapshot.recorded_at
             ):
-                market_snapshot = parsed_market
+                self.market_snapshot = parsed_market
         elif event == "REPEAT_READY":
             _parse_repeat_ready(latent_attempts, key, body, log_time)
         elif event == "LATENT_TIMEOUT_ARMED":
@@ -359,13 +466,22 @@ def parse_run_log_text(text: str) -> RunLogSnapshot:
             "HEAD_TIMEOUT",
         }:
             _mark_latent_ended(latent_attempts, key, event, log_time)
-    return RunLogSnapshot(
-        lifecycles=lifecycles,
-        tail_telemetry=tail_telemetry,
-        latent_attempts=latent_attempts,
-        market_snapshot=market_snapshot,
-        last_log_at=last_log_at,
-    )
+
+    def snapshot(self) -> RunLogSnapshot:
+        return RunLogSnapshot(
+            lifecycles=dict(self.lifecycles),
+            tail_telemetry=dict(self.tail_telemetry),
+            latent_attempts=dict(self.latent_attempts),
+            market_snapshot=self.market_snapshot,
+            last_log_at=self.last_log_at,
+        )
+
+    def _same_prefix(self, handle: BinaryIO, size: int) -> bool:
+        if size < self.offset:
+            return False
+        start = self.offset - len(self._fingerprint)
+        handle.seek(start)
+        return handle.read(len(self._fingerprint)) == self._fingerprint
 
 
 def fetch_fill_summaries(
@@ -379,44 +495,7 @@ def fetch_fill_summaries(
     took liquidity, otherwise maker if any fill made liquidity.
     """
 
-    ids = sorted({client_id for client_id in client_order_ids if client_id})
-    if not ids:
-        return {}
-    engine = create_engine(db_url, echo=False, future=True)
-    try:
-        with Session(engine) as session:
-            rows = session.execute(
-                select(ExchangeOrder, ExchangeFill)
-                .join(ExchangeFill, ExchangeFill.order_id == ExchangeOrder.id)
-                .where(ExchangeOrder.client_order_id.in_(ids))
-                .order_by(ExchangeFill.local_timestamp, ExchangeFill.id)
-            ).all()
-    except SQLAlchemyError as exc:
-        raise ReportError(f"could not read local account DB: {_compact_error(exc)}") from exc
-    finally:
-        engine.dispose()
-
-    accumulators: dict[str, _FillAccumulator] = {}
-    for order, fill in rows:
-        client_id = order.client_order_id
-        if not client_id:
-            continue
-        accumulator = accumulators.setdefault(
-            client_id,
-            _FillAccumulator(client_order_id=client_id, side=order.side),
-        )
-        accumulator.add_fill(
-            fill_id=fill.id,
-            price=_decimal(fill.price),
-            quantity=_decimal(fill.quantity),
-            fee=_optional_decimal(fill.fee),
-            fee_currency=fill.fee_currency,
-            liquidity_role=fill.liquidity_role,
-        )
-    return {
-        client_id: accumulator.summary()
-        for client_id, accumulator in accumulators.items()
-    }
+    return fetch_account_summaries(db_url, client_order_ids)[0]
 
 
 def fetch_order_summaries(
@@ -425,23 +504,50 @@ def fetch_order_summaries(
 ) -> dict[str, DbOrderSummary]:
     """Fetch latest local order state for requested client order ids."""
 
+    return fetch_account_summaries(db_url, client_order_ids)[1]
+
+
+def fetch_account_summaries(
+    db_url: str | None,
+    client_order_ids: Iterable[str],
+    *,
+    engine: Engine | None = None,
+) -> tuple[dict[str, DbFillSummary], dict[str, DbOrderSummary]]:
+    """Fetch fill and latest-order summaries in one account DB round trip.
+
+    Orders are outer-joined to their fills, so one query yields both views.
+    Pass `engine` to reuse a connection pool across refreshes; otherwise a
+    short-lived engine is built from `db_url` and disposed.
+    """
+
     ids = sorted({client_id for client_id in client_order_ids if client_id})
     if not ids:
-        return {}
-    engine = create_engine(db_url, echo=False, future=True)
+        return {}, {}
+    owned = engine is None
+    if engine is None:
+        if not db_url:
+            raise ReportError("account DB URL is required to fetch account summaries")
+        engine = create_engine(db_url, echo=False, future=True)
+    accumulators: dict[str, _FillAccumulator] = {}
+    orders: dict[str, DbOrderSummary] = {}
     try:
         with Session(engine) as session:
             rows = session.execute(
-                select(ExchangeOrder)
+                select(ExchangeOrder, ExchangeFill)
+                .outerjoin(ExchangeFill, ExchangeFill.order_id == ExchangeOrder.id)
                 .where(ExchangeOrder.client_order_id.in_(ids))
-                .order_by(ExchangeOrder.local_timestamp, ExchangeOrder.id)
-            ).scalars()
-            summaries: dict[str, DbOrderSummary] = {}
-            for order in rows:
+                .order_by(
+                    ExchangeOrder.local_timestamp,
+                    ExchangeOrder.id,
+                    ExchangeFill.local_timestamp,
+                    ExchangeFill.id,
+                )
+            ).all()
+            for order, fill in rows:
                 client_id = order.client_order_id
                 if not client_id:
                     continue
-                summaries[client_id] = DbOrderSummary(
+                orders[client_id] = DbOrderSummary(
                     client_order_id=client_id,
                     side=order.side,
                     status=order.status,
@@ -449,11 +555,30 @@ def fetch_order_summaries(
                     quantity=_decimal(order.quantity),
                     filled_quantity=_decimal(order.filled_quantity),
                 )
+                if fill is None:
+                    continue
+                accumulator = accumulators.setdefault(
+                    client_id,
+                    _FillAccumulator(client_order_id=client_id, side=order.side),
+                )
+                accumulator.add_fill(
+                    fill_id=fill.id,
+                    price=_decimal(fill.price),
+                    quantity=_decimal(fill.quantity),
+                    fee=_optional_decimal(fill.fee),
+                    fee_currency=fill.fee_currency,
+                    liquidity_role=fill.liquidity_role,
+                )
     except SQLAlchemyError as exc:
         raise ReportError(f"could not read local account DB: {_compact_error(exc)}") from exc
     finally:
-        engine.dispose()
-    return summaries
+        if owned:
+            engine.dispose()
+    fills = {
+        client_id: accumulator.summary()
+        for client_id, accumulator in accumulators.items()
+    }
+    return fills, orders
 
 
 def build_report_rows(
@@ -928,21 +1053,38 @@ def build_report_table(
     db_url: str | None = None,
     log_only: bool = False,
     options: ReportOptions | None = None,
+    checkpoint: str | Path | None = None,
 ) -> str:
     """Build the full report table from a runtime log and optional DB URL."""
 
-    snapshot = parse_run_log_file(log_path)
+    if not log_only:
+        _require_db_url(db_url)
+    snapshot = parse_run_log_file(log_path, checkpoint=checkpoint)
+    return render_snapshot_report(
+        snapshot, db_url=db_url, log_only=log_only, options=options
+    )
+
+
+def render_snapshot_report(
+    snapshot: RunLogSnapshot,
+    *,
+    db_url: str | None = None,
+    engine: Engine | None = None,
+    log_only: bool = False,
+    options: ReportOptions | None = None,
+) -> str:
+    """Render one parsed log snapshot, joining account DB rows unless `log_only`."""
+
     fill_summaries: Mapping[str, DbFillSummary] = {}
     order_summaries: Mapping[str, DbOrderSummary] = {}
     if not log_only:
-        if not db_url:
-            raise ReportError(
-                "account DB URL is required for exact reports; pass --account-db-url "
-                "or --log-only"
-            )
-        client_ids = _client_ids(snapshot.lifecycles.values())
-        fill_summaries = fetch_fill_summaries(db_url, client_ids)
-        order_summaries = fetch_order_summaries(db_url, client_ids)
+        if engine is None:
+            _require_db_url(db_url)
+        fill_summaries, order_summaries = fetch_account_summaries(
+            db_url,
+            _client_ids(snapshot.lifecycles.values()),
+            engine=engine,
+        )
     terminated_rows = build_report_rows(
         snapshot.lifecycles,
         fill_summaries=fill_summaries,
@@ -968,6 +1110,59 @@ def build_report_table(
     )
 
 
+def follow_report(
+    log_path: str | Path,
+    emit: Callable[[str], None],
+    *,
+    db_url: str | None = None,
+    log_only: bool = False,
+    options: ReportOptions | None = None,
+    checkpoint: str | Path | None = None,
+    interval_seconds: float = 5.0,
+    refreshes: int | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """Re-render the report each time the log grows; returns the render count.
+
+    The parser and the account DB engine stay open between refreshes, so each
+    pass only reads the appended lines plus one account DB query.  An
+    unterminated last line waits for the next pass.  `refreshes` bounds the
+    number of renders; `None` follows until interrupted.
+    """
+
+    if not log_only:
+        _require_db_url(db_url)
+    parser = (
+        RunLogParser() if checkpoint is None else RunLogParser.load_checkpoint(checkpoint)
+    )
+    engine = None if log_only else create_engine(str(db_url), echo=False, future=True)
+    rendered = 0
+    rendered_offset: int | None = None
+    try:
+        while refreshes is None or rendered < refreshes:
+            parser.read_file(log_path)
+            if parser.offset != rendered_offset:
+                if checkpoint is not None:
+                    parser.save_checkpoint(checkpoint)
+                emit(
+                    render_snapshot_report(
+                        parser.snapshot(),
+                        engine=engine,
+                        log_only=log_only,
+                        options=options,
+                    )
+                )
+                rendered += 1
+                rendered_offset = parser.offset
+                if refreshes is not None and rendered >= refreshes:
+                    break
+            sleep(interval_seconds)
+    finally:
+        if engine is not None:
+            engine.dispose()
+    return rendered
+
+
 def resolve_account_db_url(
     explicit_url: str | None,
     *,
@@ -1031,6 +1226,25 @@ def build_parser() -> argparse.ArgumentParser:
         default=5,
         help="Decimal places for Hfill and Tfill.",
     )
+    parser.add_argument(
+        "--checkpoint",
+        help=(
+            "Pickle file holding parsed log state and byte offset; later runs "
+            "only parse lines appended since."
+        ),
+    )
+    parser.add_argument(
+        "--follow",
+        "-f",
+        action="store_true",
+        help="Keep reading the log and refresh the report whenever it grows.",
+    )
+    parser.add_argument(
+        "--follow-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between log size checks in --follow mode.",
+    )
     return parser
 
 
@@ -1047,16 +1261,31 @@ def main(
         db_url = None
         if not args.log_only:
             db_url = resolve_account_db_url(args.account_db_url, env_file=args.env_file)
+        options = ReportOptions(price_places=args.price_dp)
+        if args.follow:
+            follow_report(
+                args.log_file,
+                _follow_emitter(args.output, out),
+                db_url=db_url,
+                log_only=args.log_only,
+                options=options,
+                checkpoint=args.checkpoint,
+                interval_seconds=args.follow_interval,
+            )
+            return 0
         table = build_report_table(
             args.log_file,
             db_url=db_url,
             log_only=args.log_only,
-            options=ReportOptions(price_places=args.price_dp),
+            options=options,
+            checkpoint=args.checkpoint,
         )
         if args.output:
             _prepend_output(Path(args.output), table)
         else:
             print(table, file=out)
+    except KeyboardInterrupt:
+        return 0
     except ReportError as exc:
         print(f"kolabi-run-report: {exc}", file=err)
         return 2
@@ -1408,7 +1637,9 @@ def _parse_iso_utc(raw: str) -> datetime:
 
 
 def _parse_log_utc(raw: str) -> datetime:
-    return datetime.strptime(raw, "%Y-%m-%d %H:%M:%S,%f").replace(tzinfo=timezone.utc)
+    # fromisoformat reads the logging `,mmm` fraction and is far cheaper than
+    # strptime on multi-day logs.
+    return datetime.fromisoformat(raw).replace(tzinfo=timezone.utc)
 
 
 def _tail_amend_time(lifecycle: PairLifecycle, index: int) -> datetime | None:
@@ -1795,14 +2026,39 @@ def _compact_error(exc: BaseException) -> str:
     return " ".join(str(exc).split())
 
 
-def _prepend_output(path: Path, text: str) -> None:
+def _prepend_output(path: Path, text: str, *, existing: str | None = None) -> None:
     rendered = text.rstrip() + "\n"
-    if path.exists():
+    if existing is None and path.exists():
         existing = path.read_text(encoding="utf-8")
-        if existing:
-            rendered = rendered + "\n" + existing
+    if existing:
+        rendered = rendered + "\n" + existing
     path.write_text(rendered, encoding="utf-8")
 
 
+def _follow_emitter(output: str | None, out: TextIO) -> Callable[[str], None]:
+    """Print each refresh, or keep one live report above the original file body."""
+
+    if not output:
+        def emit_stdout(table: str) -> None:
+            print(table, file=out, flush=True)
+
+        return emit_stdout
+    path = Path(output)
+    existing = path.read_text(encoding="utf-8") if path.exists() else ""
+
+    def emit_file(table: str) -> None:
+        _prepend_output(path, table, existing=existing)
+
+    return emit_file
+
+
+def _require_db_url(db_url: str | None) -> None:
+    if not db_url:
+        raise ReportError(
+            "account DB URL is required for exact reports; pass --account-db-url "
+            "or --log-only"
+        )
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
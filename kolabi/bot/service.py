@@ -7,7 +7,20 @@ import re
 import time
 from dataclasses import dataclass, replace
 from decimal import Decimal
-from typing import Any, Callable, Iterable, Optional, Protocol, TypeVar, cast
+from functools import partial
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    TypeVar,
+    cast,
+)
 
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -26,7 +39,7 @@ from kolabi.bot.indicators import (
     IndicatorClient,
     KrakenDbIndicatorClient,
 )
-from kolabi.bot.ogun_executor import OgunExecutor, RestFlightPolicy
+from kolabi.bot.ogun_executor import OgunExecutor, RestBatchPolicy, RestFlightPolicy
 from kolabi.bot.order_codes import parse_order_code
 from kolabi.bot.persistence import (
     OrderRecorder,
@@ -36,6 +49,7 @@ from kolabi.bot.persistence import (
 from kolabi.bot.strategy_runtime import (
     KrakenPrivateOrderPollingSource,
     KrakenPublicTriggerSource,
+    PrivateOrderStateReader,
     PublicRuntimeStateReader,
     SimulatedExecutor,
     StaticHookSource,
@@ -43,6 +57,7 @@ from kolabi.bot.strategy_runtime import (
     StrategyRuntime,
     plan_strategy_once,
 )
+from kolabi.bot.tail_verification import TailVerifyMetrics, TriggerOrderWaiters
 from kolabi.shared.binance_futures import (
     binance_futures_audit_db_url,
     binance_futures_critical_db_url,
@@ -81,6 +96,8 @@ from kolabi.shared.core.runtime_types import (
     Symbol,
 )
 from kolabi.shared.exchanges import get_adapter
+from kolabi.shared.instrument_cache import InstrumentMetadataCache
+from kolabi.shared.rate_limits import RateLimitRegistry, TokenBucket
 from kolabi.shared.kraken_futures import (
     kraken_futures_audit_db_url,
     kraken_futures_environment,
@@ -88,9 +105,21 @@ from kolabi.shared.kraken_futures import (
     kraken_futures_telemetry_db_url,
 )
 from kolabi.shared.logging import setup_logging
+from kolabi.shared.notify import (
+    INSTRUMENT_CHANNEL,
+    MARKET_CHANNEL,
+    PRIVATE_CHANNEL,
+    StateChangeListener,
+    StateChangeSignal,
+    parse_state_route,
+)
 from kolabi.shared.pruning import DEFAULT_PRUNING, TimeCountPruning
 from kolabi.shared.redaction import redact_url
-from kolabi.shared.runtime_state import KrakenRuntimeStateClient, StrategyRuntimeState
+from kolabi.shared.runtime_state import (
+    AsyncRuntimeStateReader,
+    KrakenRuntimeStateClient,
+    StrategyRuntimeState,
+)
 
 _LOGGER = logging.getLogger("kola")
 _T = TypeVar("_T")
@@ -348,6 +377,10 @@ class ExchangeAdapterLike(Protocol):
     ) -> OrderAck: ...
     def amend_order(self, order_id: str, **params: object) -> OrderAck: ...
     def cancel_order(self, order_id: str) -> OrderAck: ...
+    def place_orders(
+        self, orders: Sequence[Mapping[str, Any]]
+    ) -> list[OrderAck | Exception]: ...
+    def cancel_orders(self, order_ids: Sequence[str]) -> list[OrderAck | Exception]: ...
     def get_position(self) -> Any: ...
 
 
@@ -397,6 +430,14 @@ class BotConfig:
     max_active_pairs: int = 4
     rest_min_interval_seconds: float = 0.1
     rest_max_inflight: int = 2
+    rest_batch_window_seconds: float = 0.0
+    rest_batch_max_size: int = 10
+    rest_weight_headroom: float = 0.8
+    async_state_reads: bool = True
+    state_read_workers: int = 2
+    state_notify: bool = True
+    state_safety_poll_seconds: float = 5.0
+    instrument_cache_ttl_seconds: float = 3600.0
     rest_audit_retention_minutes: int = DEFAULT_PRUNING.rest_audit.retention_minutes
     rest_audit_retention_limit: int = DEFAULT_PRUNING.rest_audit.retention_limit
     tail_telemetry_retention_minutes: int = (
@@ -546,7 +587,18 @@ class BotService:
                 config.symbol,
             ),
         )
+        # One cache for the runtime state client and every adapter, so the
+        # feeders' INSTRUMENT_CHANNEL notifications invalidate all of them.
+        self.instrument_cache = InstrumentMetadataCache(
+            ttl_seconds=config.instrument_cache_ttl_seconds,
+        )
+        # Same idea for REST weight: Ogun spends from these buckets and the
+        # adapters resync them from the venue's used-weight headers.
+        self.rate_limits = RateLimitRegistry(headroom=config.rest_weight_headroom)
         self.runtime_state: KrakenRuntimeStateClient | None = None
+        self._async_state_reader: AsyncRuntimeStateReader | None = None
+        self._state_listener: StateChangeListener | None = None
+        self.tail_verify_metrics = TailVerifyMetrics()
         if (
             self.default_exchange in {"kraken", "binance", "bitmex"}
             and market_db_url is not None
@@ -564,6 +616,7 @@ class BotService:
                 max_public_age_seconds=config.max_public_age_seconds,
                 max_private_age_seconds=config.max_private_age_seconds,
                 max_reconcile_age_seconds=config.max_reconcile_age_seconds,
+                instrument_cache=self.instrument_cache,
             )
 
     def start(self) -> None:
@@ -847,7 +900,7 @@ class BotService:
                 market_type=record.market_type or self.default_market_type,
             )
             try:
-                asyncio.run(executor.execute(command))
+                asyncio.run(_closing_http(executor.execute(command), port))
             except Exception as exc:
                 raise RuntimeError(
                     "startup orphan cancel failed "
@@ -1020,6 +1073,7 @@ class BotService:
             simulate=simulate,
         )
         if dry_run:
+            self._close_state_reader()
             return plan_strategy_once(strategy=strategy, symbol=self.config.symbol)
         return self._run_runtime_with_cleanup(runtime, simulate=simulate)
 
@@ -1031,8 +1085,11 @@ class BotService:
     ) -> StrategyRunResult:
         """Run the async runtime and unwind live exposure on operator/runtime aborts."""
 
+        if self._state_listener is not None:
+            self._state_listener.start()
         try:
-            return asyncio.run(runtime.run())
+            port = getattr(getattr(runtime, "executor", None), "port", None)
+            return asyncio.run(_closing_http(runtime.run(), port))
         except KeyboardInterrupt:
             self._cleanup_runtime_after_abort(runtime, simulate=simulate, reason="interrupt")
             raise
@@ -1043,6 +1100,8 @@ class BotService:
                 reason="runtime_error",
             )
             raise
+        finally:
+            self._close_state_reader()
 
     def _cleanup_runtime_after_abort(
         self,
@@ -1204,6 +1263,10 @@ class BotService:
                 min_interval_seconds=self.config.rest_min_interval_seconds,
                 max_inflight=self.config.rest_max_inflight,
             ),
+            batch_policy=RestBatchPolicy(
+                window_seconds=self.config.rest_batch_window_seconds,
+                max_size=self.config.rest_batch_max_size,
+            ),
         )
 
     def _build_routing_port(self, *, verify_tail_on_place: bool) -> SymbolRoutingExchangePort:
@@ -1215,6 +1278,11 @@ class BotService:
             verify_poll_seconds=self.config.tail_verify_poll_seconds,
             run_blocking_calls_in_thread=True,
             verify_tail_on_place=verify_tail_on_place,
+            rate_limits=self.rate_limits,
+            account_scope=self.config.account_scope,
+            private_order_listener=self._ensure_state_listener(),
+            verify_metrics=self.tail_verify_metrics,
+            safety_poll_seconds=self.config.state_safety_poll_seconds,
         )
 
     def _build_public_source(self, *, simulate: bool):
@@ -1222,14 +1290,100 @@ class BotService:
             return StaticHookSource()
         if self.runtime_state is not None:
             return KrakenPublicTriggerSource(
-                cast(PublicRuntimeStateReader, self.runtime_state)
+                cast(PublicRuntimeStateReader, self._source_state_reader()),
+                wakeup=self._state_wakeup(MARKET_CHANNEL),
+                safety_poll_seconds=self.config.state_safety_poll_seconds,
             )
         return StaticHookSource()
 
     def _build_private_source(self, *, simulate: bool):
         if simulate or self.runtime_state is None:
             return None
-        return KrakenPrivateOrderPollingSource(self.runtime_state)
+        return KrakenPrivateOrderPollingSource(
+            cast(PrivateOrderStateReader, self._source_state_reader()),
+            wakeup=self._state_wakeup(PRIVATE_CHANNEL),
+            safety_poll_seconds=self.config.state_safety_poll_seconds,
+        )
+
+    def _state_wakeup(self, channel: str) -> StateChangeSignal | None:
+        """LISTEN/NOTIFY wakeup for polling sources; `None` keeps plain polling.
+
+        The listener connects when the runtime starts, not when sources are built.
+        """
+        listener = self._ensure_state_listener()
+        if listener is None:
+            return None
+        return listener.signal(channel)
+
+    def _ensure_state_listener(self) -> StateChangeListener | None:
+        """Shared LISTEN/NOTIFY listener, or `None` when notify is off or DBs are missing."""
+        if (
+            not self.config.state_notify
+            or self._market_db_url is None
+            or self._account_db_url is None
+        ):
+            return None
+        if self._state_listener is None:
+            self._state_listener = StateChangeListener(
+                (self._market_db_url, self._account_db_url),
+                environment=self.config.environment,
+                logger=self.logger,
+            )
+            self._state_listener.subscribe(
+                INSTRUMENT_CHANNEL,
+                self._invalidate_instrument_route,
+            )
+        return self._state_listener
+
+    def _invalidate_instrument_route(self, route: str | None) -> None:
+        """Drop cached instrument rules when a feeder rewrites `exchange_instruments`."""
+        if route is None:
+            # Reconnect: notifications may have been missed.
+            self.instrument_cache.clear()
+            return
+        parsed = parse_state_route(route)
+        if parsed is None:
+            return
+        exchange, market_type, symbol = parsed
+        self.instrument_cache.invalidate(
+            exchange,
+            self.config.environment,
+            market_type,
+            symbol,
+        )
+
+    def _source_state_reader(self) -> KrakenRuntimeStateClient | AsyncRuntimeStateReader:
+        """State reader for polling sources: executor-backed unless disabled."""
+        assert self.runtime_state is not None
+        if not self.config.async_state_reads:
+            return self.runtime_state
+        if self._async_state_reader is None:
+            self._async_state_reader = AsyncRuntimeStateReader(
+                self.runtime_state,
+                max_workers=self.config.state_read_workers,
+            )
+        return self._async_state_reader
+
+    def _close_state_reader(self) -> None:
+        if self.runtime_state is not None:
+            for line in self.runtime_state.read_metrics.summary_lines():
+                self.logger.info("state_read_latency %s", line)
+        for line in self.tail_verify_metrics.summary_lines():
+            self.logger.info("tail_verify %s", line)
+        cache_stats = self.instrument_cache.stats()
+        self.logger.info(
+            "instrument_cache hits=%d misses=%d invalidations=%d entries=%d",
+            cache_stats.hits,
+            cache_stats.misses,
+            cache_stats.invalidations,
+            cache_stats.entries,
+        )
+        if self._async_state_reader is not None:
+            self._async_state_reader.close()
+            self._async_state_reader = None
+        if self._state_listener is not None:
+            self._state_listener.stop()
+            self._state_listener = None
 
     def _ensure_exchange_config(self) -> None:
         if self.exchange_config is not None:
@@ -1316,6 +1470,8 @@ class BotService:
         )
         cfg.adapter_kwargs["account_scope"] = self.config.account_scope
         cfg.adapter_kwargs["market_type"] = market_type
+        cfg.adapter_kwargs["instrument_cache"] = self.instrument_cache
+        cfg.adapter_kwargs["rate_limits"] = self.rate_limits
 
     def _build_admin_port(self) -> AdapterExchangePort:
         self._ensure_exchange_config()
@@ -1362,7 +1518,7 @@ class BotService:
                 ),
             )
             try:
-                cancelled.append(asyncio.run(executor.execute(command)))
+                cancelled.append(asyncio.run(_closing_http(executor.execute(command), port)))
             except Exception as exc:
                 cancel_errors.append({"order_id": key, "error": _compact_admin_error(exc)})
                 continue
@@ -1389,6 +1545,9 @@ class BotService:
                 **close_params["params"],
             )
         position_after = port.adapter.get_position()
+        flush_rest_audit = getattr(port.adapter, "flush_rest_audit", None)
+        if callable(flush_rest_audit):
+            flush_rest_audit()
         audit_errors = list(getattr(port.adapter, "rest_audit_errors", ()))
         return {
             "cancelled": cancelled,
@@ -1585,6 +1744,16 @@ class BotService:
         return adapter
 
 
+async def _closing_http(awaitable: Awaitable[_T], port: object) -> _T:
+    """Attend `awaitable` puis ferme le pool HTTP du port avant la fin de la boucle."""
+    try:
+        return await awaitable
+    finally:
+        close = getattr(port, "aclose", None)
+        if close is not None:
+            await close()
+
+
 async def _run_private_stack(
     *_args: Any,
 ) -> None:
@@ -1604,6 +1773,9 @@ class AdapterExchangePort(ExchangePort):
         verify_poll_seconds: float = 0.5,
         run_blocking_calls_in_thread: bool = False,
         verify_tail_on_place: bool = True,
+        private_order_listener: StateChangeListener | None = None,
+        verify_metrics: TailVerifyMetrics | None = None,
+        safety_poll_seconds: float = 5.0,
     ) -> None:
         adapter_cls = _adapter_class(exchange, market_type)
         adapter_kwargs = dict(exchange_config.adapter_kwargs)
@@ -1622,31 +1794,100 @@ class AdapterExchangePort(ExchangePort):
         self.verify_poll_seconds = verify_poll_seconds
         self.run_blocking_calls_in_thread = run_blocking_calls_in_thread
         self.verify_tail_on_place = verify_tail_on_place
+        self.verify_metrics = verify_metrics
+        self.trigger_waiters: TriggerOrderWaiters | None = None
+        if private_order_listener is not None and getattr(
+            self.adapter, "private_orders_in_db", False
+        ):
+            # les lignes privees arrivent par le feeder: on attend son NOTIFY
+            # au lieu de lister les ordres en REST
+            reader = cast(TriggerOrderReader, self.adapter)
+            self.trigger_waiters = TriggerOrderWaiters(
+                ExchangeRoute(
+                    exchange=exchange,
+                    market_type=market_type,
+                    symbol=exchange_config.symbol,
+                ).label,
+                partial(self._call_blocking, _trigger_orders_from_private_db, reader),
+                safety_poll_seconds=safety_poll_seconds,
+            )
+            private_order_listener.subscribe(PRIVATE_CHANNEL, self.trigger_waiters.notify)
 
     async def place_head(self, command: PlaceHeadCommand) -> OrderAck:
-        return await self._call_blocking(self._place, command.request)
+        return await self._place(command.request)
 
     async def place_tail(self, command: PlaceTailCommand) -> OrderAck:
-        ack = await self._call_blocking(self._place, command.request)
+        ack = await self._place(command.request)
         if self.verify_tail_on_place:
             await self._verify_tail_trigger(command.request, ack)
         return ack
 
     async def amend_head(self, command: AmendHeadCommand) -> OrderAck:
-        return await self._call_blocking(self._amend_head, command.request)
+        return await self._amend_head(command.request)
 
     async def amend_tail(self, command: AmendTailCommand) -> OrderAck:
-        return await self._call_blocking(self._amend_tail, command.request)
+        return await self._amend_tail(command.request)
 
     async def cancel(self, command: CancelCommand) -> OrderAck:
-        return await self._call_blocking(self.adapter.cancel_order, command.request.clOrdID)
+        return await self._adapter_call("cancel_order", command.request.clOrdID)
+
+    async def aclose(self) -> None:
+        """Ferme le pool HTTP asynchrone de l'adaptateur, s'il en a un."""
+        close = getattr(self.adapter, "aclose", None)
+        if close is not None:
+            await close()
 
     async def _call_blocking(self, func: Callable[..., _T], *args: object) -> _T:
         if self.run_blocking_calls_in_thread:
             return await asyncio.to_thread(func, *args)
         return func(*args)
 
-    def _place(self, request: PlaceOrderCommandRequest) -> OrderAck:
+    async def _adapter_call(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        # l'adaptateur qui expose `<name>_async` envoie sur son pool HTTP
+        # asynchrone; les autres restent sur l'appel bloquant
+        native = getattr(self.adapter, f"{name}_async", None)
+        if native is not None:
+            return await native(*args, **kwargs)
+        return await self._call_blocking(partial(getattr(self.adapter, name), *args, **kwargs))
+
+    def batch_key(self, command: DragonSong) -> Hashable | None:
+        if isinstance(command, (CancelCommand, PlaceHeadCommand)):
+            return str(command.symbol)
+        return None
+
+    async def execute_batch(
+        self, commands: Sequence[DragonSong]
+    ) -> list[OrderAck | Exception]:
+        if all(isinstance(command, CancelCommand) for command in commands):
+            order_ids = [
+                cast(CancelCommand, command).request.clOrdID for command in commands
+            ]
+            return await self._adapter_call("cancel_orders", order_ids)
+        if all(isinstance(command, PlaceHeadCommand) for command in commands):
+            requests = [cast(PlaceHeadCommand, command).request for command in commands]
+            return await self._place_batch(requests)
+        raise TypeError("execute_batch needs only cancels or only head placements")
+
+    async def _place(self, request: PlaceOrderCommandRequest) -> OrderAck:
+        params = self._place_kwargs(request)
+        side = params.pop("side")
+        return await self._adapter_call("place_order", side, params.pop("orderQty"), **params)
+
+    async def _place_batch(
+        self, requests: Sequence[PlaceOrderCommandRequest]
+    ) -> list[OrderAck | Exception]:
+        results: list[OrderAck | Exception | None] = []
+        orders: list[dict[str, Any]] = []
+        for request in requests:
+            try:
+                orders.append(self._place_kwargs(request))
+                results.append(None)
+            except ValueError as exc:
+                results.append(exc)
+        acks = iter(await self._adapter_call("place_orders", orders) if orders else [])
+        return [next(acks) if result is None else result for result in results]
+
+    def _place_kwargs(self, request: PlaceOrderCommandRequest) -> dict[str, Any]:
         if request.orderQty is None:
             raise ValueError(f"Missing orderQty for place request on pair '{request.pair_name}'")
         params: dict[str, Any] = {}
@@ -1680,12 +1921,12 @@ class AdapterExchangePort(ExchangePort):
             params["text"] = request.text
         if request.oDelta is not None:
             params["oDelta"] = request.oDelta
-        return self.adapter.place_order(
-            request.side,
-            request.orderQty,
-            type_=request.ordType,
+        return {
+            "side": request.side,
+            "orderQty": request.orderQty,
+            "type_": request.ordType,
             **params,
-        )
+        }
 
     async def _verify_tail_trigger(
         self,
@@ -1696,16 +1937,18 @@ class AdapterExchangePort(ExchangePort):
             return
         if not hasattr(self.adapter, "live_trigger_orders"):
             return
+        if self.trigger_waiters is not None:
+            await self._await_tail_trigger(request, ack, self.trigger_waiters)
+            return
         reader = cast(TriggerOrderReader, self.adapter)
-        deadline = asyncio.get_running_loop().time() + self.verify_timeout_seconds
-        last_live_orders: list[dict[str, Any]] = []
-        last_db_orders: list[dict[str, Any]] = []
-        contradictory_ack = not _ack_can_rest_as_trigger(ack)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.verify_timeout_seconds
+        rest_calls = 0
         while True:
             live_orders = await self._call_blocking(reader.live_trigger_orders)
+            rest_calls += 1
             db_orders = await self._call_blocking(_trigger_orders_from_private_db, reader)
-            last_live_orders = live_orders
-            last_db_orders = db_orders
             match, source = _match_trigger_evidence(
                 live_orders,
                 db_orders,
@@ -1713,43 +1956,59 @@ class AdapterExchangePort(ExchangePort):
                 ack,
             )
             if match is not None and source is not None:
-                if contradictory_ack:
-                    _LOGGER.warning(
-                        "tail trigger verified by %s despite contradictory ack: "
-                        "pair=%s clOrdID=%s orderID=%s ack_status=%s "
-                        "live_order_id=%s live_client_id=%s live_status=%s",
-                        source,
-                        request.pair_name,
-                        request.clOrdID or "-",
-                        ack.order_id,
-                        ack.status,
-                        match.get("order_id"),
-                        match.get("client_order_id"),
-                        match.get("status"),
-                    )
+                self._record_verify(source, loop.time() - started, rest_calls)
+                _warn_on_contradictory_ack(request, ack, match, source)
                 return
-            if asyncio.get_running_loop().time() >= deadline:
-                err_kind = (
-                    "tail trigger order rejected by exchange"
-                    if contradictory_ack
-                    else "tail trigger order not visible after placement"
-                )
-                raise RuntimeError(
-                    f"{err_kind}: "
-                    f"pair={request.pair_name} clOrdID={request.clOrdID or '-'} "
-                    f"orderID={ack.order_id} status={ack.status} "
-                    f"stopPx={request.stopPx} qty={request.orderQty} "
-                    f"live_seen={len(last_live_orders)} db_seen={len(last_db_orders)}"
-                )
+            if loop.time() >= deadline:
+                self._record_verify("failed", loop.time() - started, rest_calls)
+                raise _tail_not_verified(request, ack, live_orders, db_orders)
             await asyncio.sleep(self.verify_poll_seconds)
 
-    def _amend_head(self, request: AmendOrderCommandRequest) -> OrderAck:
+    async def _await_tail_trigger(
+        self,
+        request: PlaceOrderCommandRequest,
+        ack: OrderAck,
+        waiters: TriggerOrderWaiters,
+    ) -> None:
+        """Attend la ligne privee du tail; une seule liste REST a l'echeance."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        match = await waiters.wait(
+            request.clOrdID or str(ack.order_id),
+            partial(_matching_tail_trigger_order, request=request, ack=ack),
+            self.verify_timeout_seconds,
+        )
+        if match is not None:
+            self._record_verify("private_stream", loop.time() - started, 0)
+            _warn_on_contradictory_ack(request, ack, match, "private_stream")
+            return
+        reader = cast(TriggerOrderReader, self.adapter)
+        live_orders = await self._call_blocking(reader.live_trigger_orders)
+        db_orders = await self._call_blocking(_trigger_orders_from_private_db, reader)
+        match, source = _match_trigger_evidence(live_orders, db_orders, request, ack)
+        if match is not None and source is not None:
+            self._record_verify(f"deadline_{source}", loop.time() - started, 1)
+            _warn_on_contradictory_ack(request, ack, match, source)
+            return
+        self._record_verify("failed", loop.time() - started, 1)
+        raise _tail_not_verified(request, ack, live_orders, db_orders)
+
+    def _record_verify(self, source: str, seconds: float, rest_calls: int) -> None:
+        if self.verify_metrics is not None:
+            self.verify_metrics.record(
+                source,
+                seconds,
+                rest_calls=rest_calls,
+                poll_seconds=self.verify_poll_seconds,
+            )
+
+    async def _amend_head(self, request: AmendOrderCommandRequest) -> OrderAck:
         params: dict[str, Any] = {}
         if request.newPrice is not None:
             params["price"] = request.newPrice
-        return self._amend_with_params(request, params)
+        return await self._amend_with_params(request, params)
 
-    def _amend_tail(self, request: AmendOrderCommandRequest) -> OrderAck:
+    async def _amend_tail(self, request: AmendOrderCommandRequest) -> OrderAck:
         params: dict[str, Any] = {}
         if request.newPrice is not None:
             params["stopPx"] = request.newPrice
@@ -1759,9 +2018,9 @@ class AdapterExchangePort(ExchangePort):
                     stop_px=request.newPrice,
                     offset=request.oDelta,
                 )
-        return self._amend_with_params(request, params)
+        return await self._amend_with_params(request, params)
 
-    def _amend_with_params(
+    async def _amend_with_params(
         self,
         request: AmendOrderCommandRequest,
         params: dict[str, Any],
@@ -1772,7 +2031,7 @@ class AdapterExchangePort(ExchangePort):
             params["orderQty"] = request.newQty
         if request.text is not None:
             params["text"] = request.text
-        return self.adapter.amend_order(request.orderID, **params)
+        return await self._adapter_call("amend_order", request.orderID, **params)
 
 
 class SymbolRoutingExchangePort(ExchangePort):
@@ -1789,6 +2048,11 @@ class SymbolRoutingExchangePort(ExchangePort):
         verify_poll_seconds: float = 0.5,
         run_blocking_calls_in_thread: bool = False,
         verify_tail_on_place: bool = True,
+        rate_limits: RateLimitRegistry | None = None,
+        account_scope: str = "default",
+        private_order_listener: StateChangeListener | None = None,
+        verify_metrics: TailVerifyMetrics | None = None,
+        safety_poll_seconds: float = 5.0,
     ) -> None:
         self.exchange = normalise_exchange_name(exchange)
         self.market_type = (market_type or DEFAULT_MARKET_TYPE).strip().lower()
@@ -1803,6 +2067,11 @@ class SymbolRoutingExchangePort(ExchangePort):
         self.verify_poll_seconds = verify_poll_seconds
         self.run_blocking_calls_in_thread = run_blocking_calls_in_thread
         self.verify_tail_on_place = verify_tail_on_place
+        self.rate_limits = rate_limits
+        self.account_scope = account_scope
+        self.private_order_listener = private_order_listener
+        self.verify_metrics = verify_metrics
+        self.safety_poll_seconds = safety_poll_seconds
         self._ports: dict[ExchangeRoute, AdapterExchangePort] = {}
 
     def _route(self, command: DragonSong) -> ExchangeRoute:
@@ -1819,6 +2088,16 @@ class SymbolRoutingExchangePort(ExchangePort):
             )
         return ExchangeRoute(exchange=exchange, market_type=market_type, symbol=str(command.symbol))
 
+    def rate_limit_lane(
+        self, command: DragonSong
+    ) -> tuple[tuple[str, str, str], TokenBucket | None]:
+        """Rate-limit lane shared by every symbol of one venue account."""
+        route = self._route(command)
+        key = (route.exchange, route.market_type, self.account_scope)
+        if self.rate_limits is None:
+            return key, None
+        return key, self.rate_limits.bucket(*key)
+
     def _config_for_route(self, route: ExchangeRoute) -> ExchangeConfig:
         if self.exchange_config_loader is not None:
             return self.exchange_config_loader(route)
@@ -1852,6 +2131,9 @@ class SymbolRoutingExchangePort(ExchangePort):
             verify_poll_seconds=self.verify_poll_seconds,
             run_blocking_calls_in_thread=self.run_blocking_calls_in_thread,
             verify_tail_on_place=self.verify_tail_on_place,
+            private_order_listener=self.private_order_listener,
+            verify_metrics=self.verify_metrics,
+            safety_poll_seconds=self.safety_poll_seconds,
         )
         self._ports[route] = port
         return port
@@ -1871,6 +2153,20 @@ class SymbolRoutingExchangePort(ExchangePort):
     async def cancel(self, command: CancelCommand) -> OrderAck:
         return await self._port(command).cancel(command)
 
+    def batch_key(self, command: DragonSong) -> Hashable | None:
+        if isinstance(command, (CancelCommand, PlaceHeadCommand)):
+            return self._route(command)
+        return None
+
+    async def execute_batch(
+        self, commands: Sequence[DragonSong]
+    ) -> list[OrderAck | Exception]:
+        return await self._port(commands[0]).execute_batch(commands)
+
+    async def aclose(self) -> None:
+        for port in self._ports.values():
+            await port.aclose()
+
 
 def _matching_tail_trigger_order(
     orders: list[dict[str, Any]],
@@ -1917,6 +2213,49 @@ def _trigger_orders_from_private_db(reader: TriggerOrderReader) -> list[dict[str
     return reader.live_trigger_orders_db()
 
 
+def _warn_on_contradictory_ack(
+    request: PlaceOrderCommandRequest,
+    ack: OrderAck,
+    match: dict[str, Any],
+    source: str,
+) -> None:
+    if _ack_can_rest_as_trigger(ack):
+        return
+    _LOGGER.warning(
+        "tail trigger verified by %s despite contradictory ack: "
+        "pair=%s clOrdID=%s orderID=%s ack_status=%s "
+        "live_order_id=%s live_client_id=%s live_status=%s",
+        source,
+        request.pair_name,
+        request.clOrdID or "-",
+        ack.order_id,
+        ack.status,
+        match.get("order_id"),
+        match.get("client_order_id"),
+        match.get("status"),
+    )
+
+
+def _tail_not_verified(
+    request: PlaceOrderCommandRequest,
+    ack: OrderAck,
+    live_orders: list[dict[str, Any]],
+    db_orders: list[dict[str, Any]],
+) -> RuntimeError:
+    err_kind = (
+        "tail trigger order not visible after placement"
+        if _ack_can_rest_as_trigger(ack)
+        else "tail trigger order rejected by exchange"
+    )
+    return RuntimeError(
+        f"{err_kind}: "
+        f"pair={request.pair_name} clOrdID={request.clOrdID or '-'} "
+        f"orderID={ack.order_id} status={ack.status} "
+        f"stopPx={request.stopPx} qty={request.orderQty} "
+        f"live_seen={len(live_orders)} db_seen={len(db_orders)}"
+    )
+
+
 def _ack_can_rest_as_trigger(ack: OrderAck) -> bool:
     status = ack.status.replace(" ", "_").replace("-", "_").lower()
     return status in {"new", "open", "placed", "submitted"}
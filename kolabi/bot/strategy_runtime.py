@@ -13,13 +13,25 @@ Role: interpreter shell.
 from __future__ import annotations
 
 import asyncio
+import inspect
 import logging
+from bisect import bisect_right
 from collections import deque
 from dataclasses import dataclass, replace
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from itertools import count
-from typing import Mapping, Protocol, assert_never, cast
+from time import monotonic, perf_counter
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Protocol,
+    assert_never,
+    cast,
+)
 
 from kolabi.bot.chronos import (
     Chronos,
@@ -27,6 +39,8 @@ from kolabi.bot.chronos import (
     pair_dependency_satisfied,
     resolve_pair_name,
 )
+from kolabi.bot.deadlines import DeadlineScheduler, utc_now
+from kolabi.bot.dedupe import DEFAULT_DEDUPE_MAX_KEYS, AttemptDedupe
 from kolabi.bot.domain import (
     EggMove,
     EggMoveKind,
@@ -82,6 +96,7 @@ from kolabi.shared.core.runtime_types import (
     PlaceOrderCommandRequest,
     PlaceTailCommand,
     Price,
+    PrivateDeltaQuery,
     PrivateOrderRecord,
     RuntimeCommandKind,
     Symbol,
@@ -93,6 +108,7 @@ _DEFAULT_HEAD_FILL_REFERENCE_GRACE_SECONDS = 20.0
 _DEFAULT_PRIVATE_PENDING_RECORD_TTL_SECONDS = 120.0
 _DEFAULT_PRIVATE_PENDING_RECORD_LIMIT = 512
 _DEFAULT_PRIVATE_SUPPRESSED_EVENT_ID_LIMIT = 2048
+_DEFAULT_STATE_SAFETY_POLL_SECONDS = 5.0
 _LEGEND_GAP = "    "
 
 
@@ -188,6 +204,14 @@ class PrivateOrderStateReader(Protocol):
     ) -> tuple[PrivateOrderRecord, ...]: ...
 
 
+class StateChangeWakeup(Protocol):
+    """Push hint that backing state changed (e.g. PostgreSQL LISTEN/NOTIFY)."""
+
+    def watch(self, routes: Iterable[str] | None) -> None: ...
+
+    async def wait(self, timeout: float) -> bool: ...
+
+
 class StrategyRuntimeLike(RuntimeQueueLike, Protocol):
     strategy: StrategySpec
 
@@ -267,6 +291,10 @@ class _LatentHeadDeadline:
     deadline_at: datetime
 
 
+DEFAULT_IDLE_WAKE_SECONDS = 5.0
+_PAST_DUE_RECHECK = timedelta(seconds=0.2)
+_WINDOW_END_SLACK = timedelta(milliseconds=1)
+
 _LEASE_PENDING_PLACE = "PENDING_PLACE"
 _LEASE_ACKED = "ACKED"
 _LEASE_LIVE = "LIVE"
@@ -345,21 +373,79 @@ class StaticHookSource:
             )
 
 
+class MarketStateCache:
+    """Per-route public market state shared by one runtime tick.
+
+    The public trigger source fills it after each batched read; telemetry,
+    gate-wait logs and amend logs read it instead of querying the DB per pair.
+    A missing or older-than-`max_age_seconds` entry is fetched once and stored.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_age_seconds: float = 1.0,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.max_age_seconds = max(0.0, float(max_age_seconds))
+        self._clock = clock
+        self._entries: dict[ExchangeRoute, tuple[float, PublicMarketStateReader]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def put_many(self, markets: Mapping[ExchangeRoute, PublicMarketStateReader]) -> None:
+        now = self._clock()
+        for route, market in markets.items():
+            self._entries[route] = (now, market)
+
+    def get(self, route: ExchangeRoute) -> PublicMarketStateReader | None:
+        entry = self._entries.get(route)
+        if entry is None or self._clock() - entry[0] > self.max_age_seconds:
+            return None
+        return entry[1]
+
+    def get_or_fetch(
+        self,
+        reader: PublicRuntimeStateReader,
+        route: ExchangeRoute,
+    ) -> PublicMarketStateReader:
+        market = self.get(route)
+        if market is not None:
+            self.hits += 1
+            return market
+        self.misses += 1
+        market = _fetch_market_state_for_route(reader, route)
+        self._entries[route] = (self._clock(), market)
+        return market
+
+
 class KrakenPublicTriggerSource:
     def __init__(
         self,
         client: PublicRuntimeStateReader,
         *,
         poll_seconds: float = 0.25,
+        wakeup: StateChangeWakeup | None = None,
+        safety_poll_seconds: float = _DEFAULT_STATE_SAFETY_POLL_SECONDS,
+        max_seen_event_ids: int = DEFAULT_DEDUPE_MAX_KEYS,
     ) -> None:
         self.client = client
         self.poll_seconds = poll_seconds
-        self._seen_event_ids: set[str] = set()
+        self.wakeup = wakeup
+        self.safety_poll_seconds = safety_poll_seconds
+        self._seen_event_ids: AttemptDedupe[str] = AttemptDedupe(
+            max_keys=max_seen_event_ids
+        )
 
     async def pump(self, runtime: RuntimeQueueLike) -> None:
         while runtime.running:
-            for route in _active_runtime_routes(runtime):
-                market = _fetch_market_state_for_route(self.client, route)
+            routes = _active_runtime_routes(runtime)
+            markets = await _read_market_states_for_routes(self.client, routes)
+            cache = getattr(runtime, "market_states", None)
+            if isinstance(cache, MarketStateCache):
+                cache.put_many(markets)
+            for route in routes:
+                market = markets[route]
                 snapshot = MarketSnapshotFact(
                     symbol=route.symbol,
                     best_bid=market.best_bid,
@@ -390,6 +476,8 @@ class KrakenPublicTriggerSource:
                             TailState.SUBMITTED,
                             TailState.LIVING,
                         }:
+                            if _pair_attempt_closed(pair_state):
+                                self._seen_event_ids.forget(pair_name)
                             continue
                         move = market_tick_from_market_snapshot(
                             pair=pair_state.pair,
@@ -405,13 +493,22 @@ class KrakenPublicTriggerSource:
                         f"{event_prefix}:{route.label}:{pair_name}:{pair_state.attempt_index}:"
                         f"{market.recorded_at or snapshot.occurred_at.isoformat()}{reference_key}"
                     )
-                    if event_id in self._seen_event_ids:
+                    if self._seen_event_ids.seen(
+                        pair_name,
+                        pair_state.attempt_index,
+                        event_id,
+                        now=snapshot.occurred_at,
+                    ):
                         continue
-                    self._seen_event_ids.add(event_id)
                     await runtime.enqueue(replace(move, event_id=event_id))
             if _runtime_sources_should_stop(runtime):
                 return
-            await asyncio.sleep(self.poll_seconds)
+            await _wait_for_next_poll(
+                runtime,
+                wakeup=self.wakeup,
+                poll_seconds=self.poll_seconds,
+                safety_poll_seconds=self.safety_poll_seconds,
+            )
 
 
 class KrakenPrivateOrderPollingSource:
@@ -424,9 +521,13 @@ class KrakenPrivateOrderPollingSource:
         pending_record_ttl_seconds: float = _DEFAULT_PRIVATE_PENDING_RECORD_TTL_SECONDS,
         max_pending_records: int = _DEFAULT_PRIVATE_PENDING_RECORD_LIMIT,
         max_suppressed_event_ids: int = _DEFAULT_PRIVATE_SUPPRESSED_EVENT_ID_LIMIT,
+        wakeup: StateChangeWakeup | None = None,
+        safety_poll_seconds: float = _DEFAULT_STATE_SAFETY_POLL_SECONDS,
     ) -> None:
         self.client = client
         self.poll_seconds = poll_seconds
+        self.wakeup = wakeup
+        self.safety_poll_seconds = safety_poll_seconds
         self.head_fill_reference_grace_seconds = max(
             0.0, head_fill_reference_grace_seconds
         )
@@ -443,54 +544,7 @@ class KrakenPrivateOrderPollingSource:
             now = datetime.now(timezone.utc)
             candidates = tuple(self._pending_records)
             self._pending_records = []
-            for route in _active_runtime_routes(runtime):
-                cursor = self._cursor_for(route.label, runtime.state.launched_at)
-                records = self.client.fetch_private_orders_since(
-                    after_local_timestamp=cursor.after_local_timestamp,
-                    after_local_id=cursor.after_local_id,
-                    symbol=route.symbol,
-                    exchange=route.exchange,
-                    market_type=route.market_type,
-                )
-                fill_records = self.client.fetch_private_fills_since(
-                    after_local_timestamp=cursor.after_fill_timestamp,
-                    after_local_id=cursor.after_fill_id,
-                    symbol=route.symbol,
-                    exchange=route.exchange,
-                    market_type=route.market_type,
-                )
-                active_client_ids, active_exchange_ids = self._active_identity_sets(
-                    runtime,
-                    route,
-                )
-                if active_client_ids or active_exchange_ids:
-                    fetch_orders_by_identity = getattr(
-                        self.client, "fetch_private_orders_for_identities", None
-                    )
-                    if callable(fetch_orders_by_identity):
-                        identity_orders = fetch_orders_by_identity(
-                            client_order_ids=active_client_ids,
-                            exchange_order_ids=active_exchange_ids,
-                            symbol=route.symbol,
-                            exchange=route.exchange,
-                            market_type=route.market_type,
-                        )
-                        records = self._merge_unique_private_records(records, identity_orders)
-                    fetch_fills_by_identity = getattr(
-                        self.client, "fetch_private_fills_for_identities", None
-                    )
-                    if callable(fetch_fills_by_identity):
-                        identity_fills = fetch_fills_by_identity(
-                            client_order_ids=active_client_ids,
-                            exchange_order_ids=active_exchange_ids,
-                            symbol=route.symbol,
-                            exchange=route.exchange,
-                            market_type=route.market_type,
-                        )
-                        fill_records = self._merge_unique_private_records(
-                            fill_records,
-                            identity_fills,
-                        )
+            for cursor, records, fill_records in await self._read_private_records(runtime):
                 candidates = candidates + tuple(
                     _PendingPrivateRecord(record=record, first_seen_at=now)
                     for record in records
@@ -564,7 +618,116 @@ class KrakenPrivateOrderPollingSource:
             self._trim_pending_records()
             if _runtime_sources_should_stop(runtime):
                 return
-            await asyncio.sleep(self.poll_seconds)
+            await _wait_for_next_poll(
+                runtime,
+                wakeup=self.wakeup,
+                poll_seconds=self.poll_seconds,
+                safety_poll_seconds=(
+                    self.poll_seconds if self._pending_records else self.safety_poll_seconds
+                ),
+            )
+
+    async def _read_private_records(
+        self,
+        runtime: RuntimeQueueLike,
+    ) -> list[
+        tuple[_PrivateCursor, tuple[PrivateOrderRecord, ...], tuple[PrivateOrderRecord, ...]]
+    ]:
+        """Read order and fill records newer than each active route cursor.
+
+        Readers exposing `fetch_private_deltas` serve every route in one call;
+        others are read route by route.
+        """
+        plans = [
+            (
+                route,
+                self._cursor_for(route.label, runtime.state.launched_at),
+                *self._active_identity_sets(runtime, route),
+            )
+            for route in _active_runtime_routes(runtime)
+        ]
+        if _reader_supports(self.client, "fetch_private_deltas"):
+            deltas = await _read_runtime_state(
+                self.client,
+                "fetch_private_deltas",
+                [
+                    PrivateDeltaQuery(
+                        exchange=route.exchange,
+                        market_type=route.market_type,
+                        symbol=route.symbol,
+                        after_order_timestamp=cursor.after_local_timestamp,
+                        after_order_id=cursor.after_local_id,
+                        after_fill_timestamp=cursor.after_fill_timestamp,
+                        after_fill_id=cursor.after_fill_id,
+                        client_order_ids=active_client_ids,
+                        exchange_order_ids=active_exchange_ids,
+                    )
+                    for route, cursor, active_client_ids, active_exchange_ids in plans
+                ],
+            )
+            results = []
+            for route, cursor, _, _ in plans:
+                delta = deltas[(route.exchange, route.market_type, route.symbol)]
+                results.append(
+                    (
+                        cursor,
+                        self._merge_unique_private_records(delta.orders, delta.identity_orders),
+                        self._merge_unique_private_records(delta.fills, delta.identity_fills),
+                    )
+                )
+            return results
+        results = []
+        for route, cursor, active_client_ids, active_exchange_ids in plans:
+            records = await _read_runtime_state(
+                self.client,
+                "fetch_private_orders_since",
+                after_local_timestamp=cursor.after_local_timestamp,
+                after_local_id=cursor.after_local_id,
+                symbol=route.symbol,
+                exchange=route.exchange,
+                market_type=route.market_type,
+            )
+            fill_records = await _read_runtime_state(
+                self.client,
+                "fetch_private_fills_since",
+                after_local_timestamp=cursor.after_fill_timestamp,
+                after_local_id=cursor.after_fill_id,
+                symbol=route.symbol,
+                exchange=route.exchange,
+                market_type=route.market_type,
+            )
+            if active_client_ids or active_exchange_ids:
+                if callable(
+                    getattr(self.client, "fetch_private_orders_for_identities", None)
+                ):
+                    identity_orders = await _read_runtime_state(
+                        self.client,
+                        "fetch_private_orders_for_identities",
+                        client_order_ids=active_client_ids,
+                        exchange_order_ids=active_exchange_ids,
+                        symbol=route.symbol,
+                        exchange=route.exchange,
+                        market_type=route.market_type,
+                    )
+                    records = self._merge_unique_private_records(records, identity_orders)
+                if callable(
+                    getattr(self.client, "fetch_private_fills_for_identities", None)
+                ):
+                    identity_fills = await _read_runtime_state(
+                        self.client,
+                        "fetch_private_fills_for_identities",
+                        client_order_ids=active_client_ids,
+                        exchange_order_ids=active_exchange_ids,
+                        symbol=route.symbol,
+                        exchange=route.exchange,
+                        market_type=route.market_type,
+                    )
+                    fill_records = self._merge_unique_private_records(
+                        fill_records,
+                        identity_fills,
+                    )
+            results.append((cursor, records, fill_records))
+        return results
 
     def _cursor_for(self, symbol: str, launched_at: datetime) -> _PrivateCursor:
         cursor = self._cursors.setdefault(symbol, _PrivateCursor())
@@ -820,6 +983,9 @@ class StrategyRuntime:
         tail_visibility_timeout_seconds: float = 30.0,
         max_active_pairs: int = 4,
         simulate: bool = False,
+        idle_wake_seconds: float = DEFAULT_IDLE_WAKE_SECONDS,
+        market_state_max_age_seconds: float = 1.0,
+        clock: Callable[[], datetime] | None = None,
     ) -> None:
         self.strategy = strategy
         self.symbol = symbol
@@ -827,6 +993,8 @@ class StrategyRuntime:
         self.public_source = public_source
         self.private_source = private_source
         self.public_state_reader = public_state_reader
+        # Un seul etat de marche par route et par tick pour tous les lecteurs.
+        self.market_states = MarketStateCache(max_age_seconds=market_state_max_age_seconds)
         self.tail_telemetry_writer = tail_telemetry_writer
         self.tail_telemetry_interval_seconds = tail_telemetry_interval_seconds
         self.exchange = exchange
@@ -836,6 +1004,13 @@ class StrategyRuntime:
         self.tail_visibility_timeout_seconds = max(0.1, float(tail_visibility_timeout_seconds))
         self.max_active_pairs = max(0, int(max_active_pairs))
         self.simulate = simulate
+        # Filet de securite: la boucle dort jusqu'a l'echeance suivante, un
+        # evenement ou un reveil, jamais plus que `idle_wake_seconds`.
+        self.idle_wake_seconds = max(0.05, float(idle_wake_seconds))
+        self._clock = clock or utc_now
+        self._deadlines: DeadlineScheduler[str] = DeadlineScheduler(clock=self._clock)
+        self._wake = asyncio.Event()
+        self._window_boundaries: tuple[datetime, tuple[datetime, ...]] | None = None
         launched_at = datetime.now(timezone.utc)
         self.state = StrategyState(
             launched_at=launched_at,
@@ -940,9 +1115,12 @@ class StrategyRuntime:
             and self.tail_telemetry_writer is not None
         ):
             self._tasks.append(asyncio.create_task(self._pump_tail_telemetry()))
+        for task in self._tasks:
+            task.add_done_callback(self._wake_loop)
 
     async def stop(self) -> None:
         self.running = False
+        self._wake.set()
         for task in self._tasks:
             task.cancel()
         for entry in self._inflight_commands.values():
@@ -967,7 +1145,7 @@ class StrategyRuntime:
         await self.start()
         try:
             while self.running:
-                current_time = datetime.now(timezone.utc)
+                current_time = self._clock()
                 self.chronos.expire_pending(now=current_time)
                 self._reap_source_tasks()
                 self._reap_command_tasks()
@@ -985,15 +1163,15 @@ class StrategyRuntime:
                     now=current_time,
                 )
                 if repeat_commands or self.chronos.state is not self.state:
-                    previous_pairs = dict(self.state.pairs)
                     previous_state = self.state
                     self.state = self.chronos.state
+                    changed_pairs = self.chronos.drain_changed_pairs()
                     self._prune_latent_head_deadlines()
-                    self._log_repeat_attempts(previous_state.pairs)
+                    self._log_repeat_attempts(previous_state.pairs, changed_pairs)
                 if repeat_commands:
                     self._log_repeat_start(repeat_commands)
                     self._dispatch_commands(repeat_commands)
-                    self._log_living_updates(previous_pairs)
+                    self._log_living_updates(previous_state.pairs, changed_pairs)
                     self._drain_pending_head_commands()
                 if (
                     self.all_pairs_terminal
@@ -1006,25 +1184,29 @@ class StrategyRuntime:
                     and not self.chronos.pending_repeats
                 ):
                     break
-                try:
-                    event = await asyncio.wait_for(self.event_queue.get(), timeout=0.2)
-                except TimeoutError:
+                self._schedule_deadlines(current_time)
+                event = await self._next_event(
+                    self._deadlines.seconds_until_next(cap=self.idle_wake_seconds)
+                )
+                if event is None:
                     continue
                 if self._should_ignore_stale_runtime_cancel(event):
                     continue
-                previous_pairs = dict(self.state.pairs)
+                # L'etat est persistant: garder la version precedente ne copie rien.
+                previous_state = self.state
                 previous_repeats = dict(self.chronos.pending_repeats)
                 self._record_private_event_for_leases(event)
                 self._record_head_lifecycle(event)
                 commands = self.chronos.process_event(event)
                 self.state = self.chronos.state
+                changed_pairs = self.chronos.drain_changed_pairs()
                 self._prune_latent_head_deadlines()
                 self._prune_order_leases()
                 self._sync_head_fill_deadline(event)
                 self._log_new_pending_repeats(previous_repeats)
-                self._log_chain_releases(previous_pairs)
+                self._log_chain_releases(previous_state.pairs, changed_pairs)
                 self._dispatch_commands(commands)
-                self._log_living_updates(previous_pairs)
+                self._log_living_updates(previous_state.pairs, changed_pairs)
                 self._drain_pending_head_commands()
         finally:
             await self.stop()
@@ -1034,6 +1216,119 @@ class StrategyRuntime:
             notices=tuple(self.chronos.notices),
         )
 
+    async def _next_event(self, timeout: float | None) -> EggMove | None:
+        """Attend un evenement, l'echeance suivante ou un reveil de la boucle.
+
+        Retourne None sur echeance ou reveil (tache terminee, `stop`).
+        """
+        if not self.event_queue.empty():
+            return self.event_queue.get_nowait()
+        if self._wake.is_set():
+            self._wake.clear()
+            return None
+        getter = asyncio.ensure_future(self.event_queue.get())
+        waker = asyncio.ensure_future(self._wake.wait())
+        try:
+            await asyncio.wait(
+                {getter, waker},
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            waker.cancel()
+            if not getter.done():
+                # Une annulation de `Queue.get` laisse l'element dans la file.
+                getter.cancel()
+        self._wake.clear()
+        if getter.done() and not getter.cancelled():
+            return getter.result()
+        return None
+
+    def _wake_loop(self, _task: object = None) -> None:
+        self._wake.set()
+
+    def _schedule_deadlines(self, now: datetime) -> None:
+        """Enregistre la prochaine echeance de chaque mecanisme de la boucle."""
+        now = _as_utc_aware(now)
+        recheck_at = now + _PAST_DUE_RECHECK
+        for key, due_times in (
+            ("latent_head", self._latent_head_due_times()),
+            ("head_fill", self._head_fill_due_times(now)),
+            ("order_lease", self._order_lease_due_times()),
+            ("tail_visibility", self._tail_visibility_due_times()),
+            ("tail_amend", (item.deadline_at for item in self._pending_tail_amends.values())),
+            ("repeat", (item.ready_at for item in self.chronos.pending_repeats.values())),
+        ):
+            # Une echeance deja passee a ete armee apres les controles du tour
+            # ou attend une condition: elle est revue apres `_PAST_DUE_RECHECK`.
+            due_at = min(map(_as_utc_aware, due_times), default=None)
+            self._deadlines.schedule(key, None if due_at is None else max(due_at, recheck_at))
+        # Les journaux de gate perimes ne sont jamais rafraichis: futur seulement.
+        self._deadlines.schedule(
+            "gate_wait",
+            min((due for due in self._gate_wait_due_times() if due > now), default=None),
+        )
+        self._deadlines.schedule("pair_window", self._next_pair_window_boundary(now))
+
+    def _latent_head_due_times(self) -> Iterator[datetime]:
+        for deadline in self._latent_head_deadlines.values():
+            yield deadline.deadline_at
+
+    def _head_fill_due_times(self, now: datetime) -> Iterator[datetime]:
+        retry = timedelta(seconds=self._head_cancel_retry_seconds())
+        for deadline in self._head_fill_deadlines.values():
+            if deadline.cancel_dispatched_at is None or now < deadline.deadline_at:
+                yield deadline.deadline_at
+            else:
+                yield deadline.cancel_dispatched_at + retry
+
+    def _order_lease_due_times(self) -> Iterator[datetime]:
+        if self.simulate:
+            return
+        visibility = timedelta(seconds=self.tail_visibility_timeout_seconds)
+        retry = timedelta(seconds=self._head_cancel_retry_seconds())
+        for lease in self._order_leases.values():
+            if (
+                lease.role == "head"
+                and lease.status in {_LEASE_PENDING_PLACE, _LEASE_ACKED}
+                and lease.visibility_warned_at is None
+            ):
+                yield _as_utc_aware(lease.created_at) + visibility
+            elif lease.status == _LEASE_CANCEL_REQUESTED and lease.cancel_sent_at is not None:
+                yield _as_utc_aware(lease.cancel_sent_at) + retry
+
+    def _tail_visibility_due_times(self) -> Iterator[datetime]:
+        warn_after = timedelta(seconds=max(5.0, self.tail_visibility_timeout_seconds))
+        for window in self._pending_tail_visibility.values():
+            if window.last_warned_at is None:
+                yield window.deadline_at
+            else:
+                yield window.last_warned_at + warn_after
+
+    def _gate_wait_due_times(self) -> Iterator[datetime]:
+        if self.public_state_reader is None:
+            return
+        interval = timedelta(seconds=self._gate_log_interval_seconds)
+        for logged_at in self._last_gate_logs.values():
+            yield logged_at + interval
+
+    def _next_pair_window_boundary(self, now: datetime) -> datetime | None:
+        """Prochaine ouverture ou fermeture de fenetre de paire apres `now`."""
+        launched_at = _as_utc_aware(self.state.launched_at)
+        if self._window_boundaries is None or self._window_boundaries[0] != launched_at:
+            boundaries: set[datetime] = set()
+            for pair_state in self.state.pairs.values():
+                window = pair_state.pair.window
+                boundaries.add(launched_at + timedelta(minutes=window.start_minutes))
+                # La fenetre est fermee strictement apres `end_minutes`.
+                boundaries.add(
+                    launched_at + timedelta(minutes=window.end_minutes) + _WINDOW_END_SLACK
+                )
+            self._window_boundaries = (launched_at, tuple(sorted(boundaries)))
+        boundaries_sorted = self._window_boundaries[1]
+        index = bisect_right(boundaries_sorted, now)
+        return boundaries_sorted[index] if index < len(boundaries_sorted) else None
+
     def _dispatch_commands(self, commands: tuple[DragonSong, ...]) -> None:
         for command in commands:
             prepared = self._prepare_command(command)
@@ -1061,10 +1356,9 @@ class StrategyRuntime:
         if identity is not None:
             self._live_command_identities[_identity_key(identity)] = identity
         self._on_command_dispatched(slot, prepared, identity)
-        self._inflight_commands[slot] = _InFlightCommand(
-            command=prepared,
-            task=asyncio.create_task(self._execute_and_enqueue(prepared, slot)),
-        )
+        task = asyncio.create_task(self._execute_and_enqueue(prepared, slot))
+        task.add_done_callback(self._wake_loop)
+        self._inflight_commands[slot] = _InFlightCommand(command=prepared, task=task)
 
     async def _execute_and_enqueue(
         self,
@@ -1216,7 +1510,8 @@ class StrategyRuntime:
         interval = max(self.tail_telemetry_interval_seconds, 1.0)
         while self.running:
             now = datetime.now(timezone.utc)
-            rows = self._collect_tail_telemetry_rows(now)
+            samples = self._collect_tail_telemetry(now)
+            rows = tuple(row for row, _, _ in samples)
             if rows and self.tail_telemetry_writer is not None:
                 try:
                     self.tail_telemetry_writer.record_rows(rows)
@@ -1226,19 +1521,7 @@ class StrategyRuntime:
                         len(rows),
                         _compact_error(exc),
                     )
-            for row in rows:
-                source = "unknown"
-                pair_state = self.state.pairs[row.pair_name]
-                market = (
-                    None
-                    if self.public_state_reader is None
-                    else _fetch_market_state_for_route(
-                        self.public_state_reader,
-                        _pair_route(pair_state, self),
-                    )
-                )
-                if market is not None:
-                    source, _ = tail_reference_price(pair_state.pair, market)
+            for row, market, source in samples:
                 signature = (
                     str(self.state.pairs[row.pair_name].attempt_index),
                     row.head_state,
@@ -1251,12 +1534,12 @@ class StrategyRuntime:
                     _fmt_compact_price(row.unblock_requirement),
                     row.last_tail_update_at.isoformat() if row.last_tail_update_at is not None else "-",
                     source,
-                    _fmt_compact_price(None if market is None else getattr(market, "best_bid", None)),
-                    _fmt_compact_price(None if market is None else getattr(market, "best_ask", None)),
-                    _fmt_compact_price(None if market is None else getattr(market, "mid_price", None)),
-                    _fmt_compact_price(None if market is None else getattr(market, "last_price", None)),
-                    _fmt_compact_price(None if market is None else getattr(market, "mark_price", None)),
-                    _fmt_compact_price(None if market is None else getattr(market, "index_price", None)),
+                    _fmt_compact_price(getattr(market, "best_bid", None)),
+                    _fmt_compact_price(getattr(market, "best_ask", None)),
+                    _fmt_compact_price(getattr(market, "mid_price", None)),
+                    _fmt_compact_price(getattr(market, "last_price", None)),
+                    _fmt_compact_price(getattr(market, "mark_price", None)),
+                    _fmt_compact_price(getattr(market, "index_price", None)),
                 )
                 if self._last_tail_metrics.get(row.pair_name) == signature:
                     continue
@@ -1285,11 +1568,20 @@ class StrategyRuntime:
                 )
             await asyncio.sleep(interval)
 
+    def _market_state_for_route(self, route: ExchangeRoute) -> PublicMarketStateReader:
+        if self.public_state_reader is None:
+            raise RuntimeError("public state reader is not configured")
+        return self.market_states.get_or_fetch(self.public_state_reader, route)
+
     def _collect_tail_telemetry_rows(self, now: datetime) -> tuple[TailTelemetryRow, ...]:
-        reader = self.public_state_reader
-        if reader is None:
+        return tuple(row for row, _, _ in self._collect_tail_telemetry(now))
+
+    def _collect_tail_telemetry(
+        self, now: datetime
+    ) -> tuple[tuple[TailTelemetryRow, PublicMarketStateReader, str], ...]:
+        if self.public_state_reader is None:
             return ()
-        rows: list[TailTelemetryRow] = []
+        samples: list[tuple[TailTelemetryRow, PublicMarketStateReader, str]] = []
         for pair_name, pair_state in self.state.pairs.items():
             if (
                 pair_state.tail_trail is None
@@ -1298,8 +1590,8 @@ class StrategyRuntime:
                 continue
             route = _pair_route(pair_state, self)
             symbol = route.symbol
-            market = _fetch_market_state_for_route(reader, route)
-            _, ref = tail_reference_price(pair_state.pair, market)
+            market = self._market_state_for_route(route)
+            source, ref = tail_reference_price(pair_state.pair, market)
             if ref <= 0:
                 continue
             stop = pair_state.tail_trail.confirmed_stop_price
@@ -1316,35 +1608,36 @@ class StrategyRuntime:
                 pair_state.tail_trail,
                 spread_guard,
             )
-            rows.append(
-                TailTelemetryRow(
-                    exchange=route.exchange,
-                    environment=self.environment,
-                    market_type=route.market_type,
-                    account_scope=self.account_scope,
-                    strategy_id=self.state.strategy_id,
-                    pair_name=pair_name,
-                    symbol=symbol,
-                    head_state=pair_state.head_state.value,
-                    tail_state=pair_state.tail_state.value,
-                    tail_mode=None if pair_state.tail_mode is None else pair_state.tail_mode.value,
-                    reference_price=float(ref),
-                    stop_price=float(stop),
-                    initial_distance=float(pair_state.tail_trail.baseline_width),
-                    current_distance=float(current_distance),
-                    spread_guard=float(spread_guard),
-                    unblock_requirement=float(unblock_requirement),
-                    last_tail_update_at=pair_state.tail_trail.last_confirmed_at,
-                    recorded_at=now,
-                )
+            row = TailTelemetryRow(
+                exchange=route.exchange,
+                environment=self.environment,
+                market_type=route.market_type,
+                account_scope=self.account_scope,
+                strategy_id=self.state.strategy_id,
+                pair_name=pair_name,
+                symbol=symbol,
+                head_state=pair_state.head_state.value,
+                tail_state=pair_state.tail_state.value,
+                tail_mode=None if pair_state.tail_mode is None else pair_state.tail_mode.value,
+                reference_price=float(ref),
+                stop_price=float(stop),
+                initial_distance=float(pair_state.tail_trail.baseline_width),
+                current_distance=float(current_distance),
+                spread_guard=float(spread_guard),
+                unblock_requirement=float(unblock_requirement),
+                last_tail_update_at=pair_state.tail_trail.last_confirmed_at,
+                recorded_at=now,
             )
-        return tuple(rows)
+            samples.append((row, market, source))
+        return tuple(samples)
 
-    def _log_living_updates(self, previous_pairs: dict[str, PairCycleState]) -> None:
-        for pair_name, current in self.state.pairs.items():
-            previous = previous_pairs.get(pair_name)
-            if previous is None:
-                continue
+    def _log_living_updates(
+        self,
+        previous_pairs: Mapping[str, PairCycleState],
+        changed_pairs: Iterable[str] | None = None,
+    ) -> None:
+        moved = self._moved_pairs(previous_pairs, changed_pairs)
+        for pair_name, current, previous in moved:
             if (
                 current.head_state == HeadState.FAILED
                 and previous.head_state != HeadState.FAILED
@@ -1669,7 +1962,7 @@ class StrategyRuntime:
             route = _pair_route(pair_state, self)
             symbol = route.symbol
             try:
-                market = _fetch_market_state_for_route(self.public_state_reader, route)
+                market = self._market_state_for_route(route)
                 source, reference = executable_head_reference_price(pair, market)
             except Exception as exc:
                 _LOGGER.warning(
@@ -2793,10 +3086,7 @@ class StrategyRuntime:
         ref_source = "-"
         ref_price: Decimal | None = None
         if self.public_state_reader is not None:
-            market = _fetch_market_state_for_route(
-                self.public_state_reader,
-                _pair_route(pair_state, self),
-            )
+            market = self._market_state_for_route(_pair_route(pair_state, self))
             ref_source, ref_price_value = tail_reference_price(pair_state.pair, market)
             ref_price = to_decimal(ref_price_value)
         _LOGGER.info(
@@ -2836,11 +3126,30 @@ class StrategyRuntime:
                 pending.ready_at.isoformat(),
             )
 
-    def _log_chain_releases(self, previous_pairs: Mapping[str, PairCycleState]) -> None:
-        for pair_name, current in self.state.pairs.items():
+    def _moved_pairs(
+        self,
+        previous_pairs: Mapping[str, PairCycleState],
+        changed_pairs: Iterable[str] | None,
+    ) -> Iterator[tuple[str, PairCycleState, PairCycleState]]:
+        """Paires presentes avant et apres le pas dont l'etat a change.
+
+        Sans `changed_pairs`, toute la table est comparee.
+        """
+        names = self.state.pairs if changed_pairs is None else changed_pairs
+        for pair_name in names:
+            current = self.state.pairs.get(pair_name)
             previous = previous_pairs.get(pair_name)
-            if previous is None:
+            if current is None or previous is None or current is previous:
                 continue
+            yield pair_name, current, previous
+
+    def _log_chain_releases(
+        self,
+        previous_pairs: Mapping[str, PairCycleState],
+        changed_pairs: Iterable[str] | None = None,
+    ) -> None:
+        moved = self._moved_pairs(previous_pairs, changed_pairs)
+        for pair_name, current, previous in moved:
             token = current.dependency_token
             if token is None or previous.dependency_token == token:
                 continue
@@ -2855,11 +3164,13 @@ class StrategyRuntime:
                 ),
             )
 
-    def _log_repeat_attempts(self, previous_pairs: Mapping[str, PairCycleState]) -> None:
-        for pair_name, current in self.state.pairs.items():
-            previous = previous_pairs.get(pair_name)
-            if previous is None:
-                continue
+    def _log_repeat_attempts(
+        self,
+        previous_pairs: Mapping[str, PairCycleState],
+        changed_pairs: Iterable[str] | None = None,
+    ) -> None:
+        moved = self._moved_pairs(previous_pairs, changed_pairs)
+        for pair_name, current, previous in moved:
             if current.attempt_index <= previous.attempt_index:
                 continue
             _LOGGER.info(
@@ -3056,6 +3367,94 @@ def _active_runtime_symbols(runtime: RuntimeQueueLike) -> tuple[str, ...]:
     return tuple(sorted(symbols))
 
 
+async def _wait_for_next_poll(
+    runtime: RuntimeQueueLike,
+    *,
+    wakeup: StateChangeWakeup | None,
+    poll_seconds: float,
+    safety_poll_seconds: float,
+) -> None:
+    """Sleep one poll tick, or until a state-change push when a wakeup is wired.
+
+    With a wakeup the poll interval stretches to `safety_poll_seconds`: pushes
+    are hints and a missed one only costs one safety-net tick.
+    """
+    if wakeup is None:
+        await asyncio.sleep(poll_seconds)
+        return
+    wakeup.watch(route.label for route in _active_runtime_routes(runtime))
+    await wakeup.wait(max(poll_seconds, safety_poll_seconds))
+
+
+async def _read_runtime_state(
+    reader: object,
+    method_name: str,
+    /,
+    *args: object,
+    **kwargs: object,
+) -> Any:
+    """Call a state-reader method, awaiting it when the reader is async.
+
+    Sync readers still block the loop; that time lands in the reader's
+    `loop_blocking` histogram when it exposes `read_metrics`.
+    """
+    method = getattr(reader, method_name)
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    started = perf_counter()
+    try:
+        return method(*args, **kwargs)
+    finally:
+        metrics = getattr(reader, "read_metrics", None)
+        if metrics is not None:
+            metrics.observe("loop_blocking", perf_counter() - started)
+
+
+async def _read_market_state_for_route(
+    reader: PublicRuntimeStateReader,
+    route: ExchangeRoute,
+) -> PublicMarketStateReader:
+    try:
+        return await _read_runtime_state(
+            reader,
+            "fetch_market_state",
+            symbol=route.symbol,
+            exchange=route.exchange,
+            market_type=route.market_type,
+        )
+    except TypeError as exc:
+        message = str(exc)
+        if "exchange" not in message and "market_type" not in message:
+            raise
+        return await _read_runtime_state(reader, "fetch_market_state", route.symbol)
+
+
+def _reader_supports(reader: object, method_name: str) -> bool:
+    """Probe an optional read, asking async facades about their backing client."""
+    supports = getattr(reader, "supports", None)
+    if callable(supports):
+        return bool(supports(method_name))
+    return callable(getattr(reader, method_name, None))
+
+
+async def _read_market_states_for_routes(
+    reader: PublicRuntimeStateReader,
+    routes: tuple[ExchangeRoute, ...],
+) -> dict[ExchangeRoute, PublicMarketStateReader]:
+    """Read every route's market state, in one call when the reader batches."""
+    if _reader_supports(reader, "fetch_market_states"):
+        states = await _read_runtime_state(
+            reader,
+            "fetch_market_states",
+            [(route.exchange, route.market_type, route.symbol) for route in routes],
+        )
+        return {
+            route: states[(route.exchange, route.market_type, route.symbol)]
+            for route in routes
+        }
+    return {route: await _read_market_state_for_route(reader, route) for route in routes}
+
+
 def _fetch_market_state_for_route(
     reader: PublicRuntimeStateReader,
     route: ExchangeRoute,
@@ -3073,6 +3472,14 @@ def _fetch_market_state_for_route(
         return reader.fetch_market_state(route.symbol)
 
 
+def _pair_attempt_closed(pair_state: PairCycleState) -> bool:
+    """Tentative finie: ses ids d'evenements publics ne peuvent plus revenir."""
+    return pair_state.head_state == HeadState.FAILED or pair_state.tail_state in {
+        TailState.CLOSED,
+        TailState.FAILED,
+    }
+
+
 def _pair_runtime_complete(
     pair_state: PairCycleState,
     *,
@@ -0,0 +1,208 @@
+"""Push-driven verification that a placed tail rests on the exchange.
+
+Purpose: confirm tail trigger orders from the private order rows the account
+feeder persists, woken by its `kola_private` NOTIFY, instead of polling the
+REST open-orders listing.
+Inputs: `StateChangeListener` callbacks for one route, a private-DB row reader
+and one matcher per pending tail.
+Outputs: the matching private row (or None at the deadline) and
+`TailVerifyMetrics` counters.
+Side effects: one private-DB read per wakeup for all tails pending on the
+route; no REST calls.
+Important types: `TriggerOrderWaiters`, `TailVerifyMetrics`.
+Role: boundary adapter.
+
+Waiters are keyed by client order id. A wakeup is only a hint: the pump
+re-reads the rows and resolves every waiter whose matcher accepts one. It also
+reads once when a waiter registers (the row may have landed before) and every
+`safety_poll_seconds` in case a NOTIFY was lost.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+from kolabi.shared.runtime_state import LatencyHistogram
+
+TriggerRows = list[dict[str, Any]]
+TriggerMatcher = Callable[[TriggerRows], "dict[str, Any] | None"]
+
+_VERIFY_BUCKETS_MS = (
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    11000.0,
+)
+
+
+class TailVerifyMetrics:
+    """Tail verification latency per evidence source and REST calls saved.
+
+    `rest_calls_saved` compares with the polling verifier, which listed open
+    orders once on entry and once per poll interval until a match.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latency: dict[str, LatencyHistogram] = {}
+        self.outcomes: Counter[str] = Counter()
+        self.rest_calls = 0
+        self.rest_calls_saved = 0
+
+    def record(
+        self,
+        source: str,
+        seconds: float,
+        *,
+        rest_calls: int,
+        poll_seconds: float,
+    ) -> None:
+        polled = 1 + int(max(0.0, seconds) // poll_seconds) if poll_seconds > 0 else 1
+        with self._lock:
+            histogram = self._latency.get(source)
+            if histogram is None:
+                histogram = self._latency[source] = LatencyHistogram(_VERIFY_BUCKETS_MS)
+            self.outcomes[source] += 1
+            self.rest_calls += rest_calls
+            self.rest_calls_saved += max(0, polled - rest_calls)
+        histogram.observe(seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            latency = dict(self._latency)
+            outcomes = dict(self.outcomes)
+            rest_calls = self.rest_calls
+            saved = self.rest_calls_saved
+        return {
+            "outcomes": outcomes,
+            "rest_calls": rest_calls,
+            "rest_calls_saved": saved,
+            "latency": {name: latency[name].snapshot() for name in sorted(latency)},
+        }
+
+    def summary_lines(self) -> list[str]:
+        snapshot = self.snapshot()
+        lines = [
+            f"rest_calls={snapshot['rest_calls']} "
+            f"rest_calls_saved={snapshot['rest_calls_saved']}"
+        ]
+        for name, stats in snapshot["latency"].items():
+            lines.append(
+                f"{name} n={stats['count']} mean_ms={stats['mean_ms']} "
+                f"p50_ms<={stats['p50_ms']} p99_ms<={stats['p99_ms']} "
+                f"max_ms={stats['max_ms']}"
+            )
+        return lines
+
+
+class TriggerOrderWaiters:
+    """Pending tail verifications of one route, resolved from private rows."""
+
+    def __init__(
+        self,
+        route: str,
+        read_rows: Callable[[], Awaitable[TriggerRows]],
+        *,
+        safety_poll_seconds: float = 5.0,
+    ) -> None:
+        self.route = route
+        self.read_rows = read_rows
+        self.safety_poll_seconds = max(0.05, safety_poll_seconds)
+        self._waiters: dict[str, list[tuple[TriggerMatcher, asyncio.Future[Any]]]] = {}
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._kick: asyncio.Event | None = None
+        self._pump: asyncio.Task[None] | None = None
+        self.db_reads = 0
+        self.wakeups = 0
+
+    def notify(self, route: str | None) -> None:
+        """Listener callback; `route` None (reconnect) wakes every route."""
+
+        if route is not None and route != self.route:
+            return
+        with self._lock:
+            loop, kick = self._loop, self._kick
+            if not self._waiters:
+                return
+            self.wakeups += 1
+        if loop is not None and kick is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(kick.set)
+            except RuntimeError:
+                return
+
+    async def wait(
+        self, key: str, match: TriggerMatcher, timeout: float
+    ) -> dict[str, Any] | None:
+        """Return the first private row `match` accepts, or None after `timeout`."""
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        entry = (match, future)
+        with self._lock:
+            if self._loop is not loop or self._kick is None:
+                self._loop = loop
+                self._kick = asyncio.Event()
+                self._pump = None
+            self._waiters.setdefault(key, []).append(entry)
+            kick = self._kick
+        # la ligne a pu arriver avant l'inscription: on relit tout de suite
+        kick.set()
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.create_task(self._run_pump())
+        try:
+            return await asyncio.wait_for(future, timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._forget(key, entry)
+
+    def _forget(self, key: str, entry: tuple[TriggerMatcher, asyncio.Future[Any]]) -> None:
+        with self._lock:
+            entries = self._waiters.get(key, [])
+            if entry in entries:
+                entries.remove(entry)
+            if not entries:
+                self._waiters.pop(key, None)
+
+    async def _run_pump(self) -> None:
+        kick = self._kick
+        assert kick is not None
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    return
+            try:
+                await asyncio.wait_for(kick.wait(), timeout=self.safety_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            kick.clear()
+            self.db_reads += 1
+            try:
+                rows = await self.read_rows()
+            except Exception:
+                # lecture ratee: la prochaine notification ou le filet relira
+                continue
+            self._resolve(rows)
+
+    def _resolve(self, rows: TriggerRows) -> None:
+        with self._lock:
+            pending = [entry for entries in self._waiters.values() for entry in entries]
+        for match, future in pending:
+            if future.done():
+                continue
+            row = match(rows)
+            if row is not None:
+                future.set_result(row)
+
+
+__all__ = ["TailVerifyMetrics", "TriggerOrderWaiters"]
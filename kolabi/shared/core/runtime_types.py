@@ -17,7 +17,16 @@ from datetime import datetime
 from decimal import Decimal
 from enum import StrEnum
 from types import MappingProxyType
-from typing import TYPE_CHECKING, Iterable, Mapping, NewType, Protocol, TypedDict
+from typing import (
+    TYPE_CHECKING,
+    Hashable,
+    Iterable,
+    Mapping,
+    NewType,
+    Protocol,
+    Sequence,
+    TypedDict,
+)
 
 if TYPE_CHECKING:
     from kolabi.shared.core.models import OrderAck
@@ -361,6 +370,39 @@ class PrivatePositionRecord:
     market_type: str | None = None
 
 
+RouteKey = tuple[str, str, str]
+"""`(exchange, market_type, symbol)` key used by bulk state reads."""
+
+
+@dataclass(frozen=True)
+class PrivateDeltaQuery:
+    """Cursor and active identities for one route in a bulk private read."""
+
+    exchange: str
+    market_type: str
+    symbol: str
+    after_order_timestamp: datetime | None = None
+    after_order_id: int | None = None
+    after_fill_timestamp: datetime | None = None
+    after_fill_id: int | None = None
+    client_order_ids: tuple[str, ...] = ()
+    exchange_order_ids: tuple[str, ...] = ()
+
+    @property
+    def route_key(self) -> RouteKey:
+        return (self.exchange, self.market_type, self.symbol)
+
+
+@dataclass(frozen=True)
+class PrivateDelta:
+    """Private rows newer than a route cursor, plus rows for its active identities."""
+
+    orders: tuple[PrivateOrderRecord, ...] = ()
+    fills: tuple[PrivateOrderRecord, ...] = ()
+    identity_orders: tuple[PrivateOrderRecord, ...] = ()
+    identity_fills: tuple[PrivateOrderRecord, ...] = ()
+
+
 class CryptoApiLike(Protocol):
     dummy: bool
     dummyID: str
@@ -538,3 +580,12 @@ class ExchangePort(Protocol):
     async def amend_head(self, command: AmendHeadCommand) -> OrderAck: ...
     async def amend_tail(self, command: AmendTailCommand) -> OrderAck: ...
     async def cancel(self, command: CancelCommand) -> OrderAck: ...
+
+
+class BatchExchangePort(Protocol):
+    """Optional ExchangePort extension that sends several commands in one call."""
+
+    def batch_key(self, command: DragonSong) -> Hashable | None: ...
+    async def execute_batch(
+        self, commands: Sequence[DragonSong]
+    ) -> list[OrderAck | Exception]: ...
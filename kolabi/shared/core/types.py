@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Mapping, Optional, Sequence
 
 from .models import OrderAck, Position
 from .runtime_types import OrderID, OrderQty, Price, StopPrice
@@ -36,6 +36,34 @@ class ExchangeABC(ABC):
     def cancel_order(self, order_id: OrderID | str) -> OrderAck:
         """Cancel an order and return an acknowledgement."""
 
+    def place_orders(
+        self, orders: Sequence[Mapping[str, Any]]
+    ) -> list[OrderAck | Exception]:
+        """Place several orders; one acknowledgement or error per input, in order.
+
+        Each mapping holds `place_order` keyword arguments. The default sends
+        them one by one; adapters with a native batch endpoint override it.
+        """
+        results: list[OrderAck | Exception] = []
+        for order in orders:
+            try:
+                results.append(self.place_order(**order))
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    def cancel_orders(
+        self, order_ids: Sequence[OrderID | str]
+    ) -> list[OrderAck | Exception]:
+        """Cancel several orders; one acknowledgement or error per input, in order."""
+        results: list[OrderAck | Exception] = []
+        for order_id in order_ids:
+            try:
+                results.append(self.cancel_order(order_id))
+            except Exception as exc:
+                results.append(exc)
+        return results
+
     @abstractmethod
     def get_position(self) -> Position:
         """Return the current position for the configured symbol."""
@@ -8,14 +8,18 @@ Binance APIs overlap.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import hmac
+import json
 import logging
 import time
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime
 from decimal import ROUND_DOWN, ROUND_HALF_UP, ROUND_UP, Decimal
-from typing import Any, Dict, Iterable, Sequence, cast
+from functools import partial
+from typing import Any, Dict, Iterable, Mapping, Sequence, TypeVar, cast
 from urllib.parse import urlencode
 from uuid import uuid4
 
@@ -26,16 +30,31 @@ from kolabi.shared.binance_futures import binance_futures_audit_db_url
 from kolabi.shared.core.models import OrderAck, Position
 from kolabi.shared.core.runtime_types import OrderQty, Price, StopPrice
 from kolabi.shared.core.types import ExchangeABC
-from kolabi.shared.persistence import (
-    Base,
-    ExchangeRestCall,
-    create_persistence_engine,
-    prune_exchange_rest_calls,
+from kolabi.shared.exchanges.http_flow import (
+    AsyncHttpTransport,
+    AsyncOrderFlows,
+    Backoff,
+    HttpCall,
+    HttpFlow,
+    run_flow,
 )
+from kolabi.shared.exchanges.rest_audit import RestAuditSink
+from kolabi.shared.instrument_cache import REST_SOURCE, InstrumentMetadataCache
+from kolabi.shared.order_cache import (
+    DEFAULT_ORDER_CACHE_SIZE,
+    OrderRequestCache,
+    PersistedOrder,
+    PersistedOrderReader,
+    order_status_is_terminal,
+)
+from kolabi.shared.persistence import Base, create_persistence_engine
+from kolabi.shared.rate_limits import RateLimitRegistry, TokenBucket
 
 _LOGGER = logging.getLogger("kola")
 
 _REST_AUDIT_MAINTENANCE_SECONDS = 60.0
+_USED_WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+_T = TypeVar("_T")
 
 
 @dataclass(frozen=True)
@@ -54,7 +73,16 @@ class BinanceOrderRequest:
     time_in_force: str | None
 
 
-class BinanceAdapter(ExchangeABC):
+@dataclass
+class _AmendSlot:
+    """Amend in flight for one order plus the latest amend queued behind it."""
+
+    order_id: str
+    params: dict[str, Any] | None
+    waiters: list[asyncio.Future[OrderAck]] = field(default_factory=list)
+
+
+class BinanceAdapter(AsyncOrderFlows, ExchangeABC):
     """REST adapter for Binance USD-M Futures."""
 
     market_type = "futures"
@@ -70,6 +98,11 @@ class BinanceAdapter(ExchangeABC):
     supports_working_type = True
     supports_native_limit_amend = True
     uses_margin_order_params = False
+    batch_orders_path: str | None = "/fapi/v1/batchOrders"
+    # Single-call cancel + new order; USD-M Futures and margin have none.
+    cancel_replace_path: str | None = None
+    batch_place_limit = 5
+    batch_cancel_limit = 10
 
     def __init__(
         self,
@@ -89,6 +122,10 @@ class BinanceAdapter(ExchangeABC):
         rest_audit_retention_minutes: int = 1440,
         rest_audit_retention_limit: int = 10000,
         rest_audit_maintenance_seconds: float = _REST_AUDIT_MAINTENANCE_SECONDS,
+        instrument_cache: InstrumentMetadataCache | None = None,
+        rate_limits: RateLimitRegistry | None = None,
+        account_db_url: str | None = None,
+        order_cache_size: int = DEFAULT_ORDER_CACHE_SIZE,
         **_unused: Any,
     ) -> None:
         super().__init__(api_key, api_secret, base_url.rstrip("/"), symbol)
@@ -104,6 +141,7 @@ class BinanceAdapter(ExchangeABC):
         self.rest_audit_maintenance_seconds = rest_audit_maintenance_seconds
         self.session = requests.Session()
         self.session.headers.update({"X-MBX-APIKEY": api_key})
+        self.http = AsyncHttpTransport(headers={"X-MBX-APIKEY": api_key})
         self.audit_db_url = audit_db_url or binance_futures_audit_db_url(
             environment,
             account_scope,
@@ -115,11 +153,56 @@ class BinanceAdapter(ExchangeABC):
             expire_on_commit=False,
             class_=Session,
         )
-        self.rest_audit_errors: list[str] = []
-        self._last_rest_audit_prune_monotonic = 0.0
-        self._rules_cache: dict[str, dict[str, object]] = {}
-        self._orders_by_order_id: dict[str, BinanceOrderRequest] = {}
-        self._orders_by_client_id: dict[str, BinanceOrderRequest] = {}
+        self.rest_audit = RestAuditSink(
+            self._audit_sessionmaker,
+            exchange="binance",
+            environment=self.environment,
+            market_type=self.market_type,
+            account_scope=self.account_scope,
+            retention_minutes=self.rest_audit_retention_minutes,
+            retention_limit=self.rest_audit_retention_limit,
+            maintenance_seconds=self.rest_audit_maintenance_seconds,
+        )
+        self.rest_audit_errors = self.rest_audit.errors
+        self.instrument_cache = instrument_cache or InstrumentMetadataCache()
+        # Shared with the Ogun flight gate, which spends from it before each
+        # order call; responses resync it from the venue's own weight counter.
+        self.rate_limit_bucket: TokenBucket | None = (
+            None
+            if rate_limits is None
+            else rate_limits.bucket("binance", self.market_type, account_scope)
+        )
+        # Original requests for cancel-replace amends. A miss (restart, LRU
+        # eviction) is rehydrated from the REST audit and the private orders,
+        # never from the exchange. Ids of orders this adapter replaced alias
+        # the live replacement, so callers holding them keep amending it.
+        self.persisted_orders = PersistedOrderReader(
+            exchange="binance",
+            environment=self.environment,
+            market_type=self.market_type,
+            account_scope=self.account_scope,
+            symbol=self.symbol,
+            place_paths=tuple(
+                path for path in (self.order_path, self.cancel_replace_path) if path
+            ),
+            cancel_calls=(("DELETE", self.order_path),),
+            audit_sessionmaker=self._audit_sessionmaker,
+            account_sessionmaker=(
+                None
+                if account_db_url is None
+                else sessionmaker(
+                    bind=create_persistence_engine(account_db_url),
+                    expire_on_commit=False,
+                    class_=Session,
+                )
+            ),
+        )
+        self.order_cache: OrderRequestCache[BinanceOrderRequest] = OrderRequestCache(
+            max_entries=order_cache_size,
+            rehydrate=self._rehydrate_order,
+        )
+        self._amend_slots: dict[str, _AmendSlot] = {}
+        self.amends_coalesced = 0
 
     def _request(
         self,
@@ -130,6 +213,32 @@ class BinanceAdapter(ExchangeABC):
         auth: bool = False,
         retry_attempts: int = 3,
     ) -> Any:
+        return run_flow(
+            self._request_flow(
+                method, path, params=params, auth=auth, retry_attempts=retry_attempts
+            ),
+            self._send_http,
+        )
+
+    def _send_http(self, call: HttpCall) -> Any:
+        return self.session.request(
+            call.method,
+            call.url,
+            params=call.params,
+            data=call.data,
+            timeout=call.timeout,
+        )
+
+    def _request_flow(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Dict[str, Any] | Sequence[tuple[str, Any]] | None = None,
+        auth: bool = False,
+        retry_attempts: int = 3,
+        correlation_id: str | None = None,
+    ) -> HttpFlow[Any]:
         raw_params = dict(params or {}) if not isinstance(params, list) else dict(params)
         payload = _clean_params(raw_params)
         max_attempts = _effective_retry_attempts(
@@ -149,9 +258,9 @@ class BinanceAdapter(ExchangeABC):
                     self.api_secret,
                 )
             try:
-                response = self.session.request(
-                    method.upper(),
-                    f"{self.base_url}{path}",
+                response = yield HttpCall(
+                    method=method.upper(),
+                    url=f"{self.base_url}{path}",
                     params=request_payload if method.upper() in {"GET", "DELETE"} else None,
                     data=request_payload if method.upper() not in {"GET", "DELETE"} else None,
                     timeout=self.timeout,
@@ -161,7 +270,7 @@ class BinanceAdapter(ExchangeABC):
                     f"Binance transport error on {path}: {exc.__class__.__name__}: {exc}"
                 )
                 if attempt < max_attempts:
-                    time.sleep(0.25 * attempt)
+                    yield Backoff(0.25 * attempt)
                     last_error = error
                     continue
                 self._record_rest_call(
@@ -173,6 +282,7 @@ class BinanceAdapter(ExchangeABC):
                     response_payload={},
                     result_kind="transport_error",
                     error_text=str(error),
+                    correlation_id=correlation_id,
                 )
                 raise error from exc
             try:
@@ -180,10 +290,11 @@ class BinanceAdapter(ExchangeABC):
             except ValueError:
                 data = {"raw_text": response.text}
             status_code = getattr(response, "status_code", 200)
+            self._observe_rate_limit(response, status_code)
             if status_code >= 400:
                 error = RuntimeError(f"Binance HTTP {status_code} on {path}: {data}")
                 if status_code in {502, 503, 504} and attempt < max_attempts:
-                    time.sleep(0.25 * attempt)
+                    yield Backoff(0.25 * attempt)
                     last_error = error
                     continue
                 self._record_rest_call(
@@ -195,6 +306,7 @@ class BinanceAdapter(ExchangeABC):
                     response_payload=data if isinstance(data, dict) else {"payload": data},
                     result_kind="http_error",
                     error_text=str(error),
+                    correlation_id=correlation_id,
                 )
                 raise error
             self._record_rest_call(
@@ -206,11 +318,25 @@ class BinanceAdapter(ExchangeABC):
                 response_payload=data if isinstance(data, dict) else {"payload": data},
                 result_kind="ok",
                 error_text=None,
+                correlation_id=correlation_id,
             )
             return data
         assert last_error is not None
         raise last_error
 
+    def _observe_rate_limit(self, response: Any, status_code: int) -> None:
+        bucket = self.rate_limit_bucket
+        headers = getattr(response, "headers", None)
+        if bucket is None or not headers:
+            return
+        used = _optional_float(headers.get(_USED_WEIGHT_HEADER))
+        if used is not None:
+            bucket.observe_used(used)
+        if status_code in {418, 429}:
+            retry_after = _optional_float(headers.get("Retry-After"))
+            if retry_after is not None:
+                bucket.observe_retry_after(retry_after)
+
     def _record_rest_call(
         self,
         *,
@@ -222,6 +348,7 @@ class BinanceAdapter(ExchangeABC):
         response_payload: Dict[str, Any],
         result_kind: str,
         error_text: str | None,
+        correlation_id: str | None = None,
     ) -> None:
         if not _should_persist_rest_call(method=method, path=path):
             return
@@ -229,7 +356,10 @@ class BinanceAdapter(ExchangeABC):
         payload = cast(Dict[str, Any], _json_safe_value(response_payload))
         order_like = _extract_order_like(payload)
         request_order_id = optional_str(
-            request_payload.get("orderId") or request_payload.get("origClientOrderId")
+            request_payload.get("orderId")
+            or request_payload.get("origClientOrderId")
+            or request_payload.get("cancelOrderId")
+            or request_payload.get("cancelOrigClientOrderId")
         )
         response_order_id = optional_str(order_like.get("orderId"))
         endpoint_order_id = response_order_id or request_order_id
@@ -238,105 +368,54 @@ class BinanceAdapter(ExchangeABC):
             or request_payload.get("newClientOrderId")
             or request_payload.get("origClientOrderId")
         )
-        correlation_id = client_order_id or endpoint_order_id or request_order_id
-        with self._audit_sessionmaker() as session:
-            try:
-                session.add(
-                    ExchangeRestCall(
-                        local_uuid=str(uuid4()),
-                        exchange="binance",
-                        environment=self.environment,
-                        market_type=self.market_type,
-                        account_scope=self.account_scope,
-                        symbol=optional_str(
-                            order_like.get("symbol") or request_payload.get("symbol")
-                        ),
-                        method=method.upper(),
-                        path=path,
-                        request_params=request_payload,
-                        attempt_count=attempt_count,
-                        http_status=http_status,
-                        result_kind=result_kind,
-                        response_payload=payload,
-                        error_text=error_text,
-                        client_order_id=client_order_id,
-                        exchange_order_id=endpoint_order_id,
-                        endpoint_order_id=endpoint_order_id,
-                        correlation_id=correlation_id,
-                        ack_status=optional_str(order_like.get("status")),
-                        ack_order_id=endpoint_order_id,
-                        ack_client_order_id=client_order_id,
-                    )
-                )
-                session.commit()
-                self._prune_rest_audit_if_due(session)
-                return
-            except Exception as exc:
-                session.rollback()
-                self._record_rest_audit_failure(
-                    method=method,
-                    path=path,
-                    client_order_id=client_order_id,
-                    endpoint_order_id=endpoint_order_id,
-                    retry=0,
-                    exc=exc,
-                )
-                return
-
-    def _record_rest_audit_failure(
-        self,
-        *,
-        method: str,
-        path: str,
-        client_order_id: str | None,
-        endpoint_order_id: str | None,
-        retry: int,
-        exc: BaseException,
-    ) -> None:
-        error = _compact_error(exc)
-        self.rest_audit_errors.append(
-            (
-                f"method={method.upper()} path={path} "
-                f"clOrdID={client_order_id or '-'} orderID={endpoint_order_id or '-'} "
-                f"retry={retry} error={error}"
-            )
+        correlation_id = (
+            correlation_id or client_order_id or endpoint_order_id or request_order_id
         )
-        _LOGGER.warning(
-            "rest call audit persistence failed method=%s path=%s clOrdID=%s orderID=%s retry=%s error=%s",
-            method.upper(),
-            path,
-            client_order_id or "-",
-            endpoint_order_id or "-",
-            retry,
-            error,
+        self.rest_audit.submit(
+            {
+                "symbol": optional_str(
+                    order_like.get("symbol") or request_payload.get("symbol")
+                ),
+                "method": method.upper(),
+                "path": path,
+                "request_params": request_payload,
+                "attempt_count": attempt_count,
+                "http_status": http_status,
+                "result_kind": result_kind,
+                "response_payload": payload,
+                "error_text": error_text,
+                "client_order_id": client_order_id,
+                "exchange_order_id": endpoint_order_id,
+                "endpoint_order_id": endpoint_order_id,
+                "correlation_id": correlation_id,
+                "ack_status": optional_str(order_like.get("status")),
+                "ack_order_id": endpoint_order_id,
+                "ack_client_order_id": client_order_id,
+            }
         )
 
-    def _prune_rest_audit_if_due(self, session: Session) -> None:
-        now_monotonic = time.monotonic()
-        if (
-            now_monotonic - self._last_rest_audit_prune_monotonic
-            < self.rest_audit_maintenance_seconds
-        ):
-            return
-        self._last_rest_audit_prune_monotonic = now_monotonic
-        prune_exchange_rest_calls(
-            session,
-            exchange="binance",
-            environment=self.environment,
-            market_type=self.market_type,
-            account_scope=self.account_scope,
-            retention_minutes=self.rest_audit_retention_minutes,
-            retention_limit=self.rest_audit_retention_limit,
-            now=datetime.now(timezone.utc),
-        )
-        session.commit()
+    def flush_rest_audit(self) -> int:
+        """Write queued REST audit rows now (reports, tests, shutdown)."""
+
+        return self.rest_audit.flush()
+
+    def close(self) -> None:
+        """Drain the REST audit queue and stop its writer."""
+
+        self.rest_audit.stop()
 
     def instrument_rules(self, symbol: str | None = None) -> dict[str, object]:
         """Return compact symbol filters needed by preflight and rounding."""
 
         target_symbol = symbol or self.symbol
-        if target_symbol in self._rules_cache:
-            return self._rules_cache[target_symbol]
+        rules = self.instrument_cache.get_or_load(
+            REST_SOURCE,
+            ("binance", self.environment, self.market_type, target_symbol),
+            partial(self._fetch_instrument_rules, target_symbol),
+        )
+        return dict(rules or {})
+
+    def _fetch_instrument_rules(self, target_symbol: str) -> dict[str, object]:
         payload = self._request(
             "GET",
             self.exchange_info_path,
@@ -378,7 +457,6 @@ class BinanceAdapter(ExchangeABC):
                 "quantityPrecision": item.get("quantityPrecision"),
                 "pricePrecision": item.get("pricePrecision"),
             }
-            self._rules_cache[target_symbol] = rules
             return rules
         raise ValueError(f"Binance {self.market_type} symbol not found: {target_symbol}")
 
@@ -455,6 +533,53 @@ class BinanceAdapter(ExchangeABC):
         type_: str = "LIMIT",
         **params: Any,
     ) -> OrderAck:
+        return run_flow(
+            self._place_order_flow(side, orderQty, price, stopPx, type_, **params),
+            self._send_http,
+        )
+
+    def _place_order_flow(
+        self,
+        side: str,
+        orderQty: OrderQty | float,
+        price: Price | float | None = None,
+        stopPx: StopPrice | float | None = None,
+        type_: str = "LIMIT",
+        **params: Any,
+    ) -> HttpFlow[OrderAck]:
+        normalised, cached = self._order_request(
+            side, orderQty, price, stopPx, type_, **params
+        )
+        ack = yield from self._submit_order_flow(normalised, cached)
+        return ack
+
+    def _submit_order_flow(
+        self,
+        normalised: Dict[str, Any],
+        cached: BinanceOrderRequest,
+        *,
+        correlation_id: str | None = None,
+    ) -> HttpFlow[OrderAck]:
+        payload = yield from self._request_flow(
+            "POST",
+            self.order_path,
+            params=normalised,
+            auth=True,
+            correlation_id=correlation_id,
+        )
+        ack = _ack_from_payload(payload)
+        self._cache_order(ack, cached)
+        return ack
+
+    def _order_request(
+        self,
+        side: str,
+        orderQty: OrderQty | float,
+        price: Price | float | None = None,
+        stopPx: StopPrice | float | None = None,
+        type_: str = "LIMIT",
+        **params: Any,
+    ) -> tuple[Dict[str, Any], BinanceOrderRequest]:
         exec_inst = str(params.pop("execInst", "") or "")
         reduce_only = _truthy(params.pop("reduceOnly", False)) or _has_exec_flag(
             exec_inst,
@@ -512,39 +637,78 @@ class BinanceAdapter(ExchangeABC):
         normalised = self.validate_order(
             self._with_route_params(request, include_side_effect=True)
         )
-        payload = self._request(
-            "POST",
-            self.order_path,
-            params=normalised,
-            auth=True,
-        )
-        ack = _ack_from_payload(payload)
-        self._cache_order(
-            ack,
-            BinanceOrderRequest(
-                side=side.upper(),
-                quantity=float(normalised["quantity"]),
-                kolabi_type=str(type_),
-                binance_type=binance_type,
-                price=_optional_float(normalised.get("price")),
-                stop_price=_optional_float(normalised.get("stopPrice")),
-                client_order_id=client_order_id,
-                reduce_only=reduce_only,
-                working_type=working_type,
-                time_in_force=optional_str(normalised.get("timeInForce")),
-            ),
+        return normalised, BinanceOrderRequest(
+            side=side.upper(),
+            quantity=float(normalised["quantity"]),
+            kolabi_type=str(type_),
+            binance_type=binance_type,
+            price=_optional_float(normalised.get("price")),
+            stop_price=_optional_float(normalised.get("stopPrice")),
+            client_order_id=client_order_id,
+            reduce_only=reduce_only,
+            working_type=working_type,
+            time_in_force=optional_str(normalised.get("timeInForce")),
         )
-        return ack
 
     def amend_order(self, order_id: str, **params: Any) -> OrderAck:
+        return run_flow(self._amend_order_flow(order_id, **params), self._send_http)
+
+    async def amend_order_async(self, order_id: str, **params: Any) -> OrderAck:
+        """Amend on the async pool, coalescing amends of one order.
+
+        While an amend is in flight, later amends of the same order (keyed by
+        `clOrdID`, else the order id) wait; once it settles only their merged,
+        latest params are sent, and every waiter gets that call's ack.
+        """
+
+        key = str(params.get("clOrdID") or order_id)
+        future: asyncio.Future[OrderAck] = asyncio.get_running_loop().create_future()
+        slot = self._amend_slots.get(key)
+        if slot is not None:
+            if slot.params is not None:
+                self.amends_coalesced += 1
+            slot.order_id = order_id
+            slot.params = {**(slot.params or {}), **params}
+            slot.waiters.append(future)
+            return await future
+        slot = _AmendSlot(order_id=order_id, params=dict(params), waiters=[future])
+        self._amend_slots[key] = slot
+        waiters: list[asyncio.Future[OrderAck]] = []
+        try:
+            while slot.params is not None:
+                call_order_id, call_params, waiters = slot.order_id, slot.params, slot.waiters
+                slot.params, slot.waiters = None, []
+                try:
+                    ack = await self._run_async(
+                        self._amend_order_flow(call_order_id, **call_params)
+                    )
+                except Exception as exc:
+                    _settle(waiters, error=exc)
+                else:
+                    _settle(waiters, ack=ack)
+        finally:
+            del self._amend_slots[key]
+            for waiter in (*waiters, *slot.waiters):
+                if not waiter.done():
+                    waiter.cancel()
+        return await future
+
+    def _amend_order_flow(self, order_id: str, **params: Any) -> HttpFlow[OrderAck]:
+        order_id = self._current_order_identity(order_id)
         cached = self._lookup_cached_order(order_id, params.get("clOrdID"))
         if cached is None:
             raise ValueError(
-                "Binance amend requires a cached original order from this process; "
+                "Binance amend requires the original order in memory, the audit or the "
+                "private orders; "
                 f"order_id={order_id}"
             )
+        # Every REST call of one amend shares this correlation id in the audit.
+        correlation_id = _amend_correlation_id(cached.client_order_id)
         if not self.supports_native_limit_amend:
-            return self._amend_by_cancel_replace(order_id, cached, params)
+            replaced = yield from self._amend_by_cancel_replace_flow(
+                order_id, cached, params, correlation_id=correlation_id
+            )
+            return replaced
         if cached.binance_type == "LIMIT":
             quantity = float(params.get("orderQty") or cached.quantity)
             price = params.get("price")
@@ -561,11 +725,12 @@ class BinanceAdapter(ExchangeABC):
                     _order_id_param_name(order_id): order_id,
                 }
             )
-            payload = self._request(
+            payload = yield from self._request_flow(
                 "PUT",
                 self.order_path,
                 params=request,
                 auth=True,
+                correlation_id=correlation_id,
             )
             ack = _ack_from_payload(payload)
             self._cache_order(
@@ -584,11 +749,19 @@ class BinanceAdapter(ExchangeABC):
                 ),
             )
             return ack
+        if cached.reduce_only:
+            # Futures modify only takes LIMIT orders and there is no
+            # cancel-replace endpoint. A reduce-only trigger may overlap its
+            # successor, so place the new one first: the tail is never off.
+            ack = yield from self._place_then_cancel_flow(
+                order_id, cached, params, correlation_id=correlation_id
+            )
+            return ack
         # Binance modify only supports LIMIT orders. Stop-market tails are
         # therefore replaced atomically from the runtime point of view:
         # cancel old trigger, then submit the new trigger with the same client id.
-        self.cancel_order(order_id)
-        return self.place_order(
+        yield from self._cancel_order_flow(order_id, correlation_id=correlation_id)
+        normalised, request = self._order_request(
             side=cached.side,
             orderQty=float(params.get("orderQty") or cached.quantity),
             price=cached.price,
@@ -598,15 +771,55 @@ class BinanceAdapter(ExchangeABC):
             reduceOnly=cached.reduce_only,
             execInst=_exec_inst_from_cached(cached),
         )
+        ack = yield from self._submit_order_flow(
+            normalised, request, correlation_id=correlation_id
+        )
+        return ack
 
-    def _amend_by_cancel_replace(
+    def _place_then_cancel_flow(
         self,
         order_id: str,
         cached: BinanceOrderRequest,
         params: dict[str, Any],
-    ) -> OrderAck:
-        self.cancel_order(order_id)
-        return self.place_order(
+        *,
+        correlation_id: str,
+    ) -> HttpFlow[OrderAck]:
+        normalised, request = self._order_request(
+            side=cached.side,
+            orderQty=float(params.get("orderQty") or cached.quantity),
+            price=cached.price,
+            stopPx=params.get("stopPx") or cached.stop_price,
+            type_=cached.kolabi_type,
+            clOrdID=_replacement_client_order_id(cached.client_order_id),
+            reduceOnly=True,
+            execInst=_exec_inst_from_cached(cached),
+        )
+        ack = yield from self._submit_order_flow(
+            normalised, request, correlation_id=correlation_id
+        )
+        try:
+            yield from self._cancel_order_flow(order_id, correlation_id=correlation_id)
+        except Exception:
+            # The old trigger is gone (fired) or unknown: do not leave both
+            # resting; the new one is withdrawn and the amend fails.
+            with suppress(Exception):
+                yield from self._cancel_order_flow(
+                    ack.order_id or request.client_order_id,
+                    correlation_id=correlation_id,
+                )
+            raise
+        self._note_replacement((order_id, cached.client_order_id), ack)
+        return ack
+
+    def _amend_by_cancel_replace_flow(
+        self,
+        order_id: str,
+        cached: BinanceOrderRequest,
+        params: dict[str, Any],
+        *,
+        correlation_id: str | None = None,
+    ) -> HttpFlow[OrderAck]:
+        normalised, request = self._order_request(
             side=cached.side,
             orderQty=float(params.get("orderQty") or cached.quantity),
             price=params.get("price", cached.price),
@@ -620,23 +833,183 @@ class BinanceAdapter(ExchangeABC):
             reduceOnly=cached.reduce_only,
             execInst=_exec_inst_from_cached(cached),
         )
+        if self.cancel_replace_path is None:
+            yield from self._cancel_order_flow(order_id, correlation_id=correlation_id)
+            ack = yield from self._submit_order_flow(
+                normalised, request, correlation_id=correlation_id
+            )
+            return ack
+        # STOP_ON_FAILURE: the venue only places the new order if the cancel
+        # succeeded, in one signed call.
+        cancel_key = (
+            "cancelOrderId"
+            if _order_id_param_name(order_id) == "orderId"
+            else "cancelOrigClientOrderId"
+        )
+        payload = yield from self._request_flow(
+            "POST",
+            self.cancel_replace_path,
+            params={
+                **normalised,
+                "cancelReplaceMode": "STOP_ON_FAILURE",
+                cancel_key: order_id,
+            },
+            auth=True,
+            correlation_id=correlation_id,
+        )
+        ack = _ack_from_payload(payload)
+        self._forget_order(order_id)
+        self._forget_order(cached.client_order_id)
+        self._cache_order(ack, request)
+        self._note_replacement((order_id, cached.client_order_id), ack)
+        return ack
 
     def cancel_order(self, order_id: str) -> OrderAck:
+        return run_flow(self._cancel_order_flow(order_id), self._send_http)
+
+    def _cancel_order_flow(
+        self, order_id: str, *, correlation_id: str | None = None
+    ) -> HttpFlow[OrderAck]:
+        order_id = self._current_order_identity(order_id)
         request = {
             "symbol": self.symbol,
             _order_id_param_name(order_id): order_id,
         }
-        payload = self._request(
+        payload = yield from self._request_flow(
             "DELETE",
             self.order_path,
             params=self._with_route_params(request, include_auto_repay=True),
             auth=True,
+            correlation_id=correlation_id,
         )
         ack = _ack_from_payload(payload)
         self._forget_order(order_id)
         self._forget_order(ack_client_id(ack, ""))
         return ack
 
+    def place_orders(
+        self, orders: Sequence[Mapping[str, Any]]
+    ) -> list[OrderAck | Exception]:
+        """Send orders through `batchOrders`, `batch_place_limit` per call."""
+
+        return run_flow(self._place_orders_flow(orders), self._send_http)
+
+    def _place_orders_flow(
+        self, orders: Sequence[Mapping[str, Any]]
+    ) -> HttpFlow[list[OrderAck | Exception]]:
+        if self.batch_orders_path is None:
+            singles: list[OrderAck | Exception] = []
+            for order in orders:
+                try:
+                    ack = yield from self._place_order_flow(**order)
+                    singles.append(ack)
+                except Exception as exc:
+                    singles.append(exc)
+            return singles
+        results: list[OrderAck | Exception | None] = []
+        prepared: list[tuple[int, Dict[str, Any], BinanceOrderRequest]] = []
+        for index, order in enumerate(orders):
+            try:
+                normalised, cached = self._order_request(**order)
+            except Exception as exc:
+                results.append(exc)
+                continue
+            results.append(None)
+            prepared.append((index, normalised, cached))
+        for chunk in _chunks(prepared, self.batch_place_limit):
+            replies = yield from self._batch_request_flow(
+                "POST",
+                {
+                    "batchOrders": json.dumps(
+                        [
+                            {key: str(value) for key, value in row.items()}
+                            for _, row, _ in chunk
+                        ]
+                    )
+                },
+                expected=len(chunk),
+            )
+            for (index, _, cached), reply in zip(chunk, replies):
+                if isinstance(reply, Exception):
+                    results[index] = reply
+                    continue
+                ack = _ack_from_payload(reply)
+                self._cache_order(ack, cached)
+                results[index] = ack
+        return cast(list[OrderAck | Exception], results)
+
+    def cancel_orders(self, order_ids: Sequence[str]) -> list[OrderAck | Exception]:
+        """Cancel through `batchOrders`, one call per id family and chunk."""
+
+        return run_flow(self._cancel_orders_flow(order_ids), self._send_http)
+
+    def _cancel_orders_flow(
+        self, order_ids: Sequence[str]
+    ) -> HttpFlow[list[OrderAck | Exception]]:
+        if self.batch_orders_path is None:
+            singles: list[OrderAck | Exception] = []
+            for order_id in order_ids:
+                try:
+                    ack = yield from self._cancel_order_flow(order_id)
+                    singles.append(ack)
+                except Exception as exc:
+                    singles.append(exc)
+            return singles
+        identities = [self._current_order_identity(str(order_id)) for order_id in order_ids]
+        results: list[OrderAck | Exception | None] = [None] * len(identities)
+        by_param: dict[str, list[int]] = {}
+        for index, identity in enumerate(identities):
+            by_param.setdefault(_order_id_param_name(identity), []).append(index)
+        for param_name, indexes in by_param.items():
+            for chunk in _chunks(indexes, self.batch_cancel_limit):
+                ids = [identities[index] for index in chunk]
+                values: list[int] | list[str] = (
+                    [int(identity) for identity in ids] if param_name == "orderId" else ids
+                )
+                replies = yield from self._batch_request_flow(
+                    "DELETE",
+                    {"symbol": self.symbol, f"{param_name}List": json.dumps(values)},
+                    expected=len(chunk),
+                )
+                for index, reply in zip(chunk, replies):
+                    if isinstance(reply, Exception):
+                        results[index] = reply
+                        continue
+                    ack = _ack_from_payload(reply)
+                    self._forget_order(identities[index])
+                    self._forget_order(ack_client_id(ack, ""))
+                    results[index] = ack
+        return cast(list[OrderAck | Exception], results)
+
+    def _batch_request_flow(
+        self,
+        method: str,
+        params: Dict[str, Any],
+        *,
+        expected: int,
+    ) -> HttpFlow[list[Dict[str, Any] | Exception]]:
+        assert self.batch_orders_path is not None
+        payload = yield from self._request_flow(
+            method, self.batch_orders_path, params=params, auth=True
+        )
+        rows = payload if isinstance(payload, list) else []
+        if len(rows) != expected:
+            raise RuntimeError(
+                f"Binance {method} {self.batch_orders_path} returned {len(rows)} "
+                f"replies for {expected} orders: {payload}"
+            )
+        replies: list[Dict[str, Any] | Exception] = []
+        for row in rows:
+            if not isinstance(row, dict) or ("code" in row and "orderId" not in row):
+                replies.append(
+                    RuntimeError(
+                        f"Binance batch item rejected on {self.batch_orders_path}: {row}"
+                    )
+                )
+                continue
+            replies.append(cast(Dict[str, Any], row))
+        return replies
+
     def live_open_orders(self) -> list[Dict[str, Any]]:
         payload = self._request(
             "GET",
@@ -864,25 +1237,35 @@ class BinanceAdapter(ExchangeABC):
         order_id: str,
         client_order_id: object | None = None,
     ) -> BinanceOrderRequest | None:
-        if order_id in self._orders_by_order_id:
-            return self._orders_by_order_id[order_id]
-        if order_id in self._orders_by_client_id:
-            return self._orders_by_client_id[order_id]
-        if client_order_id is not None and str(client_order_id) in self._orders_by_client_id:
-            return self._orders_by_client_id[str(client_order_id)]
-        return None
+        return self.order_cache.get(order_id, client_order_id)
 
     def _cache_order(self, ack: OrderAck, request: BinanceOrderRequest) -> None:
-        if ack.order_id:
-            self._orders_by_order_id[str(ack.order_id)] = request
-        self._orders_by_client_id[request.client_order_id] = request
+        if order_status_is_terminal(ack.status):
+            self._forget_order(request.client_order_id)
+            return
+        self.order_cache.put((ack.order_id, request.client_order_id), request)
 
     def _forget_order(self, identity: str) -> None:
-        cached = self._orders_by_order_id.pop(identity, None)
-        if cached is not None:
-            self._orders_by_client_id.pop(cached.client_order_id, None)
-            return
-        self._orders_by_client_id.pop(identity, None)
+        self.order_cache.forget(identity)
+
+    def _current_order_identity(self, identity: str) -> str:
+        return self.order_cache.resolve(str(identity))
+
+    def _note_replacement(self, old_ids: Iterable[str], ack: OrderAck) -> None:
+        new_id = str(ack.order_id or ack.client_order_id or "")
+        if new_id:
+            self.order_cache.alias(old_ids, new_id)
+
+    def _rehydrate_order(
+        self, identity: str
+    ) -> tuple[BinanceOrderRequest, tuple[str, ...]] | None:
+        persisted = self.persisted_orders.lookup(identity)
+        if persisted is None or persisted.terminal:
+            return None
+        request = _request_from_persisted(persisted)
+        if request is None:
+            return None
+        return request, persisted.identities
 
 
 def _map_order_type(value: object, market_type: str) -> str:
@@ -932,6 +1315,60 @@ def _apply_post_only(
     return order_type, None
 
 
+def _request_from_persisted(persisted: PersistedOrder) -> BinanceOrderRequest | None:
+    """Rebuild the placement request from its audit row, else the feeder row."""
+    params = persisted.request_params
+    if params and params.get("side") and params.get("type"):
+        binance_type = str(params["type"]).upper()
+        return BinanceOrderRequest(
+            side=str(params["side"]).upper(),
+            quantity=float(params["quantity"]),
+            kolabi_type=_kolabi_type_from_binance(binance_type),
+            binance_type=binance_type,
+            price=_optional_float(params.get("price")),
+            stop_price=_optional_float(params.get("stopPrice")),
+            client_order_id=str(
+                params.get("newClientOrderId") or persisted.client_order_id or ""
+            ),
+            reduce_only=_truthy(params.get("reduceOnly")),
+            working_type=optional_str(params.get("workingType")),
+            time_in_force=optional_str(params.get("timeInForce")),
+        )
+    row = persisted.row
+    if row is None or not persisted.client_order_id:
+        return None
+    raw = cast(Dict[str, Any], row.get("raw_payload") or {})
+    binance_type = str(raw.get("type") or raw.get("o") or row["order_type"]).upper()
+    if binance_type in _STOP_LIMIT_TYPES:
+        # the feeder keeps the trigger in `price`; the limit price is lost
+        return None
+    triggered = "STOP" in binance_type or "TAKE_PROFIT" in binance_type
+    stop_price = _optional_float(
+        raw.get("stop_price") or raw.get("stopPrice") or raw.get("sp")
+    )
+    return BinanceOrderRequest(
+        side=str(row["side"]).upper(),
+        quantity=float(row["quantity"]),
+        kolabi_type=_kolabi_type_from_binance(binance_type),
+        binance_type=binance_type,
+        price=None if triggered else row.get("price"),
+        stop_price=stop_price or (row.get("price") if triggered else None),
+        client_order_id=persisted.client_order_id,
+        reduce_only=bool(row.get("reduce_only")) or _truthy(raw.get("reduceOnly")),
+        working_type=optional_str(raw.get("workingType") or raw.get("wt")),
+        time_in_force=optional_str(raw.get("timeInForce") or raw.get("f")),
+    )
+
+
+_STOP_LIMIT_TYPES = frozenset({"STOP", "TAKE_PROFIT", "STOP_LOSS_LIMIT", "TAKE_PROFIT_LIMIT"})
+
+
+def _kolabi_type_from_binance(binance_type: str) -> str:
+    # `_map_order_type` reads Binance names back, except the post-only one,
+    # which `_exec_inst_from_cached` restores from `binance_type`.
+    return "LIMIT" if binance_type == "LIMIT_MAKER" else binance_type
+
+
 def _exec_inst_from_cached(cached: BinanceOrderRequest) -> str:
     flags: list[str] = []
     if cached.reduce_only:
@@ -962,6 +1399,21 @@ def ack_client_id(ack: OrderAck, default: str) -> str:
     return ack.client_order_id or default
 
 
+def _settle(
+    waiters: Iterable[asyncio.Future[OrderAck]],
+    *,
+    ack: OrderAck | None = None,
+    error: Exception | None = None,
+) -> None:
+    for waiter in waiters:
+        if waiter.done():
+            continue
+        if error is not None:
+            waiter.set_exception(error)
+        else:
+            waiter.set_result(cast(OrderAck, ack))
+
+
 def _normalize_live_order(order: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "order_id": str(order.get("orderId") or ""),
@@ -1021,6 +1473,10 @@ def _effective_retry_attempts(
     payload: Dict[str, Any],
     configured: int,
 ) -> int:
+    if method.upper() == "POST" and path.endswith(("/batchOrders", "/cancelReplace")):
+        # A resent batch would only see duplicate-client-id rejections, a
+        # resent cancel-replace an unknown-order cancel.
+        return 1
     if method.upper() != "POST" or not path.endswith("/order"):
         return max(1, configured)
     if str(payload.get("newClientOrderId") or "").strip():
@@ -1029,7 +1485,14 @@ def _effective_retry_attempts(
 
 
 def _should_persist_rest_call(*, method: str, path: str) -> bool:
-    return path.endswith("/order") and method.upper() in {"POST", "PUT", "DELETE"}
+    if not path.endswith(("/order", "/batchOrders", "/cancelReplace")):
+        return False
+    return method.upper() in {"POST", "PUT", "DELETE"}
+
+
+def _chunks(items: Sequence[_T], size: int) -> Iterable[Sequence[_T]]:
+    for start in range(0, len(items), max(1, size)):
+        yield items[start : start + max(1, size)]
 
 
 def _sign_params(params: Dict[str, Any], api_secret: str) -> str:
@@ -1063,7 +1526,7 @@ def _json_safe_value(value: object) -> object:
 
 
 def _extract_order_like(payload: Dict[str, Any]) -> Dict[str, Any]:
-    for key in ("order", "result"):
+    for key in ("order", "result", "newOrderResponse"):
         value = payload.get(key)
         if isinstance(value, dict):
             return value
@@ -1129,6 +1592,10 @@ def _generated_client_order_id() -> str:
     return f"b-{uuid4().hex[:30]}"
 
 
+def _amend_correlation_id(client_order_id: str) -> str:
+    return f"amend:{client_order_id}:{uuid4().hex[:8]}"
+
+
 def _replacement_client_order_id(previous: str) -> str:
     prefix = (previous or "b")[:24].rstrip("-")
     return f"{prefix}-r{uuid4().hex[:9]}"[:36]
@@ -1293,6 +1760,8 @@ class BinanceSpotAdapter(BinanceAdapter):
     supports_reduce_only = False
     supports_working_type = False
     supports_native_limit_amend = False
+    batch_orders_path = None
+    cancel_replace_path = "/api/v3/order/cancelReplace"
 
 
 class BinanceMarginAdapter(BinanceSpotAdapter):
@@ -1304,6 +1773,7 @@ class BinanceMarginAdapter(BinanceSpotAdapter):
     open_orders_path = "/sapi/v1/margin/openOrders"
     balance_path = "/sapi/v1/margin/account"
     uses_margin_order_params = True
+    cancel_replace_path = None
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         is_isolated = _truthy(kwargs.get("is_isolated", False))
@@ -4,25 +4,27 @@ from __future__ import annotations
 
 import logging
 import re
-import time
-from datetime import datetime, timezone
+from datetime import datetime
 from decimal import Decimal
-from typing import Any, Callable, Dict
-from uuid import uuid4
+from functools import partial
+from typing import Any, Callable, Dict, Mapping, Sequence
+
+from sqlalchemy.orm import Session, sessionmaker
 
 from kolabi.shared.core.models import OrderAck, Position
 from kolabi.shared.core.runtime_types import OrderQty, Price, StopPrice
 from kolabi.shared.core.types import ExchangeABC
 from kolabi.shared.exchanges.bitmex_api.custom_api import BitMEX
-from kolabi.shared.persistence import (
-    Base,
-    ExchangeRestCall,
-    create_persistence_engine,
-    prune_exchange_rest_calls,
+from kolabi.shared.exchanges.http_flow import (
+    AsyncHttpTransport,
+    AsyncOrderFlows,
+    HttpFlow,
+    run_flow,
 )
+from kolabi.shared.exchanges.rest_audit import RestAuditSink
+from kolabi.shared.instrument_cache import REST_SOURCE, InstrumentMetadataCache
+from kolabi.shared.persistence import Base, create_persistence_engine
 from kolabi.shared.pruning import DEFAULT_PRUNING
-from sqlalchemy.orm import Session, sessionmaker
-
 
 _LOGGER = logging.getLogger("kola")
 _KOLABI_CLIENT_ORDER_ID_RE = re.compile(
@@ -30,7 +32,7 @@ _KOLABI_CLIENT_ORDER_ID_RE = re.compile(
 )
 
 
-class BitmexAdapter(ExchangeABC):
+class BitmexAdapter(AsyncOrderFlows, ExchangeABC):
     """Adapter that reuses the legacy BitMEX client."""
 
     _ORDER_TYPE_MAP = {
@@ -58,6 +60,12 @@ class BitmexAdapter(ExchangeABC):
         super().__init__(api_key, api_secret, base_url, symbol)
         self.market_type = market_type
         self.environment = str(client_kwargs.pop("environment", "demo") or "demo")
+        self.instrument_cache = (
+            client_kwargs.pop("instrument_cache", None) or InstrumentMetadataCache()
+        )
+        # The legacy client already sleeps on 429 from X-Ratelimit-Reset; the
+        # Ogun gate paces BitMEX calls from the shared bucket on its own.
+        client_kwargs.pop("rate_limits", None)
         self.audit_db_url = client_kwargs.pop("audit_db_url", None)
         self.account_scope = str(
             client_kwargs.pop("account_scope", "default") or "default"
@@ -89,8 +97,6 @@ class BitmexAdapter(ExchangeABC):
                 )
             ),
         )
-        self.rest_audit_errors: list[str] = []
-        self._last_rest_audit_prune_monotonic = 0.0
         self._audit_engine = (
             create_persistence_engine(self.audit_db_url) if self.audit_db_url else None
         )
@@ -103,6 +109,23 @@ class BitmexAdapter(ExchangeABC):
             if self._audit_engine is not None
             else None
         )
+        self.rest_audit = (
+            RestAuditSink(
+                self._audit_sessionmaker,
+                exchange="bitmex",
+                environment=self.environment,
+                market_type=self.market_type,
+                account_scope=self.account_scope,
+                retention_minutes=self.rest_audit_retention_minutes,
+                retention_limit=self.rest_audit_retention_limit,
+                maintenance_seconds=self.rest_audit_maintenance_seconds,
+            )
+            if self._audit_sessionmaker is not None
+            else None
+        )
+        self.rest_audit_errors: list[str] = (
+            self.rest_audit.errors if self.rest_audit is not None else []
+        )
         if self._audit_engine is not None:
             Base.metadata.create_all(self._audit_engine)
         for ignored in (
@@ -129,6 +152,12 @@ class BitmexAdapter(ExchangeABC):
         except Exception as exc:
             raise RuntimeError(f"Failed to initialise BitMEX client: {exc}") from exc
         self._order_write_permission_checked = False
+        # The legacy client signs a prepared request; the async transport
+        # replays it as is, so it carries no default headers. An injected
+        # client keeps its blocking calls.
+        self.http: AsyncHttpTransport | None = (
+            AsyncHttpTransport() if client_factory is None else None
+        )
 
     # ------------------------------------------------------------------
     # Helpers
@@ -157,17 +186,44 @@ class BitmexAdapter(ExchangeABC):
             client_order_id=data.get("clOrdID"),
         )
 
+    def _run(self, flow: HttpFlow[Any]) -> Any:
+        """Drive a flow on the legacy client's blocking session."""
+
+        runner = getattr(self.client, "_run", None)
+        if callable(runner):
+            return runner(flow)
+        # Injected clients without flows answer synchronously and never yield.
+        return run_flow(flow, _no_transport)
+
+    def _curl_flow(self, **request: Any) -> HttpFlow[Any]:
+        """`_curl_bitmex` as a flow, or a direct call for clients without flows."""
+
+        flow = getattr(self.client, "_curl_bitmex_flow", None)
+        if callable(flow):
+            return (yield from flow(**request))
+        return self.client._curl_bitmex(**request)
+
+    def _client_flow(self, name: str, *args: Any, **kwargs: Any) -> HttpFlow[Any]:
+        """Legacy client call `name`, through its `_<name>_flow` when present."""
+
+        flow = getattr(self.client, f"_{name}_flow", None)
+        if callable(flow):
+            return (yield from flow(*args, **kwargs))
+        return getattr(self.client, name)(*args, **kwargs)
+
     def _ensure_order_write_permission(self) -> None:
         """Fail before submitting when a BitMEX key cannot create orders."""
 
+        self._run(self._ensure_order_write_permission_flow())
+
+    def _ensure_order_write_permission_flow(self) -> HttpFlow[None]:
         if self._order_write_permission_checked:
             return
-        curl = getattr(self.client, "_curl_bitmex", None)
-        if not callable(curl):
+        if not callable(getattr(self.client, "_curl_bitmex", None)):
             self._order_write_permission_checked = True
             return
         try:
-            payload = curl(path="apiKey", verb="GET")
+            payload = yield from self._curl_flow(path="apiKey", verb="GET")
         except Exception as exc:
             raise RuntimeError(
                 "Could not verify BitMEX order permission before placing order: "
@@ -255,7 +311,20 @@ class BitmexAdapter(ExchangeABC):
         type_: str = "LIMIT",
         **params: Any,
     ) -> OrderAck:
-        self._ensure_order_write_permission()
+        return self._run(
+            self._place_order_flow(side, orderQty, price, stopPx, type_, **params)
+        )
+
+    def _place_order_flow(
+        self,
+        side: str,
+        orderQty: OrderQty | float,
+        price: Price | float | None = None,
+        stopPx: StopPrice | float | None = None,
+        type_: str = "LIMIT",
+        **params: Any,
+    ) -> HttpFlow[OrderAck]:
+        yield from self._ensure_order_write_permission_flow()
         ord_type = self._normalize_type(type_)
         reduce_only = _truthy(params.pop("reduceOnly", False))
         exec_inst = params.pop("execInst", None)
@@ -281,7 +350,7 @@ class BitmexAdapter(ExchangeABC):
             **opts,
         }
         try:
-            response = self._submit_order_request(
+            response = yield from self._submit_order_flow(
                 request,
                 order_qty=float(orderQty),
                 side=side.lower(),
@@ -309,9 +378,12 @@ class BitmexAdapter(ExchangeABC):
         return self._build_ack(data)
 
     def amend_order(self, order_id: str, **params: Any) -> OrderAck:
+        return self._run(self._amend_order_flow(order_id, **params))
+
+    def _amend_order_flow(self, order_id: str, **params: Any) -> HttpFlow[OrderAck]:
         request = {"orderID": order_id, **params}
         try:
-            response = self._amend_order_request(request)
+            response = yield from self._amend_request_flow(request)
         except Exception as exc:
             self._record_rest_call(
                 method="PUT",
@@ -333,42 +405,52 @@ class BitmexAdapter(ExchangeABC):
         )
         return self._build_ack(data)
 
-    def _submit_order_request(
+    def _submit_order_flow(
         self,
         request: Dict[str, Any],
         *,
         order_qty: float,
         side: str,
         opts: Dict[str, Any],
-    ) -> Any:
+    ) -> HttpFlow[Any]:
         if self.market_type == "spot" and hasattr(self.client, "_curl_bitmex"):
-            return self.client._curl_bitmex(
-                path="order",
-                postdict=request,
-                verb="POST",
+            return (
+                yield from self._curl_flow(
+                    path="order",
+                    postdict=request,
+                    verb="POST",
+                )
+            )
+        return (
+            yield from self._client_flow(
+                "place",
+                order_qty,
+                side=side,
+                asBulk=False,
+                **opts,
             )
-        return self.client.place(
-            order_qty,
-            side=side,
-            asBulk=False,
-            **opts,
         )
 
-    def _amend_order_request(self, request: Dict[str, Any]) -> Any:
+    def _amend_request_flow(self, request: Dict[str, Any]) -> HttpFlow[Any]:
         if hasattr(self.client, "_curl_bitmex"):
-            return self.client._curl_bitmex(
-                path="order",
-                postdict=request,
-                verb="PUT",
+            return (
+                yield from self._curl_flow(
+                    path="order",
+                    postdict=request,
+                    verb="PUT",
+                )
             )
         order_id = str(request["orderID"])
         params = {key: value for key, value in request.items() if key != "orderID"}
         return self.client.amend({"orderID": order_id}, **params)
 
     def cancel_order(self, order_id: str) -> OrderAck:
+        return self._run(self._cancel_order_flow(order_id))
+
+    def _cancel_order_flow(self, order_id: str) -> HttpFlow[OrderAck]:
         request = self._cancel_request(order_id)
         try:
-            response = self._cancel_order_request(request)
+            response = yield from self._cancel_request_flow(request)
         except Exception as exc:
             self._record_rest_call(
                 method="DELETE",
@@ -392,18 +474,106 @@ class BitmexAdapter(ExchangeABC):
         )
         return self._build_ack(data)
 
+    def cancel_orders(self, order_ids: Sequence[str]) -> list[OrderAck | Exception]:
+        """Cancel every id in one `DELETE /order` carrying orderID/clOrdID lists.
+
+        BitMEX deprecated bulk placement and amendment, so `place_orders`
+        keeps the one-by-one default.
+        """
+        return self._run(self._cancel_orders_flow(order_ids))
+
+    def _place_orders_flow(
+        self, orders: Sequence[Mapping[str, Any]]
+    ) -> HttpFlow[list[OrderAck | Exception]]:
+        results: list[OrderAck | Exception] = []
+        for order in orders:
+            try:
+                results.append((yield from self._place_order_flow(**order)))
+            except Exception as exc:
+                results.append(exc)
+        return results
+
+    def _cancel_orders_flow(
+        self, order_ids: Sequence[str]
+    ) -> HttpFlow[list[OrderAck | Exception]]:
+        identities = [str(order_id) for order_id in order_ids]
+        if not identities or not hasattr(self.client, "_curl_bitmex"):
+            results: list[OrderAck | Exception] = []
+            for identity in identities:
+                try:
+                    results.append((yield from self._cancel_order_flow(identity)))
+                except Exception as exc:
+                    results.append(exc)
+            return results
+        request: Dict[str, Any] = {}
+        for identity in identities:
+            for key, value in self._cancel_request(identity).items():
+                request.setdefault(key, []).append(value)
+        try:
+            response = yield from self._curl_flow(
+                path="order",
+                postdict=request,
+                verb="DELETE",
+            )
+        except Exception as exc:
+            self._record_rest_call(
+                method="DELETE",
+                path="/order",
+                request_params=request,
+                response_payload={},
+                result_kind="transport_error",
+                error_text=str(exc),
+            )
+            raise
+        rows = response if isinstance(response, list) else [response]
+        by_identity: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            for key in ("orderID", "clOrdID"):
+                if row.get(key):
+                    by_identity[str(row[key])] = row
+        results: list[OrderAck | Exception] = []
+        for identity in identities:
+            data = by_identity.get(identity)
+            if data is None:
+                results.append(
+                    RuntimeError(f"BitMEX bulk cancel returned no order for {identity}")
+                )
+                continue
+            data.setdefault("ordStatus", "Canceled")
+            self._record_rest_call(
+                method="DELETE",
+                path="/order",
+                request_params=self._cancel_request(identity),
+                response_payload=data,
+                result_kind="ok" if not data.get("error") else "exchange_error",
+                error_text=_optional_str(data.get("error")),
+            )
+            if data.get("error"):
+                results.append(
+                    RuntimeError(
+                        f"BitMEX cancel rejected for {identity}: {data['error']}"
+                    )
+                )
+                continue
+            results.append(self._build_ack(data))
+        return results
+
     def _cancel_request(self, order_id: str) -> Dict[str, Any]:
         identity = str(order_id)
         if _looks_like_client_order_id(identity, prefix=self.order_id_prefix):
             return {"clOrdID": identity}
         return {"orderID": identity}
 
-    def _cancel_order_request(self, request: Dict[str, Any]) -> Any:
+    def _cancel_request_flow(self, request: Dict[str, Any]) -> HttpFlow[Any]:
         if hasattr(self.client, "_curl_bitmex"):
-            return self.client._curl_bitmex(
-                path="order",
-                postdict=request,
-                verb="DELETE",
+            return (
+                yield from self._curl_flow(
+                    path="order",
+                    postdict=request,
+                    verb="DELETE",
+                )
             )
         if "clOrdID" in request:
             return self.client.cancel({"clIDList": [request["clOrdID"]]})
@@ -421,7 +591,7 @@ class BitmexAdapter(ExchangeABC):
         attempt_count: int = 1,
         http_status: int | None = None,
     ) -> None:
-        if self._audit_sessionmaker is None:
+        if self.rest_audit is None:
             return
         request_payload = _json_safe_dict(request_params)
         payload = _json_safe_dict(response_payload)
@@ -436,97 +606,51 @@ class BitmexAdapter(ExchangeABC):
         ack_status = _optional_str(payload.get("ordStatus"))
         if ack_status is None and result_kind != "ok":
             ack_status = "Rejected"
-        with self._audit_sessionmaker() as session:
-            try:
-                session.add(
-                    ExchangeRestCall(
-                        local_uuid=str(uuid4()),
-                        exchange="bitmex",
-                        environment=self.environment,
-                        market_type=self.market_type,
-                        account_scope=self.account_scope,
-                        symbol=self.symbol,
-                        method=method.upper(),
-                        path=path,
-                        request_params=request_payload,
-                        attempt_count=attempt_count,
-                        http_status=http_status,
-                        result_kind=result_kind,
-                        response_payload=payload,
-                        error_text=error_text,
-                        client_order_id=client_order_id,
-                        exchange_order_id=exchange_order_id,
-                        endpoint_order_id=exchange_order_id or client_order_id,
-                        correlation_id=client_order_id or exchange_order_id,
-                        ack_status=ack_status,
-                        ack_order_id=exchange_order_id,
-                        ack_client_order_id=client_order_id,
-                    )
-                )
-                session.commit()
-                self._prune_rest_audit_if_due(session)
-            except Exception as exc:
-                session.rollback()
-                self._record_rest_audit_failure(
-                    method=method,
-                    path=path,
-                    client_order_id=client_order_id,
-                    endpoint_order_id=exchange_order_id or client_order_id,
-                    exc=exc,
-                )
-
-    def _record_rest_audit_failure(
-        self,
-        *,
-        method: str,
-        path: str,
-        client_order_id: str | None,
-        endpoint_order_id: str | None,
-        exc: BaseException,
-    ) -> None:
-        error = _compact_error(exc)
-        self.rest_audit_errors.append(
-            (
-                f"method={method.upper()} path={path} "
-                f"clOrdID={client_order_id or '-'} orderID={endpoint_order_id or '-'} "
-                f"error={error}"
-            )
-        )
-        _LOGGER.warning(
-            "rest call audit persistence failed method=%s path=%s clOrdID=%s orderID=%s error=%s",
-            method.upper(),
-            path,
-            client_order_id or "-",
-            endpoint_order_id or "-",
-            error,
+        self.rest_audit.submit(
+            {
+                "symbol": self.symbol,
+                "method": method.upper(),
+                "path": path,
+                "request_params": request_payload,
+                "attempt_count": attempt_count,
+                "http_status": http_status,
+                "result_kind": result_kind,
+                "response_payload": payload,
+                "error_text": error_text,
+                "client_order_id": client_order_id,
+                "exchange_order_id": exchange_order_id,
+                "endpoint_order_id": exchange_order_id or client_order_id,
+                "correlation_id": client_order_id or exchange_order_id,
+                "ack_status": ack_status,
+                "ack_order_id": exchange_order_id,
+                "ack_client_order_id": client_order_id,
+            }
         )
 
-    def _prune_rest_audit_if_due(self, session: Session) -> None:
-        now_monotonic = time.monotonic()
-        if (
-            now_monotonic - self._last_rest_audit_prune_monotonic
-            < self.rest_audit_maintenance_seconds
-        ):
-            return
-        self._last_rest_audit_prune_monotonic = now_monotonic
-        try:
-            prune_exchange_rest_calls(
-                session,
-                exchange="bitmex",
-                environment=self.environment,
-                market_type=self.market_type,
-                account_scope=self.account_scope,
-                retention_minutes=self.rest_audit_retention_minutes,
-                retention_limit=self.rest_audit_retention_limit,
-                now=datetime.now(timezone.utc),
-            )
-            session.commit()
-        except Exception as exc:
-            session.rollback()
-            _LOGGER.warning("rest call audit pruning skipped error=%s", _compact_error(exc))
+    def flush_rest_audit(self) -> int:
+        """Write queued REST audit rows now (reports, tests, shutdown)."""
+
+        return self.rest_audit.flush() if self.rest_audit is not None else 0
+
+    def close(self) -> None:
+        """Drain the REST audit queue and stop its writer."""
+
+        if self.rest_audit is not None:
+            self.rest_audit.stop()
 
     def instrument_rules(self, symbol: str | None = None) -> dict[str, object]:
         target_symbol = symbol or self.symbol
+        rules = self.instrument_cache.get_or_load(
+            REST_SOURCE,
+            self._instrument_key(target_symbol),
+            partial(self._fetch_instrument_rules, target_symbol),
+        )
+        return dict(rules or {})
+
+    def _instrument_key(self, symbol: str) -> tuple[str, str, str, str]:
+        return ("bitmex", self.environment, self.market_type, symbol)
+
+    def _fetch_instrument_rules(self, target_symbol: str) -> dict[str, object]:
         instrument = self.client.instrument(target_symbol) or {}
         tick_size = _optional_float(instrument.get("tickSize"))
         min_quantity = (
@@ -554,9 +678,14 @@ class BitmexAdapter(ExchangeABC):
         }
 
     def instrument(self, symbol: str) -> Dict[str, Any]:
-        """Return compact BitMEX instrument metadata for operator tools."""
+        """Return compact BitMEX instrument metadata for operator tools.
 
-        return dict(self.instrument_rules(symbol))
+        Always fetched: the rules carry live prices that the cache would freeze.
+        """
+
+        rules = self._fetch_instrument_rules(symbol)
+        self.instrument_cache.put(REST_SOURCE, self._instrument_key(symbol), rules)
+        return dict(rules)
 
     def list_instruments(self) -> list[Dict[str, Any]]:
         """Return BitMEX instruments when the legacy client exposes them."""
@@ -678,6 +807,10 @@ class BitmexAdapter(ExchangeABC):
             return method()
 
 
+def _no_transport(call: Any) -> Any:
+    raise RuntimeError(f"BitMEX client has no HTTP session for {call.method} {call.url}")
+
+
 def _json_safe_dict(payload: Dict[str, Any]) -> dict[str, Any]:
     return {
         str(key): _json_safe_value(value)
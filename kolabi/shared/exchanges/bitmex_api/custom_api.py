@@ -27,6 +27,7 @@ from kolabi.runtime.kola.utils.orderfunc import (
 )
 from kolabi.shared.exchanges.bitmex_api.auth import APIKeyAuthWithExpires
 from kolabi.shared.exchanges.bitmex_api.custom_ws_thread import BitMEXWebsocket
+from kolabi.shared.exchanges.http_flow import Backoff, HttpCall, run_flow
 
 # https://www.bitmex.com/api/explorer/
 
@@ -108,6 +109,30 @@ class BitMEX(object):
         max_retries=None,
     ):
         """Send a request to BitMEX Servers."""
+        return self._run(
+            self._curl_bitmex_flow(
+                path, query, postdict, timeout, verb, rethrow_errors, max_retries
+            )
+        )
+
+    def _run(self, flow):
+        """Execute un flux REST en bloquant (session requests et time.sleep)."""
+        return run_flow(flow, self._send_http, sleep=lambda seconds: sleep(seconds))
+
+    def _send_http(self, call):
+        return self.session.send(call.prepared, timeout=call.timeout)
+
+    def _curl_bitmex_flow(
+        self,
+        path,
+        query=None,
+        postdict=None,
+        timeout=None,
+        verb=None,
+        rethrow_errors=True,
+        max_retries=None,
+    ):
+        """Flux de _curl_bitmex: produit les requetes et les pauses, meme logique."""
         # Handle URL
         url = self.base_url + path
 
@@ -136,7 +161,7 @@ class BitMEX(object):
                 self.logger.error(f"msg={error}, load={load}")
 
                 if load["verb"] == "GET":
-                    self.retry(**load)
+                    yield from self._retry_flow(**load)
 
                 raise ke.InvalidOrder(e, load, error)
 
@@ -162,14 +187,16 @@ class BitMEX(object):
 
             req = rq.Request(verb, url, json=postdict, auth=auth, params=query)
             prepped = self.session.prepare_request(req)
-            response = self.session.send(prepped, timeout=timeout)
+            response = yield HttpCall(
+                method=verb, url=url, timeout=timeout, prepared=prepped
+            )
 
             # Make non-200s throw
             response.raise_for_status()
 
         except rq.exceptions.HTTPError as e:
             if response is None:
-                raise exit_or_throw(e, "response is None", load)
+                raise (yield from exit_or_throw(e, "response is None", load))
 
             # 400
             elif response.status_code == 400:
@@ -186,7 +213,7 @@ class BitMEX(object):
                     "duplicate clordid" in message
                     or "this request has expired" in message
                 ):
-                    return self.retry(**load)
+                    return (yield from self._retry_flow(**load))
 
                 if "insufficient available balance" in message:
                     raise ke.InsufficientBalance(e, load, message)
@@ -230,7 +257,7 @@ class BitMEX(object):
                         f"Order not found. postdict = {postdict} and load={load}"
                     )
                     return None
-                exit_or_throw(e, response, load)
+                yield from exit_or_throw(e, response, load)
 
             # 429, ratelimit; cancel orders & wait until X-Ratelimit-Reset
             elif response.status_code == 429:
@@ -249,15 +276,17 @@ class BitMEX(object):
 
                 # We're ratelimited, and we may be waiting for a long time. Cancel orders.
                 self.logger.warning("Canceling all known orders in the meantime.")
-                self.cancel([o["orderID"] for o in self.open_orders()])
+                known = yield from self._open_orders_flow()
+                yield from self._cancel_flow([o["orderID"] for o in known])
 
                 self.logger.error(
                     f"Your ratelimit will reset at {reset_str}."
                     f"Sleeping for {to_sleep} seconds."
                 )
 
-                sleep(to_sleep)
-                return self.retry(**load)  # ne passe pas are exit_or_throw
+                yield Backoff(to_sleep)
+                # ne passe pas are exit_or_throw
+                return (yield from self._retry_flow(**load))
 
             # 502 Server Error: Bad Gateway
             elif response.status_code in [502, 503]:
@@ -272,10 +301,10 @@ class BitMEX(object):
                     "exception": e,
                 }
 
-                return self.retry(**load)
+                return (yield from self._retry_flow(**load))
 
             # in other status_code cases
-            exit_or_throw(e, "Unhandled Error", load)
+            yield from exit_or_throw(e, "Unhandled Error", load)
         except (rq.exceptions.Timeout, rq.exceptions.ConnectionError):
             # Timeout, re-run this request
             load = {
@@ -288,7 +317,7 @@ class BitMEX(object):
                 "max_retries": max_retries,
             }
 
-            return self.retry(**load)
+            return (yield from self._retry_flow(**load))
 
         # Reset retry counter on success
         self.retries = 0
@@ -369,6 +398,11 @@ class BitMEX(object):
     @authentication_required
     def cancel(self, orderID):
         """Cancel an existing order. (or List or  dict from split_ids)"""
+        return self._run(self._cancel_flow(orderID))
+
+    @authentication_required
+    def _cancel_flow(self, orderID):
+        """Flux de cancel."""
         path = "order"
         self.logger.debug(f"canceling ={orderID}")
 
@@ -379,30 +413,32 @@ class BitMEX(object):
 
             if clIDList:
                 postdict = {"clOrdID": clIDList}
-                sleep(HTTP_SIMPLE_RATE_LIMITE)
-                ret["clID"] = self._curl_bitmex(
+                yield Backoff(HTTP_SIMPLE_RATE_LIMITE)
+                ret["clID"] = yield from self._curl_bitmex_flow(
                     path=path, postdict=postdict, verb="DELETE"
                 )
 
             if oIDList:
                 postdict = {"orderID": oIDList}
-                sleep(HTTP_SIMPLE_RATE_LIMITE)
-                ret["oID"] = self._curl_bitmex(
+                yield Backoff(HTTP_SIMPLE_RATE_LIMITE)
+                ret["oID"] = yield from self._curl_bitmex_flow(
                     path=path, postdict=postdict, verb="DELETE"
                 )
 
             return ret
 
         if isinstance(orderID, list):
-            return self.cancel(split_ids(orderID))
+            return (yield from self._cancel_flow(split_ids(orderID)))
 
         elif orderID.startswith(ORDERID_PREFIX):
             postdict = {"clOrdID": orderID}
         else:
             postdict = {"orderID": orderID}
 
-        sleep(HTTP_SIMPLE_RATE_LIMITE)
-        return self._curl_bitmex(path=path, postdict=postdict, verb="DELETE")
+        yield Backoff(HTTP_SIMPLE_RATE_LIMITE)
+        return (
+            yield from self._curl_bitmex_flow(path=path, postdict=postdict, verb="DELETE")
+        )
 
     @authentication_required
     def delta(self):
@@ -435,9 +471,14 @@ class BitMEX(object):
     @authentication_required
     def http_open_orders(self):
         """Get 10 open orders via HTTP. Used on close to ensure we catch them all."""
+        return self._run(self._http_open_orders_flow())
+
+    @authentication_required
+    def _http_open_orders_flow(self):
+        """Flux de http_open_orders."""
         path = "order"
-        sleep(HTTP_SIMPLE_RATE_LIMITE)
-        orders = self._curl_bitmex(
+        yield Backoff(HTTP_SIMPLE_RATE_LIMITE)
+        orders = yield from self._curl_bitmex_flow(
             path=path,
             query={
                 "filter": dumps(
@@ -496,6 +537,12 @@ class BitMEX(object):
         except Exception:
             self.logger.exception("open_orders")
 
+    def _open_orders_flow(self):
+        """Flux de open_orders: HTTP sans websocket, lecture directe sinon."""
+        if self.ws is None:
+            return (yield from self._http_open_orders_flow())
+        return self.open_orders()
+
     @authentication_required
     def exec_orders(self, exectype=None):
         """
@@ -517,6 +564,11 @@ class BitMEX(object):
         Returns what _curl_bitmex_returns
         mendatory is orderQty
         """
+        return self._run(self._place_flow(orderQty, side, clOrdID, asBulk, **opts))
+
+    @authentication_required
+    def _place_flow(self, orderQty, side=None, clOrdID=None, asBulk=False, **opts):
+        """Flux de place."""
         try:
             postdict = self.create_order(side, orderQty, clOrdID, **opts)
         except Exception as e:
@@ -528,13 +580,17 @@ class BitMEX(object):
             raise (e)
         # self.logger.warning(f"postdict={postdict}")
         if asBulk:
-            sleep(HTTP_BULK_RATE_LIMITE)
-            return self._curl_bitmex(
-                path="order/bulk", postdict={"orders": [postdict]}, verb="POST"
+            yield Backoff(HTTP_BULK_RATE_LIMITE)
+            return (
+                yield from self._curl_bitmex_flow(
+                    path="order/bulk", postdict={"orders": [postdict]}, verb="POST"
+                )
             )
         else:
-            sleep(HTTP_SIMPLE_RATE_LIMITE)
-            retVal = self._curl_bitmex(path="order", postdict=postdict, verb="POST")
+            yield Backoff(HTTP_SIMPLE_RATE_LIMITE)
+            retVal = yield from self._curl_bitmex_flow(
+                path="order", postdict=postdict, verb="POST"
+            )
             # self.logger.info(f"retVal = {retVal}")
             return retVal
 
@@ -652,6 +708,35 @@ class BitMEX(object):
         """Renvois la réponse du borker après un retry
         Relance l'ordre un certain nombre de fois, un après avoir attendu quelques secondes.
         Nécessite les même argurments que _curl_bitmex et dans le même ordre"""
+        return self._run(
+            self._retry_flow(
+                path,
+                error,
+                query,
+                postdict,
+                timeout,
+                verb,
+                rethrow_errors,
+                max_retries,
+                fast,
+                exception,
+            )
+        )
+
+    def _retry_flow(
+        self,
+        path,
+        error=None,
+        query=None,
+        postdict=None,
+        timeout=None,
+        verb=None,
+        rethrow_errors=False,
+        max_retries=None,
+        fast=False,
+        exception=None,
+    ):
+        """Flux de retry: la pause est rendue au pilote (sleep ou asyncio.sleep)."""
         self.retries += 1
 
         if self.retries >= max_retries:
@@ -668,10 +753,12 @@ class BitMEX(object):
             f' postdict={dumps(postdict or "")}'
         )
         # going to sleep
-        sleep(tps1) if fast else sleep(round_sprice(tps1 + tps2 + tps3, self.symbol))
+        yield Backoff(tps1 if fast else round_sprice(tps1 + tps2 + tps3, self.symbol))
 
-        return self._curl_bitmex(
-            path, query, postdict, timeout, verb, rethrow_errors, max_retries
+        return (
+            yield from self._curl_bitmex_flow(
+                path, query, postdict, timeout, verb, rethrow_errors, max_retries
+            )
         )
 
     def change_orderId(self, postdict):
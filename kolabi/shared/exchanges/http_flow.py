@@ -0,0 +1,329 @@
+"""REST request flows shared by the blocking and the async adapter paths.
+
+Purpose: let one adapter request loop (signing, nonce, retries, REST audit)
+run either on a blocking `requests.Session` or on a pooled async client,
+without keeping two copies of the loop.
+Inputs: flows, i.e. generators that yield `HttpCall` (send this request and
+hand me the response) or `Backoff` (wait before the next attempt) and return
+the parsed result.
+Outputs: the flow result, through `run_flow` (blocking) or `run_flow_async`.
+Side effects: network I/O and sleeps, done by the drivers only; the async
+transport keeps one keep-alive connection pool per event loop.
+Important types: `HttpCall`, `Backoff`, `HttpReply`, `AsyncHttpTransport`,
+`AsyncOrderFlows`.
+Role: boundary adapter.
+
+Everything a flow does between two yields runs synchronously, so a nonce or a
+timestamp taken just before `yield HttpCall(...)` is signed and sent in that
+same order on both paths. Transport failures are raised back into the flow at
+the `yield` as `requests` exceptions (the async transport maps aiohttp errors
+onto `Timeout` / `ConnectionError` / `RequestException`), so the adapters keep
+one `except requests.exceptions.RequestException` branch. aiohttp is imported
+on the first async request only; it speaks HTTP/1.1, and connection reuse
+comes from the pooled keep-alive connector.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generator, Mapping, Sequence, TypeVar, Union, cast
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+_T = TypeVar("_T")
+
+FormPayload = Union[Mapping[str, Any], Sequence[tuple[str, Any]]]
+
+
+@dataclass(frozen=True)
+class HttpCall:
+    """One HTTP request yielded by a flow, in `requests.Session.request` terms.
+
+    `prepared` carries a `requests.PreparedRequest` when the adapter signs the
+    prepared URL and body itself (BitMEX); the async transport then replays
+    its method, URL, headers and body byte for byte.
+    """
+
+    method: str
+    url: str
+    params: FormPayload | None = None
+    data: FormPayload | None = None
+    headers: Mapping[str, str] = field(default_factory=dict)
+    timeout: float | None = None
+    prepared: Any = None
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """Pause yielded by a flow between two attempts."""
+
+    seconds: float
+
+
+HttpFlow = Generator[Union[HttpCall, Backoff], Any, _T]
+
+
+class HttpReply:
+    """Response of the async transport, with the `requests.Response` surface
+    the adapter flows read."""
+
+    def __init__(
+        self,
+        *,
+        status_code: int,
+        reason: str,
+        url: str,
+        headers: Mapping[str, str],
+        text: str,
+    ) -> None:
+        self.status_code = status_code
+        self.reason = reason
+        self.url = url
+        self.headers: CaseInsensitiveDict[str] = CaseInsensitiveDict(headers)
+        self.text = text
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        if 400 <= self.status_code < 500:
+            kind = "Client Error"
+        elif 500 <= self.status_code < 600:
+            kind = "Server Error"
+        else:
+            return
+        raise requests.exceptions.HTTPError(
+            f"{self.status_code} {kind}: {self.reason} for url: {self.url}",
+            response=None,
+        )
+
+
+def run_flow(
+    flow: HttpFlow[_T],
+    send: Callable[[HttpCall], Any],
+    *,
+    sleep: Callable[[float], None] | None = None,
+) -> _T:
+    """Drive `flow` with a blocking sender; `Backoff` uses `time.sleep`."""
+
+    reply: Any = None
+    error: BaseException | None = None
+    while True:
+        try:
+            step = flow.send(reply) if error is None else flow.throw(error)
+        except StopIteration as stop:
+            return cast(_T, stop.value)
+        reply, error = None, None
+        if isinstance(step, Backoff):
+            (sleep or time.sleep)(step.seconds)
+            continue
+        try:
+            reply = send(step)
+        except Exception as exc:
+            error = exc
+
+
+async def run_flow_async(flow: HttpFlow[_T], transport: AsyncHttpTransport) -> _T:
+    """Drive `flow` on the running loop; `Backoff` uses `asyncio.sleep`."""
+
+    reply: Any = None
+    error: BaseException | None = None
+    while True:
+        try:
+            step = flow.send(reply) if error is None else flow.throw(error)
+        except StopIteration as stop:
+            return cast(_T, stop.value)
+        reply, error = None, None
+        if isinstance(step, Backoff):
+            await asyncio.sleep(step.seconds)
+            continue
+        try:
+            reply = await transport.send(step)
+        except Exception as exc:
+            error = exc
+
+
+class AsyncHttpTransport:
+    """Pooled keep-alive aiohttp client, rebuilt when the event loop changes."""
+
+    def __init__(
+        self,
+        *,
+        headers: Mapping[str, str] | None = None,
+        max_connections: int = 32,
+        keepalive_seconds: float = 30.0,
+    ) -> None:
+        self.headers = dict(headers or {})
+        self.max_connections = max(1, int(max_connections))
+        self.keepalive_seconds = max(0.0, float(keepalive_seconds))
+        self.requests_sent = 0
+        self._session: Any = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _client(self) -> Any:
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections,
+                    keepalive_timeout=self.keepalive_seconds,
+                ),
+                headers=self.headers,
+            )
+            self._loop = loop
+        return self._session
+
+    async def send(self, call: HttpCall) -> HttpReply:
+        import aiohttp
+        from yarl import URL
+
+        if call.prepared is not None:
+            method = str(call.prepared.method)
+            url = str(call.prepared.url)
+            headers = {
+                key: value
+                for key, value in call.prepared.headers.items()
+                if key.lower() != "content-length"
+            }
+            body = call.prepared.body
+        else:
+            method = call.method.upper()
+            url = _with_query(call.url, call.params)
+            headers = dict(call.headers)
+            body = None
+            if call.data:
+                body = _form_encode(call.data)
+                headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+        timeout = aiohttp.ClientTimeout(total=call.timeout)
+        self.requests_sent += 1
+        try:
+            async with self._client().request(
+                method,
+                URL(url, encoded=True),
+                data=body,
+                headers=headers,
+                timeout=timeout,
+            ) as response:
+                text = await response.text(errors="replace")
+                return HttpReply(
+                    status_code=response.status,
+                    reason=str(response.reason or ""),
+                    url=url,
+                    headers=dict(response.headers),
+                    text=text,
+                )
+        except asyncio.TimeoutError as exc:
+            raise requests.exceptions.Timeout(f"{method} {url}: timed out") from exc
+        except aiohttp.ClientConnectionError as exc:
+            raise requests.exceptions.ConnectionError(str(exc)) from exc
+        except aiohttp.ClientError as exc:
+            raise requests.exceptions.RequestException(str(exc)) from exc
+
+    async def aclose(self) -> None:
+        session, self._session, self._loop = self._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+class AsyncOrderFlows:
+    """Async order surface for adapters that expose their order calls as flows.
+
+    The adapter provides `http` (an `AsyncHttpTransport`, or None when it was
+    given a blocking session or client to use, as tests and benches do),
+    `_send_http` or `_run` for that blocking path, and the `_place_order_flow`, `_amend_order_flow`,
+    `_cancel_order_flow`, `_place_orders_flow` and `_cancel_orders_flow`
+    generators; the blocking methods run the same flows through `run_flow`.
+    """
+
+    http: AsyncHttpTransport | None
+
+    async def place_order_async(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run_async(self._place_order_flow(*args, **kwargs))
+
+    async def amend_order_async(self, order_id: str, **params: Any) -> Any:
+        return await self._run_async(self._amend_order_flow(order_id, **params))
+
+    async def cancel_order_async(self, order_id: str) -> Any:
+        return await self._run_async(self._cancel_order_flow(order_id))
+
+    async def place_orders_async(self, orders: Sequence[Mapping[str, Any]]) -> Any:
+        return await self._run_async(self._place_orders_flow(orders))
+
+    async def cancel_orders_async(self, order_ids: Sequence[str]) -> Any:
+        return await self._run_async(self._cancel_orders_flow(order_ids))
+
+    async def aclose(self) -> None:
+        """Close the async connection pool (the REST audit keeps `close`)."""
+
+        if self.http is not None:
+            await self.http.aclose()
+
+    async def _run_async(self, flow: HttpFlow[_T]) -> _T:
+        if self.http is None:
+            # An injected blocking session keeps its own driver, off the loop.
+            return await asyncio.to_thread(self._run, flow)
+        return await run_flow_async(flow, self.http)
+
+    def _run(self, flow: HttpFlow[_T]) -> _T:
+        return run_flow(flow, self._send_http)
+
+    def _send_http(self, call: HttpCall) -> Any:
+        raise NotImplementedError
+
+    def _place_order_flow(self, *args: Any, **kwargs: Any) -> HttpFlow[Any]:
+        raise NotImplementedError
+
+    def _amend_order_flow(self, order_id: str, **params: Any) -> HttpFlow[Any]:
+        raise NotImplementedError
+
+    def _cancel_order_flow(self, order_id: str) -> HttpFlow[Any]:
+        raise NotImplementedError
+
+    def _place_orders_flow(self, orders: Sequence[Mapping[str, Any]]) -> HttpFlow[Any]:
+        raise NotImplementedError
+
+    def _cancel_orders_flow(self, order_ids: Sequence[str]) -> HttpFlow[Any]:
+        raise NotImplementedError
+
+
+def _encodable_pairs(payload: FormPayload) -> list[tuple[str, Any]]:
+    items = payload.items() if isinstance(payload, Mapping) else payload
+    # Same skipping as requests: `None` values are not sent.
+    return [(str(key), value) for key, value in items if value is not None]
+
+
+def _with_query(url: str, params: FormPayload | None) -> str:
+    if not params:
+        return url
+    query = urlencode(_encodable_pairs(params), doseq=True)
+    if not query:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{query}"
+
+
+def _form_encode(data: FormPayload) -> bytes:
+    return urlencode(_encodable_pairs(data), doseq=True).encode("utf-8")
+
+
+__all__ = [
+    "AsyncHttpTransport",
+    "AsyncOrderFlows",
+    "Backoff",
+    "HttpCall",
+    "HttpFlow",
+    "HttpReply",
+    "run_flow",
+    "run_flow_async",
+]
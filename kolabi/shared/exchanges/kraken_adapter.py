@@ -5,12 +5,14 @@ from __future__ import annotations
 import base64
 import hashlib
 import hmac
+import json
 import logging
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import ROUND_HALF_UP, Decimal
-from typing import Any, Dict, Iterable, Sequence, TypeAlias, cast
+from functools import partial
+from typing import Any, Dict, Iterable, Mapping, Sequence, TypeAlias, cast
 from urllib.parse import urlencode
 from uuid import uuid4
 
@@ -18,22 +20,42 @@ import requests
 from sqlalchemy import select
 from sqlalchemy.orm import Session, sessionmaker
 
-from kolabi.kraken_contract import build_send_order_contract
+from kolabi.kraken_contract import SendOrderContract, build_send_order_contract
 from kolabi.shared.core.models import OrderAck, Position
 from kolabi.shared.core.runtime_types import OrderQty, Price, StopPrice
 from kolabi.shared.core.types import ExchangeABC
+from kolabi.shared.exchanges.http_flow import (
+    AsyncHttpTransport,
+    AsyncOrderFlows,
+    Backoff,
+    HttpCall,
+    HttpFlow,
+    run_flow,
+)
+from kolabi.shared.exchanges.rest_audit import RestAuditSink
+from kolabi.shared.instrument_cache import (
+    DB_SOURCE,
+    REST_SOURCE,
+    InstrumentMetadataCache,
+    InstrumentRecord,
+    load_instrument_record,
+)
 from kolabi.shared.kraken_futures import (
     kraken_futures_audit_db_url,
     kraken_futures_environment,
 )
+from kolabi.shared.order_cache import (
+    DEFAULT_ORDER_CACHE_SIZE,
+    OrderRequestCache,
+    PersistedOrderReader,
+    order_status_is_terminal,
+)
 from kolabi.shared.persistence import (
     Base,
     ExchangeFill,
     ExchangeInstrument,
     ExchangeOrder,
-    ExchangeRestCall,
     create_persistence_engine,
-    prune_exchange_rest_calls,
 )
 from kolabi.shared.pruning import DEFAULT_PRUNING
 from kolabi.tree.account import sign_rest_auth
@@ -77,9 +99,13 @@ def _default_audit_db_url(
     return kraken_futures_audit_db_url(environment, account_scope)
 
 
-class KrakenFuturesAdapter(ExchangeABC):
+class KrakenFuturesAdapter(AsyncOrderFlows, ExchangeABC):
     """Adapter exposing a BitMEX-like surface to the legacy runtime."""
 
+    # The account feeder persists this adapter's private orders and NOTIFYs
+    # `kola_private`, so `live_trigger_orders_db` can stand in for REST reads.
+    private_orders_in_db = True
+
     def __init__(
         self,
         api_key: str,
@@ -100,13 +126,16 @@ class KrakenFuturesAdapter(ExchangeABC):
         timeout: float = 10.0,
         postOnly: bool = False,
         session: requests.Session | None = None,
+        instrument_cache: InstrumentMetadataCache | None = None,
         **_ignored: Any,
     ) -> None:
         super().__init__(api_key, api_secret, base_url, symbol)
         self.environment = environment
+        self.instrument_cache = instrument_cache or InstrumentMetadataCache()
         self.timeout = timeout
         self.post_only = postOnly
         self.session = session or requests.Session()
+        self.http = AsyncHttpTransport() if session is None else None
         self.rest_url = base_url.rstrip("/") + "/derivatives/api/v3"
         env_cfg = kraken_futures_environment(environment)
         self.account_db_url = account_db_url or env_cfg.private_db_url
@@ -144,8 +173,17 @@ class KrakenFuturesAdapter(ExchangeABC):
             expire_on_commit=False,
             class_=Session,
         )
-        self.rest_audit_errors: list[str] = []
-        self._last_rest_audit_prune_monotonic = 0.0
+        self.rest_audit = RestAuditSink(
+            self._audit_sessionmaker,
+            exchange="kraken",
+            environment=self.environment,
+            market_type="futures",
+            account_scope=self.account_scope,
+            retention_minutes=self.rest_audit_retention_minutes,
+            retention_limit=self.rest_audit_retention_limit,
+            maintenance_seconds=self.rest_audit_maintenance_seconds,
+        )
+        self.rest_audit_errors = self.rest_audit.errors
         Base.metadata.create_all(self._engine)
         Base.metadata.create_all(self._audit_engine)
         Base.metadata.create_all(self._public_engine)
@@ -181,6 +219,32 @@ class KrakenFuturesAdapter(ExchangeABC):
         auth: bool = False,
         retry_attempts: int = 3,
     ) -> Dict[str, Any]:
+        return run_flow(
+            self._request_flow(
+                method, path, params=params, auth=auth, retry_attempts=retry_attempts
+            ),
+            self._send_http,
+        )
+
+    def _send_http(self, call: HttpCall) -> Any:
+        return self.session.request(
+            method=call.method,
+            url=call.url,
+            params=call.params,
+            data=call.data,
+            headers=dict(call.headers),
+            timeout=call.timeout,
+        )
+
+    def _request_flow(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Sequence[tuple[str, Any]] | Dict[str, Any] | None = None,
+        auth: bool = False,
+        retry_attempts: int = 3,
+    ) -> HttpFlow[Dict[str, Any]]:
         url = f"{self.rest_url}{path}"
         raw_params = (
             list(params.items()) if isinstance(params, dict) else list(params or [])
@@ -209,7 +273,7 @@ class KrakenFuturesAdapter(ExchangeABC):
                     "Nonce": nonce,
                 }
             try:
-                response = self.session.request(
+                response = yield HttpCall(
                     method=method.upper(),
                     url=url,
                     params=payload if method.upper() == "GET" else None,
@@ -222,7 +286,7 @@ class KrakenFuturesAdapter(ExchangeABC):
                     f"Kraken transport error on {path}: {exc.__class__.__name__}: {exc}"
                 )
                 if attempt < max_attempts:
-                    time.sleep(0.5 * attempt)
+                    yield Backoff(0.5 * attempt)
                     last_error = error
                     continue
                 self._record_rest_call(
@@ -244,7 +308,7 @@ class KrakenFuturesAdapter(ExchangeABC):
             if status_code >= 400:
                 error = RuntimeError(f"Kraken HTTP {status_code} on {path}: {data}")
                 if status_code in {502, 503, 504} and attempt < max_attempts:
-                    time.sleep(0.5 * attempt)
+                    yield Backoff(0.5 * attempt)
                     last_error = error
                     continue
                 self._record_rest_call(
@@ -263,7 +327,7 @@ class KrakenFuturesAdapter(ExchangeABC):
             if data.get("result") == "error":
                 error = RuntimeError(str(data))
                 if "nonceBelowThreshold" in str(data) and attempt < max_attempts:
-                    time.sleep(0.25 * attempt)
+                    yield Backoff(0.25 * attempt)
                     last_error = error
                     continue
                 self._record_rest_call(
@@ -330,99 +394,36 @@ class KrakenFuturesAdapter(ExchangeABC):
         ack_status = _map_order_status_from_payload(order_like) if order_like else None
         ack_order_id = endpoint_order_id
         ack_client_order_id = client_order_id
-        with self._audit_sessionmaker() as session:
-            try:
-                session.add(
-                    ExchangeRestCall(
-                        local_uuid=str(uuid4()),
-                        exchange="kraken",
-                        environment=self.environment,
-                        market_type="futures",
-                        account_scope=self.account_scope,
-                        symbol=self.symbol,
-                        method=method.upper(),
-                        path=path,
-                        request_params=request_payload,
-                        attempt_count=attempt_count,
-                        http_status=http_status,
-                        result_kind=result_kind,
-                        response_payload=payload,
-                        error_text=error_text,
-                        client_order_id=client_order_id,
-                        exchange_order_id=exchange_order_id,
-                        endpoint_order_id=endpoint_order_id,
-                        correlation_id=client_order_id or endpoint_order_id or request_order_id,
-                        ack_status=ack_status,
-                        ack_order_id=ack_order_id,
-                        ack_client_order_id=ack_client_order_id,
-                    )
-                )
-                session.commit()
-                self._prune_rest_audit_if_due(session)
-                return
-            except Exception as exc:
-                session.rollback()
-                self._record_rest_audit_failure(
-                    method=method,
-                    path=path,
-                    client_order_id=client_order_id,
-                    endpoint_order_id=endpoint_order_id,
-                    retry=0,
-                    exc=exc,
-                )
-                return
-
-    def _record_rest_audit_failure(
-        self,
-        *,
-        method: str,
-        path: str,
-        client_order_id: str | None,
-        endpoint_order_id: str | None,
-        retry: int,
-        exc: BaseException,
-    ) -> None:
-        error = _compact_error(exc)
-        self.rest_audit_errors.append(
-            (
-                f"method={method.upper()} path={path} "
-                f"clOrdID={client_order_id or '-'} orderID={endpoint_order_id or '-'} "
-                f"retry={retry} error={error}"
-            )
-        )
-        _LOGGER.warning(
-            "rest call audit persistence failed method=%s path=%s clOrdID=%s orderID=%s retry=%s error=%s",
-            method.upper(),
-            path,
-            client_order_id or "-",
-            endpoint_order_id or "-",
-            retry,
-            error,
+        self.rest_audit.submit(
+            {
+                "symbol": self.symbol,
+                "method": method.upper(),
+                "path": path,
+                "request_params": request_payload,
+                "attempt_count": attempt_count,
+                "http_status": http_status,
+                "result_kind": result_kind,
+                "response_payload": payload,
+                "error_text": error_text,
+                "client_order_id": client_order_id,
+                "exchange_order_id": exchange_order_id,
+                "endpoint_order_id": endpoint_order_id,
+                "correlation_id": client_order_id or endpoint_order_id or request_order_id,
+                "ack_status": ack_status,
+                "ack_order_id": ack_order_id,
+                "ack_client_order_id": ack_client_order_id,
+            }
         )
 
-    def _prune_rest_audit_if_due(self, session: Session) -> None:
-        now_monotonic = time.monotonic()
-        if (
-            now_monotonic - self._last_rest_audit_prune_monotonic
-            < self.rest_audit_maintenance_seconds
-        ):
-            return
-        self._last_rest_audit_prune_monotonic = now_monotonic
-        try:
-            prune_exchange_rest_calls(
-                session,
-                exchange="kraken",
-                environment=self.environment,
-                market_type="futures",
-                account_scope=self.account_scope,
-                retention_minutes=self.rest_audit_retention_minutes,
-                retention_limit=self.rest_audit_retention_limit,
-                now=datetime.now(timezone.utc),
-            )
-            session.commit()
-        except Exception as exc:
-            session.rollback()
-            _LOGGER.warning("rest call audit pruning skipped error=%s", _compact_error(exc))
+    def flush_rest_audit(self) -> int:
+        """Write queued REST audit rows now (reports, tests, shutdown)."""
+
+        return self.rest_audit.flush()
+
+    def close(self) -> None:
+        """Drain the REST audit queue and stop its writer."""
+
+        self.rest_audit.stop()
 
     def _ticker(self) -> _Ticker:
         payload = self._request("GET", f"/tickers/{self.symbol}")
@@ -502,44 +503,33 @@ class KrakenFuturesAdapter(ExchangeABC):
                     row.raw_payload = payload
                     row.updated_at = now
             session.commit()
+        self.instrument_cache.invalidate("kraken", self.environment, "futures")
 
     def instrument_rules(self, symbol: str | None = None) -> Dict[str, Any]:
         """Return cached local instrument rules, syncing from Kraken if needed."""
         target_symbol = symbol or self.symbol
-        with self._public_sessionmaker() as session:
-            row = (
-                session.execute(
-                    select(ExchangeInstrument).where(
-                        ExchangeInstrument.exchange == "kraken",
-                        ExchangeInstrument.environment == self.environment,
-                        ExchangeInstrument.market_type == "futures",
-                        ExchangeInstrument.symbol == target_symbol,
-                    )
-                )
-                .scalars()
-                .first()
-            )
-            if row is not None:
-                if row.tick_size is not None:
-                    return {
-                        "symbol": row.symbol,
-                        "tradeable": row.tradeable,
-                        "tickSize": row.tick_size,
-                        "contractSize": row.contract_size,
-                        "minQuantity": row.min_quantity,
-                        "type": row.instrument_type,
-                        **dict(row.raw_payload or {}),
-                    }
-                refreshed = self.validate_symbol(target_symbol)
+        row = self._instrument_record(target_symbol)
+        if row is not None:
+            if row.tick_size is not None:
                 return {
                     "symbol": row.symbol,
                     "tradeable": row.tradeable,
-                    "tickSize": _optional_float(refreshed.get("tickSize")),
+                    "tickSize": row.tick_size,
                     "contractSize": row.contract_size,
                     "minQuantity": row.min_quantity,
                     "type": row.instrument_type,
-                    **dict(refreshed),
+                    **dict(row.raw_payload),
                 }
+            refreshed = self.validate_symbol(target_symbol)
+            return {
+                "symbol": row.symbol,
+                "tradeable": row.tradeable,
+                "tickSize": _optional_float(refreshed.get("tickSize")),
+                "contractSize": row.contract_size,
+                "minQuantity": row.min_quantity,
+                "type": row.instrument_type,
+                **dict(refreshed),
+            }
         instrument = self.validate_symbol(target_symbol)
         return {
             "symbol": str(instrument.get("symbol") or target_symbol),
@@ -577,21 +567,20 @@ class KrakenFuturesAdapter(ExchangeABC):
             return ticker.ask * 1.01
         return ticker.bid * 0.99
 
+    def _instrument_record(self, symbol: str) -> InstrumentRecord | None:
+        """Return the public-DB instrument row through the shared TTL cache."""
+        key = ("kraken", self.environment, "futures", symbol)
+
+        def _load() -> InstrumentRecord | None:
+            with self._public_sessionmaker() as session:
+                return load_instrument_record(session, key)
+
+        return self.instrument_cache.get_or_load(DB_SOURCE, key, _load)
+
     def _cached_tick_size(self) -> float | None:
-        with self._public_sessionmaker() as session:
-            row = (
-                session.execute(
-                    select(ExchangeInstrument.tick_size).where(
-                        ExchangeInstrument.exchange == "kraken",
-                        ExchangeInstrument.environment == self.environment,
-                        ExchangeInstrument.market_type == "futures",
-                        ExchangeInstrument.symbol == self.symbol,
-                    )
-                )
-                .scalars()
-                .first()
-            )
-        return float(row) if row else None
+        row = self._instrument_record(self.symbol)
+        tick_size = None if row is None else row.tick_size
+        return float(tick_size) if tick_size else None
 
     @staticmethod
     def _legacy_ack_from_order(
@@ -682,18 +671,89 @@ class KrakenFuturesAdapter(ExchangeABC):
         text: str | None = None,
         **_opts: Any,
     ) -> Dict[str, Any]:
+        return run_flow(
+            self._place_flow(
+                orderQty,
+                side=side,
+                asBulk=asBulk,
+                ordType=ordType,
+                price=price,
+                stopPx=stopPx,
+                execInst=execInst,
+                clOrdID=clOrdID,
+                text=text,
+                **_opts,
+            ),
+            self._send_http,
+        )
+
+    def _place_flow(
+        self,
+        orderQty: float,
+        *,
+        side: str,
+        asBulk: bool = False,
+        ordType: str = "Limit",
+        price: float | None = None,
+        stopPx: float | None = None,
+        execInst: str = "",
+        clOrdID: str | None = None,
+        text: str | None = None,
+        **_opts: Any,
+    ) -> HttpFlow[Dict[str, Any]]:
         del asBulk
         client_order_id = clOrdID or _generated_client_order_id()
-        fallback_market_price = None
-        contract = build_send_order_contract(
+        contract = self._send_order_contract(
+            orderQty,
+            side=side,
+            ordType=ordType,
+            price=price,
+            stopPx=stopPx,
+            execInst=execInst,
+            clOrdID=client_order_id,
+            text=text,
+            **_opts,
+        )
+        payload = yield from self._request_flow(
+            "POST",
+            "/sendorder",
+            params=contract.as_params(),
+            auth=True,
+        )
+        return self._legacy_ack_from_sent(
+            _extract_order_like(payload),
+            {
+                "side": side,
+                "orderQty": orderQty,
+                "price": price,
+                "stopPx": stopPx,
+                "execInst": execInst,
+                "clOrdID": client_order_id,
+            },
+        )
+
+    def _send_order_contract(
+        self,
+        orderQty: float,
+        *,
+        side: str,
+        ordType: str = "Limit",
+        price: float | None = None,
+        stopPx: float | None = None,
+        execInst: str = "",
+        clOrdID: str | None = None,
+        text: str | None = None,
+        **_opts: Any,
+    ) -> SendOrderContract:
+        return build_send_order_contract(
             ord_type=ordType,
             symbol=self.symbol,
             side=side,
             size=orderQty,
             price=price,
             stop_price=stopPx,
-            fallback_market_price=fallback_market_price,
-            cli_ord_id=client_order_id,
+            fallback_market_price=None,
+            cli_ord_id=clOrdID,
             reduce_only=_has_exec_flag(execInst, "ReduceOnly"),
             post_only=self.post_only
             or _has_exec_flag(execInst, "ParticipateDoNotInitiate"),
@@ -702,24 +762,136 @@ class KrakenFuturesAdapter(ExchangeABC):
             trailing_stop_deviation_unit=_opts.get("trailingStopDeviationUnit"),
             tag=text,
         )
-        payload = self._request(
+
+    def _legacy_ack_from_sent(
+        self, order: Dict[str, Any], sent: Mapping[str, Any]
+    ) -> Dict[str, Any]:
+        merged = _merge_order_payload_defaults(
+            order,
+            side=sent["side"],
+            size=sent["orderQty"],
+            price=sent.get("price"),
+            stop_price=sent.get("stopPx"),
+            reduce_only=_has_exec_flag(sent.get("execInst") or "", "ReduceOnly"),
+            cli_ord_id=sent.get("clOrdID"),
+        )
+        return self._legacy_ack_from_order(merged)
+
+    def place_orders(
+        self, orders: Sequence[Mapping[str, Any]]
+    ) -> list[OrderAck | Exception]:
+        """Send every order in one `/batchorder` call, acks matched by order_tag."""
+        return run_flow(self._place_orders_flow(orders), self._send_http)
+
+    def _place_orders_flow(
+        self, orders: Sequence[Mapping[str, Any]]
+    ) -> HttpFlow[list[OrderAck | Exception]]:
+        results: list[OrderAck | Exception | None] = []
+        instructions: list[Dict[str, Any]] = []
+        sent: dict[str, tuple[int, Dict[str, Any]]] = {}
+        for index, order in enumerate(orders):
+            try:
+                kwargs = self._place_kwargs(**order)
+                kwargs["clOrdID"] = kwargs.get("clOrdID") or _generated_client_order_id()
+                contract = self._send_order_contract(**kwargs)
+            except Exception as exc:
+                results.append(exc)
+                continue
+            tag = str(index)
+            sent[tag] = (index, kwargs)
+            results.append(None)
+            instructions.append(
+                {
+                    "order": "send",
+                    "order_tag": tag,
+                    **{
+                        key: value
+                        for key, value in contract.as_params()
+                        if value is not None
+                    },
+                }
+            )
+        if not instructions:
+            return cast(list[OrderAck | Exception], results)
+        statuses = yield from self._batch_order_flow(instructions)
+        by_tag = {
+            str(status.get("order_tag")): status
+            for status in statuses
+            if status.get("order_tag") is not None
+        }
+        for tag, (index, kwargs) in sent.items():
+            status = by_tag.get(tag)
+            if status is None:
+                results[index] = RuntimeError(
+                    f"Kraken batchorder returned no status for order_tag={tag} "
+                    f"cliOrdId={kwargs['clOrdID']}"
+                )
+                continue
+            results[index] = _ack_from_legacy(self._legacy_ack_from_sent(status, kwargs))
+        return cast(list[OrderAck | Exception], results)
+
+    def cancel_orders(self, order_ids: Sequence[str]) -> list[OrderAck | Exception]:
+        """Cancel every order in one `/batchorder` call."""
+        return run_flow(self._cancel_orders_flow(order_ids), self._send_http)
+
+    def _cancel_orders_flow(
+        self, order_ids: Sequence[str]
+    ) -> HttpFlow[list[OrderAck | Exception]]:
+        identities = [str(order_id) for order_id in order_ids]
+        if not identities:
+            return []
+        statuses = yield from self._batch_order_flow(
+            [{"order": "cancel", "order_id": identity} for identity in identities]
+        )
+        cancel_statuses = [
+            status for status in statuses if status.get("order_tag") is None
+        ]
+        by_order_id = {
+            str(status.get("order_id")): status
+            for status in cancel_statuses
+            if status.get("order_id") is not None
+        }
+        results: list[OrderAck | Exception] = []
+        for position, identity in enumerate(identities):
+            status = by_order_id.get(identity)
+            if status is None and len(cancel_statuses) == len(identities):
+                # Les statuts sans order_id suivent l'ordre des instructions.
+                status = cancel_statuses[position]
+            if status is None:
+                results.append(
+                    RuntimeError(
+                        f"Kraken batchorder returned no status for order_id={identity}"
+                    )
+                )
+                continue
+            ack = dict(status)
+            ack.setdefault("order_id", identity)
+            ack.setdefault("cli_ord_id", identity)
+            results.append(
+                _ack_from_legacy(self._legacy_ack_from_order(ack, exec_type="Canceled"))
+            )
+        return results
+
+    def _batch_order_flow(
+        self, instructions: list[Dict[str, Any]]
+    ) -> HttpFlow[list[Dict[str, Any]]]:
+        payload = yield from self._request_flow(
             "POST",
-            "/sendorder",
-            params=contract.as_params(),
+            "/batchorder",
+            params=[("json", json.dumps({"batchOrder": instructions}))],
             auth=True,
         )
-        order = _merge_order_payload_defaults(
-            _extract_order_like(payload),
-            side=side,
-            size=orderQty,
-            price=price if price is not None else fallback_market_price,
-            stop_price=stopPx,
-            reduce_only=_has_exec_flag(execInst, "ReduceOnly"),
-            cli_ord_id=client_order_id,
-        )
-        return self._legacy_ack_from_order(order)
+        statuses = payload.get("batchStatus")
+        if not isinstance(statuses, list):
+            raise RuntimeError(f"Kraken batchorder without batchStatus: {payload}")
+        return [status for status in statuses if isinstance(status, dict)]
 
     def amend(self, order: Dict[str, Any] | str, **params: Any) -> Dict[str, Any]:
+        return run_flow(self._amend_flow(order, **params), self._send_http)
+
+    def _amend_flow(
+        self, order: Dict[str, Any] | str, **params: Any
+    ) -> HttpFlow[Dict[str, Any]]:
         order_id = _extract_order_id(order)
         payload = [
             ("order_id", order_id),
@@ -729,7 +901,9 @@ class KrakenFuturesAdapter(ExchangeABC):
             ("size", params.get("orderQty")),
             ("cliOrdId", params.get("clOrdID")),
         ]
-        response = self._request("POST", "/editorder", params=payload, auth=True)
+        response = yield from self._request_flow(
+            "POST", "/editorder", params=payload, auth=True
+        )
         order_payload = _extract_order_like(response)
         if params.get("price") is not None and not any(
             key in order_payload for key in ("limit_price", "limitPrice", "price")
@@ -759,7 +933,10 @@ class KrakenFuturesAdapter(ExchangeABC):
                 if isinstance(reply, dict):
                     replies.append(reply)
             return replies
-        payload = self._request(
+        return run_flow(self._cancel_flow(order), self._send_http)
+
+    def _cancel_flow(self, order: str) -> HttpFlow[Dict[str, Any]]:
+        payload = yield from self._request_flow(
             "POST",
             "/cancelorder",
             params=[("order_id", order)],
@@ -894,6 +1071,34 @@ class KrakenFuturesAdapter(ExchangeABC):
         type_: str = "LIMIT",
         **params: Any,
     ) -> OrderAck:
+        return run_flow(
+            self._place_order_flow(side, orderQty, price, stopPx, type_, **params),
+            self._send_http,
+        )
+
+    def _place_order_flow(
+        self,
+        side: str,
+        orderQty: OrderQty | float,
+        price: Price | float | None = None,
+        stopPx: StopPrice | float | None = None,
+        type_: str = "LIMIT",
+        **params: Any,
+    ) -> HttpFlow[OrderAck]:
+        response = yield from self._place_flow(
+            **self._place_kwargs(side, orderQty, price, stopPx, type_, **params)
+        )
+        return _ack_from_legacy(response)
+
+    def _place_kwargs(
+        self,
+        side: str,
+        orderQty: OrderQty | float,
+        price: Price | float | None = None,
+        stopPx: StopPrice | float | None = None,
+        type_: str = "LIMIT",
+        **params: Any,
+    ) -> Dict[str, Any]:
         requested_exec_inst = str(params.pop("execInst", "") or "")
         reduce_only = bool(params.pop("reduceOnly", False))
         exec_flags = [flag for flag in requested_exec_inst.split(",") if flag]
@@ -901,33 +1106,34 @@ class KrakenFuturesAdapter(ExchangeABC):
             exec_flags.append("ReduceOnly")
         exec_inst = ",".join(exec_flags)
         tick_size = self._cached_tick_size()
-        rounded_price = _round_price_to_tick(price, tick_size)
-        rounded_stop = _round_price_to_tick(stopPx, tick_size)
-        response = self.place(
-            orderQty=float(orderQty),
-            side=side,
-            ordType=type_,
-            price=rounded_price,
-            stopPx=rounded_stop,
-            execInst=exec_inst,
+        return {
+            "orderQty": float(orderQty),
+            "side": side,
+            "ordType": type_,
+            "price": _round_price_to_tick(price, tick_size),
+            "stopPx": _round_price_to_tick(stopPx, tick_size),
+            "execInst": exec_inst,
             **params,
-        )
-        return _ack_from_legacy(response)
+        }
 
     def amend_order(self, order_id: str, **params: float) -> OrderAck:
+        return run_flow(self._amend_order_flow(order_id, **params), self._send_http)
+
+    def _amend_order_flow(self, order_id: str, **params: Any) -> HttpFlow[OrderAck]:
         tick_size = self._cached_tick_size()
         rounded_params: Dict[str, Any] = dict(params)
         if "price" in rounded_params:
             rounded_params["price"] = _round_price_to_tick(rounded_params.get("price"), tick_size)
         if "stopPx" in rounded_params:
             rounded_params["stopPx"] = _round_price_to_tick(rounded_params.get("stopPx"), tick_size)
-        response = self.amend({"orderID": order_id}, **rounded_params)
+        response = yield from self._amend_flow({"orderID": order_id}, **rounded_params)
         return _ack_from_legacy(response)
 
     def cancel_order(self, order_id: str) -> OrderAck:
-        response = self.cancel(order_id)
-        if isinstance(response, list):
-            response = response[0]
+        return run_flow(self._cancel_order_flow(order_id), self._send_http)
+
+    def _cancel_order_flow(self, order_id: str) -> HttpFlow[OrderAck]:
+        response = yield from self._cancel_flow(order_id)
         return _ack_from_legacy(response)
 
     def get_position(self) -> Position:
@@ -1252,7 +1458,7 @@ def _should_persist_rest_call(*, method: str, path: str) -> bool:
     """Persist only trading REST calls needed for order-ack forensics."""
     if method.upper() != "POST":
         return False
-    return path in {"/sendorder", "/editorder", "/cancelorder"}
+    return path in {"/sendorder", "/editorder", "/cancelorder", "/batchorder"}
 
 
 def _effective_retry_attempts(
@@ -1284,13 +1490,6 @@ def _generated_client_order_id() -> str:
     return f"k-{uuid4().hex}"
 
 
-def _compact_error(exc: BaseException) -> str:
-    message = str(exc).strip().replace("\n", " ")
-    if len(message) <= 280:
-        return message
-    return f"{message[:277]}..."
-
-
 def optional_str(value: object) -> str | None:
     if value in (None, ""):
         return None
@@ -1526,10 +1725,13 @@ class KrakenSpotAdapter(ExchangeABC):
             DEFAULT_PRUNING.rest_audit.maintenance_seconds
         ),
         session: requests.Session | None = None,
+        instrument_cache: InstrumentMetadataCache | None = None,
+        order_cache_size: int = DEFAULT_ORDER_CACHE_SIZE,
         **_ignored: Any,
     ) -> None:
         super().__init__(api_key, api_secret, base_url.rstrip("/"), symbol)
         self.environment = environment
+        self.instrument_cache = instrument_cache or InstrumentMetadataCache()
         self.timeout = float(timeout)
         self.market_type = market_type or self.market_type
         self.leverage = None if leverage in (None, "") else str(leverage)
@@ -1542,8 +1744,6 @@ class KrakenSpotAdapter(ExchangeABC):
             1.0,
             float(rest_audit_maintenance_seconds),
         )
-        self.rest_audit_errors: list[str] = []
-        self._last_rest_audit_prune_monotonic = 0.0
         self._audit_engine = (
             create_persistence_engine(audit_db_url) if audit_db_url else None
         )
@@ -1556,10 +1756,41 @@ class KrakenSpotAdapter(ExchangeABC):
             if self._audit_engine is not None
             else None
         )
+        self.rest_audit = (
+            RestAuditSink(
+                self._audit_sessionmaker,
+                exchange="kraken",
+                environment=self.environment,
+                market_type=self.market_type,
+                account_scope=self.account_scope,
+                retention_minutes=self.rest_audit_retention_minutes,
+                retention_limit=self.rest_audit_retention_limit,
+                maintenance_seconds=self.rest_audit_maintenance_seconds,
+            )
+            if self._audit_sessionmaker is not None
+            else None
+        )
+        self.rest_audit_errors: list[str] = (
+            self.rest_audit.errors if self.rest_audit is not None else []
+        )
         if self._audit_engine is not None:
             Base.metadata.create_all(self._audit_engine)
-        self._orders_by_order_id: dict[str, _KrakenSpotOrderRequest] = {}
-        self._orders_by_client_id: dict[str, _KrakenSpotOrderRequest] = {}
+        # No private order feeder writes Kraken Spot orders: a cache miss is
+        # rehydrated from the AddOrder audit row only.
+        self.persisted_orders = PersistedOrderReader(
+            exchange="kraken",
+            environment=self.environment,
+            market_type=self.market_type,
+            account_scope=self.account_scope,
+            symbol=self.symbol,
+            place_paths=("/0/private/AddOrder",),
+            cancel_calls=(("POST", "/0/private/CancelOrder"),),
+            audit_sessionmaker=self._audit_sessionmaker,
+        )
+        self.order_cache: OrderRequestCache[_KrakenSpotOrderRequest] = OrderRequestCache(
+            max_entries=order_cache_size,
+            rehydrate=self._rehydrate_order,
+        )
 
     def _request(
         self,
@@ -1662,7 +1893,7 @@ class KrakenSpotAdapter(ExchangeABC):
         result_kind: str,
         error_text: str | None,
     ) -> None:
-        if self._audit_sessionmaker is None:
+        if self.rest_audit is None:
             return
         if not _should_persist_spot_rest_call(method=method, path=path):
             return
@@ -1674,97 +1905,48 @@ class KrakenSpotAdapter(ExchangeABC):
             response_payload=payload,
         )
         endpoint_order_id = exchange_order_id or client_order_id
-        with self._audit_sessionmaker() as session:
-            try:
-                session.add(
-                    ExchangeRestCall(
-                        local_uuid=str(uuid4()),
-                        exchange="kraken",
-                        environment=self.environment,
-                        market_type=self.market_type,
-                        account_scope=self.account_scope,
-                        symbol=self.symbol,
-                        method=method.upper(),
-                        path=path,
-                        request_params=request_payload,
-                        attempt_count=attempt_count,
-                        http_status=http_status,
-                        result_kind=result_kind,
-                        response_payload=payload,
-                        error_text=error_text,
-                        client_order_id=client_order_id,
-                        exchange_order_id=exchange_order_id,
-                        endpoint_order_id=endpoint_order_id,
-                        correlation_id=client_order_id or exchange_order_id,
-                        ack_status=_spot_rest_ack_status(path, result_kind),
-                        ack_order_id=exchange_order_id,
-                        ack_client_order_id=client_order_id,
-                    )
-                )
-                session.commit()
-                self._prune_rest_audit_if_due(session)
-            except Exception as exc:
-                session.rollback()
-                self._record_rest_audit_failure(
-                    method=method,
-                    path=path,
-                    client_order_id=client_order_id,
-                    endpoint_order_id=endpoint_order_id,
-                    exc=exc,
-                )
-
-    def _record_rest_audit_failure(
-        self,
-        *,
-        method: str,
-        path: str,
-        client_order_id: str | None,
-        endpoint_order_id: str | None,
-        exc: BaseException,
-    ) -> None:
-        error = _compact_error(exc)
-        self.rest_audit_errors.append(
-            (
-                f"method={method.upper()} path={path} "
-                f"clOrdID={client_order_id or '-'} orderID={endpoint_order_id or '-'} "
-                f"error={error}"
-            )
-        )
-        _LOGGER.warning(
-            "rest call audit persistence failed method=%s path=%s clOrdID=%s orderID=%s error=%s",
-            method.upper(),
-            path,
-            client_order_id or "-",
-            endpoint_order_id or "-",
-            error,
+        self.rest_audit.submit(
+            {
+                "symbol": self.symbol,
+                "method": method.upper(),
+                "path": path,
+                "request_params": request_payload,
+                "attempt_count": attempt_count,
+                "http_status": http_status,
+                "result_kind": result_kind,
+                "response_payload": payload,
+                "error_text": error_text,
+                "client_order_id": client_order_id,
+                "exchange_order_id": exchange_order_id,
+                "endpoint_order_id": endpoint_order_id,
+                "correlation_id": client_order_id or exchange_order_id,
+                "ack_status": _spot_rest_ack_status(path, result_kind),
+                "ack_order_id": exchange_order_id,
+                "ack_client_order_id": client_order_id,
+            }
         )
 
-    def _prune_rest_audit_if_due(self, session: Session) -> None:
-        now_monotonic = time.monotonic()
-        if (
-            now_monotonic - self._last_rest_audit_prune_monotonic
-            < self.rest_audit_maintenance_seconds
-        ):
-            return
-        self._last_rest_audit_prune_monotonic = now_monotonic
-        try:
-            prune_exchange_rest_calls(
-                session,
-                exchange="kraken",
-                environment=self.environment,
-                market_type=self.market_type,
-                account_scope=self.account_scope,
-                retention_minutes=self.rest_audit_retention_minutes,
-                retention_limit=self.rest_audit_retention_limit,
-                now=datetime.now(timezone.utc),
-            )
-            session.commit()
-        except Exception as exc:
-            session.rollback()
-            _LOGGER.warning("rest call audit pruning skipped error=%s", _compact_error(exc))
+    def flush_rest_audit(self) -> int:
+        """Write queued REST audit rows now (reports, tests, shutdown)."""
+
+        return self.rest_audit.flush() if self.rest_audit is not None else 0
+
+    def close(self) -> None:
+        """Drain the REST audit queue and stop its writer."""
+
+        if self.rest_audit is not None:
+            self.rest_audit.stop()
 
     def instrument_rules(self, symbol: str | None = None) -> dict[str, object]:
         target_symbol = symbol or self.symbol
+        rules = self.instrument_cache.get_or_load(
+            REST_SOURCE,
+            ("kraken", self.environment, self.market_type, target_symbol),
+            partial(self._fetch_instrument_rules, target_symbol),
+        )
+        return dict(rules or {})
+
+    def _fetch_instrument_rules(self, target_symbol: str) -> dict[str, object]:
         payload = self._request(
             "GET",
             "/0/public/AssetPairs",
@@ -1907,7 +2089,7 @@ class KrakenSpotAdapter(ExchangeABC):
         cached = self._lookup_cached_order(order_id, params.get("clOrdID"))
         if cached is None:
             raise ValueError(
-                "Kraken Spot amend requires a cached original order from this process; "
+                "Kraken Spot amend requires the original order in memory or the audit; "
                 f"order_id={order_id}"
             )
         self.cancel_order(order_id)
@@ -2021,26 +2203,46 @@ class KrakenSpotAdapter(ExchangeABC):
         order_id: str,
         client_order_id: object | None = None,
     ) -> _KrakenSpotOrderRequest | None:
-        if order_id in self._orders_by_order_id:
-            return self._orders_by_order_id[order_id]
-        if order_id in self._orders_by_client_id:
-            return self._orders_by_client_id[order_id]
-        if client_order_id is not None and str(client_order_id) in self._orders_by_client_id:
-            return self._orders_by_client_id[str(client_order_id)]
-        return None
+        return self.order_cache.get(order_id, client_order_id)
 
     def _cache_order(self, ack: OrderAck, request: _KrakenSpotOrderRequest) -> None:
-        if ack.order_id:
-            self._orders_by_order_id[str(ack.order_id)] = request
-        if request.client_order_id:
-            self._orders_by_client_id[request.client_order_id] = request
+        if order_status_is_terminal(ack.status):
+            self._forget_order(str(ack.order_id or request.client_order_id or ""))
+            return
+        self.order_cache.put((ack.order_id, request.client_order_id), request)
 
     def _forget_order(self, identity: str) -> None:
-        cached = self._orders_by_order_id.pop(identity, None)
-        if cached is not None and cached.client_order_id:
-            self._orders_by_client_id.pop(cached.client_order_id, None)
-            return
-        self._orders_by_client_id.pop(identity, None)
+        self.order_cache.forget(identity)
+
+    def _rehydrate_order(
+        self, identity: str
+    ) -> tuple[_KrakenSpotOrderRequest, tuple[str, ...]] | None:
+        persisted = self.persisted_orders.lookup(identity)
+        if persisted is None or persisted.terminal or not persisted.request_params:
+            return None
+        params = persisted.request_params
+        kraken_type = str(params.get("ordertype") or "")
+        if not kraken_type or not params.get("type"):
+            return None
+        price = _optional_float(params.get("price"))
+        # AddOrder sends the trigger as `price` and the stop limit as `price2`
+        stop_price = price if kraken_type.startswith("stop-loss") else None
+        if kraken_type == "stop-loss":
+            price = None
+        elif kraken_type == "stop-loss-limit":
+            price = _optional_float(params.get("price2"))
+        request = _KrakenSpotOrderRequest(
+            side=str(params["type"]).lower(),
+            quantity=float(params["volume"]),
+            kolabi_type=kraken_type,
+            kraken_type=kraken_type,
+            price=price,
+            stop_price=stop_price,
+            client_order_id=optional_str(params.get("cl_ord_id"))
+            or persisted.client_order_id,
+            leverage=optional_str(params.get("leverage")),
+        )
+        return request, persisted.identities
 
 
 class KrakenMarginAdapter(KrakenSpotAdapter):
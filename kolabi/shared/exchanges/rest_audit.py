@@ -0,0 +1,343 @@
+"""Write-behind sink for exchange REST call audit rows.
+
+Purpose: keep `exchange_rest_calls` inserts and their retention off the order
+placement path of the exchange adapters.
+Inputs: per-call column values handed over by an adapter after each trading
+REST call.
+Outputs: `exchange_rest_calls` rows written in multi-row INSERTs and
+`RestAuditStats` counters.
+Side effects: one lazily started worker thread per sink, a bounded queue,
+PostgreSQL writes and periodic retention deletes.
+Important types: `RestAuditSink`, `RestAuditStats`.
+Role: boundary adapter.
+
+`submit` only stamps the row and does a `put_nowait`; it never opens a
+session. The worker drains the queue in batches, commits them, and runs the
+time/count retention every `maintenance_seconds` (first run one interval after
+the sink is built) in its own transaction; `maintain` runs it on demand. A full
+queue or a failed batch is counted, logged and appended to `errors`, which the
+adapters expose as `rest_audit_errors`. `stop` (also run at interpreter exit)
+drains what is still queued.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import weakref
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from time import monotonic, sleep
+from typing import Any, Callable
+from uuid import uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from kolabi.shared.persistence import ExchangeRestCall, prune_exchange_rest_calls
+
+_LOGGER = logging.getLogger("kola")
+_LIVE_SINKS: weakref.WeakSet[RestAuditSink] = weakref.WeakSet()
+
+
+@dataclass(frozen=True)
+class RestAuditStats:
+    """Counters exposed by a sink for status lines and alerts."""
+
+    submitted: int
+    dropped: int
+    written: int
+    failed: int
+    flushes: int
+    pruned: int
+    queue_depth: int
+    max_queue_depth: int
+
+
+@dataclass
+class _RestAuditCounters:
+    submitted: int = 0
+    dropped: int = 0
+    written: int = 0
+    failed: int = 0
+    flushes: int = 0
+    pruned: int = 0
+    max_queue_depth: int = 0
+    unwritten: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class RestAuditSink:
+    """Bounded queue plus batch writer for one adapter audit lane."""
+
+    def __init__(
+        self,
+        sessionmaker: Callable[[], Session],
+        *,
+        exchange: str,
+        environment: str,
+        market_type: str,
+        account_scope: str,
+        retention_minutes: int,
+        retention_limit: int,
+        maintenance_seconds: float,
+        max_queue: int = 10_000,
+        batch_size: int = 200,
+        flush_seconds: float = 0.05,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._sessionmaker = sessionmaker
+        self.exchange = exchange
+        self.environment = environment
+        self.market_type = market_type
+        self.account_scope = account_scope
+        self.retention_minutes = retention_minutes
+        self.retention_limit = retention_limit
+        self.maintenance_seconds = max(1.0, float(maintenance_seconds))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_seconds = max(0.0, float(flush_seconds))
+        self.logger = logger or _LOGGER
+        self.errors: list[str] = []
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(
+            maxsize=max(1, int(max_queue))
+        )
+        self._counters = _RestAuditCounters()
+        self._pending: list[dict[str, Any]] = []
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._last_flush_at = monotonic()
+        self._next_maintenance_at = monotonic() + self.maintenance_seconds
+        _LIVE_SINKS.add(self)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, values: dict[str, Any]) -> bool:
+        """Queue one call's columns; never blocks and never touches the DB."""
+
+        row = {
+            "local_uuid": str(uuid4()),
+            "exchange": self.exchange,
+            "environment": self.environment,
+            "market_type": self.market_type,
+            "account_scope": self.account_scope,
+            "created_at": datetime.now(timezone.utc),
+            **values,
+        }
+        if not self.running:
+            self.start()
+        with self._counters.lock:
+            self._counters.unwritten += 1
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._counters.lock:
+                self._counters.unwritten -= 1
+                self._counters.dropped += 1
+            self._record_failure(row, "audit queue full", kind="dropped")
+            return False
+        depth = self._queue.qsize()
+        with self._counters.lock:
+            self._counters.submitted += 1
+            if depth > self._counters.max_queue_depth:
+                self._counters.max_queue_depth = depth
+        return True
+
+    def stats(self) -> RestAuditStats:
+        with self._counters.lock:
+            return RestAuditStats(
+                submitted=self._counters.submitted,
+                dropped=self._counters.dropped,
+                written=self._counters.written,
+                failed=self._counters.failed,
+                flushes=self._counters.flushes,
+                pruned=self._counters.pruned,
+                queue_depth=self._queue.qsize(),
+                max_queue_depth=self._counters.max_queue_depth,
+            )
+
+    def start(self) -> None:
+        """Start the worker thread if needed."""
+
+        with self._start_lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"rest-audit-{self.exchange}-{self.market_type}",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker after writing everything still queued."""
+
+        thread = self._thread
+        self._stop.set()
+        if thread is not None and thread.is_alive():
+            # Wakes a worker blocked on `get`; a full queue means it is busy anyway.
+            with suppress(queue.Full):
+                self._queue.put_nowait(None)
+            thread.join(timeout=timeout)
+            if thread.is_alive():
+                self.logger.warning("rest audit worker still busy after %ss", timeout)
+        self._thread = None
+        self.flush()
+
+    def flush(self, timeout: float = 5.0) -> int:
+        """Write every row submitted so far; return the number of rows written."""
+
+        deadline = monotonic() + timeout
+        written = 0
+        while True:
+            with self._write_lock:
+                self._drain_nowait()
+                written += self._write_pending()
+            with self._counters.lock:
+                # The worker may hold one row between `get` and `_write_lock`.
+                if self._counters.unwritten == 0 or monotonic() >= deadline:
+                    return written
+            sleep(0.001)
+
+    def maintain(self, now: datetime | None = None) -> int:
+        """Apply time/count retention to this lane; return the deleted row count."""
+
+        self._next_maintenance_at = monotonic() + self.maintenance_seconds
+        with self._sessionmaker() as session:
+            try:
+                result = prune_exchange_rest_calls(
+                    session,
+                    exchange=self.exchange,
+                    environment=self.environment,
+                    market_type=self.market_type,
+                    account_scope=self.account_scope,
+                    retention_minutes=self.retention_minutes,
+                    retention_limit=self.retention_limit,
+                    now=now or datetime.now(timezone.utc),
+                )
+                session.commit()
+            except Exception as exc:
+                session.rollback()
+                self.logger.warning(
+                    "rest call audit pruning skipped error=%s",
+                    _compact_error(exc),
+                )
+                return 0
+        with self._counters.lock:
+            self._counters.pruned += result.deleted_rows
+        return result.deleted_rows
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get(timeout=self._wait_seconds())
+            except queue.Empty:
+                item = None
+            if self._stop.is_set():
+                # `stop` drains and writes the rest, `item` included.
+                if item is not None:
+                    with self._write_lock:
+                        self._pending.append(item)
+                return
+            with self._write_lock:
+                if item is not None:
+                    self._pending.append(item)
+                    self._drain_nowait(limit=self.batch_size)
+                if self._flush_is_due():
+                    self._write_pending()
+            if monotonic() >= self._next_maintenance_at:
+                self.maintain()
+
+    def _wait_seconds(self) -> float:
+        now = monotonic()
+        wait = self._next_maintenance_at - now
+        if self._pending:
+            wait = min(wait, self.flush_seconds - (now - self._last_flush_at))
+        return max(0.01, wait)
+
+    def _drain_nowait(self, limit: int | None = None) -> None:
+        drained = 0
+        while limit is None or drained < limit:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                self._pending.append(item)
+            drained += 1
+
+    def _flush_is_due(self) -> bool:
+        if not self._pending:
+            self._last_flush_at = monotonic()
+            return False
+        if len(self._pending) >= self.batch_size:
+            return True
+        return monotonic() - self._last_flush_at >= self.flush_seconds
+
+    def _write_pending(self) -> int:
+        rows = self._pending
+        self._pending = []
+        self._last_flush_at = monotonic()
+        if not rows:
+            return 0
+        with self._sessionmaker() as session:
+            try:
+                session.execute(insert(ExchangeRestCall), rows)
+                session.commit()
+            except Exception as exc:
+                session.rollback()
+                with self._counters.lock:
+                    self._counters.failed += len(rows)
+                    self._counters.unwritten -= len(rows)
+                error = _compact_error(exc)
+                for row in rows:
+                    self._record_failure(row, error, kind="failed")
+                return 0
+        with self._counters.lock:
+            self._counters.written += len(rows)
+            self._counters.unwritten -= len(rows)
+            self._counters.flushes += 1
+        return len(rows)
+
+    def _record_failure(self, row: dict[str, Any], error: str, *, kind: str) -> None:
+        method = str(row.get("method") or "").upper()
+        path = row.get("path")
+        client_order_id = row.get("client_order_id") or "-"
+        endpoint_order_id = row.get("endpoint_order_id") or "-"
+        self.errors.append(
+            f"method={method} path={path} clOrdID={client_order_id} "
+            f"orderID={endpoint_order_id} {kind} error={error}"
+        )
+        self.logger.warning(
+            "rest call audit persistence failed method=%s path=%s clOrdID=%s "
+            "orderID=%s %s error=%s",
+            method,
+            path,
+            client_order_id,
+            endpoint_order_id,
+            kind,
+            error,
+        )
+
+
+def _compact_error(exc: BaseException) -> str:
+    message = str(exc).strip().replace("\n", " ")
+    if len(message) <= 280:
+        return message
+    return f"{message[:277]}..."
+
+
+@atexit.register
+def _stop_live_sinks() -> None:
+    for sink in list(_LIVE_SINKS):
+        sink.stop(timeout=2.0)
+
+
+__all__ = ["RestAuditSink", "RestAuditStats"]
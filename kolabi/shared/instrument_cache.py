@@ -0,0 +1,253 @@
+"""TTL cache for exchange instrument metadata.
+
+Purpose: stop re-reading tick sizes and instrument rules on every market-state
+read or order placement; these rows change a few times a day at most.
+Inputs: `(exchange, environment, market_type, symbol)` keys and loader
+callables (an `exchange_instruments` query or an adapter REST call).
+Outputs: cached `InstrumentRecord` rows or adapter rule mappings, plus
+`InstrumentCacheStats` hit/miss counters.
+Side effects: loaders run on miss or expiry; nothing is written.
+Role: shared infrastructure.
+
+The bot service builds one cache and hands it to the runtime state client and
+every adapter; components built alone get a private cache. Entries are
+namespaced by source (`DB_SOURCE`, `REST_SOURCE`) because REST rules and DB
+rows for the same key carry different fields. Writers of `exchange_instruments`
+call `invalidate` after commit; other processes see changes once the TTL
+expires.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Callable, Iterable, Sequence, TypeVar
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import distinct_on
+from sqlalchemy.orm import Session
+
+from kolabi.shared.persistence import ExchangeInstrument
+
+InstrumentKey = tuple[str, str, str, str]
+"""`(exchange, environment, market_type, symbol)`."""
+
+DB_SOURCE = "db"
+REST_SOURCE = "rest"
+
+_DEFAULT_TTL_SECONDS = 3600.0
+_DEFAULT_MISSING_TTL_SECONDS = 30.0
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class InstrumentRecord:
+    """Detached projection of one `exchange_instruments` row."""
+
+    symbol: str
+    tradeable: bool
+    tick_size: float | None
+    contract_size: float | None
+    min_quantity: float
+    instrument_type: str | None
+    raw_payload: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_row(cls, row: ExchangeInstrument) -> "InstrumentRecord":
+        return cls(
+            symbol=row.symbol,
+            tradeable=row.tradeable,
+            tick_size=row.tick_size,
+            contract_size=row.contract_size,
+            min_quantity=row.min_quantity,
+            instrument_type=row.instrument_type,
+            raw_payload=dict(row.raw_payload or {}),
+        )
+
+
+@dataclass(frozen=True)
+class InstrumentCacheStats:
+    hits: int
+    misses: int
+    invalidations: int
+    entries: int
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "entries": self.entries,
+        }
+
+
+class InstrumentMetadataCache:
+    """Thread-safe TTL cache keyed by source and `InstrumentKey`.
+
+    Missing instruments are cached for `missing_ttl_seconds` only, so a row
+    written by another process is seen quickly. Loader errors are not cached.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = _DEFAULT_TTL_SECONDS,
+        missing_ttl_seconds: float = _DEFAULT_MISSING_TTL_SECONDS,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self.missing_ttl_seconds = max(0.0, missing_ttl_seconds)
+        self._clock = clock
+        self._entries: dict[tuple[str, InstrumentKey], tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get_or_load(
+        self,
+        source: str,
+        key: InstrumentKey,
+        loader: Callable[[], _T | None],
+    ) -> _T | None:
+        """Return the cached value for `key`, calling `loader` on miss or expiry."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get((source, key))
+            if entry is not None and entry[0] > now:
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+        value = loader()
+        self.put(source, key, value)
+        return value
+
+    def get_many(
+        self,
+        source: str,
+        keys: Iterable[InstrumentKey],
+    ) -> tuple[dict[InstrumentKey, Any], list[InstrumentKey]]:
+        """Split `keys` into fresh cached values and keys the caller must load."""
+        now = self._clock()
+        found: dict[InstrumentKey, Any] = {}
+        missing: list[InstrumentKey] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get((source, key))
+                if entry is not None and entry[0] > now:
+                    found[key] = entry[1]
+                else:
+                    missing.append(key)
+            self._hits += len(found)
+            self._misses += len(missing)
+        return found, missing
+
+    def put(self, source: str, key: InstrumentKey, value: Any) -> None:
+        ttl = self.ttl_seconds if value is not None else self.missing_ttl_seconds
+        with self._lock:
+            self._entries[(source, key)] = (self._clock() + ttl, value)
+
+    def invalidate(
+        self,
+        exchange: str,
+        environment: str,
+        market_type: str,
+        symbol: str | None = None,
+    ) -> int:
+        """Drop entries for one symbol, or for the whole market when `symbol` is None."""
+        with self._lock:
+            stale = [
+                cache_key
+                for cache_key in self._entries
+                if cache_key[1][:3] == (exchange, environment, market_type)
+                and (symbol is None or cache_key[1][3] == symbol)
+            ]
+            for cache_key in stale:
+                del self._entries[cache_key]
+            self._invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> InstrumentCacheStats:
+        with self._lock:
+            return InstrumentCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                entries=len(self._entries),
+            )
+
+
+def load_instrument_record(
+    session: Session,
+    key: InstrumentKey,
+) -> InstrumentRecord | None:
+    """Read the newest `exchange_instruments` row for `key`."""
+
+    exchange, environment, market_type, symbol = key
+    row = (
+        session.execute(
+            select(ExchangeInstrument)
+            .where(
+                ExchangeInstrument.exchange == exchange,
+                ExchangeInstrument.environment == environment,
+                ExchangeInstrument.market_type == market_type,
+                ExchangeInstrument.symbol == symbol,
+            )
+            .order_by(ExchangeInstrument.id.desc())
+            .limit(1)
+        )
+        .scalars()
+        .first()
+    )
+    return None if row is None else InstrumentRecord.from_row(row)
+
+
+def load_instrument_records(
+    session: Session,
+    keys: Sequence[InstrumentKey],
+) -> dict[InstrumentKey, InstrumentRecord | None]:
+    """Bulk `load_instrument_record`: one DISTINCT ON statement for all `keys`."""
+
+    if not keys:
+        return {}
+    rows = (
+        session.execute(
+            select(ExchangeInstrument)
+            .where(
+                tuple_(
+                    ExchangeInstrument.exchange,
+                    ExchangeInstrument.environment,
+                    ExchangeInstrument.market_type,
+                    ExchangeInstrument.symbol,
+                ).in_(keys)
+            )
+            .ext(
+                distinct_on(
+                    ExchangeInstrument.exchange,
+                    ExchangeInstrument.environment,
+                    ExchangeInstrument.market_type,
+                    ExchangeInstrument.symbol,
+                )
+            )
+            .order_by(
+                ExchangeInstrument.exchange,
+                ExchangeInstrument.environment,
+                ExchangeInstrument.market_type,
+                ExchangeInstrument.symbol,
+                ExchangeInstrument.id.desc(),
+            )
+        )
+        .scalars()
+        .all()
+    )
+    records: dict[InstrumentKey, InstrumentRecord | None] = dict.fromkeys(keys)
+    for row in rows:
+        records[(row.exchange, row.environment, row.market_type, row.symbol)] = (
+            InstrumentRecord.from_row(row)
+        )
+    return records
@@ -0,0 +1,247 @@
+"""PostgreSQL LISTEN/NOTIFY push channel between feeders and the bot.
+
+Purpose: wake bot runtime sources as soon as a feeder commits new rows instead
+of waiting for the next poll tick.
+Inputs: feeder sessions (`notify_state_change`) and bot DB URLs (listener).
+Outputs: `pg_notify` payloads `{"route": ..., "environment": ..., "id": ...}`,
+`StateChangeSignal` wakeups awaited by runtime sources and `subscribe`
+callbacks (instrument cache invalidation).
+Side effects: one NOTIFY per committed write batch; one background thread and
+one autocommit LISTEN connection per database on the bot side.
+Role: boundary adapter.
+
+NOTIFY is transactional: it is issued inside the feeder transaction and only
+delivered on commit, so a woken reader always sees the committed row. Wakeups
+are hints, not data: sources keep polling on a slow safety-net interval and
+re-read the database on every wakeup.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Callable, Iterable, Sequence
+
+import psycopg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+MARKET_CHANNEL = "kola_market"
+PRIVATE_CHANNEL = "kola_private"
+INSTRUMENT_CHANNEL = "kola_instrument"
+STATE_CHANNELS = (MARKET_CHANNEL, PRIVATE_CHANNEL, INSTRUMENT_CHANNEL)
+
+
+def state_route_label(exchange: str, market_type: str, symbol: str) -> str:
+    """Return the route label used by `ExchangeRoute.label` on the bot side."""
+
+    return f"{exchange}:{market_type}:{symbol}"
+
+
+def notify_state_change(
+    session: Session,
+    channel: str,
+    *,
+    route: str,
+    environment: str,
+    row_id: int | None = None,
+) -> None:
+    """Queue a NOTIFY in the current transaction; delivered on commit."""
+
+    payload = json.dumps(
+        {"route": route, "environment": environment, "id": row_id},
+        separators=(",", ":"),
+    )
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": channel, "payload": payload},
+    )
+
+
+def parse_state_route(route: str) -> tuple[str, str, str] | None:
+    """Split a `state_route_label` back into `(exchange, market_type, symbol)`."""
+
+    parts = route.split(":", 2)
+    if len(parts) != 3 or not all(parts):
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def listen_conninfo(db_url: str) -> str:
+    """Convert a SQLAlchemy PostgreSQL URL into a plain psycopg conninfo."""
+
+    url = make_url(db_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+class StateChangeSignal:
+    """Asyncio-side wakeup for one channel, optionally filtered by route."""
+
+    def __init__(self, channel: str) -> None:
+        self.channel = channel
+        self._lock = threading.Lock()
+        self._routes: frozenset[str] | None = None
+        self._pending = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._event: asyncio.Event | None = None
+        self.wakeups = 0
+
+    def watch(self, routes: Iterable[str] | None) -> None:
+        """Only wake for these route labels (`None` wakes on any route)."""
+
+        with self._lock:
+            self._routes = None if routes is None else frozenset(routes)
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a matching NOTIFY; return False when `timeout` elapses first."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._pending:
+                self._pending = False
+                return True
+            if self._loop is not loop or self._event is None:
+                self._loop = loop
+                self._event = asyncio.Event()
+            event = self._event
+            event.clear()
+        try:
+            await asyncio.wait_for(event.wait(), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return False
+        with self._lock:
+            self._pending = False
+        return True
+
+    def deliver(self, route: str | None) -> bool:
+        """Mark the signal pending; safe to call from the listener thread."""
+
+        with self._lock:
+            if route is not None and self._routes is not None and route not in self._routes:
+                return False
+            self._pending = True
+            self.wakeups += 1
+            loop = self._loop
+            event = self._event
+        if loop is not None and event is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                return True
+        return True
+
+
+class StateChangeListener:
+    """Background LISTEN connections fanning NOTIFY payloads out to signals."""
+
+    def __init__(
+        self,
+        db_urls: Sequence[str],
+        *,
+        channels: Sequence[str] = STATE_CHANNELS,
+        environment: str | None = None,
+        poll_timeout: float = 0.5,
+        reconnect_seconds: float = 1.0,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self.conninfos = tuple(dict.fromkeys(listen_conninfo(url) for url in db_urls))
+        self.channels = tuple(channels)
+        self.environment = environment
+        self.poll_timeout = max(0.05, poll_timeout)
+        self.reconnect_seconds = max(0.05, reconnect_seconds)
+        self.logger = logger or logging.getLogger("kola")
+        self._signals: dict[str, list[StateChangeSignal]] = {}
+        self._callbacks: dict[str, list[Callable[[str | None], None]]] = {}
+        self._signals_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._listening = threading.Semaphore(0)
+        self.received = 0
+
+    def signal(self, channel: str) -> StateChangeSignal:
+        """Return a new signal woken by NOTIFY payloads on `channel`."""
+
+        signal = StateChangeSignal(channel)
+        with self._signals_lock:
+            self._signals.setdefault(channel, []).append(signal)
+        return signal
+
+    def subscribe(self, channel: str, callback: Callable[[str | None], None]) -> None:
+        """Call `callback(route)` on the listener thread for each NOTIFY on `channel`.
+
+        `route` is None after a reconnect, when missed notifications are unknown.
+        """
+
+        with self._signals_lock:
+            self._callbacks.setdefault(channel, []).append(callback)
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for index, conninfo in enumerate(self.conninfos):
+            thread = threading.Thread(
+                target=self._run,
+                args=(conninfo,),
+                name=f"kola-state-listen-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def wait_listening(self, timeout: float = 5.0) -> bool:
+        """Block until every connection issued its LISTEN (tests, benchmarks)."""
+
+        return all(self._listening.acquire(timeout=timeout) for _ in self.conninfos)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def dispatch(self, channel: str, payload: str) -> int:
+        """Fan one NOTIFY payload out; return how many signals and callbacks fired."""
+
+        route: str | None = None
+        try:
+            decoded = json.loads(payload) if payload else {}
+        except ValueError:
+            decoded = {}
+        if isinstance(decoded, dict):
+            environment = decoded.get("environment")
+            if self.environment is not None and environment not in (None, self.environment):
+                return 0
+            raw_route = decoded.get("route")
+            route = str(raw_route) if raw_route else None
+        with self._signals_lock:
+            signals = tuple(self._signals.get(channel, ()))
+            callbacks = tuple(self._callbacks.get(channel, ()))
+        for callback in callbacks:
+            try:
+                callback(route)
+            except Exception as exc:
+                self.logger.warning("state_listen callback error channel=%s error=%s", channel, exc)
+        return sum(1 for signal in signals if signal.deliver(route)) + len(callbacks)
+
+    def _run(self, conninfo: str) -> None:
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as conn:
+                    for channel in self.channels:
+                        conn.execute(f'LISTEN "{channel}"')
+                    self._listening.release()
+                    # Rows committed while disconnected were never announced.
+                    for channel in self.channels:
+                        self.dispatch(channel, "")
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=self.poll_timeout):
+                            self.received += 1
+                            self.dispatch(notify.channel, notify.payload)
+            except Exception as exc:
+                if self._stop.is_set():
+                    return
+                self.logger.warning("state_listen reconnect error=%s", exc)
+                self._stop.wait(self.reconnect_seconds)
@@ -0,0 +1,382 @@
+"""Bounded cache of original order requests for cancel-replace amends.
+
+Purpose: let adapters that amend by re-placing an order (Binance, Kraken
+spot/margin) find the original request without keeping every order of the
+process in memory, and find it again after a restart.
+Inputs: requests the adapter placed, keyed by exchange and client order ids;
+on a miss, the placement row in `exchange_rest_calls` and the latest
+`exchange_orders` row written by the private feeder.
+Outputs: the adapter's own request dataclass, plus `OrderCacheStats` counters.
+Side effects: at most two indexed SELECTs per miss; no exchange calls.
+Important types: `OrderRequestCache`, `PersistedOrderReader`, `PersistedOrder`.
+Role: shared infrastructure.
+
+Entries are evicted least recently used past `max_entries`, and when the
+adapter sees the order reach a terminal status (cancel, fill, reject). Ids of
+orders the adapter replaced are kept as aliases of the live replacement, in the
+same bound. A persisted order whose latest feeder row is terminal is not
+rehydrated.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Iterable, TypeVar
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from kolabi.shared.persistence import ExchangeOrder, ExchangeRestCall
+
+_LOGGER = logging.getLogger("kola")
+
+DEFAULT_ORDER_CACHE_SIZE = 1024
+
+TERMINAL_ORDER_STATUSES = frozenset(
+    {
+        "filled",
+        "canceled",
+        "cancelled",
+        "rejected",
+        "expired",
+        "expired_in_match",
+        "closed",
+    }
+)
+
+_R = TypeVar("_R")
+
+
+def order_status_is_terminal(status: object) -> bool:
+    text = str(status or "").strip().replace(" ", "_").replace("-", "_").lower()
+    return text in TERMINAL_ORDER_STATUSES
+
+
+@dataclass(frozen=True)
+class OrderCacheStats:
+    hits: int
+    misses: int
+    rehydrated: int
+    evictions: int
+    entries: int
+
+
+@dataclass
+class _Entry(Generic[_R]):
+    request: _R
+    ids: set[str]
+
+
+class OrderRequestCache(Generic[_R]):
+    """Thread-safe LRU of order requests indexed by every id of the order."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_ORDER_CACHE_SIZE,
+        rehydrate: Callable[[str], tuple[_R, tuple[str, ...]] | None] | None = None,
+    ) -> None:
+        # `rehydrate` maps a missed id to the request and every id it is known by.
+        self.max_entries = max(1, int(max_entries))
+        self._rehydrate = rehydrate
+        self._entries: OrderedDict[int, _Entry[_R]] = OrderedDict()
+        self._index: dict[str, int] = {}
+        self._aliases: OrderedDict[str, str] = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._rehydrated = 0
+        self._evictions = 0
+
+    def get(self, identity: str, client_order_id: object | None = None) -> _R | None:
+        """Return the request for `identity` (or `client_order_id`), loading on miss."""
+        identities = [self.resolve(str(identity))]
+        if client_order_id is not None:
+            identities.append(self.resolve(str(client_order_id)))
+        with self._lock:
+            for candidate in identities:
+                key = self._index.get(candidate)
+                if key is not None:
+                    self._hits += 1
+                    self._entries.move_to_end(key)
+                    return self._entries[key].request
+            self._misses += 1
+        if self._rehydrate is None:
+            return None
+        for candidate in identities:
+            loaded = self._rehydrate(candidate)
+            if loaded is None:
+                continue
+            request, ids = loaded
+            self.put((candidate, *ids), request)
+            with self._lock:
+                self._rehydrated += 1
+            return request
+        return None
+
+    def put(self, identities: Iterable[object | None], request: _R) -> None:
+        ids = {str(identity) for identity in identities if identity not in (None, "")}
+        if not ids:
+            return
+        with self._lock:
+            for identity in ids:
+                self._drop_locked(identity)
+            key = self._next_key
+            self._next_key += 1
+            self._entries[key] = _Entry(request, ids)
+            for identity in ids:
+                self._index[identity] = key
+                self._aliases.pop(identity, None)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                for identity in evicted.ids:
+                    self._index.pop(identity, None)
+                self._evictions += 1
+
+    def forget(self, identity: str) -> None:
+        """Drop the order known by `identity` and the aliases pointing at it."""
+        with self._lock:
+            ids = self._drop_locked(self._aliases.get(identity, identity)) or {identity}
+            for old in [old for old, new in self._aliases.items() if new in ids]:
+                del self._aliases[old]
+
+    def alias(self, old_ids: Iterable[object | None], identity: str) -> None:
+        """Make `old_ids` (a replaced order) resolve to its replacement `identity`."""
+        previous = {str(old) for old in old_ids if old not in (None, "")}
+        previous.discard(identity)
+        with self._lock:
+            for old, new in self._aliases.items():
+                if new in previous:
+                    self._aliases[old] = identity
+            for old in previous:
+                self._aliases[old] = identity
+                self._aliases.move_to_end(old)
+            while len(self._aliases) > self.max_entries:
+                self._aliases.popitem(last=False)
+
+    def resolve(self, identity: str) -> str:
+        with self._lock:
+            return self._aliases.get(identity, identity)
+
+    def stats(self) -> OrderCacheStats:
+        with self._lock:
+            return OrderCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                rehydrated=self._rehydrated,
+                evictions=self._evictions,
+                entries=len(self._entries),
+            )
+
+    def _drop_locked(self, identity: str) -> set[str]:
+        key = self._index.get(identity)
+        if key is None:
+            return set()
+        entry = self._entries.pop(key)
+        for known in entry.ids:
+            self._index.pop(known, None)
+        return entry.ids
+
+
+@dataclass(frozen=True)
+class PersistedOrder:
+    """What the databases remember about one order.
+
+    `request_params` is the placement request as the adapter sent it (from the
+    REST audit); `row` is the latest `exchange_orders` row of the private feeder
+    with its `raw_payload`; `cancelled` is set when the audit holds a successful
+    cancel of the order after its placement.
+    """
+
+    exchange_order_id: str | None
+    client_order_id: str | None
+    request_params: dict[str, Any] | None
+    row: dict[str, Any] | None
+    cancelled: bool = False
+
+    @property
+    def terminal(self) -> bool:
+        if self.cancelled:
+            return True
+        return self.row is not None and order_status_is_terminal(self.row.get("status"))
+
+    @property
+    def identities(self) -> tuple[str, ...]:
+        return tuple(
+            identity
+            for identity in (self.exchange_order_id, self.client_order_id)
+            if identity
+        )
+
+
+class PersistedOrderReader:
+    """Look orders up in the REST audit and private order tables.
+
+    `cancel_calls` are the `(method, path)` of the adapter's single cancel; a
+    successful one after the placement marks the order terminal.
+    """
+
+    def __init__(
+        self,
+        *,
+        exchange: str,
+        environment: str,
+        market_type: str,
+        account_scope: str,
+        symbol: str,
+        place_paths: tuple[str, ...],
+        cancel_calls: tuple[tuple[str, str], ...] = (),
+        audit_sessionmaker: Callable[[], Session] | None = None,
+        account_sessionmaker: Callable[[], Session] | None = None,
+    ) -> None:
+        self.exchange = exchange
+        self.environment = environment
+        self.market_type = market_type
+        self.account_scope = account_scope
+        self.symbol = symbol
+        self.place_paths = place_paths
+        self.cancel_calls = cancel_calls
+        self.audit_sessionmaker = audit_sessionmaker
+        self.account_sessionmaker = account_sessionmaker
+
+    def lookup(self, identity: str) -> PersistedOrder | None:
+        try:
+            audit = self._placement(identity)
+            ids = {identity}
+            cancelled = False
+            if audit is not None:
+                ids.update(value for value in audit[1:3] if value)
+                cancelled = self._cancelled_after(ids, audit[3])
+            row = self._latest_order_row(ids)
+        except SQLAlchemyError as exc:
+            _LOGGER.warning(
+                "order cache rehydration failed exchange=%s identity=%s error=%s",
+                self.exchange,
+                identity,
+                exc,
+            )
+            return None
+        if audit is None and row is None:
+            return None
+        return PersistedOrder(
+            exchange_order_id=(audit[1] if audit else None)
+            or (row or {}).get("exchange_order_id"),
+            client_order_id=(audit[2] if audit else None)
+            or (row or {}).get("client_order_id"),
+            request_params=audit[0] if audit else None,
+            row=row,
+            cancelled=cancelled,
+        )
+
+    def _placement(
+        self, identity: str
+    ) -> tuple[dict[str, Any], str | None, str | None, int] | None:
+        if self.audit_sessionmaker is None:
+            return None
+        stmt = (
+            select(
+                ExchangeRestCall.request_params,
+                ExchangeRestCall.exchange_order_id,
+                ExchangeRestCall.client_order_id,
+                ExchangeRestCall.id,
+            )
+            .where(
+                *self._audit_scope(),
+                ExchangeRestCall.method == "POST",
+                ExchangeRestCall.path.in_(self.place_paths),
+                ExchangeRestCall.result_kind == "ok",
+                or_(
+                    ExchangeRestCall.client_order_id == identity,
+                    ExchangeRestCall.exchange_order_id == identity,
+                ),
+            )
+            .order_by(ExchangeRestCall.id.desc())
+            .limit(1)
+        )
+        with self.audit_sessionmaker() as session:
+            found = session.execute(stmt).first()
+        if found is None:
+            return None
+        return dict(found[0] or {}), found[1], found[2], found[3]
+
+    def _cancelled_after(self, ids: set[str], placement_id: int) -> bool:
+        if not self.cancel_calls or self.audit_sessionmaker is None:
+            return False
+        stmt = (
+            select(ExchangeRestCall.id)
+            .where(
+                *self._audit_scope(),
+                or_(
+                    *(
+                        and_(ExchangeRestCall.method == method, ExchangeRestCall.path == path)
+                        for method, path in self.cancel_calls
+                    )
+                ),
+                ExchangeRestCall.result_kind == "ok",
+                ExchangeRestCall.id > placement_id,
+                or_(
+                    ExchangeRestCall.client_order_id.in_(ids),
+                    ExchangeRestCall.exchange_order_id.in_(ids),
+                ),
+            )
+            .limit(1)
+        )
+        with self.audit_sessionmaker() as session:
+            return session.execute(stmt).first() is not None
+
+    def _audit_scope(self) -> tuple[Any, ...]:
+        return (
+            ExchangeRestCall.exchange == self.exchange,
+            ExchangeRestCall.environment == self.environment,
+            ExchangeRestCall.market_type == self.market_type,
+            ExchangeRestCall.account_scope == self.account_scope,
+        )
+
+    def _latest_order_row(self, ids: set[str]) -> dict[str, Any] | None:
+        if self.account_sessionmaker is None:
+            return None
+        stmt = (
+            select(ExchangeOrder)
+            .where(
+                ExchangeOrder.exchange == self.exchange,
+                ExchangeOrder.environment == self.environment,
+                ExchangeOrder.market_type == self.market_type,
+                ExchangeOrder.symbol == self.symbol,
+                or_(
+                    ExchangeOrder.exchange_order_id.in_(ids),
+                    ExchangeOrder.client_order_id.in_(ids),
+                ),
+            )
+            .order_by(ExchangeOrder.local_timestamp.desc(), ExchangeOrder.id.desc())
+            .limit(1)
+        )
+        with self.account_sessionmaker() as session:
+            order = session.execute(stmt).scalars().first()
+            if order is None:
+                return None
+            return {
+                "exchange_order_id": order.exchange_order_id,
+                "client_order_id": order.client_order_id,
+                "side": order.side,
+                "order_type": order.order_type,
+                "status": order.status,
+                "price": order.price,
+                "quantity": order.quantity,
+                "reduce_only": order.reduce_only,
+                "raw_payload": dict(order.raw_payload or {}),
+            }
+
+
+__all__ = [
+    "DEFAULT_ORDER_CACHE_SIZE",
+    "OrderCacheStats",
+    "OrderRequestCache",
+    "PersistedOrder",
+    "PersistedOrderReader",
+    "TERMINAL_ORDER_STATUSES",
+    "order_status_is_terminal",
+]
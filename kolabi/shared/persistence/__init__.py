@@ -19,6 +19,13 @@ from .models import (
     RawExchangeEvent,
     TailTelemetry,
 )
+from .partitions import (
+    MARKET_STORAGE_LAYOUTS,
+    PartitionMaintenance,
+    ensure_market_storage,
+    maintain_market_partitions,
+    market_storage_layout,
+)
 from .retention import (
     PruneResult,
     prune_account_balances,
@@ -30,6 +37,7 @@ from .retention import (
 )
 
 __all__ = [
+    "MARKET_STORAGE_LAYOUTS",
     "AccountBalance",
     "AccountPosition",
     "Base",
@@ -43,13 +51,17 @@ __all__ = [
     "MarketSnapshot",
     "OrderEvent",
     "OrderRun",
+    "PartitionMaintenance",
     "PrivateIngestAudit",
     "PruneResult",
     "RawExchangeEvent",
     "TailTelemetry",
     "create_persistence_engine",
+    "ensure_market_storage",
     "get_sessionmaker",
     "init_engine",
+    "maintain_market_partitions",
+    "market_storage_layout",
     "prune_account_balances",
     "prune_account_positions",
     "prune_exchange_rest_calls",
@@ -0,0 +1,174 @@
+"""Compact per-snapshot encoding of public L2 levels.
+
+Purpose: store the ask/bid ladders of a market snapshot as four `float8[]`
+columns on `market_snapshots` instead of one `market_levels` row per level.
+Inputs: book levels as `(price, volume)` pairs, sessions and engines on a
+market database.
+Outputs: encoded arrays, decoded ladders and `LevelMigration` counters.
+Side effects: the migration rewrites `market_snapshots` and deletes the
+migrated `market_levels` rows.
+Important types: `LevelMigration`.
+Role: persistence helper.
+
+Snapshots written before the array columns existed keep their levels in
+`market_levels`; `snapshot_levels` reads whichever encoding a snapshot has.
+`migrate_level_rows` folds those rows into the arrays batch by batch, so it
+can run while a feeder keeps writing:
+
+    python -m kolabi.shared.persistence.market_levels --db-url <market db url>
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Sequence, TextIO
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from kolabi.shared.persistence.db import create_persistence_engine
+from kolabi.shared.persistence.models import MarketLevel, MarketSnapshot
+from kolabi.shared.persistence.partitions import ensure_market_columns
+from kolabi.shared.redaction import redact_url
+
+LevelT = tuple[float, float]
+LEVEL_STORAGE_MODES = ("arrays", "rows")
+
+_MIGRATE_BATCH_SQL = text(
+    "WITH moved AS ("
+    " SELECT snapshot_id,"
+    " array_agg(price ORDER BY level_index) FILTER (WHERE side = 'ask') AS ap,"
+    " array_agg(volume ORDER BY level_index) FILTER (WHERE side = 'ask') AS av,"
+    " array_agg(price ORDER BY level_index) FILTER (WHERE side = 'bid') AS bp,"
+    " array_agg(volume ORDER BY level_index) FILTER (WHERE side = 'bid') AS bv"
+    " FROM market_levels WHERE snapshot_id = ANY(:ids) GROUP BY snapshot_id"
+    ") "
+    "UPDATE market_snapshots SET"
+    " ask_prices = coalesce(moved.ap, '{}'),"
+    " ask_volumes = coalesce(moved.av, '{}'),"
+    " bid_prices = coalesce(moved.bp, '{}'),"
+    " bid_volumes = coalesce(moved.bv, '{}') "
+    "FROM moved WHERE market_snapshots.id = moved.snapshot_id "
+    "AND market_snapshots.ask_prices IS NULL"
+)
+
+
+@dataclass(frozen=True)
+class LevelMigration:
+    """Work done by `migrate_level_rows`."""
+
+    snapshots: int = 0
+    rows: int = 0
+    batches: int = 0
+
+
+def encode_levels(levels: Sequence[LevelT]) -> tuple[list[float], list[float]]:
+    """Split a ladder into its price and volume arrays."""
+
+    return [float(price) for price, _ in levels], [float(volume) for _, volume in levels]
+
+
+def level_columns(
+    asks: Sequence[LevelT],
+    bids: Sequence[LevelT],
+) -> dict[str, list[float]]:
+    """`MarketSnapshot` array columns for one book."""
+
+    ask_prices, ask_volumes = encode_levels(asks)
+    bid_prices, bid_volumes = encode_levels(bids)
+    return {
+        "ask_prices": ask_prices,
+        "ask_volumes": ask_volumes,
+        "bid_prices": bid_prices,
+        "bid_volumes": bid_volumes,
+    }
+
+
+def decode_levels(
+    prices: Sequence[float] | None,
+    volumes: Sequence[float] | None,
+) -> tuple[LevelT, ...]:
+    return tuple(zip(prices or (), volumes or ()))
+
+
+def snapshot_levels(
+    session: Session,
+    snapshot: MarketSnapshot,
+) -> tuple[tuple[LevelT, ...], tuple[LevelT, ...]]:
+    """Asks and bids of a snapshot, from its arrays or its legacy level rows."""
+
+    if snapshot.ask_prices is not None or snapshot.bid_prices is not None:
+        return (
+            decode_levels(snapshot.ask_prices, snapshot.ask_volumes),
+            decode_levels(snapshot.bid_prices, snapshot.bid_volumes),
+        )
+    rows = session.execute(
+        select(MarketLevel.side, MarketLevel.price, MarketLevel.volume)
+        .where(MarketLevel.snapshot_id == snapshot.id)
+        .order_by(MarketLevel.side, MarketLevel.level_index)
+    ).all()
+    asks = tuple((row.price, row.volume) for row in rows if row.side == "ask")
+    bids = tuple((row.price, row.volume) for row in rows if row.side == "bid")
+    return asks, bids
+
+
+def migrate_level_rows(engine: Engine, *, batch_size: int = 1000) -> LevelMigration:
+    """Fold `market_levels` rows into snapshot arrays, one batch per transaction."""
+
+    ensure_market_columns(engine)
+    snapshots = rows = batches = 0
+    while True:
+        with engine.begin() as connection:
+            ids = list(
+                connection.execute(
+                    text(
+                        "SELECT DISTINCT snapshot_id FROM market_levels "
+                        "ORDER BY snapshot_id LIMIT :limit"
+                    ),
+                    {"limit": max(1, batch_size)},
+                ).scalars()
+            )
+            if not ids:
+                return LevelMigration(snapshots=snapshots, rows=rows, batches=batches)
+            snapshots += connection.execute(_MIGRATE_BATCH_SQL, {"ids": ids}).rowcount
+            rows += connection.execute(
+                text("DELETE FROM market_levels WHERE snapshot_id = ANY(:ids)"),
+                {"ids": ids},
+            ).rowcount
+            batches += 1
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Move legacy market_levels rows into per-snapshot level arrays.",
+    )
+    parser.add_argument("--db-url", required=True, help="Public market PostgreSQL URL.")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Snapshots migrated per transaction.",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None, *, stdout: TextIO | None = None) -> int:
+    out = stdout or sys.stdout
+    args = _parser().parse_args(argv)
+    engine = create_persistence_engine(args.db_url)
+    try:
+        result = migrate_level_rows(engine, batch_size=args.batch_size)
+    finally:
+        engine.dispose()
+    print(
+        f"kolabi-market-levels: url={redact_url(args.db_url)} "
+        f"snapshots={result.snapshots} rows={result.rows} batches={result.batches}",
+        file=out,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 from sqlalchemy import (
+    ARRAY,
     JSON,
     Boolean,
     DateTime,
@@ -116,6 +117,11 @@ class MarketSnapshot(Base):
     local_timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
+    # Niveaux L2 compacts; None = niveaux historiques dans `market_levels`.
+    ask_prices: Mapped[list[float] | None] = mapped_column(ARRAY(Float))
+    ask_volumes: Mapped[list[float] | None] = mapped_column(ARRAY(Float))
+    bid_prices: Mapped[list[float] | None] = mapped_column(ARRAY(Float))
+    bid_volumes: Mapped[list[float] | None] = mapped_column(ARRAY(Float))
 
     levels: Mapped[list["MarketLevel"]] = relationship(
         "MarketLevel",
@@ -130,7 +136,7 @@ class MarketSnapshot(Base):
 
 
 class MarketLevel(Base):
-    """Niveau L2 sparse lie a un snapshot normalise."""
+    """Niveau L2 sparse lie a un snapshot (encodage historique, une ligne/niveau)."""
 
     __tablename__ = "market_levels"
     __table_args__ = (
@@ -146,6 +152,8 @@ class MarketLevel(Base):
     level_index: Mapped[int] = mapped_column(Integer, nullable=False)
     price: Mapped[float] = mapped_column(Float, nullable=False)
     volume: Mapped[float] = mapped_column(Float, nullable=False)
+    # Copie du temps du snapshot: cle de partition en stockage partitionne.
+    local_timestamp: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     snapshot: Mapped["MarketSnapshot"] = relationship(
         "MarketSnapshot",
@@ -0,0 +1,283 @@
+"""Time-partitioned storage layout for the public market tables.
+
+Purpose: let public feeders keep `market_snapshots`, `market_levels` and
+`market_indicators` bounded by dropping whole time partitions instead of
+running retention DELETEs on every snapshot flush.
+Inputs: an engine, the storage layout, the partition interval, the retention
+window and the current time.
+Outputs: `PartitionMaintenance` with the partitions created and dropped.
+Side effects: CREATE/ALTER/DROP TABLE statements on the market database.
+Important types: `PartitionMaintenance`.
+Role: persistence helper.
+
+Layout `plain` is the mapped schema created by `Base.metadata.create_all`.
+Layout `partitioned` creates the three parents with `PARTITION BY RANGE` on
+their time column (`local_timestamp`, `local_timestamp` copied on each level,
+`computed_at`) and one child per interval, named `<table>_pYYYYMMDDHHMM`
+after its UTC lower bound. Partitioned parents carry no foreign keys: levels
+and indicators live in the partition of the same bucket as their snapshot and
+are dropped in the same transaction. A bucket is dropped only once its upper
+bound is older than the retention cutoff, so up to one extra interval of data
+is kept.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from kolabi.shared.persistence.models import MarketIndicator, MarketLevel, MarketSnapshot
+
+MARKET_STORAGE_LAYOUTS = ("plain", "partitioned")
+MARKET_PARTITION_KEYS = {
+    MarketSnapshot.__table__.name: "local_timestamp",
+    MarketLevel.__table__.name: "local_timestamp",
+    MarketIndicator.__table__.name: "computed_at",
+}
+_PARTITION_SUFFIX_FORMAT = "%Y%m%d%H%M"
+_PARTITION_LOCK_SQL = text(
+    "SELECT pg_advisory_xact_lock(hashtext('kolabi_market_partitions'))"
+)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class PartitionMaintenance:
+    """Partitions touched by one maintenance pass."""
+
+    created: tuple[str, ...] = ()
+    dropped: tuple[str, ...] = ()
+
+
+def market_storage_layout(engine: Engine) -> str | None:
+    """Return the layout of the existing market tables, None when absent."""
+
+    with engine.connect() as connection:
+        kinds = connection.execute(
+            text(
+                "SELECT relname, relkind FROM pg_class WHERE relname = ANY(:names) "
+                "AND relnamespace = current_schema()::regnamespace"
+            ),
+            {"names": list(MARKET_PARTITION_KEYS)},
+        ).all()
+    layouts = {"partitioned" if kind == "p" else "plain" for _name, kind in kinds}
+    if not layouts:
+        return None
+    if len(layouts) > 1:
+        raise ValueError("market tables mix plain and partitioned layouts")
+    return layouts.pop()
+
+
+def ensure_market_storage(
+    engine: Engine,
+    layout: str,
+    *,
+    interval_minutes: int = 60,
+    premake: int = 2,
+    now: datetime | None = None,
+) -> PartitionMaintenance:
+    """Prepare the market tables for `layout` before `create_all` runs.
+
+    Existing tables get the columns added since they were created; for
+    `plain`, `create_all` creates missing tables. An existing database in the
+    other layout is rejected: rebuild it with
+    `kolabi-purge --market-storage <layout>`.
+    """
+
+    if layout not in MARKET_STORAGE_LAYOUTS:
+        raise ValueError(f"unknown market storage layout: {layout}")
+    current = market_storage_layout(engine)
+    if current is not None and current != layout:
+        raise ValueError(
+            f"market tables use the {current} layout, config asks for {layout}; "
+            f"rebuild them with kolabi-purge --market-storage {layout}"
+        )
+    if current is not None:
+        ensure_market_columns(engine)
+    if layout == "plain":
+        return PartitionMaintenance()
+    if current is None:
+        with engine.begin() as connection:
+            connection.execute(_PARTITION_LOCK_SQL)
+            for table_name in MARKET_PARTITION_KEYS:
+                for statement in _partitioned_parent_ddl(table_name, connection):
+                    connection.execute(text(statement))
+    return maintain_market_partitions(
+        engine,
+        interval_minutes=interval_minutes,
+        retention_minutes=0,
+        premake=premake,
+        now=now,
+    )
+
+
+def maintain_market_partitions(
+    engine: Engine,
+    *,
+    interval_minutes: int,
+    retention_minutes: int,
+    premake: int = 2,
+    now: datetime | None = None,
+) -> PartitionMaintenance:
+    """Create the current and `premake` next buckets, drop expired ones."""
+
+    if interval_minutes <= 0:
+        raise ValueError("partition interval must be positive")
+    now = _as_utc(now)
+    current = partition_floor(now, interval_minutes)
+    interval = timedelta(minutes=interval_minutes)
+    wanted = [current + interval * step for step in range(max(0, premake) + 1)]
+    cutoff = now - timedelta(minutes=retention_minutes) if retention_minutes > 0 else None
+    created: list[str] = []
+    dropped: list[str] = []
+    with engine.begin() as connection:
+        connection.execute(_PARTITION_LOCK_SQL)
+        for table_name in MARKET_PARTITION_KEYS:
+            existing = market_partitions(connection, table_name)
+            for lower in wanted:
+                name = partition_name(table_name, lower)
+                if name in existing:
+                    continue
+                connection.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF {table_name} "
+                        f"FOR VALUES FROM ('{lower.isoformat()}') "
+                        f"TO ('{(lower + interval).isoformat()}')"
+                    )
+                )
+                created.append(name)
+            if cutoff is None:
+                continue
+            for name, lower in sorted(existing.items(), key=lambda item: item[1]):
+                if lower + interval > cutoff:
+                    continue
+                connection.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+    return PartitionMaintenance(created=tuple(created), dropped=tuple(dropped))
+
+
+def market_partitions(connection: Connection, table_name: str) -> dict[str, datetime]:
+    """Child partitions of `table_name` named by this module, with their lower bound."""
+
+    names = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent "
+            "AND parent.relnamespace = current_schema()::regnamespace"
+        ),
+        {"parent": table_name},
+    ).scalars()
+    partitions: dict[str, datetime] = {}
+    prefix = f"{table_name}_p"
+    for name in names:
+        if not name.startswith(prefix):
+            continue
+        try:
+            lower = datetime.strptime(name[len(prefix):], _PARTITION_SUFFIX_FORMAT)
+        except ValueError:
+            continue
+        partitions[name] = lower.replace(tzinfo=timezone.utc)
+    return partitions
+
+
+def partition_floor(value: datetime, interval_minutes: int) -> datetime:
+    """UTC lower bound of the bucket holding `value`."""
+
+    step = interval_minutes * 60
+    seconds = int((_as_utc(value) - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=seconds - seconds % step)
+
+
+def partition_name(table_name: str, lower: datetime) -> str:
+    return f"{table_name}_p{lower.strftime(_PARTITION_SUFFIX_FORMAT)}"
+
+
+def _as_utc(value: datetime | None) -> datetime:
+    if value is None:
+        return datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _partitioned_parent_ddl(table_name: str, connection: Connection) -> list[str]:
+    """CREATE TABLE/INDEX statements for one partitioned parent.
+
+    Columns are rendered from the mapped table so both layouts stay in sync;
+    the primary key and unique indexes gain the partition key, as PostgreSQL
+    requires, and foreign keys are left out.
+    """
+
+    table = _mapped_table(table_name)
+    key = MARKET_PARTITION_KEYS[table_name]
+    dialect = connection.dialect
+    columns = [
+        str(CreateColumn(column).compile(dialect=dialect)) for column in table.columns
+    ]
+    primary_key = [column.name for column in table.primary_key.columns] + [key]
+    statements = [
+        f"CREATE TABLE {table_name} ({', '.join(columns)}, "
+        f"PRIMARY KEY ({', '.join(primary_key)})) PARTITION BY RANGE ({key})"
+    ]
+    for index in sorted(table.indexes, key=lambda item: str(item.name)):
+        if not index.unique:
+            statements.append(str(CreateIndex(index).compile(dialect=dialect)))
+            continue
+        index_columns = [column.name for column in index.columns]
+        if key not in index_columns:
+            index_columns.append(key)
+        statements.append(
+            f"CREATE UNIQUE INDEX {index.name} "
+            f"ON {table_name} ({', '.join(index_columns)})"
+        )
+    return statements
+
+
+def _mapped_table(table_name: str) -> Any:
+    for model in (MarketSnapshot, MarketLevel, MarketIndicator):
+        if model.__table__.name == table_name:
+            return model.__table__
+    raise KeyError(table_name)
+
+
+def ensure_market_columns(engine: Engine) -> None:
+    """Add mapped columns missing from market tables created by older versions."""
+
+    inspector = inspect(engine)
+    statements = []
+    for table_name in MARKET_PARTITION_KEYS:
+        table = _mapped_table(table_name)
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            statements.append(
+                f"ALTER TABLE {table_name} "
+                f"ADD COLUMN IF NOT EXISTS {column.name} {column_type}"
+            )
+    if not statements:
+        return
+    with engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+__all__ = [
+    "MARKET_PARTITION_KEYS",
+    "MARKET_STORAGE_LAYOUTS",
+    "PartitionMaintenance",
+    "ensure_market_columns",
+    "ensure_market_storage",
+    "maintain_market_partitions",
+    "market_partitions",
+    "market_storage_layout",
+    "partition_floor",
+    "partition_name",
+]
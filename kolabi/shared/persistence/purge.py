@@ -13,6 +13,11 @@ from sqlalchemy.exc import OperationalError
 
 from kolabi.shared.persistence.db import create_persistence_engine
 from kolabi.shared.persistence.models import Base
+from kolabi.shared.persistence.partitions import (
+    MARKET_PARTITION_KEYS,
+    MARKET_STORAGE_LAYOUTS,
+    ensure_market_storage,
+)
 from kolabi.shared.redaction import redact_url
 
 _DB_ENV_RE = re.compile(
@@ -56,19 +61,25 @@ def purge_database(
     dry_run: bool = False,
     connect_attempts: int = 1,
     connect_delay_seconds: float = 1.0,
+    market_storage: str | None = None,
 ) -> str:
-    """Truncate every mapped runtime table in one PostgreSQL database lane."""
+    """Truncate every mapped runtime table in one PostgreSQL database lane.
+
+    With `market_storage`, the market tables are dropped and recreated in that
+    layout (plain or time-partitioned) instead of being truncated in place.
+    """
 
     safe_url = redact_url(lane.url)
     table_count = len(Base.metadata.sorted_tables)
+    layout = f" market_storage={market_storage}" if market_storage else ""
     if dry_run:
-        return f"would purge {lane.label} url={safe_url} tables={table_count}"
+        return f"would purge {lane.label} url={safe_url} tables={table_count}{layout}"
 
     attempts = max(1, int(connect_attempts))
     for attempt in range(1, attempts + 1):
         try:
-            _truncate_database(lane)
-            return f"purged {lane.label} url={safe_url} tables={table_count}"
+            _truncate_database(lane, market_storage=market_storage)
+            return f"purged {lane.label} url={safe_url} tables={table_count}{layout}"
         except OperationalError:
             if attempt >= attempts:
                 raise
@@ -76,12 +87,17 @@ def purge_database(
     raise RuntimeError("unreachable purge retry state")
 
 
-def _truncate_database(lane: DatabaseLane) -> None:
+def _truncate_database(lane: DatabaseLane, *, market_storage: str | None = None) -> None:
     engine = create_persistence_engine(lane.url)
     try:
         if engine.dialect.name != "postgresql":
             raise ValueError(f"{lane.label} is not PostgreSQL: {redact_url(lane.url)}")
 
+        if market_storage is not None:
+            market_tables = ", ".join(MARKET_PARTITION_KEYS)
+            with engine.begin() as connection:
+                connection.execute(text(f"DROP TABLE IF EXISTS {market_tables} CASCADE"))
+            ensure_market_storage(engine, market_storage)
         Base.metadata.create_all(engine)
         preparer = engine.dialect.identifier_preparer
         table_sql = ", ".join(
@@ -101,6 +117,7 @@ def purge_lanes(
     dry_run: bool = False,
     connect_attempts: int = 1,
     connect_delay_seconds: float = 1.0,
+    market_storage: str | None = None,
 ) -> tuple[str, ...]:
     return tuple(
         purge_database(
@@ -108,6 +125,7 @@ def purge_lanes(
             dry_run=dry_run,
             connect_attempts=connect_attempts,
             connect_delay_seconds=connect_delay_seconds,
+            market_storage=market_storage,
         )
         for lane in lanes
     )
@@ -139,6 +157,11 @@ def _parser() -> argparse.ArgumentParser:
         default=1.0,
         help="Delay between connection attempts.",
     )
+    parser.add_argument(
+        "--market-storage",
+        choices=MARKET_STORAGE_LAYOUTS,
+        help="Rebuild the market tables in this layout (partitioned: time partitions).",
+    )
     return parser
 
 
@@ -159,6 +182,7 @@ def main(argv: Sequence[str] | None = None, *, stdout: TextIO | None = None) ->
         dry_run=bool(args.dry_run),
         connect_attempts=int(args.connect_attempts),
         connect_delay_seconds=float(args.connect_delay_seconds),
+        market_storage=args.market_storage,
     ):
         print(f"kolabi-purge: {line}", file=out)
     return 0
@@ -1,3 +1,20 @@
+"""Retention pruning for append-only and sampled state tables.
+
+Purpose: keep private state and telemetry tables bounded without touching
+the ingest path.
+Inputs: a session, the scope filters and retention settings.
+Outputs: `PruneResult` with the number of deleted rows.
+Side effects: DELETE statements in the caller's transaction.
+Important types: `PruneResult`.
+Role: persistence helper.
+
+Sampled state tables (balances, positions) keep, per identity and newest
+first: the first row, every state change, and repeated states spaced by at
+least the sample interval, all within the cutoff and the count limit.
+`_prune_sampled_state_sql` runs those rules as one DELETE in PostgreSQL; the
+row-by-row `_prune_sampled_state` walk is kept as the reference behaviour
+(`sql_sampling=False`).
+"""
 from __future__ import annotations
 
 from collections.abc import Callable, Sequence
@@ -5,7 +22,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, TypeVar, cast
 
-from sqlalchemy import delete, select
+from sqlalchemy import cast as sql_cast
+from sqlalchemy import delete, false, func, literal, or_, select, true, tuple_
 from sqlalchemy.engine import CursorResult
 from sqlalchemy.orm import Session
 
@@ -19,6 +37,17 @@ from kolabi.shared.persistence.models import (
 
 T = TypeVar("T")
 
+_POSITION_STATE_COLUMNS = (
+    AccountPosition.size,
+    AccountPosition.entry_price,
+    AccountPosition.leverage,
+    AccountPosition.liquidation_price,
+    AccountPosition.available_margin,
+    AccountPosition.maintenance_margin,
+    AccountPosition.maintenance_margin_buffer,
+    AccountPosition.funding_rate,
+)
+
 
 @dataclass(frozen=True)
 class PruneResult:
@@ -52,15 +81,22 @@ def prune_time_count(
         ))
         deleted += int(result.rowcount or 0)
     if retention_limit > 0:
-        keep_ids = (
-            select(model.id)
+        # Delete below the newest `retention_limit`-th row instead of a
+        # NOT IN over every kept id.
+        boundary = (
+            select(time_column.label("ts"), model.id.label("id"))
             .where(*filters)
             .order_by(time_column.desc(), model.id.desc())
-            .limit(retention_limit)
+            .offset(retention_limit - 1)
+            .limit(1)
+            .subquery("retention_boundary")
         )
         result = cast(CursorResult[Any], session.execute(
             delete(model)
-            .where(*filters, model.id.notin_(keep_ids))
+            .where(
+                *filters,
+                tuple_(time_column, model.id) < tuple_(boundary.c.ts, boundary.c.id),
+            )
             .execution_options(synchronize_session=False)
         ))
         deleted += int(result.rowcount or 0)
@@ -77,15 +113,30 @@ def prune_account_balances(
     retention_limit: int,
     sample_interval_seconds: float,
     now: datetime,
+    sql_sampling: bool = True,
 ) -> PruneResult:
+    filters = (
+        AccountBalance.exchange == exchange,
+        AccountBalance.environment == environment,
+        AccountBalance.account_scope == account_scope,
+    )
+    if sql_sampling:
+        return _prune_sampled_state_sql(
+            session,
+            model=AccountBalance,
+            filters=filters,
+            identity=(AccountBalance.asset,),
+            state=(AccountBalance.available, AccountBalance.locked, AccountBalance.total),
+            time_column=AccountBalance.local_timestamp,
+            retention_minutes=retention_minutes,
+            retention_limit=retention_limit,
+            sample_interval_seconds=sample_interval_seconds,
+            now=now,
+        )
     rows = (
         session.execute(
             select(AccountBalance)
-            .where(
-                AccountBalance.exchange == exchange,
-                AccountBalance.environment == environment,
-                AccountBalance.account_scope == account_scope,
-            )
+            .where(*filters)
             .order_by(
                 AccountBalance.asset.asc(),
                 AccountBalance.local_timestamp.desc(),
@@ -120,16 +171,31 @@ def prune_account_positions(
     retention_limit: int,
     sample_interval_seconds: float,
     now: datetime,
+    sql_sampling: bool = True,
 ) -> PruneResult:
+    filters = (
+        AccountPosition.exchange == exchange,
+        AccountPosition.environment == environment,
+        AccountPosition.market_type == market_type,
+        AccountPosition.account_scope == account_scope,
+    )
+    if sql_sampling:
+        return _prune_sampled_state_sql(
+            session,
+            model=AccountPosition,
+            filters=filters,
+            identity=(AccountPosition.symbol, AccountPosition.side),
+            state=_POSITION_STATE_COLUMNS,
+            time_column=AccountPosition.local_timestamp,
+            retention_minutes=retention_minutes,
+            retention_limit=retention_limit,
+            sample_interval_seconds=sample_interval_seconds,
+            now=now,
+        )
     rows = (
         session.execute(
             select(AccountPosition)
-            .where(
-                AccountPosition.exchange == exchange,
-                AccountPosition.environment == environment,
-                AccountPosition.market_type == market_type,
-                AccountPosition.account_scope == account_scope,
-            )
+            .where(*filters)
             .order_by(
                 AccountPosition.symbol.asc(),
                 AccountPosition.side.asc(),
@@ -145,15 +211,8 @@ def prune_account_positions(
         model=AccountPosition,
         rows=rows,
         identity=lambda row: (row.symbol, row.side),
-        state=lambda row: (
-            row.size,
-            row.entry_price,
-            row.leverage,
-            row.liquidation_price,
-            row.available_margin,
-            row.maintenance_margin,
-            row.maintenance_margin_buffer,
-            row.funding_rate,
+        state=lambda row: tuple(
+            getattr(row, column.key) for column in _POSITION_STATE_COLUMNS
         ),
         timestamp=lambda row: row.local_timestamp,
         retention_minutes=retention_minutes,
@@ -306,6 +365,147 @@ def _prune_sampled_state(
     return PruneResult(deleted_rows=deleted)
 
 
+def _prune_sampled_state_sql(
+    session: Session,
+    *,
+    model: type[Any],
+    filters: Sequence[Any],
+    identity: Sequence[Any],
+    state: Sequence[Any],
+    time_column: Any,
+    retention_minutes: int,
+    retention_limit: int,
+    sample_interval_seconds: float,
+    now: datetime,
+) -> PruneResult:
+    """`_prune_sampled_state` as a single DELETE, without loading rows.
+
+    Walking newest first, the state last kept always equals the state of the
+    previous row until the cutoff or the limit is reached. So "state change"
+    is a `lag()` comparison, and every change inside the cutoff starts a run
+    that ends at the next change (`lead()` over the change points). Inside a
+    run the sample-gap rule is greedy: a recursive CTE jumps from each kept
+    row to the first row at least `sample_interval_seconds` older, through
+    the (identity, time) index, and stops at the cutoff or at the run end.
+    The count limit then keeps the newest `retention_limit` candidates per
+    identity, and the DELETE is an anti-join on that keep set.
+    """
+    cutoff = now - timedelta(minutes=retention_minutes) if retention_minutes > 0 else None
+    min_gap = timedelta(seconds=max(0.0, sample_interval_seconds))
+    order = (time_column.desc(), model.id.desc())
+    identity_names = [column.key for column in identity]
+    ordered = (
+        select(
+            model.id.label("id"),
+            time_column.label("ts"),
+            *identity,
+            func.row_number().over(partition_by=identity, order_by=order).label("rn"),
+            or_(
+                false(),
+                *(
+                    column.is_distinct_from(
+                        func.lag(column).over(partition_by=identity, order_by=order)
+                    )
+                    for column in state
+                ),
+            ).label("changed"),
+        )
+        .where(*filters)
+        .subquery("ordered")
+    )
+    in_window = ordered.c.ts >= cutoff if cutoff is not None else true()
+    if min_gap <= timedelta(0):
+        # Without a sample gap every row inside the cutoff is kept.
+        candidates = (
+            select(
+                ordered.c.id,
+                ordered.c.ts,
+                *(ordered.c[name] for name in identity_names),
+            )
+            .where(or_(ordered.c.rn == 1, in_window))
+            .cte("sampled_keep")
+        )
+    else:
+        change_order = (ordered.c.ts.desc(), ordered.c.id.desc())
+        change_partition = [ordered.c[name] for name in identity_names]
+        runs = (
+            select(
+                ordered.c.id,
+                ordered.c.ts,
+                *change_partition,
+                ordered.c.rn,
+                func.lead(ordered.c.ts)
+                .over(partition_by=change_partition, order_by=change_order)
+                .label("run_end_ts"),
+                func.lead(ordered.c.id)
+                .over(partition_by=change_partition, order_by=change_order)
+                .label("run_end_id"),
+            )
+            .where(or_(ordered.c.rn == 1, ordered.c.changed))
+            .subquery("runs")
+        )
+        columns = ("id", "ts", *identity_names, "run_end_ts", "run_end_id")
+        run_in_window = runs.c.ts >= cutoff if cutoff is not None else true()
+        chain = (
+            select(*(runs.c[name] for name in columns))
+            .where(or_(runs.c.rn == 1, run_in_window))
+            .cte("sampled_keep", recursive=True)
+        )
+        # Indexable lower bound: the run end, else the cutoff.
+        lower_bound = (
+            func.greatest(chain.c.run_end_ts, cutoff)
+            if cutoff is not None
+            else func.coalesce(
+                chain.c.run_end_ts,
+                sql_cast(literal("-infinity"), time_column.type),
+            )
+        )
+        step = (
+            select(model.id.label("id"), time_column.label("ts"))
+            .where(
+                *filters,
+                *(column == chain.c[column.key] for column in identity),
+                time_column <= chain.c.ts - min_gap,
+                time_column >= lower_bound,
+                or_(
+                    chain.c.run_end_id.is_(None),
+                    tuple_(time_column, model.id)
+                    > tuple_(chain.c.run_end_ts, chain.c.run_end_id),
+                ),
+            )
+            .order_by(*order)
+            .limit(1)
+            .lateral("next_sample")
+        )
+        candidates = chain.union_all(
+            select(
+                step.c.id,
+                step.c.ts,
+                *(chain.c[name] for name in identity_names),
+                chain.c.run_end_ts,
+                chain.c.run_end_id,
+            ).select_from(chain.join(step, true()))
+        )
+    ranked = select(
+        candidates.c.id,
+        func.row_number()
+        .over(
+            partition_by=[candidates.c[name] for name in identity_names],
+            order_by=(candidates.c.ts.desc(), candidates.c.id.desc()),
+        )
+        .label("kept_rank"),
+    ).subquery("ranked")
+    kept = select(ranked.c.id).where(ranked.c.id == model.id)
+    if retention_limit > 0:
+        kept = kept.where(ranked.c.kept_rank <= retention_limit)
+    result = cast(CursorResult[Any], session.execute(
+        delete(model)
+        .where(*filters, ~kept.exists())
+        .execution_options(synchronize_session=False)
+    ))
+    return PruneResult(deleted_rows=int(result.rowcount or 0))
+
+
 @dataclass
 class _StateGroup:
     kept_count: int = 0
@@ -0,0 +1,238 @@
+"""Per-route REST weight budgets and token buckets.
+
+Purpose: pace trading REST calls per `(exchange, market_type, account_scope)`
+lane against the venue's published request-weight budget instead of one global
+interval shared by every route.
+Inputs: `RouteBudget` tables (capacity, refill rate, per-operation weights),
+a headroom fraction, and used-weight / retry-after hints read from responses.
+Outputs: `TokenBucket` objects shared by the Ogun flight gate (which spends
+tokens) and the adapters (which correct them from response headers).
+Side effects: none besides in-memory counters.
+Important types: `RouteBudget`, `TokenBucket`, `RateLimitRegistry`.
+Role: shared infrastructure.
+
+The bot service builds one registry and hands it to the routing port and every
+adapter; components built alone get no bucket and stay unpaced. Buckets refill
+continuously and may go negative: a header that reports more used weight than
+we counted, or a 429 with `Retry-After`, pushes the next launch out instead of
+failing the call. Venues without a known budget get no bucket.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Callable, Mapping
+
+RateLimitKey = tuple[str, str, str]
+"""`(exchange, market_type, account_scope)`."""
+
+PLACE = "place"
+AMEND = "amend"
+CANCEL = "cancel"
+PLACE_BATCH = "place_batch"
+CANCEL_BATCH = "cancel_batch"
+
+_DEFAULT_HEADROOM = 0.8
+
+
+@dataclass(frozen=True)
+class RouteBudget:
+    """Published REST budget of one venue lane.
+
+    `weights` maps an operation to `(per_call, per_item)`; a batch of `n`
+    commands costs `per_call + n * per_item`. Unknown operations cost 1.
+    """
+
+    capacity: float
+    refill_per_second: float
+    weights: Mapping[str, tuple[float, float]] = field(default_factory=dict)
+
+    def cost(self, operation: str, items: int = 1) -> float:
+        per_call, per_item = self.weights.get(operation, (1.0, 0.0))
+        return per_call + per_item * max(1, items)
+
+
+_SINGLE_WEIGHT = {
+    PLACE: (1.0, 0.0),
+    AMEND: (1.0, 0.0),
+    CANCEL: (1.0, 0.0),
+    PLACE_BATCH: (1.0, 0.0),
+    CANCEL_BATCH: (1.0, 0.0),
+}
+
+KNOWN_BUDGETS: dict[tuple[str, str], RouteBudget] = {
+    # Kraken Futures derivatives API: 500 cost units per 10 s; send/edit/cancel
+    # cost 10, batchorder costs 9 plus one per instruction.
+    ("kraken", "futures"): RouteBudget(
+        capacity=500.0,
+        refill_per_second=50.0,
+        weights={
+            PLACE: (10.0, 0.0),
+            AMEND: (10.0, 0.0),
+            CANCEL: (10.0, 0.0),
+            PLACE_BATCH: (9.0, 1.0),
+            CANCEL_BATCH: (9.0, 1.0),
+        },
+    ),
+    # Kraken Spot trading counter: starter tier caps at 60 and decays 1/s.
+    ("kraken", "spot"): RouteBudget(60.0, 1.0, _SINGLE_WEIGHT),
+    ("kraken", "margin"): RouteBudget(60.0, 1.0, _SINGLE_WEIGHT),
+    # Binance USD-M REQUEST_WEIGHT: 2400 per minute; batchOrders POST weighs 5.
+    ("binance", "futures"): RouteBudget(
+        capacity=2400.0,
+        refill_per_second=40.0,
+        weights={**_SINGLE_WEIGHT, PLACE_BATCH: (5.0, 0.0)},
+    ),
+    # Binance Spot/Margin REQUEST_WEIGHT: 6000 per minute.
+    ("binance", "spot"): RouteBudget(6000.0, 100.0, _SINGLE_WEIGHT),
+    ("binance", "margin"): RouteBudget(6000.0, 100.0, _SINGLE_WEIGHT),
+    ("binance", "isolated_margin"): RouteBudget(6000.0, 100.0, _SINGLE_WEIGHT),
+    # BitMEX: 120 requests per minute, one request per bulk cancel.
+    ("bitmex", "futures"): RouteBudget(120.0, 2.0, _SINGLE_WEIGHT),
+    ("bitmex", "spot"): RouteBudget(120.0, 2.0, _SINGLE_WEIGHT),
+}
+
+
+@dataclass(frozen=True)
+class TokenBucketStats:
+    """Counters for status lines."""
+
+    tokens: float
+    capacity: float
+    spent: float
+    waits: int
+    header_updates: int
+
+
+class TokenBucket:
+    """Thread-safe continuous-refill bucket for one rate-limit lane."""
+
+    def __init__(
+        self,
+        budget: RouteBudget,
+        *,
+        headroom: float = _DEFAULT_HEADROOM,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.budget = budget
+        self.headroom = min(1.0, max(0.0, float(headroom)))
+        self.capacity = budget.capacity * self.headroom
+        self.refill_per_second = budget.refill_per_second * self.headroom
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._spent = 0.0
+        self._waits = 0
+        self._header_updates = 0
+
+    def cost(self, operation: str, items: int = 1) -> float:
+        return self.budget.cost(operation, items)
+
+    def delay_for(self, cost: float) -> float:
+        """Seconds until `cost` tokens are available (0 when they already are)."""
+
+        with self._lock:
+            self._refill()
+            missing = min(cost, self.capacity) - self._tokens
+            if missing <= 0:
+                return 0.0
+            self._waits += 1
+            if self.refill_per_second <= 0:
+                return float("inf")
+            return missing / self.refill_per_second
+
+    def take(self, cost: float) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens -= cost
+            self._spent += cost
+
+    def observe_used(self, used: float) -> None:
+        """Resync from a venue-reported used weight (e.g. `X-MBX-USED-WEIGHT-1M`)."""
+
+        with self._lock:
+            self._refill()
+            self._tokens = self.capacity - used * self.headroom
+            self._header_updates += 1
+
+    def observe_retry_after(self, seconds: float) -> None:
+        """Hold launches for `seconds` after a 429/418 from the venue."""
+
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -self.refill_per_second * max(0.0, seconds))
+            self._header_updates += 1
+
+    def stats(self) -> TokenBucketStats:
+        with self._lock:
+            self._refill()
+            return TokenBucketStats(
+                tokens=self._tokens,
+                capacity=self.capacity,
+                spent=self._spent,
+                waits=self._waits,
+                header_updates=self._header_updates,
+            )
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated_at)
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+
+
+class RateLimitRegistry:
+    """One `TokenBucket` per `(exchange, market_type, account_scope)` lane."""
+
+    def __init__(
+        self,
+        budgets: Mapping[tuple[str, str], RouteBudget] | None = None,
+        *,
+        headroom: float = _DEFAULT_HEADROOM,
+    ) -> None:
+        self.budgets = dict(KNOWN_BUDGETS if budgets is None else budgets)
+        self.headroom = headroom
+        self._buckets: dict[RateLimitKey, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.headroom > 0
+
+    def bucket(
+        self, exchange: str, market_type: str, account_scope: str = "default"
+    ) -> TokenBucket | None:
+        if not self.enabled:
+            return None
+        budget = self.budgets.get((exchange, market_type))
+        if budget is None:
+            return None
+        key = (exchange, market_type, account_scope or "default")
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(budget, headroom=self.headroom)
+                self._buckets[key] = bucket
+            return bucket
+
+    def stats(self) -> dict[RateLimitKey, TokenBucketStats]:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {key: bucket.stats() for key, bucket in buckets.items()}
+
+
+__all__ = [
+    "AMEND",
+    "CANCEL",
+    "CANCEL_BATCH",
+    "KNOWN_BUDGETS",
+    "PLACE",
+    "PLACE_BATCH",
+    "RateLimitKey",
+    "RateLimitRegistry",
+    "RouteBudget",
+    "TokenBucket",
+    "TokenBucketStats",
+]
@@ -4,35 +4,68 @@ Purpose: provide typed public/private state snapshots used by bot runtime
 preflight and pair-cycle execution.
 Inputs: PostgreSQL URLs, exchange/environment/symbol filters.
 Outputs: `PublicMarketState`, `PrivateFeedState`, `StrategyRuntimeState`.
-Side effects: database reads and polling sleeps in wait loops.
+Side effects: database reads and polling sleeps in wait loops; the optional
+`AsyncRuntimeStateReader` runs the same reads on a dedicated thread pool.
 Important types: typed DB records (`PublicBookRecord`, `PrivateOrderRecord`,
-`PrivatePositionRecord`) and state dataclasses.
+`PrivatePositionRecord`), state dataclasses and `StateReadMetrics`.
 Role: boundary adapter.
 Transitional: yes, typed row adapters are incremental over existing ORM models.
 """
 from __future__ import annotations
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from time import sleep
-from typing import Any
-
-from sqlalchemy import and_, or_, select
+from functools import partial, wraps
+from time import perf_counter, sleep
+from typing import Any, Callable, Iterable, Iterator, Sequence, TypeVar
+
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    String,
+    Values,
+    and_,
+    any_,
+    cast,
+    column,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, distinct_on
 from sqlalchemy.exc import OperationalError, ProgrammingError
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session, aliased, sessionmaker
 
 from kolabi.shared.core.runtime_types import (
+    PrivateDelta,
+    PrivateDeltaQuery,
     PrivateFillRecord,
     PrivateOrderRecord,
     PrivatePositionRecord,
     PublicBookRecord,
     PublicIndicatorRecord,
+    RouteKey,
+)
+from kolabi.shared.instrument_cache import (
+    DB_SOURCE,
+    InstrumentMetadataCache,
+    load_instrument_record,
+    load_instrument_records,
 )
 from kolabi.shared.persistence import (
     AccountPosition,
     ExchangeFill,
-    ExchangeInstrument,
     ExchangeOrder,
+    MarketIndicator,
+    MarketSnapshot,
     create_persistence_engine,
 )
 from kolabi.tree.account import AccountStreamConfig, latest_connection
@@ -113,6 +146,120 @@ class StrategyRuntimeState:
 
 
 _MISSING_SCHEMA_EXCEPTIONS = (OperationalError, ProgrammingError)
+_LATENCY_BUCKETS_MS = (1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0)
+_T = TypeVar("_T")
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram in milliseconds."""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = _LATENCY_BUCKETS_MS) -> None:
+        self.buckets_ms = buckets_ms
+        self._counts = [0] * (len(buckets_ms) + 1)
+        self._count = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        elapsed_ms = max(0.0, seconds * 1000.0)
+        index = len(self.buckets_ms)
+        for position, upper in enumerate(self.buckets_ms):
+            if elapsed_ms <= upper:
+                index = position
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._total_ms += elapsed_ms
+            self._max_ms = max(self._max_ms, elapsed_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            count = self._count
+            total_ms = self._total_ms
+            max_ms = self._max_ms
+        buckets = {f"le_{upper:g}ms": counts[index] for index, upper in enumerate(self.buckets_ms)}
+        buckets["inf"] = counts[-1]
+        return {
+            "count": count,
+            "total_ms": round(total_ms, 3),
+            "mean_ms": round(total_ms / count, 3) if count else None,
+            "max_ms": round(max_ms, 3),
+            "p50_ms": self._quantile_upper(counts, count, 0.50),
+            "p99_ms": self._quantile_upper(counts, count, 0.99),
+            "buckets": buckets,
+        }
+
+    def _quantile_upper(self, counts: list[int], count: int, quantile: float) -> float | None:
+        if count == 0:
+            return None
+        target = quantile * count
+        seen = 0
+        for index, bucket_count in enumerate(counts[:-1]):
+            seen += bucket_count
+            if seen >= target:
+                return self.buckets_ms[index]
+        return float("inf")
+
+
+class StateReadMetrics:
+    """Per-query latency histograms for runtime state reads.
+
+    `loop_blocking` records the time the asyncio loop thread itself spent in a
+    state read: the full query in sync mode, only the executor hand-off in async
+    mode.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            return histogram
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.histogram(name).observe(seconds)
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - started)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histograms[name].snapshot() for name in sorted(histograms)}
+
+    def summary_lines(self) -> list[str]:
+        lines = []
+        for name, stats in self.snapshot().items():
+            lines.append(
+                f"{name} n={stats['count']} mean_ms={stats['mean_ms']} "
+                f"p50_ms<={stats['p50_ms']} p99_ms<={stats['p99_ms']} "
+                f"max_ms={stats['max_ms']}"
+            )
+        return lines
+
+
+def _timed_read(method: Callable[..., _T]) -> Callable[..., _T]:
+    """Record the wrapped client read into `self.read_metrics`."""
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self: "KrakenRuntimeStateClient", *args: Any, **kwargs: Any) -> _T:
+        with self.read_metrics.timed(name):
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 def _is_missing_schema_error(exc: BaseException) -> bool:
@@ -189,6 +336,7 @@ class KrakenRuntimeStateClient:
         max_public_age_seconds: float = 15.0,
         max_private_age_seconds: float = 30.0,
         max_reconcile_age_seconds: float = 300.0,
+        instrument_cache: InstrumentMetadataCache | None = None,
     ) -> None:
         self.market_db_url = market_db_url
         self.account_db_url = account_db_url
@@ -216,7 +364,10 @@ class KrakenRuntimeStateClient:
             expire_on_commit=False,
             class_=Session,
         )
+        self.read_metrics = StateReadMetrics()
+        self.instrument_cache = instrument_cache or InstrumentMetadataCache()
 
+    @_timed_read
     def fetch_market_state(
         self,
         symbol: str | None = None,
@@ -249,48 +400,26 @@ class KrakenRuntimeStateClient:
                     self.environment,
                     target_market_type,
                 )
-                public_book = _public_book_record_from_snapshot(snapshot, target_symbol)
-                tick_size = _instrument_tick_size(
-                    session,
-                    symbol=target_symbol,
-                    exchange=target_exchange,
-                    environment=self.environment,
-                    market_type=target_market_type,
+                instrument_key = (
+                    target_exchange,
+                    self.environment,
+                    target_market_type,
+                    target_symbol,
                 )
-                public_indicators = _public_indicator_records(indicators, target_symbol)
-                freshest_local_time = _latest_public_timestamp(
-                    snapshot.local_timestamp,
-                    indicators,
+                instrument = self.instrument_cache.get_or_load(
+                    DB_SOURCE,
+                    instrument_key,
+                    partial(load_instrument_record, session, instrument_key),
                 )
-                age_seconds = _age_seconds(freshest_local_time, current_time)
-                source_age_seconds = _age_seconds(snapshot.source_timestamp, current_time)
-                ready = (
-                    age_seconds is not None
-                    and age_seconds <= self.max_public_age_seconds
+                tick_size = _positive_tick_size(
+                    None if instrument is None else instrument.tick_size
                 )
-                reason = None if ready else "public market data is stale"
-                return PublicMarketState(
-                    symbol=target_symbol,
-                    best_bid=public_book.best_bid,
-                    best_ask=public_book.best_ask,
-                    mid_price=public_book.mid_price,
-                    last_price=_indicator_value(indicators, "last_price"),
-                    mark_price=_indicator_value(indicators, "mark_price"),
-                    index_price=_indicator_value(indicators, "index_price"),
-                    tick_size=tick_size,
-                    spread=public_book.spread,
-                    imbalance=public_book.imbalance,
-                    avg_bid=public_book.avg_bid,
-                    avg_ask=public_book.avg_ask,
-                    recorded_at=public_book.recorded_at,
-                    source_timestamp=public_book.source_timestamp,
-                    age_seconds=age_seconds,
-                    source_age_seconds=source_age_seconds,
-                    indicators={
-                        record.name: record.value for record in public_indicators
-                    },
-                    ready=ready,
-                    reason=reason,
+                return self._public_market_state(
+                    target_symbol,
+                    snapshot,
+                    indicators,
+                    tick_size,
+                    current_time,
                 )
         except _MISSING_SCHEMA_EXCEPTIONS as exc:
             if not _is_missing_schema_error(exc):
@@ -300,6 +429,160 @@ class KrakenRuntimeStateClient:
                 "public market DB schema missing",
             )
 
+    @_timed_read
+    def fetch_market_states(
+        self,
+        routes: Iterable[RouteKey],
+    ) -> dict[RouteKey, PublicMarketState]:
+        """Load `fetch_market_state` for many `(exchange, market_type, symbol)` routes.
+
+        Two statements whatever the route count: latest snapshot through a
+        LATERAL join, then the latest indicator per name (DISTINCT ON). Tick
+        sizes come from `instrument_cache`; routes it misses are loaded in one
+        extra statement.
+        """
+        keys = tuple(dict.fromkeys(routes))
+        if not keys:
+            return {}
+        current_time = datetime.now(timezone.utc)
+        try:
+            with self._market_sessionmaker() as session:
+                route_values = _route_values(keys)
+                snapshot_query = (
+                    select(MarketSnapshot)
+                    .where(
+                        MarketSnapshot.exchange == route_values.c.exchange,
+                        MarketSnapshot.market_type == route_values.c.market_type,
+                        MarketSnapshot.symbol == route_values.c.symbol,
+                        MarketSnapshot.environment == self.environment,
+                    )
+                    .order_by(MarketSnapshot.local_timestamp.desc(), MarketSnapshot.id.desc())
+                    .limit(1)
+                    .lateral("latest_snapshot")
+                )
+                snapshot_alias = aliased(MarketSnapshot, snapshot_query)
+                latest_rows = session.execute(
+                    select(
+                        route_values.c.exchange,
+                        route_values.c.market_type,
+                        route_values.c.symbol,
+                        snapshot_alias,
+                    )
+                    .select_from(route_values)
+                    .outerjoin(snapshot_query, true())
+                ).all()
+                indicator_rows = session.execute(
+                    select(MarketIndicator)
+                    .where(
+                        MarketIndicator.environment == self.environment,
+                        tuple_(
+                            MarketIndicator.exchange,
+                            MarketIndicator.market_type,
+                            MarketIndicator.symbol,
+                        ).in_(keys),
+                    )
+                    .ext(
+                        distinct_on(
+                            MarketIndicator.exchange,
+                            MarketIndicator.market_type,
+                            MarketIndicator.symbol,
+                            MarketIndicator.indicator_name,
+                        )
+                    )
+                    .order_by(
+                        MarketIndicator.exchange,
+                        MarketIndicator.market_type,
+                        MarketIndicator.symbol,
+                        MarketIndicator.indicator_name,
+                        MarketIndicator.id.desc(),
+                    )
+                ).scalars().all()
+                instruments, missing_keys = self.instrument_cache.get_many(
+                    DB_SOURCE,
+                    [
+                        (exchange, self.environment, market_type, symbol)
+                        for exchange, market_type, symbol in keys
+                    ],
+                )
+                for instrument_key, record in load_instrument_records(
+                    session,
+                    missing_keys,
+                ).items():
+                    self.instrument_cache.put(DB_SOURCE, instrument_key, record)
+                    instruments[instrument_key] = record
+        except _MISSING_SCHEMA_EXCEPTIONS as exc:
+            if not _is_missing_schema_error(exc):
+                raise
+            return {
+                key: _missing_public_market_state(key[2], "public market DB schema missing")
+                for key in keys
+            }
+        indicators_by_route: dict[RouteKey, dict[str, Any]] = {}
+        for indicator in indicator_rows:
+            route_key = (indicator.exchange, indicator.market_type, indicator.symbol)
+            indicators_by_route.setdefault(route_key, {})[indicator.indicator_name] = indicator
+        states: dict[RouteKey, PublicMarketState] = {}
+        for route_exchange, route_market_type, route_symbol, snapshot in latest_rows:
+            route_key = (route_exchange, route_market_type, route_symbol)
+            instrument = instruments.get(
+                (route_exchange, self.environment, route_market_type, route_symbol)
+            )
+            if snapshot is None:
+                states[route_key] = _missing_public_market_state(
+                    route_symbol,
+                    "missing public market snapshot",
+                )
+                continue
+            states[route_key] = self._public_market_state(
+                route_symbol,
+                snapshot,
+                indicators_by_route.get(route_key, {}),
+                _positive_tick_size(None if instrument is None else instrument.tick_size),
+                current_time,
+            )
+        return states
+
+    def _public_market_state(
+        self,
+        symbol: str,
+        snapshot: MarketSnapshot,
+        indicators: dict[str, Any],
+        tick_size: float | None,
+        current_time: datetime,
+    ) -> PublicMarketState:
+        public_book = _public_book_record_from_snapshot(snapshot, symbol)
+        public_indicators = _public_indicator_records(indicators, symbol)
+        freshest_local_time = _latest_public_timestamp(
+            snapshot.local_timestamp,
+            indicators,
+        )
+        age_seconds = _age_seconds(freshest_local_time, current_time)
+        source_age_seconds = _age_seconds(snapshot.source_timestamp, current_time)
+        ready = age_seconds is not None and age_seconds <= self.max_public_age_seconds
+        reason = None if ready else "public market data is stale"
+        return PublicMarketState(
+            symbol=symbol,
+            best_bid=public_book.best_bid,
+            best_ask=public_book.best_ask,
+            mid_price=public_book.mid_price,
+            last_price=_indicator_value(indicators, "last_price"),
+            mark_price=_indicator_value(indicators, "mark_price"),
+            index_price=_indicator_value(indicators, "index_price"),
+            tick_size=tick_size,
+            spread=public_book.spread,
+            imbalance=public_book.imbalance,
+            avg_bid=public_book.avg_bid,
+            avg_ask=public_book.avg_ask,
+            recorded_at=public_book.recorded_at,
+            source_timestamp=public_book.source_timestamp,
+            age_seconds=age_seconds,
+            source_age_seconds=source_age_seconds,
+            indicators={record.name: record.value for record in public_indicators},
+            ready=ready,
+            reason=reason,
+        )
+
+    @_timed_read
     def fetch_runtime_state(
         self,
         symbol: str | None = None,
@@ -374,6 +657,7 @@ class KrakenRuntimeStateClient:
             market_type=target_market_type,
         )
 
+    @_timed_read
     def fetch_private_orders_since(
         self,
         *,
@@ -419,6 +703,7 @@ class KrakenRuntimeStateClient:
             rows = session.execute(statement).scalars().all()
         return tuple(_private_order_record(row) for row in rows)
 
+    @_timed_read
     def fetch_private_fills_since(
         self,
         *,
@@ -465,6 +750,7 @@ class KrakenRuntimeStateClient:
             rows = session.execute(statement).all()
         return tuple(_private_order_record_from_fill(fill_row, order_row) for fill_row, order_row in rows)
 
+    @_timed_read
     def fetch_private_orders_for_identities(
         self,
         *,
@@ -503,6 +789,7 @@ class KrakenRuntimeStateClient:
             rows = session.execute(statement).scalars().all()
         return tuple(_private_order_record(row) for row in rows)
 
+    @_timed_read
     def fetch_latest_private_orders(
         self,
         *,
@@ -546,6 +833,7 @@ class KrakenRuntimeStateClient:
             return records
         return tuple(record for record in records if _private_order_record_is_open(record))
 
+    @_timed_read
     def fetch_private_fills_for_identities(
         self,
         *,
@@ -588,6 +876,138 @@ class KrakenRuntimeStateClient:
             for fill_row, order_row in rows
         )
 
+    @_timed_read
+    def fetch_private_deltas(
+        self,
+        queries: Sequence[PrivateDeltaQuery],
+        *,
+        limit: int = 200,
+        identity_limit: int = 400,
+    ) -> dict[RouteKey, PrivateDelta]:
+        """Bulk form of the four per-route private polling reads.
+
+        One statement for orders and one for fills whatever the route count;
+        each route keeps its own cursor and limits through a LATERAL join.
+        """
+        if not queries:
+            return {}
+        cursor_values = values(
+            column("exchange", String),
+            column("market_type", String),
+            column("symbol", String),
+            column("order_ts", DateTime(timezone=True)),
+            column("order_id", Integer),
+            column("fill_ts", DateTime(timezone=True)),
+            column("fill_id", Integer),
+            column("client_ids", ARRAY(String)),
+            column("exchange_ids", ARRAY(String)),
+            name="cursors",
+        ).data(
+            [
+                (
+                    query.exchange,
+                    query.market_type,
+                    query.symbol,
+                    _optional_cursor_timestamp(query.after_order_timestamp),
+                    query.after_order_id,
+                    _optional_cursor_timestamp(query.after_fill_timestamp),
+                    query.after_fill_id,
+                    list(query.client_order_ids),
+                    list(query.exchange_order_ids),
+                )
+                for query in queries
+            ]
+        )
+        route_predicates = (
+            ExchangeOrder.exchange == cursor_values.c.exchange,
+            ExchangeOrder.environment == self.environment,
+            ExchangeOrder.market_type == cursor_values.c.market_type,
+            ExchangeOrder.account_scope == self.account_scope,
+            ExchangeOrder.symbol == cursor_values.c.symbol,
+        )
+        identity_predicate = or_(
+            ExchangeOrder.client_order_id == any_(cursor_values.c.client_ids),
+            ExchangeOrder.exchange_order_id == any_(cursor_values.c.exchange_ids),
+        )
+        order_rows = union_all(
+            select(ExchangeOrder, literal(False).label("by_identity"))
+            .where(
+                *route_predicates,
+                _after_cursor(
+                    ExchangeOrder.local_timestamp,
+                    ExchangeOrder.id,
+                    cursor_values.c.order_ts,
+                    cursor_values.c.order_id,
+                ),
+            )
+            .order_by(ExchangeOrder.local_timestamp.asc(), ExchangeOrder.id.asc())
+            .limit(limit),
+            select(ExchangeOrder, literal(True).label("by_identity"))
+            .where(*route_predicates, identity_predicate)
+            .order_by(ExchangeOrder.local_timestamp.desc(), ExchangeOrder.id.desc())
+            .limit(identity_limit),
+        ).lateral("private_orders")
+        fill_rows = union_all(
+            select(ExchangeFill, literal(False).label("by_identity"))
+            .join(ExchangeOrder, ExchangeFill.order_id == ExchangeOrder.id)
+            .where(
+                *route_predicates,
+                _after_cursor(
+                    ExchangeFill.local_timestamp,
+                    ExchangeFill.id,
+                    cursor_values.c.fill_ts,
+                    cursor_values.c.fill_id,
+                ),
+            )
+            .order_by(ExchangeFill.local_timestamp.asc(), ExchangeFill.id.asc())
+            .limit(limit),
+            select(ExchangeFill, literal(True).label("by_identity"))
+            .join(ExchangeOrder, ExchangeFill.order_id == ExchangeOrder.id)
+            .where(*route_predicates, identity_predicate)
+            .order_by(ExchangeFill.local_timestamp.desc(), ExchangeFill.id.desc())
+            .limit(identity_limit),
+        ).lateral("private_fills")
+        order_alias = aliased(ExchangeOrder, order_rows)
+        fill_alias = aliased(ExchangeFill, fill_rows)
+        with self._critical_account_sessionmaker() as session:
+            orders = session.execute(
+                select(order_alias, order_rows.c.by_identity)
+                .select_from(cursor_values)
+                .join(order_rows, true())
+            ).all()
+            fills = session.execute(
+                select(fill_alias, ExchangeOrder, fill_rows.c.by_identity)
+                .select_from(cursor_values)
+                .join(fill_rows, true())
+                .join(ExchangeOrder, fill_alias.order_id == ExchangeOrder.id)
+            ).all()
+        buckets: dict[RouteKey, dict[str, list[PrivateOrderRecord]]] = {
+            query.route_key: {
+                "orders": [],
+                "fills": [],
+                "identity_orders": [],
+                "identity_fills": [],
+            }
+            for query in queries
+        }
+        for order_row, by_identity in orders:
+            route_key = (order_row.exchange, order_row.market_type, order_row.symbol)
+            bucket = buckets[route_key]["identity_orders" if by_identity else "orders"]
+            bucket.append(_private_order_record(order_row))
+        for fill_row, order_row, by_identity in fills:
+            route_key = (order_row.exchange, order_row.market_type, order_row.symbol)
+            bucket = buckets[route_key]["identity_fills" if by_identity else "fills"]
+            bucket.append(_private_order_record_from_fill(fill_row, order_row))
+        return {
+            route_key: PrivateDelta(
+                orders=_sorted_by_cursor(bucket["orders"]),
+                fills=_sorted_by_cursor(bucket["fills"]),
+                identity_orders=_sorted_by_cursor(bucket["identity_orders"], newest_first=True),
+                identity_fills=_sorted_by_cursor(bucket["identity_fills"], newest_first=True),
+            )
+            for route_key, bucket in buckets.items()
+        }
+
     def wait_until_ready(
         self,
         *,
@@ -812,6 +1232,89 @@ class KrakenRuntimeStateClient:
         return None if row is None else _private_position_record(row)
 
 
+class AsyncRuntimeStateReader:
+    """Async facade running `KrakenRuntimeStateClient` reads on a dedicated pool.
+
+    The worker count stays below the SQLAlchemy pool size so each in-flight read
+    holds its own connection and the event loop never waits on PostgreSQL.
+    """
+
+    def __init__(
+        self,
+        client: KrakenRuntimeStateClient,
+        *,
+        max_workers: int = 2,
+    ) -> None:
+        self.client = client
+        self.read_metrics = client.read_metrics
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="kola-state-read",
+        )
+
+    async def fetch_market_state(
+        self,
+        symbol: str | None = None,
+        exchange: str | None = None,
+        market_type: str | None = None,
+    ) -> PublicMarketState:
+        return await self._run(
+            self.client.fetch_market_state,
+            symbol=symbol,
+            exchange=exchange,
+            market_type=market_type,
+        )
+
+    async def fetch_runtime_state(self, **kwargs: Any) -> StrategyRuntimeState:
+        return await self._run(self.client.fetch_runtime_state, **kwargs)
+
+    async def fetch_private_orders_since(self, **kwargs: Any) -> tuple[PrivateOrderRecord, ...]:
+        return await self._run(self.client.fetch_private_orders_since, **kwargs)
+
+    async def fetch_private_fills_since(self, **kwargs: Any) -> tuple[PrivateOrderRecord, ...]:
+        return await self._run(self.client.fetch_private_fills_since, **kwargs)
+
+    async def fetch_private_orders_for_identities(
+        self, **kwargs: Any
+    ) -> tuple[PrivateOrderRecord, ...]:
+        return await self._run(self.client.fetch_private_orders_for_identities, **kwargs)
+
+    async def fetch_latest_private_orders(self, **kwargs: Any) -> tuple[PrivateOrderRecord, ...]:
+        return await self._run(self.client.fetch_latest_private_orders, **kwargs)
+
+    async def fetch_private_fills_for_identities(
+        self, **kwargs: Any
+    ) -> tuple[PrivateOrderRecord, ...]:
+        return await self._run(self.client.fetch_private_fills_for_identities, **kwargs)
+
+    async def fetch_market_states(
+        self,
+        routes: Iterable[RouteKey],
+    ) -> dict[RouteKey, PublicMarketState]:
+        return await self._run(self.client.fetch_market_states, routes=tuple(routes))
+
+    async def fetch_private_deltas(
+        self,
+        queries: Sequence[PrivateDeltaQuery],
+        **kwargs: Any,
+    ) -> dict[RouteKey, PrivateDelta]:
+        return await self._run(self.client.fetch_private_deltas, queries=queries, **kwargs)
+
+    def supports(self, method_name: str) -> bool:
+        """Whether the wrapped client implements the optional `method_name` read."""
+        return callable(getattr(self.client, method_name, None))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, func: Callable[..., _T], **kwargs: Any) -> _T:
+        loop = asyncio.get_running_loop()
+        started = perf_counter()
+        future = loop.run_in_executor(self._executor, partial(func, **kwargs))
+        self.read_metrics.observe("loop_blocking", perf_counter() - started)
+        return await future
+
+
 def _age_seconds(value: datetime | None, current_time: datetime) -> float | None:
     """Return the age in seconds for an optional UTC timestamp."""
     if value is None:
@@ -891,31 +1394,22 @@ def _indicator_value(indicators: dict[str, Any], name: str) -> float | None:
     return None
 
 
-def _instrument_tick_size(
-    session: Session,
-    *,
-    symbol: str,
-    exchange: str,
-    environment: str,
-    market_type: str,
-) -> float | None:
-    stmt = (
-        select(ExchangeInstrument.tick_size)
-        .where(
-            ExchangeInstrument.exchange == exchange,
-            ExchangeInstrument.environment == environment,
-            ExchangeInstrument.market_type == market_type,
-            ExchangeInstrument.symbol == symbol,
-        )
-        .order_by(ExchangeInstrument.id.desc())
-        .limit(1)
-    )
-    value = session.execute(stmt).scalar_one_or_none()
+def _positive_tick_size(value: object) -> float | None:
     if isinstance(value, (int, float)) and value > 0:
         return float(value)
     return None
 
 
+def _route_values(keys: Sequence[RouteKey]) -> Values:
+    """Inline `(exchange, market_type, symbol)` rows for LATERAL route joins."""
+    return values(
+        column("exchange", String),
+        column("market_type", String),
+        column("symbol", String),
+        name="routes",
+    ).data(list(keys))
+
+
 def _normalise_cursor_timestamp(value: datetime, peer: datetime) -> datetime:
     """Compare stored timestamps with runtime cursors safely."""
     if value.tzinfo is None or peer.tzinfo is None:
@@ -930,6 +1424,47 @@ def _cursor_timestamp(value: datetime) -> datetime:
     return value.replace(tzinfo=timezone.utc)
 
 
+def _optional_cursor_timestamp(value: datetime | None) -> datetime | None:
+    return None if value is None else _cursor_timestamp(value)
+
+
+def _after_cursor(
+    timestamp_column: Any,
+    id_column: Any,
+    cursor_timestamp: Any,
+    cursor_id: Any,
+) -> Any:
+    """SQL form of the `*_since` cursor: no cursor, later row, or same time and later id."""
+    # All-NULL VALUES columns come back as text; pin their types.
+    cursor_timestamp = cast(cursor_timestamp, DateTime(timezone=True))
+    cursor_id = cast(cursor_id, Integer)
+    return or_(
+        cursor_timestamp.is_(None),
+        timestamp_column > cursor_timestamp,
+        and_(
+            timestamp_column == cursor_timestamp,
+            or_(cursor_id.is_(None), id_column > cursor_id),
+        ),
+    )
+
+
+def _sorted_by_cursor(
+    records: list[PrivateOrderRecord],
+    *,
+    newest_first: bool = False,
+) -> tuple[PrivateOrderRecord, ...]:
+    return tuple(
+        sorted(
+            records,
+            key=lambda record: (
+                datetime.fromisoformat(record.local_timestamp or "1970-01-01T00:00:00+00:00"),
+                record.local_id or 0,
+            ),
+            reverse=newest_first,
+        )
+    )
+
+
 def _private_order_record(row: ExchangeOrder) -> PrivateOrderRecord:
     reason, is_cancel = _order_reason_flags_from_payload(row.raw_payload)
     stop_price = _stop_price_from_payload(row.raw_payload)
@@ -20,7 +20,9 @@ from uuid import uuid4
 
 import requests
 import websockets
-from sqlalchemy import delete, func, inspect, select, text
+from sqlalchemy import delete, func, insert, inspect, or_, select, text
+from sqlalchemy.dialects.postgresql import distinct_on
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session, sessionmaker
 
 from kolabi.shared.config import (
@@ -29,6 +31,7 @@ from kolabi.shared.config import (
 )
 from kolabi.shared.kraken_futures import kraken_futures_environment
 from kolabi.shared.logging import setup_logging
+from kolabi.shared.notify import PRIVATE_CHANNEL, notify_state_change, state_route_label
 from kolabi.shared.persistence import (
     AccountBalance,
     AccountPosition,
@@ -45,11 +48,37 @@ from kolabi.shared.persistence import (
 from kolabi.shared.pruning import DEFAULT_PRUNING
 from kolabi.shared.redaction import redact_url
 from kolabi.tree.kraken import build_engine
+from kolabi.tree.private_index import (
+    OPEN_ORDER_STATUSES,
+    IndexedOrder,
+    IndexedPosition,
+    PrivateStateIndex,
+    shared_private_index,
+)
 
 JsonMapT = Mapping[str, Any]
 JsonDictT = dict[str, Any]
 _REST_RECONCILE_LOG_SECONDS = 300.0
 _REST_RECONCILE_HEADER_EVERY = 50
+# Lignes par INSERT ... ON CONFLICT: reste loin de la limite de 65535 parametres.
+_ORDER_UPSERT_CHUNK_ROWS = 1000
+# Cle de `Session.info`: lignes ordres/positions a appliquer a l'index apres commit.
+_PRIVATE_INDEX_ROWS = "kolabi_private_index_rows"
+# Colonnes reecrites par un evenement sur un ordre deja connu (cf. _merged_order_fields).
+_ORDER_MERGE_COLUMNS = (
+    "status",
+    "side",
+    "order_type",
+    "symbol",
+    "client_order_id",
+    "exchange_order_id",
+    "filled_quantity",
+    "quantity",
+    "price",
+    "source_timestamp",
+    "raw_payload",
+    "local_timestamp",
+)
 
 
 def format_rest_reconcile_header(*, exchange: str = "kraken") -> str:
@@ -224,6 +253,7 @@ class AccountStreamConfig:
         DEFAULT_PRUNING.private_ingest_audit.retention_limit
     )
     forensic_shield_critical: bool = True
+    set_based_ingest: bool = True
     log_level: str = "INFO"
 
 
@@ -430,6 +460,15 @@ class AccountStateStore:
             expire_on_commit=False,
             class_=Session,
         )
+        self.private_index: PrivateStateIndex = shared_private_index(
+            (
+                config.db_url,
+                config.exchange,
+                config.environment,
+                config.market_type,
+                config.account_scope,
+            )
+        )
 
     def ingest_message(
         self,
@@ -470,24 +509,28 @@ class AccountStateStore:
                         source_timestamp=raw_event_source_timestamp(payload),
                         received_at=now,
                     )
-                for mapped in mapped_orders:
-                    row = self._ensure_order_in_session(
-                        session,
-                        mapped,
-                        now=now,
-                    )
-                    order_rows.append(row)
-                    row_count += 1
+                order_rows = self._ensure_orders_in_session(
+                    session,
+                    mapped_orders,
+                    now=now,
+                )
+                row_count += len(order_rows)
             elif feed.startswith("fills"):
-                for fill_payload in iter_fill_payloads(payload):
-                    mapped_fill = map_fill_event(fill_payload)
-                    fill_row = self._record_fill_event_in_session(
-                        session,
-                        mapped_fill,
-                        now=now,
+                mapped_fills = [
+                    map_fill_event(fill_payload)
+                    for fill_payload in iter_fill_payloads(payload)
+                ]
+                fill_rows = list(
+                    zip(
+                        mapped_fills,
+                        self._record_fill_events_in_session(
+                            session,
+                            mapped_fills,
+                            now=now,
+                        ),
                     )
-                    fill_rows.append((mapped_fill, fill_row))
-                    row_count += 1
+                )
+                row_count += len(fill_rows)
             elif feed.startswith("balances"):
                 balances = map_balances(payload)
                 persisted_balances: list[BalanceWrite] = []
@@ -536,7 +579,12 @@ class AccountStateStore:
                 row_count=row_count,
                 error_text=None,
             )
-            session.commit()
+            self._notify_private_changes_in_session(
+                session,
+                order_rows,
+                [event for event, _row in fill_rows],
+            )
+            self._commit_private(session)
         return {
             "feed": feed,
             "raw_event": raw_row,
@@ -589,29 +637,28 @@ class AccountStateStore:
                             source_timestamp=raw_event_source_timestamp(payload),
                             received_at=queued.received_at,
                         )
-                    for mapped in mapped_orders:
-                        order_rows.append(
-                            self._ensure_order_in_session(
+                    order_rows = self._ensure_orders_in_session(
+                        session,
+                        mapped_orders,
+                        now=queued.received_at,
+                    )
+                    row_count += len(order_rows)
+                elif feed.startswith("fills"):
+                    mapped_fills = [
+                        map_fill_event(fill_payload)
+                        for fill_payload in iter_fill_payloads(payload)
+                    ]
+                    fill_rows = list(
+                        zip(
+                            mapped_fills,
+                            self._record_fill_events_in_session(
                                 session,
-                                mapped,
+                                mapped_fills,
                                 now=queued.received_at,
-                            )
+                            ),
                         )
-                        row_count += 1
-                elif feed.startswith("fills"):
-                    for fill_payload in iter_fill_payloads(payload):
-                        mapped_fill = map_fill_event(fill_payload)
-                        fill_rows.append(
-                            (
-                                mapped_fill,
-                                self._record_fill_event_in_session(
-                                    session,
-                                    mapped_fill,
-                                    now=queued.received_at,
-                                ),
-                            )
-                        )
-                        row_count += 1
+                    )
+                    row_count += len(fill_rows)
                 elif feed.startswith("balances"):
                     balances = map_balances(payload)
                     persisted_balances: list[BalanceWrite] = []
@@ -681,9 +728,43 @@ class AccountStateStore:
                     now=datetime.now(timezone.utc),
                     stream_kind=stream_kind,
                 )
-            session.commit()
+            self._notify_private_changes_in_session(
+                session,
+                [row for result in results for row in result["orders"]],
+                [event for result in results for event, _row in result["fills"]],
+            )
+            self._commit_private(session)
         return tuple(results)
 
+    def _notify_private_changes_in_session(
+        self,
+        session: Session,
+        order_rows: Sequence[ExchangeOrder],
+        fill_events: Sequence[FillEvent],
+    ) -> None:
+        """Announce order/fill writes to listening bots (delivered on commit)."""
+        symbols = {row.symbol for row in order_rows if row.symbol}
+        symbols.update(event.symbol for event in fill_events if event.symbol)
+        if not symbols:
+            return
+        session.flush()
+        latest_ids: dict[str, int] = {}
+        for row in order_rows:
+            if row.symbol and row.id is not None:
+                latest_ids[row.symbol] = max(latest_ids.get(row.symbol, 0), row.id)
+        for symbol in sorted(symbols):
+            notify_state_change(
+                session,
+                PRIVATE_CHANNEL,
+                route=state_route_label(
+                    self.config.exchange,
+                    self.config.market_type,
+                    symbol,
+                ),
+                environment=self.config.environment,
+                row_id=latest_ids.get(symbol),
+            )
+
     def prune_private_storage_now(self, *, stream_kind: str) -> None:
         """Apply retention outside the critical ingest path."""
         now = datetime.now(timezone.utc)
@@ -783,42 +864,140 @@ class AccountStateStore:
                 symbol=order.symbol,
             )
         if row is None:
-            row = ExchangeOrder(
-                local_uuid=str(uuid4()),
-                exchange=self.config.exchange,
-                environment=self.config.environment,
-                market_type=self.config.market_type,
-                account_scope=self.config.account_scope,
-                symbol=order.symbol,
-                exchange_order_id=order.exchange_order_id,
-                client_order_id=order.client_order_id,
-                side=order.side,
-                order_type=order.order_type,
-                status=order.status,
-                price=order.price,
-                quantity=order.quantity,
-                filled_quantity=order.filled_quantity,
-                reduce_only=order.reduce_only,
-                raw_payload=order.raw_payload or {},
-                source_timestamp=order.source_timestamp,
-                local_timestamp=now,
-            )
+            row = ExchangeOrder(**self._new_order_values(order, now=now))
             session.add(row)
-            return row
-        row.status = _prefer_known(order.status, row.status)
-        row.side = _prefer_known(order.side, row.side)
-        row.order_type = _prefer_known(order.order_type, row.order_type)
-        row.symbol = _prefer_known(order.symbol, row.symbol)
-        row.client_order_id = order.client_order_id or row.client_order_id
-        row.exchange_order_id = order.exchange_order_id or row.exchange_order_id
-        row.filled_quantity = max(row.filled_quantity, order.filled_quantity)
-        row.quantity = max(row.quantity, order.quantity)
-        row.price = order.price if order.price is not None else row.price
-        row.source_timestamp = order.source_timestamp or row.source_timestamp
-        row.raw_payload = _merge_raw_payload(row.raw_payload, order.raw_payload)
-        row.local_timestamp = now
+        else:
+            current = {column: getattr(row, column) for column in _ORDER_MERGE_COLUMNS}
+            for column, value in _merged_order_fields(current, order, now=now).items():
+                setattr(row, column, value)
+        _stage_private_rows(session, (row,))
         return row
 
+    def _new_order_values(self, order: OrderWrite, *, now: datetime) -> dict[str, Any]:
+        return {
+            "local_uuid": str(uuid4()),
+            "exchange": self.config.exchange,
+            "environment": self.config.environment,
+            "market_type": self.config.market_type,
+            "account_scope": self.config.account_scope,
+            "symbol": order.symbol,
+            "exchange_order_id": order.exchange_order_id,
+            "client_order_id": order.client_order_id,
+            "side": order.side,
+            "order_type": order.order_type,
+            "status": order.status,
+            "price": order.price,
+            "quantity": order.quantity,
+            "filled_quantity": order.filled_quantity,
+            "reduce_only": order.reduce_only,
+            "raw_payload": order.raw_payload or {},
+            "source_timestamp": order.source_timestamp,
+            "local_timestamp": now,
+        }
+
+    def _ensure_orders_in_session(
+        self,
+        session: Session,
+        orders: Sequence[OrderWrite],
+        *,
+        now: datetime,
+    ) -> list[ExchangeOrder]:
+        """Set-based `_ensure_order_in_session` for a whole snapshot or batch.
+
+        One query pre-loads every row matching an incoming exchange or client id;
+        the writes are then folded in memory in arrival order with the same
+        `_prefer_known` / max-filled rules, and flushed with one
+        `INSERT ... ON CONFLICT (local_uuid) DO UPDATE` per chunk. Returns one
+        row per input order, like calling `_ensure_order_in_session` in a loop.
+        """
+        if not self.config.set_based_ingest:
+            return [self._ensure_order_in_session(session, order, now=now) for order in orders]
+        if not orders:
+            return []
+        by_exchange_id: dict[str, dict[str, Any]] = {}
+        by_client_id: dict[str, dict[str, Any]] = {}
+        by_client_symbol: dict[tuple[str, str], dict[str, Any]] = {}
+
+        def remember(values: dict[str, Any]) -> None:
+            if values["exchange_order_id"]:
+                by_exchange_id[values["exchange_order_id"]] = values
+            if values["client_order_id"]:
+                by_client_id[values["client_order_id"]] = values
+                by_client_symbol[(values["client_order_id"], values["symbol"])] = values
+
+        for known in self._known_orders_in_session(session, orders):
+            remember(known)
+        merged: dict[str, dict[str, Any]] = {}
+        resolved: list[str] = []
+        for order in orders:
+            values = None
+            if order.exchange_order_id:
+                values = by_exchange_id.get(order.exchange_order_id)
+            if values is None and order.client_order_id:
+                values = (
+                    by_client_symbol.get((order.client_order_id, order.symbol))
+                    if order.symbol
+                    else by_client_id.get(order.client_order_id)
+                )
+            if values is None:
+                values = self._new_order_values(order, now=now)
+            else:
+                values.update(_merged_order_fields(values, order, now=now))
+            remember(values)
+            merged[values["local_uuid"]] = values
+            resolved.append(values["local_uuid"])
+
+        rows_by_uuid: dict[str, ExchangeOrder] = {}
+        pending = list(merged.values())
+        for start in range(0, len(pending), _ORDER_UPSERT_CHUNK_ROWS):
+            stmt = pg_insert(ExchangeOrder).values(
+                pending[start : start + _ORDER_UPSERT_CHUNK_ROWS]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ExchangeOrder.local_uuid],
+                set_={column: stmt.excluded[column] for column in _ORDER_MERGE_COLUMNS},
+            )
+            for row in session.scalars(
+                stmt.returning(ExchangeOrder),
+                execution_options={"populate_existing": True},
+            ):
+                rows_by_uuid[row.local_uuid] = row
+        _stage_private_rows(session, rows_by_uuid.values())
+        return [rows_by_uuid[local_uuid] for local_uuid in resolved]
+
+    def _known_orders_in_session(
+        self,
+        session: Session,
+        orders: Sequence[OrderWrite],
+    ) -> list[dict[str, Any]]:
+        """Rows sharing an exchange or client id with `orders`, oldest first."""
+        exchange_ids = {order.exchange_order_id for order in orders if order.exchange_order_id}
+        client_ids = {order.client_order_id for order in orders if order.client_order_id}
+        identities = []
+        if exchange_ids:
+            identities.append(ExchangeOrder.exchange_order_id.in_(exchange_ids))
+        if client_ids:
+            identities.append(ExchangeOrder.client_order_id.in_(client_ids))
+        if not identities:
+            return []
+        columns = [
+            column
+            for column in ExchangeOrder.__table__.columns
+            if column.key != "id"
+        ]
+        stmt = (
+            select(*columns)
+            .where(
+                ExchangeOrder.exchange == self.config.exchange,
+                ExchangeOrder.environment == self.config.environment,
+                ExchangeOrder.market_type == self.config.market_type,
+                ExchangeOrder.account_scope == self.config.account_scope,
+                or_(*identities),
+            )
+            .order_by(ExchangeOrder.local_timestamp.asc(), ExchangeOrder.id.asc())
+        )
+        return [dict(row) for row in session.execute(stmt).mappings()]
+
     def _record_fill_in_session(
         self,
         session: Session,
@@ -829,23 +1008,104 @@ class AccountStateStore:
         existing = find_fill(session, self.config, fill.exchange_fill_id)
         if existing is not None:
             return existing
-        row = ExchangeFill(
-            local_uuid=str(uuid4()),
-            order_id=fill.order_id,
-            exchange=self.config.exchange,
-            exchange_fill_id=fill.exchange_fill_id,
-            price=fill.price,
-            quantity=fill.quantity,
-            fee=fill.fee,
-            fee_currency=fill.fee_currency,
-            liquidity_role=fill.liquidity_role,
-            raw_payload=fill.raw_payload or {},
-            source_timestamp=fill.source_timestamp,
-            local_timestamp=now,
-        )
+        row = ExchangeFill(**self._new_fill_values(fill, now=now))
         session.add(row)
         return row
 
+    def _new_fill_values(self, fill: FillWrite, *, now: datetime) -> dict[str, Any]:
+        return {
+            "local_uuid": str(uuid4()),
+            "order_id": fill.order_id,
+            "exchange": self.config.exchange,
+            "exchange_fill_id": fill.exchange_fill_id,
+            "price": fill.price,
+            "quantity": fill.quantity,
+            "fee": fill.fee,
+            "fee_currency": fill.fee_currency,
+            "liquidity_role": fill.liquidity_role,
+            "raw_payload": fill.raw_payload or {},
+            "source_timestamp": fill.source_timestamp,
+            "local_timestamp": now,
+        }
+
+    def _record_fill_events_in_session(
+        self,
+        session: Session,
+        events: Sequence[FillEvent],
+        *,
+        now: datetime,
+    ) -> list[ExchangeFill]:
+        """Set-based `_record_fill_event_in_session`: one order upsert, one fill insert."""
+        if not self.config.set_based_ingest:
+            return [
+                self._record_fill_event_in_session(session, event, now=now)
+                for event in events
+            ]
+        if not events:
+            return []
+        orders = self._ensure_orders_in_session(
+            session,
+            [_fill_order_write(event) for event in events],
+            now=now,
+        )
+        known = self._known_fills_in_session(
+            session,
+            {event.exchange_fill_id for event in events if event.exchange_fill_id},
+        )
+        slots: list[ExchangeFill | int] = []
+        new_values: list[dict[str, Any]] = []
+        pending_ids: dict[str, int] = {}
+        for event, order in zip(events, orders):
+            fill_id = event.exchange_fill_id
+            if fill_id and fill_id in known:
+                slots.append(known[fill_id])
+                continue
+            if fill_id and fill_id in pending_ids:
+                slots.append(pending_ids[fill_id])
+                continue
+            if fill_id:
+                pending_ids[fill_id] = len(new_values)
+            slots.append(len(new_values))
+            new_values.append(
+                self._new_fill_values(_fill_write(event, order_id=order.id), now=now)
+            )
+        inserted: list[ExchangeFill] = []
+        if new_values:
+            inserted = list(
+                session.scalars(
+                    insert(ExchangeFill).returning(
+                        ExchangeFill, sort_by_parameter_order=True
+                    ),
+                    new_values,
+                )
+            )
+        return [slot if isinstance(slot, ExchangeFill) else inserted[slot] for slot in slots]
+
+    def _known_fills_in_session(
+        self,
+        session: Session,
+        fill_ids: set[str],
+    ) -> dict[str, ExchangeFill]:
+        """Latest stored fill for each exchange fill id, like `find_fill`."""
+        if not fill_ids:
+            return {}
+        stmt = (
+            select(ExchangeFill)
+            .join(ExchangeOrder, ExchangeFill.order_id == ExchangeOrder.id)
+            .where(
+                ExchangeFill.exchange == self.config.exchange,
+                ExchangeFill.exchange_fill_id.in_(fill_ids),
+                ExchangeOrder.exchange == self.config.exchange,
+                ExchangeOrder.environment == self.config.environment,
+                ExchangeOrder.market_type == self.config.market_type,
+                ExchangeOrder.account_scope == self.config.account_scope,
+            )
+            .order_by(ExchangeFill.local_timestamp.asc(), ExchangeFill.id.asc())
+        )
+        return {
+            str(row.exchange_fill_id): row for row in session.execute(stmt).scalars()
+        }
+
     def _record_fill_event_in_session(
         self,
         session: Session,
@@ -855,34 +1115,13 @@ class AccountStateStore:
     ) -> ExchangeFill:
         order = self._ensure_order_in_session(
             session,
-            OrderWrite(
-                symbol=event.symbol,
-                side=event.side,
-                order_type=event.order_type,
-                status="filled",
-                quantity=event.quantity,
-                exchange_order_id=event.exchange_order_id,
-                client_order_id=event.client_order_id,
-                filled_quantity=event.quantity,
-                raw_payload=event.raw_payload,
-                source_timestamp=event.source_timestamp,
-            ),
+            _fill_order_write(event),
             now=now,
         )
         session.flush()
         return self._record_fill_in_session(
             session,
-            FillWrite(
-                order_id=order.id,
-                exchange_fill_id=event.exchange_fill_id,
-                price=event.price,
-                quantity=event.quantity,
-                fee=event.fee,
-                fee_currency=event.fee_currency,
-                liquidity_role=event.liquidity_role,
-                raw_payload=event.raw_payload,
-                source_timestamp=event.source_timestamp,
-            ),
+            _fill_write(event, order_id=order.id),
             now=now,
         )
 
@@ -960,6 +1199,7 @@ class AccountStateStore:
             local_timestamp=now,
         )
         session.add(row)
+        _stage_private_rows(session, (row,))
         return row, True
 
     def _latest_balance_in_session(
@@ -1029,43 +1269,42 @@ class AccountStateStore:
                 },
                 source_timestamp=source_timestamp,
             )
-            for row in self._latest_nonzero_positions_in_session(session)
+            for row in self._nonzero_positions_for_snapshot(session)
             if row.symbol not in seen_symbols
         ]
         return [*positions, *flat_positions]
 
-    def _latest_nonzero_positions_in_session(
+    def _nonzero_positions_for_snapshot(
         self,
         session: Session,
-    ) -> tuple[AccountPosition, ...]:
-        rows = (
-            session.execute(
-                select(AccountPosition)
-                .where(
-                    AccountPosition.exchange == self.config.exchange,
-                    AccountPosition.environment == self.config.environment,
-                    AccountPosition.market_type == self.config.market_type,
-                    AccountPosition.account_scope == self.config.account_scope,
-                )
-                .order_by(
-                    AccountPosition.local_timestamp.desc(),
-                    AccountPosition.id.desc(),
-                )
-            )
-            .scalars()
-            .all()
-        )
-        latest_by_symbol: dict[str, AccountPosition] = {}
-        for row in rows:
-            if row.symbol in latest_by_symbol:
-                continue
-            latest_by_symbol[row.symbol] = row
-        return tuple(
-            row
-            for row in latest_by_symbol.values()
-            if abs(float(row.size or 0.0)) > 0.0
+    ) -> tuple[IndexedPosition, ...]:
+        """Positions non nulles depuis l'index, ecritures de la transaction comprises."""
+        self._ensure_private_index_warm()
+        return self.private_index.nonzero_positions(
+            _staged_private_entries(session, IndexedPosition)
         )
 
+    def _latest_position_rows_in_session(
+        self,
+        session: Session,
+    ) -> tuple[IndexedPosition, ...]:
+        rows = session.execute(
+            select(AccountPosition)
+            .where(
+                AccountPosition.exchange == self.config.exchange,
+                AccountPosition.environment == self.config.environment,
+                AccountPosition.market_type == self.config.market_type,
+                AccountPosition.account_scope == self.config.account_scope,
+            )
+            .order_by(
+                AccountPosition.symbol,
+                AccountPosition.local_timestamp.desc(),
+                AccountPosition.id.desc(),
+            )
+            .ext(distinct_on(AccountPosition.symbol))
+        ).scalars()
+        return tuple(IndexedPosition.from_row(row) for row in rows)
+
     def _with_absent_orders_for_snapshot(
         self,
         session: Session,
@@ -1112,7 +1351,7 @@ class AccountStateStore:
                 },
                 source_timestamp=source_timestamp,
             )
-            for row in self._latest_open_orders_in_session(session)
+            for row in self._open_orders_for_snapshot(session)
             if not _order_seen_in_snapshot(row, seen_exchange_ids, seen_client_ids)
             and _snapshot_absence_can_tombstone(
                 row,
@@ -1122,44 +1361,69 @@ class AccountStateStore:
         ]
         return [*orders, *absent_orders]
 
-    def _latest_open_orders_in_session(
-        self,
-        session: Session,
-    ) -> tuple[ExchangeOrder, ...]:
-        rows = (
-            session.execute(
-                select(ExchangeOrder)
-                .where(
-                    ExchangeOrder.exchange == self.config.exchange,
-                    ExchangeOrder.environment == self.config.environment,
-                    ExchangeOrder.market_type == self.config.market_type,
-                    ExchangeOrder.account_scope == self.config.account_scope,
-                    ExchangeOrder.status.in_(
-                        (
-                            "new",
-                            "open",
-                            "untouched",
-                            "partial_fill",
-                            "partially_filled",
-                            "living",
-                        )
-                    ),
-                )
-                .order_by(
-                    ExchangeOrder.local_timestamp.desc(),
-                    ExchangeOrder.id.desc(),
-                )
-            )
-            .scalars()
-            .all()
+    def _open_orders_for_snapshot(self, session: Session) -> tuple[IndexedOrder, ...]:
+        """Ordres ouverts depuis l'index, ecritures de la transaction comprises."""
+        self._ensure_private_index_warm()
+        return self.private_index.open_orders(
+            _staged_private_entries(session, IndexedOrder)
         )
-        latest_by_identity: dict[tuple[str, str], ExchangeOrder] = {}
-        for row in rows:
-            identity = _order_identity_key(row)
-            if identity is None or identity in latest_by_identity:
-                continue
-            latest_by_identity[identity] = row
-        return tuple(latest_by_identity.values())
+
+    def _open_order_rows_in_session(self, session: Session) -> tuple[IndexedOrder, ...]:
+        rows = session.execute(
+            select(ExchangeOrder).where(
+                ExchangeOrder.exchange == self.config.exchange,
+                ExchangeOrder.environment == self.config.environment,
+                ExchangeOrder.market_type == self.config.market_type,
+                ExchangeOrder.account_scope == self.config.account_scope,
+                ExchangeOrder.status.in_(OPEN_ORDER_STATUSES),
+            )
+        ).scalars()
+        return tuple(IndexedOrder.from_row(row) for row in rows)
+
+    def _commit_private(self, session: Session) -> None:
+        """Commit puis applique les ordres/positions ecrits a l'index partage.
+
+        Le verrou de l'index couvre commit et application: un controle de
+        derive ne voit jamais une ligne commitee mais pas encore indexee.
+        """
+        staged = session.info.pop(_PRIVATE_INDEX_ROWS, [])
+        with self.private_index.lock:
+            session.commit()
+            if staged:
+                self.private_index.apply(_indexed_private_row(row) for row in staged)
+
+    def _ensure_private_index_warm(self) -> None:
+        if not self.private_index.warmed:
+            self.warm_private_index()
+
+    def warm_private_index(self) -> None:
+        """Charge ordres ouverts et dernieres positions du scope depuis la DB."""
+        with self.private_index.lock, self.sessionmaker() as session:
+            self.private_index.reset(
+                self._open_order_rows_in_session(session),
+                self._latest_position_rows_in_session(session),
+            )
+
+    def check_private_index(self) -> str | None:
+        """Compare l'index a la DB, le realigne et alerte en cas de derive."""
+        if not self.private_index.warmed:
+            self.warm_private_index()
+            return None
+        with self.private_index.lock, self.sessionmaker() as session:
+            drift = self.private_index.check(
+                self._open_order_rows_in_session(session),
+                self._latest_position_rows_in_session(session),
+            )
+        if drift is not None:
+            logging.getLogger(__name__).warning(
+                "PRIVATE_INDEX_DRIFT exchange=%s market=%s scope=%s drift_alerts=%s %s",
+                self.config.exchange,
+                self.config.market_type,
+                self.config.account_scope,
+                self.private_index.stats().drift_alerts,
+                drift,
+            )
+        return drift
 
     def _record_raw_event_in_session(
         self,
@@ -1332,7 +1596,8 @@ class AccountStateStore:
                 local_timestamp=datetime.now(timezone.utc),
             )
             session.add(row)
-            session.commit()
+            _stage_private_rows(session, (row,))
+            self._commit_private(session)
             session.refresh(row)
             return row
 
@@ -1341,7 +1606,7 @@ class AccountStateStore:
         now = datetime.now(timezone.utc)
         with self.sessionmaker() as session:
             row = self._ensure_order_in_session(session, order, now=now)
-            session.commit()
+            self._commit_private(session)
             return row
 
     def record_order_snapshot(
@@ -1362,11 +1627,8 @@ class AccountStateStore:
                 source_timestamp=source_timestamp,
                 received_at=now,
             )
-            rows = tuple(
-                self._ensure_order_in_session(session, order, now=now)
-                for order in normalized
-            )
-            session.commit()
+            rows = tuple(self._ensure_orders_in_session(session, normalized, now=now))
+            self._commit_private(session)
             return rows
 
     def record_fill(self, fill: FillWrite) -> ExchangeFill:
@@ -1382,7 +1644,7 @@ class AccountStateStore:
         now = datetime.now(timezone.utc)
         with self.sessionmaker() as session:
             row = self._record_fill_event_in_session(session, event, now=now)
-            session.commit()
+            self._commit_private(session)
             return row
 
     def record_balance(self, balance: BalanceWrite) -> AccountBalance:
@@ -1419,7 +1681,7 @@ class AccountStateStore:
         now = datetime.now(timezone.utc)
         with self.sessionmaker() as session:
             row, _inserted = self._record_position_in_session(session, position, now=now)
-            session.commit()
+            self._commit_private(session)
             return row
 
     def record_position_snapshot(
@@ -1446,7 +1708,7 @@ class AccountStateStore:
                     for position in normalized
                 )
             )
-            session.commit()
+            self._commit_private(session)
             return rows
 
     def record_raw_event(
@@ -1577,6 +1839,7 @@ class KrakenFuturesPrivateStream:
     def _run_startup_maintenance(self) -> None:
         try:
             self.store.prune_private_storage_now(stream_kind=self.profile.stream_kind)
+            self.store.warm_private_index()
         except Exception as exc:
             self.logger.warning(
                 "kraken_account startup maintenance skipped profile=%s error=%s",
@@ -1696,6 +1959,7 @@ class KrakenFuturesPrivateStream:
         while self._running:
             await asyncio.sleep(interval)
             self.store.prune_private_storage_now(stream_kind=self.profile.stream_kind)
+            self.store.check_private_index()
 
     async def _drain_ingest_queue(self, queue: asyncio.Queue[IngestMessage]) -> None:
         if self.profile.is_critical:
@@ -3340,16 +3604,90 @@ def _prefer_known(new_value: str, old_value: str) -> str:
     return old_value
 
 
-def _order_identity_key(row: ExchangeOrder) -> tuple[str, str] | None:
-    if row.exchange_order_id:
-        return ("exchange", row.exchange_order_id)
-    if row.client_order_id:
-        return ("client", row.client_order_id)
-    return None
+def _merged_order_fields(
+    current: Mapping[str, Any],
+    order: OrderWrite,
+    *,
+    now: datetime,
+) -> dict[str, Any]:
+    """Fields of a known order after applying one more event for it."""
+    return {
+        "status": _prefer_known(order.status, current["status"]),
+        "side": _prefer_known(order.side, current["side"]),
+        "order_type": _prefer_known(order.order_type, current["order_type"]),
+        "symbol": _prefer_known(order.symbol, current["symbol"]),
+        "client_order_id": order.client_order_id or current["client_order_id"],
+        "exchange_order_id": order.exchange_order_id or current["exchange_order_id"],
+        "filled_quantity": max(current["filled_quantity"], order.filled_quantity),
+        "quantity": max(current["quantity"], order.quantity),
+        "price": order.price if order.price is not None else current["price"],
+        "source_timestamp": order.source_timestamp or current["source_timestamp"],
+        "raw_payload": _merge_raw_payload(current["raw_payload"], order.raw_payload),
+        "local_timestamp": now,
+    }
+
+
+def _fill_order_write(event: FillEvent) -> OrderWrite:
+    """Order write implied by a fill: filled, sized by the fill."""
+    return OrderWrite(
+        symbol=event.symbol,
+        side=event.side,
+        order_type=event.order_type,
+        status="filled",
+        quantity=event.quantity,
+        exchange_order_id=event.exchange_order_id,
+        client_order_id=event.client_order_id,
+        filled_quantity=event.quantity,
+        raw_payload=event.raw_payload,
+        source_timestamp=event.source_timestamp,
+    )
+
+
+def _fill_write(event: FillEvent, *, order_id: int) -> FillWrite:
+    return FillWrite(
+        order_id=order_id,
+        exchange_fill_id=event.exchange_fill_id,
+        price=event.price,
+        quantity=event.quantity,
+        fee=event.fee,
+        fee_currency=event.fee_currency,
+        liquidity_role=event.liquidity_role,
+        raw_payload=event.raw_payload,
+        source_timestamp=event.source_timestamp,
+    )
+
+
+def _stage_private_rows(
+    session: Session,
+    rows: Iterable[ExchangeOrder | AccountPosition],
+) -> None:
+    """Retient les lignes a appliquer a l'index prive apres commit."""
+    session.info.setdefault(_PRIVATE_INDEX_ROWS, []).extend(rows)
+
+
+def _indexed_private_row(
+    row: ExchangeOrder | AccountPosition,
+) -> IndexedOrder | IndexedPosition:
+    if isinstance(row, ExchangeOrder):
+        return IndexedOrder.from_row(row)
+    return IndexedPosition.from_row(row)
+
+
+def _staged_private_entries(
+    session: Session,
+    kind: type[IndexedOrder] | type[IndexedPosition],
+) -> list[Any]:
+    """Lignes non commitees de la transaction, vues comme entrees d'index."""
+    staged = session.info.get(_PRIVATE_INDEX_ROWS)
+    if not staged:
+        return []
+    session.flush()
+    model = ExchangeOrder if kind is IndexedOrder else AccountPosition
+    return [kind.from_row(row) for row in staged if isinstance(row, model)]
 
 
 def _order_seen_in_snapshot(
-    row: ExchangeOrder,
+    row: IndexedOrder,
     seen_exchange_ids: set[str],
     seen_client_ids: set[str],
 ) -> bool:
@@ -3359,7 +3697,7 @@ def _order_seen_in_snapshot(
 
 
 def _snapshot_absence_can_tombstone(
-    row: ExchangeOrder,
+    row: IndexedOrder,
     *,
     snapshot_at: datetime,
     grace_seconds: float,
@@ -3599,6 +3937,14 @@ def build_parser() -> argparse.ArgumentParser:
             default=AccountStreamConfig.ingest_audit_retention_limit,
             help="Maximum private ingest audit rows kept per account DB; 0 disables count cleanup.",
         )
+        cmd.add_argument(
+            "--row-by-row-ingest",
+            action="store_true",
+            help=(
+                "Resolve snapshot orders and fills one ORM lookup at a time instead "
+                "of the set-based INSERT ... ON CONFLICT path."
+            ),
+        )
         cmd.add_argument(
             "--allow-critical-forensic-prune",
             action="store_true",
@@ -3660,6 +4006,7 @@ def config_from_args(args: argparse.Namespace) -> AccountStreamConfig:
         ingest_audit_retention_minutes=args.ingest_audit_retention_minutes,
         ingest_audit_retention_limit=args.ingest_audit_retention_limit,
         forensic_shield_critical=not args.allow_critical_forensic_prune,
+        set_based_ingest=not args.row_by_row_ingest,
         log_level=args.log_level,
     )
 
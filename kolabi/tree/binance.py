@@ -11,12 +11,20 @@ from typing import Mapping, Sequence
 
 import websockets
 from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
 
 from kolabi.shared.binance_futures import (
     binance_futures_environment,
     binance_futures_public_db_url,
 )
-from kolabi.shared.persistence import ExchangeInstrument
+from kolabi.shared.notify import (
+    INSTRUMENT_CHANNEL,
+    notify_state_change,
+    state_route_label,
+)
+from kolabi.shared.persistence import MARKET_STORAGE_LAYOUTS, ExchangeInstrument
+from kolabi.shared.persistence.market_levels import LEVEL_STORAGE_MODES
 from kolabi.shared.redaction import redact_url
 from kolabi.tree.kraken import (
     BookPayload,
@@ -32,6 +40,8 @@ from kolabi.tree.kraken import (
     optional_float,
     parse_optional_int,
 )
+from kolabi.tree.public_group import parse_pairs, run_group_command
+from kolabi.tree.raw_writer import RawEventWriter
 
 
 @dataclass(frozen=True)
@@ -51,23 +61,33 @@ class BinanceTree(KrakenTree):
 
     config: BinanceConfig
 
-    def __init__(self, config: BinanceConfig) -> None:
-        super().__init__(config)
+    def __init__(
+        self,
+        config: BinanceConfig,
+        *,
+        engine: Engine | None = None,
+        raw_writer: RawEventWriter | None = None,
+    ) -> None:
+        super().__init__(config, engine=engine, raw_writer=raw_writer)
         self._refresh_instrument_rules()
 
     async def run(self) -> None:
-        while self._running:
-            try:
-                await self.run_once()
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                self.logger.warning(
-                    "binance_tree reconnecting in %ss after error: %s",
-                    self.config.reconnect_seconds,
-                    exc,
-                )
-                await self._wait_or_stop(float(self.config.reconnect_seconds))
+        self.raw_writer.start()
+        try:
+            while self._running:
+                try:
+                    await self.run_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    self.logger.warning(
+                        "binance_tree reconnecting in %ss after error: %s",
+                        self.config.reconnect_seconds,
+                        exc,
+                    )
+                    await self._wait_or_stop(float(self.config.reconnect_seconds))
+        finally:
+            await asyncio.to_thread(self.raw_writer.stop)
 
     async def run_once(self) -> None:
         url = public_stream_url(self.config)
@@ -94,10 +114,12 @@ class BinanceTree(KrakenTree):
         payload = (
             raw_message.decode("utf-8") if isinstance(raw_message, bytes) else raw_message
         )
-        message = unwrap_combined_stream(json.loads(payload))
+        return self.handle_decoded(json.loads(payload), payload)
+
+    def handle_decoded(self, message: object, payload: str) -> PendingBook | None:
         self._raw_message_count += 1
-        normalised_message = with_binance_symbol_alias(message)
-        self.record_raw_event(normalised_message, stream_kind="public_ws")
+        normalised_message = with_binance_symbol_alias(unwrap_combined_stream(message))
+        self.raw_writer.submit(normalised_message, stream_kind="public_ws")
         self.trace_message(normalised_message, payload)
         ticker = ticker_prices_from_message(normalised_message)
         if ticker is not None:
@@ -109,6 +131,17 @@ class BinanceTree(KrakenTree):
         self._book_message_count += 1
         return self.ingest_payload(parsed, datetime.now(timezone.utc))
 
+    def public_subscription(
+        self, pairs: Sequence[str]
+    ) -> tuple[str, dict[str, object] | None]:
+        # Flux combines: tous les symboles passent dans l'URL, pas de message.
+        return public_stream_url(self.config, pairs), None
+
+    @staticmethod
+    def message_symbol(message: object) -> str | None:
+        symbol = unwrap_combined_stream(message).get("s")
+        return None if symbol in (None, "") else str(symbol)
+
     def _fetch_ticker_prices(self) -> TickerPrices:
         if not _is_futures_market(self.config.market_type):
             ticker_response = self._rest_session.get(
@@ -190,9 +223,23 @@ class BinanceTree(KrakenTree):
                 row.raw_payload = dict(item)
                 if existing is None:
                     session.add(row)
+                self._notify_instrument_change(session)
                 session.commit()
             return
 
+    def _notify_instrument_change(self, session: Session) -> None:
+        """Invalide les caches d'instruments des bots au commit."""
+        notify_state_change(
+            session,
+            INSTRUMENT_CHANNEL,
+            route=state_route_label(
+                self.config.exchange,
+                self.config.market_type,
+                self.config.pair,
+            ),
+            environment=self.config.environment,
+        )
+
     def log_due(self, now: datetime, snapshot: MarketSnapshot | None) -> None:
         if not is_due(self._last_log_at, now, self.config.log_interval_seconds):
             return
@@ -221,12 +268,14 @@ class BinanceTree(KrakenTree):
         self._status_rows_logged += 1
 
 
-def public_stream_url(config: BinanceConfig) -> str:
-    symbol = config.pair.lower()
-    parts = [f"{symbol}@depth{max(5, min(config.depth, 20))}@500ms"]
-    if _is_futures_market(config.market_type):
-        parts.append(f"{symbol}@markPrice@1s")
-    parts.append(f"{symbol}@ticker")
+def public_stream_url(config: BinanceConfig, pairs: Sequence[str] | None = None) -> str:
+    parts: list[str] = []
+    for pair in pairs or (config.pair,):
+        symbol = pair.lower()
+        parts.append(f"{symbol}@depth{max(5, min(config.depth, 20))}@500ms")
+        if _is_futures_market(config.market_type):
+            parts.append(f"{symbol}@markPrice@1s")
+        parts.append(f"{symbol}@ticker")
     streams = "/".join(parts)
     base = config.ws_url.rstrip("/")
     if base.endswith("/stream"):
@@ -325,6 +374,7 @@ def build_parser() -> argparse.ArgumentParser:
     for command in ("run", "probe", "status"):
         cmd = subparsers.add_parser(command, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
         cmd.add_argument("--pair", default=BinanceConfig.pair, help="Binance symbol.")
+        cmd.add_argument("--pairs", help="Comma-separated symbols served by one process; overrides --pair.")
         cmd.add_argument("--depth", type=int, default=BinanceConfig.depth, help="Orderbook depth to keep.")
         cmd.add_argument("--environment", choices=("demo", "live"), default=BinanceConfig.environment)
         cmd.add_argument("--ws-url", help="Override public websocket base URL.")
@@ -341,6 +391,9 @@ def build_parser() -> argparse.ArgumentParser:
         cmd.add_argument("--log-interval-seconds", type=float, default=BinanceConfig.log_interval_seconds)
         cmd.add_argument("--maintenance-seconds", type=float, default=BinanceConfig.maintenance_seconds)
         cmd.add_argument("--retention-minutes", type=int, default=BinanceConfig.retention_minutes)
+        cmd.add_argument("--market-storage", choices=MARKET_STORAGE_LAYOUTS, default=BinanceConfig.market_storage)
+        cmd.add_argument("--partition-interval-minutes", type=int, default=BinanceConfig.partition_interval_minutes)
+        cmd.add_argument("--level-storage", choices=LEVEL_STORAGE_MODES, default=BinanceConfig.level_storage)
         cmd.add_argument("--reconnect-seconds", type=int, default=BinanceConfig.reconnect_seconds)
         cmd.add_argument("--trace-ws", action="store_true")
         cmd.add_argument("--trace-ws-format", choices=("compact", "json"), default=BinanceConfig.trace_ws_format)
@@ -369,6 +422,9 @@ def config_from_args(args: argparse.Namespace) -> BinanceConfig:
         log_interval_seconds=args.log_interval_seconds,
         maintenance_seconds=args.maintenance_seconds,
         retention_minutes=args.retention_minutes,
+        market_storage=args.market_storage,
+        partition_interval_minutes=args.partition_interval_minutes,
+        level_storage=args.level_storage,
         reconnect_seconds=args.reconnect_seconds,
         trace_ws=args.trace_ws,
         trace_ws_format=args.trace_ws_format,
@@ -446,6 +502,9 @@ async def stop_tree_after(tree: BinanceTree, delay_seconds: float) -> None:
 def main(argv: Sequence[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    pairs = parse_pairs(args.pairs)
+    if pairs:
+        return run_group_command(BinanceTree, config_from_args(args), pairs, args)
     tree = BinanceTree(config_from_args(args))
     if args.command == "status":
         print_status(tree, args.pair)
@@ -5,18 +5,26 @@ import asyncio
 import json
 import signal
 from contextlib import suppress
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Mapping, Sequence
 
 import websockets
 from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
 
 from kolabi.shared.bitmex_futures import (
     bitmex_futures_environment,
     bitmex_futures_public_db_url,
 )
-from kolabi.shared.persistence import ExchangeInstrument
+from kolabi.shared.notify import (
+    INSTRUMENT_CHANNEL,
+    notify_state_change,
+    state_route_label,
+)
+from kolabi.shared.persistence import MARKET_STORAGE_LAYOUTS, ExchangeInstrument
+from kolabi.shared.persistence.market_levels import LEVEL_STORAGE_MODES
 from kolabi.shared.redaction import redact_url
 from kolabi.tree.kraken import (
     BookPayload,
@@ -33,6 +41,11 @@ from kolabi.tree.kraken import (
     optional_float,
     parse_kraken_time,
 )
+from kolabi.tree.orderbook import BookLevelT
+from kolabi.tree.public_group import parse_pairs, run_group_command
+from kolabi.tree.raw_writer import RawEventWriter
+
+BITMEX_L2_LEVELS = 25
 
 
 @dataclass(frozen=True)
@@ -61,40 +74,62 @@ class BitmexBookLevel:
     source_timestamp: datetime | None = None
 
 
-@dataclass(frozen=True)
+@dataclass
 class BitmexBookState:
-    """Immutable local image of the BitMEX orderBookL2 table."""
+    """Image locale de la table BitMEX orderBookL2, mise a jour sur place.
+
+    `by_id` suit la table id -> niveau; `delta` garde les changements
+    prix/quantite du dernier message insert/update/delete.
+    """
 
     symbol: str
-    levels: tuple[BitmexBookLevel, ...]
+    by_id: dict[str, BitmexBookLevel] = field(default_factory=dict)
     version: int = 0
     source_timestamp: datetime | None = None
+    delta: BookPayload | None = None
+
+    @property
+    def levels(self) -> tuple[BitmexBookLevel, ...]:
+        return tuple(self.by_id.values())
 
 
 class BitmexTree(KrakenTree):
     """BitMEX public websocket reader writing the shared market schema."""
 
     config: BitmexConfig
-
-    def __init__(self, config: BitmexConfig) -> None:
-        super().__init__(config)
+    # orderBookL2_25 borne deja la table; les deltas doivent voir toute la table.
+    book_retain_levels = BITMEX_L2_LEVELS
+
+    def __init__(
+        self,
+        config: BitmexConfig,
+        *,
+        engine: Engine | None = None,
+        raw_writer: RawEventWriter | None = None,
+    ) -> None:
+        super().__init__(config, engine=engine, raw_writer=raw_writer)
         self._bitmex_book_state: BitmexBookState | None = None
+        self._bitmex_book_synced = False
         if config.instrument_refresh_on_start:
             self._refresh_instrument_rules()
 
     async def run(self) -> None:
-        while self._running:
-            try:
-                await self.run_once()
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                self.logger.warning(
-                    "bitmex_tree reconnecting in %ss after error: %s",
-                    self.config.reconnect_seconds,
-                    exc,
-                )
-                await self._wait_or_stop(float(self.config.reconnect_seconds))
+        self.raw_writer.start()
+        try:
+            while self._running:
+                try:
+                    await self.run_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    self.logger.warning(
+                        "bitmex_tree reconnecting in %ss after error: %s",
+                        self.config.reconnect_seconds,
+                        exc,
+                    )
+                    await self._wait_or_stop(float(self.config.reconnect_seconds))
+        finally:
+            await asyncio.to_thread(self.raw_writer.stop)
 
     async def run_once(self) -> None:
         url = public_stream_url(self.config)
@@ -121,33 +156,55 @@ class BitmexTree(KrakenTree):
         payload = (
             raw_message.decode("utf-8") if isinstance(raw_message, bytes) else raw_message
         )
-        message = normalise_public_message(json.loads(payload), symbol=self.config.pair)
+        return self.handle_decoded(json.loads(payload), payload)
+
+    def handle_decoded(self, message: object, payload: str) -> PendingBook | None:
+        message = normalise_public_message(message, symbol=self.config.pair)
         self._raw_message_count += 1
-        self.record_raw_event(message, stream_kind="public_ws")
+        self.raw_writer.submit(message, stream_kind="public_ws")
         self.trace_message(message, payload)
         ticker = ticker_prices_from_message(message)
         if ticker is not None:
             self._latest_ticker_prices = ticker
             self._last_ticker_fetch_at = datetime.now(timezone.utc)
 
-        next_state, changed = apply_bitmex_book_message(
+        book_state, changed = apply_bitmex_book_message(
             self._bitmex_book_state,
             message,
             symbol=self.config.pair,
         )
-        self._bitmex_book_state = next_state
-        if not changed or next_state is None:
+        self._bitmex_book_state = book_state
+        if not changed or book_state is None:
             return None
-        parsed = book_payload_from_state(next_state)
+        parsed = book_state.delta if self._bitmex_book_synced else None
+        if parsed is None:
+            parsed = book_payload_from_state(book_state)
         if parsed is None:
+            self._bitmex_book_synced = False
             return None
         self._book_message_count += 1
         now = datetime.now(timezone.utc)
         try:
-            return self.ingest_payload(parsed, now)
+            pending = self.ingest_payload(parsed, now)
         except ValueError as exc:
+            # Delta annule par le carnet local: on se recale au prochain etat complet.
+            if self._order_book is None or self._order_book.sequence != parsed.sequence:
+                self._bitmex_book_synced = False
             self._log_invalid_book(parsed, now, exc)
             return None
+        self._bitmex_book_synced = True
+        return pending
+
+    def public_subscription(
+        self, pairs: Sequence[str]
+    ) -> tuple[str, dict[str, object] | None]:
+        return public_stream_url(self.config, pairs), None
+
+    @staticmethod
+    def message_symbol(message: object) -> str | None:
+        if not isinstance(message, Mapping):
+            return None
+        return symbol_from_message(message)
 
     def _fetch_ticker_prices(self) -> TickerPrices:
         response = self._rest_session.get(
@@ -207,8 +264,22 @@ class BitmexTree(KrakenTree):
             row.updated_at = datetime.now(timezone.utc)
             if existing is None:
                 session.add(row)
+            self._notify_instrument_change(session)
             session.commit()
 
+    def _notify_instrument_change(self, session: Session) -> None:
+        """Invalide les caches d'instruments des bots au commit."""
+        notify_state_change(
+            session,
+            INSTRUMENT_CHANNEL,
+            route=state_route_label(
+                self.config.exchange,
+                self.config.market_type,
+                self.config.pair,
+            ),
+            environment=self.config.environment,
+        )
+
     def log_due(self, now: datetime, snapshot: MarketSnapshot | None) -> None:
         if not is_due(self._last_log_at, now, self.config.log_interval_seconds):
             return
@@ -254,13 +325,11 @@ class BitmexTree(KrakenTree):
         )
 
 
-def public_stream_url(config: BitmexConfig) -> str:
+def public_stream_url(config: BitmexConfig, pairs: Sequence[str] | None = None) -> str:
     subscriptions = ",".join(
-        (
-            f"orderBookL2_25:{config.pair}",
-            f"instrument:{config.pair}",
-            f"trade:{config.pair}",
-        )
+        topic
+        for pair in pairs or (config.pair,)
+        for topic in (f"orderBookL2_25:{pair}", f"instrument:{pair}", f"trade:{pair}")
     )
     base = config.ws_url.rstrip("/")
     if base.endswith("/realtime"):
@@ -292,68 +361,80 @@ def apply_bitmex_book_message(
     *,
     symbol: str,
 ) -> tuple[BitmexBookState | None, bool]:
+    """Applique un message orderBookL2 sur place; `partial` repart d'une table neuve."""
     table = message.get("table")
     if table != "orderBookL2_25":
         return state, False
     action = str(message.get("action") or "")
     rows = tuple(row for row in message.get("data", []) if isinstance(row, Mapping))
     if action == "partial":
-        levels = tuple(
-            level
-            for row in rows
-            if (level := level_from_row(row, symbol=symbol, existing=None)) is not None
+        fresh = BitmexBookState(
+            symbol=symbol,
+            version=0 if state is None else state.version,
+            source_timestamp=None if state is None else state.source_timestamp,
         )
-        return next_state(symbol, levels, previous=state), True
-    if state is None:
-        return state, False
-    by_id = {level.level_id: level for level in state.levels}
-    if action == "insert":
         for row in rows:
             level = level_from_row(row, symbol=symbol, existing=None)
             if level is not None:
-                by_id[level.level_id] = level
-        return next_state(symbol, tuple(by_id.values()), previous=state), bool(rows)
-    if action == "update":
-        changed = False
-        for row in rows:
-            level_id = optional_level_id(row)
-            if level_id is None:
-                continue
-            existing = by_id.get(level_id)
-            level = level_from_row(row, symbol=symbol, existing=existing)
-            if level is None:
-                by_id.pop(level_id, None)
-            else:
-                by_id[level_id] = level
-            changed = True
-        return next_state(symbol, tuple(by_id.values()), previous=state), changed
-    if action == "delete":
-        changed = False
-        for row in rows:
-            level_id = optional_level_id(row)
-            if level_id is None:
-                continue
-            changed = by_id.pop(level_id, None) is not None or changed
-        return next_state(symbol, tuple(by_id.values()), previous=state), changed
-    return state, False
+                fresh.by_id[level.level_id] = level
+        touch_state(fresh, fresh.levels)
+        return fresh, True
+    if state is None or action not in {"insert", "update", "delete"}:
+        return state, False
+    asks: list[BookLevelT] = []
+    bids: list[BookLevelT] = []
+    touched: list[BitmexBookLevel] = []
+    by_id = state.by_id
+    for row in rows:
+        level_id = optional_level_id(row)
+        if level_id is None:
+            continue
+        old = by_id.get(level_id)
+        if action == "delete":
+            new = None
+        else:
+            new = level_from_row(
+                row,
+                symbol=symbol,
+                existing=old if action == "update" else None,
+            )
+        if new is None:
+            by_id.pop(level_id, None)
+        else:
+            by_id[level_id] = new
+            touched.append(new)
+        if old is not None and (new is None or (new.price, new.side) != (old.price, old.side)):
+            (asks if old.side == "Sell" else bids).append((old.price, 0.0))
+        if new is not None and new is not old:
+            (asks if new.side == "Sell" else bids).append((new.price, new.size))
+    if not asks and not bids:
+        state.delta = None
+        return state, False
+    touch_state(state, touched)
+    state.delta = BookPayload(
+        message_type="delta",
+        symbol=state.symbol,
+        asks=tuple(asks),
+        bids=tuple(bids),
+        source_timestamp=state.source_timestamp,
+        sequence=state.version,
+    )
+    return state, True
 
 
-def next_state(
-    symbol: str,
-    levels: tuple[BitmexBookLevel, ...],
-    *,
-    previous: BitmexBookState | None,
-) -> BitmexBookState:
+def touch_state(state: BitmexBookState, levels: Sequence[BitmexBookLevel]) -> None:
+    """Avance la version et l'horodatage apres une modification de la table."""
+    state.version += 1
+    state.delta = None
     source_timestamp = newest_timestamp(
         tuple(level.source_timestamp for level in levels if level.source_timestamp is not None)
     )
-    return BitmexBookState(
-        symbol=symbol,
-        levels=levels,
-        version=(0 if previous is None else previous.version) + 1,
-        source_timestamp=source_timestamp
-        or (None if previous is None else previous.source_timestamp),
-    )
+    if source_timestamp is not None:
+        state.source_timestamp = (
+            source_timestamp
+            if state.source_timestamp is None
+            else max(source_timestamp, state.source_timestamp)
+        )
 
 
 def level_from_row(
@@ -496,6 +577,7 @@ def build_parser() -> argparse.ArgumentParser:
     for command in ("run", "probe", "status"):
         cmd = subparsers.add_parser(command, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
         cmd.add_argument("--pair", default=BitmexConfig.pair, help="BitMEX instrument symbol.")
+        cmd.add_argument("--pairs", help="Comma-separated instrument symbols served by one process; overrides --pair.")
         cmd.add_argument("--depth", type=int, default=BitmexConfig.depth, help="Orderbook depth to keep.")
         cmd.add_argument("--environment", choices=("demo", "live"), default=BitmexConfig.environment)
         cmd.add_argument("--ws-url", help="Override public websocket URL.")
@@ -512,6 +594,9 @@ def build_parser() -> argparse.ArgumentParser:
         cmd.add_argument("--log-interval-seconds", type=float, default=BitmexConfig.log_interval_seconds)
         cmd.add_argument("--maintenance-seconds", type=float, default=BitmexConfig.maintenance_seconds)
         cmd.add_argument("--retention-minutes", type=int, default=BitmexConfig.retention_minutes)
+        cmd.add_argument("--market-storage", choices=MARKET_STORAGE_LAYOUTS, default=BitmexConfig.market_storage)
+        cmd.add_argument("--partition-interval-minutes", type=int, default=BitmexConfig.partition_interval_minutes)
+        cmd.add_argument("--level-storage", choices=LEVEL_STORAGE_MODES, default=BitmexConfig.level_storage)
         cmd.add_argument("--reconnect-seconds", type=int, default=BitmexConfig.reconnect_seconds)
         cmd.add_argument("--trace-ws", action="store_true")
         cmd.add_argument("--trace-ws-format", choices=("compact", "json"), default=BitmexConfig.trace_ws_format)
@@ -545,6 +630,9 @@ def config_from_args(args: argparse.Namespace) -> BitmexConfig:
         log_interval_seconds=args.log_interval_seconds,
         maintenance_seconds=args.maintenance_seconds,
         retention_minutes=args.retention_minutes,
+        market_storage=args.market_storage,
+        partition_interval_minutes=args.partition_interval_minutes,
+        level_storage=args.level_storage,
         reconnect_seconds=args.reconnect_seconds,
         trace_ws=args.trace_ws,
         trace_ws_format=args.trace_ws_format,
@@ -594,6 +682,9 @@ async def stop_tree_after(tree: BitmexTree, delay_seconds: float) -> None:
 def main(argv: Sequence[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    pairs = parse_pairs(args.pairs)
+    if pairs:
+        return run_group_command(BitmexTree, config_from_args(args), pairs, args)
     tree = BitmexTree(config_from_args(args))
     if args.command == "status":
         print_status(tree, args.pair)
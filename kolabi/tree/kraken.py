@@ -9,7 +9,7 @@ from contextlib import suppress
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import ROUND_HALF_UP, Decimal
-from typing import Any, Sequence, cast
+from typing import Any, Mapping, Protocol, Sequence, cast
 from uuid import uuid4
 
 import requests
@@ -41,17 +41,27 @@ from kolabi.shared.kraken_futures import (
     kraken_futures_public_db_url,
 )
 from kolabi.shared.logging import setup_logging
+from kolabi.shared.notify import MARKET_CHANNEL, notify_state_change, state_route_label
 from kolabi.shared.persistence import (
+    MARKET_STORAGE_LAYOUTS,
     Base,
     ExchangeInstrument,
     MarketIndicator,
     MarketLevel,
     MarketSnapshot,
     RawExchangeEvent,
+    ensure_market_storage,
+    maintain_market_partitions,
+)
+from kolabi.shared.persistence.market_levels import (
+    LEVEL_STORAGE_MODES,
+    level_columns,
+    snapshot_levels,
 )
 from kolabi.shared.redaction import redact_url
+from kolabi.tree.orderbook import BookJournalT, BookLevelT, OrderBook
+from kolabi.tree.raw_writer import RawEventWriter
 
-BookLevelT = tuple[float, float]
 BookSignatureT = tuple[tuple[BookLevelT, ...], tuple[BookLevelT, ...]]
 RawLevelT = object
 MAX_RELATIVE_BOOK_SPREAD = 0.25
@@ -75,6 +85,12 @@ class KrakenConfig:
     indicator_interval_seconds: float = 6.0
     log_interval_seconds: float = 6.0
     retention_minutes: int = 30
+    # "partitioned": tables marche par tranche de temps, retention par DROP.
+    market_storage: str = "plain"
+    partition_interval_minutes: int = 60
+    partition_premake: int = 2
+    # "arrays": niveaux en float8[] sur le snapshot; "rows": une ligne par niveau.
+    level_storage: str = "arrays"
     reconnect_seconds: int = 5
     raw_retention_minutes: int = 1440
     raw_retention_limit: int = 100000
@@ -84,6 +100,9 @@ class KrakenConfig:
     ticker_interval_seconds: float = 2.0
     ticker_timeout_seconds: float = 1.0
     maintenance_seconds: float = 60.0
+    raw_queue_size: int = 10000
+    raw_batch_size: int = 500
+    raw_flush_seconds: float = 0.5
 
 
 @dataclass(frozen=True)
@@ -103,8 +122,8 @@ class BookMetrics:
 class PendingBook:
     """Dernier carnet recu en memoire avant flush planifie vers la DB."""
 
-    asks: list[BookLevelT]
-    bids: list[BookLevelT]
+    asks: tuple[BookLevelT, ...]
+    bids: tuple[BookLevelT, ...]
     metrics: BookMetrics
     received_at: datetime
     source_timestamp: datetime | None
@@ -153,14 +172,43 @@ class OrderBookState:
     source_timestamp: datetime | None
 
 
+class PublicService(Protocol):
+    """Ce que `run_service` pilote: un arbre seul ou un groupe de symboles."""
+
+    _running: bool
+
+    async def run(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+
 class KrakenTree:
     """Lecteur async Kraken Futures qui ecrit une memoire normalisee."""
 
-    def __init__(self, config: KrakenConfig) -> None:
+    # Niveaux gardes sous la vue `depth`; None = tronque a `depth` comme avant.
+    book_retain_levels: int | None = None
+
+    def __init__(
+        self,
+        config: KrakenConfig,
+        *,
+        engine: Engine | None = None,
+        raw_writer: RawEventWriter | None = None,
+    ) -> None:
         self.config = config
         self.logger = setup_logging(config.log_level)
-        self.engine = build_engine(config.db_url)
-        Base.metadata.create_all(self.engine)
+        # Un groupe multi-symbole partage le pool et le writer du premier arbre.
+        self.engine = engine if engine is not None else build_engine(config.db_url)
+        if engine is None:
+            ensure_market_storage(
+                self.engine,
+                config.market_storage,
+                interval_minutes=config.partition_interval_minutes,
+                premake=config.partition_premake,
+            )
+            Base.metadata.create_all(self.engine)
+        # En stockage partitionne la retention passe par la maintenance.
+        self._prune_on_write = config.market_storage != "partitioned"
         self.sessionmaker = sessionmaker(
             bind=self.engine,
             expire_on_commit=False,
@@ -168,7 +216,7 @@ class KrakenTree:
         )
         self._running = True
         self._latest_book: PendingBook | None = None
-        self._book_state: OrderBookState | None = None
+        self._order_book: OrderBook | None = None
         self._last_snapshot_signature: BookSignatureT | None = None
         self._last_snapshot_flush_at: datetime | None = None
         self._last_indicator_flush_at: datetime | None = None
@@ -188,21 +236,38 @@ class KrakenTree:
         self._last_ticker_fetch_at: datetime | None = None
         self._latest_ticker_prices: TickerPrices | None = None
         self._last_maintenance_at: datetime | None = None
+        if raw_writer is None:
+            raw_writer = RawEventWriter(
+                self.sessionmaker,
+                self.raw_event_values,
+                exchange=config.exchange,
+                environment=config.environment,
+                max_queue=config.raw_queue_size,
+                batch_size=config.raw_batch_size,
+                flush_seconds=config.raw_flush_seconds,
+                logger=self.logger,
+            )
+        self.raw_writer = raw_writer
+        self._reported_raw_writer_stats = self.raw_writer.stats()
 
     async def run(self) -> None:
         """Tourne en continu et relance la session websocket apres erreur."""
-        while self._running:
-            try:
-                await self.run_once()
-            except asyncio.CancelledError:
-                raise
-            except Exception as exc:
-                self.logger.warning(
-                    "kraken_tree reconnecting in %ss after error: %s",
-                    self.config.reconnect_seconds,
-                    exc,
-                )
-                await self._wait_or_stop(float(self.config.reconnect_seconds))
+        self.raw_writer.start()
+        try:
+            while self._running:
+                try:
+                    await self.run_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    self.logger.warning(
+                        "kraken_tree reconnecting in %ss after error: %s",
+                        self.config.reconnect_seconds,
+                        exc,
+                    )
+                    await self._wait_or_stop(float(self.config.reconnect_seconds))
+        finally:
+            await asyncio.to_thread(self.raw_writer.stop)
 
     async def run_once(self) -> None:
         """Ouvre une session websocket et laisse le scheduler cadencer la DB."""
@@ -243,9 +308,12 @@ class KrakenTree:
         payload = (
             raw_message.decode("utf-8") if isinstance(raw_message, bytes) else raw_message
         )
-        message = json.loads(payload)
+        return self.handle_decoded(json.loads(payload), payload)
+
+    def handle_decoded(self, message: object, payload: str) -> PendingBook | None:
+        """Traite un message deja decode, route ici par symbole ou non."""
         self._raw_message_count += 1
-        self.record_raw_event(message, stream_kind="public_ws")
+        self.raw_writer.submit(message, stream_kind="public_ws")
         self.trace_message(message, payload)
         parsed = extract_book_payload(message)
         if parsed is None:
@@ -258,6 +326,19 @@ class KrakenTree:
             self._log_invalid_book(parsed, now, exc)
             return None
 
+    def public_subscription(
+        self, pairs: Sequence[str]
+    ) -> tuple[str, dict[str, object] | None]:
+        """URL websocket et message d'abonnement pour plusieurs produits."""
+        return self.config.ws_url, subscription_message(self.config, pairs)
+
+    @staticmethod
+    def message_symbol(message: object) -> str | None:
+        """Symbole porte par un message public, pour le routage multi-symbole."""
+        if not isinstance(message, dict):
+            return None
+        return raw_event_symbol(message)
+
     def record_raw_event(
         self,
         message: dict[str, object],
@@ -266,13 +347,15 @@ class KrakenTree:
         prune_raw: bool = False,
         received_at: datetime | None = None,
     ) -> RawExchangeEvent:
-        """Persiste le payload brut public avec collapse des doublons consecutifs."""
-        event_type = str(message.get("feed") or message.get("event") or "unknown")
-        payload = dict(message)
-        source_timestamp = parse_kraken_time(
-            first_present(payload, "timestamp", "time", "last_update_time")
-        )
+        """Persiste le payload brut public avec collapse des doublons consecutifs.
+
+        Chemin synchrone conserve pour les outils; la boucle websocket passe par
+        `self.raw_writer`.
+        """
         now = received_at or datetime.now(timezone.utc)
+        values = self.raw_event_values(message, stream_kind, now)
+        event_type = values["event_type"]
+        payload = values["payload"]
         with self.sessionmaker() as session:
             previous = (
                 session.execute(
@@ -304,23 +387,7 @@ class KrakenTree:
                 session.refresh(previous)
                 return previous
 
-            row = RawExchangeEvent(
-                exchange=self.config.exchange,
-                environment=self.config.environment,
-                market_type=self.config.market_type,
-                account_scope="public",
-                symbol=raw_event_symbol(payload),
-                stream_kind=stream_kind,
-                event_type=event_type,
-                correlation_id=raw_event_correlation_id(payload),
-                exchange_sequence=optional_str(payload.get("seq")),
-                payload=payload,
-                source_timestamp=source_timestamp,
-                duplicate_count=0,
-                last_seen_at=now,
-                received_at=now,
-                created_at=now,
-            )
+            row = RawExchangeEvent(**values)
             session.add(row)
             if prune_raw:
                 prune_raw_events(
@@ -335,20 +402,54 @@ class KrakenTree:
             session.refresh(row)
             return row
 
+    def raw_event_values(
+        self,
+        message: Mapping[str, object],
+        stream_kind: str,
+        received_at: datetime,
+    ) -> dict[str, Any]:
+        """Colonnes `raw_exchange_events` d'un message public, sans acces DB."""
+        payload = dict(message)
+        return {
+            "exchange": self.config.exchange,
+            "environment": self.config.environment,
+            "market_type": self.config.market_type,
+            "account_scope": "public",
+            "symbol": raw_event_symbol(payload),
+            "stream_kind": stream_kind,
+            "event_type": str(payload.get("feed") or payload.get("event") or "unknown"),
+            "correlation_id": raw_event_correlation_id(payload),
+            "exchange_sequence": optional_str(payload.get("seq")),
+            "payload": payload,
+            "source_timestamp": parse_kraken_time(
+                first_present(payload, "timestamp", "time", "last_update_time")
+            ),
+            "duplicate_count": 0,
+            "last_seen_at": received_at,
+            "received_at": received_at,
+            "created_at": received_at,
+        }
+
     def ingest_payload(self, payload: BookPayload, received_at: datetime) -> PendingBook:
         """Applique un snapshot ou un delta puis derive les indicateurs."""
-        self._book_state = apply_book_payload(self._book_state, payload, self.config.depth)
-        state = self._book_state
-        assert state is not None
-        metrics = calculate_metrics(state.asks, state.bids)
+        self._order_book = apply_book_payload_in_place(
+            self._order_book,
+            payload,
+            self.config.depth,
+            retain=self.book_retain_levels,
+        )
+        book = self._order_book
+        metrics = calculate_book_metrics(book)
+        asks = book.asks.levels()
+        bids = book.bids.levels()
         pending = PendingBook(
-            asks=list(state.asks),
-            bids=list(state.bids),
+            asks=asks,
+            bids=bids,
             metrics=metrics,
             received_at=received_at,
-            source_timestamp=state.source_timestamp,
-            sequence=state.sequence,
-            signature=book_signature(state.asks, state.bids),
+            source_timestamp=book.source_timestamp,
+            sequence=book.sequence,
+            signature=book_signature(asks, bids),
         )
         self._latest_book = pending
         self._invalid_book_count = 0
@@ -441,7 +542,9 @@ class KrakenTree:
         pending: PendingBook,
         now: datetime,
     ) -> MarketSnapshot:
-        """Persiste un snapshot public normalise et ses niveaux sparse."""
+        """Persiste un snapshot public normalise et ses niveaux."""
+        as_rows = self.config.level_storage == "rows"
+        levels = {} if as_rows else level_columns(pending.asks, pending.bids)
         with self.sessionmaker() as session:
             snapshot = MarketSnapshot(
                 local_uuid=str(uuid4()),
@@ -458,14 +561,28 @@ class KrakenTree:
                 imbalance=pending.metrics.imbalance,
                 source_timestamp=pending.source_timestamp or pending.received_at,
                 local_timestamp=now,
+                **levels,
             )
             session.add(snapshot)
             session.flush()
-            session.add_all(
-                build_market_level_rows(snapshot.id, "ask", pending.asks)
-                + build_market_level_rows(snapshot.id, "bid", pending.bids)
+            if as_rows:
+                session.add_all(
+                    build_market_level_rows(snapshot.id, "ask", pending.asks, now)
+                    + build_market_level_rows(snapshot.id, "bid", pending.bids, now)
+                )
+            if self._prune_on_write:
+                prune_old_market_data(session, self.config.retention_minutes, now)
+            notify_state_change(
+                session,
+                MARKET_CHANNEL,
+                route=state_route_label(
+                    self.config.exchange,
+                    self.config.market_type,
+                    self.config.pair,
+                ),
+                environment=self.config.environment,
+                row_id=snapshot.id,
             )
-            prune_old_market_data(session, self.config.retention_minutes, now)
             session.commit()
             session.refresh(snapshot)
             return snapshot
@@ -491,7 +608,8 @@ class KrakenTree:
         )
         with self.sessionmaker() as session:
             session.add_all(indicators)
-            prune_old_indicators(session, self.config.retention_minutes, now)
+            if self._prune_on_write:
+                prune_old_indicators(session, self.config.retention_minutes, now)
             session.commit()
         return len(indicators)
 
@@ -557,6 +675,9 @@ class KrakenTree:
         if not is_due(self._last_maintenance_at, now, self.config.maintenance_seconds):
             return
         self._last_maintenance_at = now
+        self._report_raw_writer_pressure()
+        if not self._prune_on_write:
+            self.maintain_partitions(now)
         with self.sessionmaker() as session:
             prune_raw_events(
                 session,
@@ -568,6 +689,42 @@ class KrakenTree:
             )
             session.commit()
 
+    def maintain_partitions(self, now: datetime) -> None:
+        """Cree les tranches a venir et supprime celles hors retention."""
+        try:
+            result = maintain_market_partitions(
+                self.engine,
+                interval_minutes=self.config.partition_interval_minutes,
+                retention_minutes=self.config.retention_minutes,
+                premake=self.config.partition_premake,
+                now=now,
+            )
+        except Exception as exc:
+            self.logger.warning("market partitions maintenance failed: %s", exc)
+            return
+        if result.created or result.dropped:
+            self.logger.info(
+                "market partitions created=%s dropped=%s",
+                len(result.created),
+                len(result.dropped),
+            )
+
+    def _report_raw_writer_pressure(self) -> None:
+        """Signale les payloads bruts perdus depuis le dernier passage."""
+        stats = self.raw_writer.stats()
+        previous = self._reported_raw_writer_stats
+        self._reported_raw_writer_stats = stats
+        if stats.dropped == previous.dropped and stats.failed == previous.failed:
+            return
+        self.logger.warning(
+            "raw_writer pressure dropped=%s failed=%s queue=%s max_queue=%s written=%s",
+            stats.dropped - previous.dropped,
+            stats.failed - previous.failed,
+            stats.queue_depth,
+            stats.max_queue_depth,
+            stats.written,
+        )
+
     def log_due(self, now: datetime, snapshot: MarketSnapshot | None) -> None:
         """Imprime un statut compact lisible dans screen ou un log."""
         if not is_due(self._last_log_at, now, self.config.log_interval_seconds):
@@ -743,14 +900,17 @@ def build_engine(db_url: str) -> Engine:
     return create_engine(db_url, future=True)
 
 
-def subscription_message(config: KrakenConfig) -> dict[str, object]:
-    """Construit le message d'abonnement Kraken book."""
+def subscription_message(
+    config: KrakenConfig, pairs: Sequence[str] | None = None
+) -> dict[str, object]:
+    """Construit le message d'abonnement Kraken book pour un ou plusieurs produits."""
+    symbols = list(pairs) if pairs else [config.pair]
     if config.market_type != "futures":
         return {
             "method": "subscribe",
             "params": {
                 "channel": "book",
-                "symbol": [config.pair],
+                "symbol": symbols,
                 "depth": _kraken_spot_depth(config.depth),
                 "snapshot": True,
             },
@@ -758,7 +918,7 @@ def subscription_message(config: KrakenConfig) -> dict[str, object]:
     return {
         "event": "subscribe",
         "feed": "book",
-        "product_ids": [config.pair],
+        "product_ids": symbols,
     }
 
 
@@ -886,6 +1046,51 @@ def apply_book_payload(
     )
 
 
+def apply_book_payload_in_place(
+    book: OrderBook | None,
+    payload: BookPayload,
+    depth: int,
+    *,
+    retain: int | None = None,
+) -> OrderBook:
+    """Version incrementale de `apply_book_payload`: mute `book` sur place.
+
+    Un delta rejete (cote vide) est annule avant de lever, le carnet reste donc
+    sur son dernier etat valide comme avec la version fonctionnelle.
+    """
+    if payload.message_type == "snapshot":
+        if book is None or book.depth != depth:
+            book = OrderBook(payload.symbol, depth, retain=retain)
+        book.symbol = payload.symbol
+        book.replace(
+            payload.asks,
+            payload.bids,
+            sequence=payload.sequence,
+            source_timestamp=payload.source_timestamp,
+        )
+        return book
+    if book is None:
+        raise ValueError("kraken_tree received delta before snapshot")
+    if payload.sequence is not None and book.sequence is not None:
+        if payload.sequence <= book.sequence:
+            return book
+    journal: BookJournalT = []
+    if payload.asks or payload.bids:
+        book.asks.update(payload.asks, journal)
+        book.bids.update(payload.bids, journal)
+    elif payload.price is not None and payload.quantity is not None:
+        side = {"sell": book.asks, "buy": book.bids}.get(payload.side or "")
+        if side is not None:
+            side.update(((payload.price, payload.quantity),), journal)
+    if not book.asks or not book.bids:
+        book.rollback(journal)
+        raise ValueError("kraken_tree local book lost one side")
+    book.symbol = payload.symbol
+    book.sequence = payload.sequence or book.sequence
+    book.source_timestamp = payload.source_timestamp or book.source_timestamp
+    return book
+
+
 def apply_side_update(
     current: Sequence[BookLevelT],
     payload: BookPayload,
@@ -1020,7 +1225,7 @@ def raw_event_symbol(payload: dict[str, object]) -> str | None:
     direct = optional_str(payload.get("product_id") or payload.get("symbol"))
     if direct:
         return direct
-    for key in ("asks", "bids", "orders", "fills"):
+    for key in ("asks", "bids", "orders", "fills", "data"):
         value = payload.get(key)
         if isinstance(value, list):
             for item in value:
@@ -1053,8 +1258,42 @@ def calculate_metrics(
     clean_bids = tuple((price, volume) for price, volume in bids if price > 0 and volume > 0)
     if not clean_asks or not clean_bids:
         raise ValueError("asks and bids must contain at least one level")
-    best_ask = min(price for price, _volume in clean_asks)
-    best_bid = max(price for price, _volume in clean_bids)
+    return book_metrics_from_totals(
+        best_ask=min(price for price, _volume in clean_asks),
+        best_bid=max(price for price, _volume in clean_bids),
+        ask_volume=sum(volume for _price, volume in clean_asks),
+        ask_notional=sum(price * volume for price, volume in clean_asks),
+        bid_volume=sum(volume for _price, volume in clean_bids),
+        bid_notional=sum(price * volume for price, volume in clean_bids),
+    )
+
+
+def calculate_book_metrics(book: OrderBook) -> BookMetrics:
+    """Meme resultat que `calculate_metrics`, lu sur les totaux courants du carnet."""
+    best_ask = book.asks.best
+    best_bid = book.bids.best
+    if best_ask is None or best_bid is None:
+        raise ValueError("asks and bids must contain at least one level")
+    return book_metrics_from_totals(
+        best_ask=best_ask,
+        best_bid=best_bid,
+        ask_volume=book.asks.volume,
+        ask_notional=book.asks.notional,
+        bid_volume=book.bids.volume,
+        bid_notional=book.bids.notional,
+    )
+
+
+def book_metrics_from_totals(
+    *,
+    best_ask: float,
+    best_bid: float,
+    ask_volume: float,
+    ask_notional: float,
+    bid_volume: float,
+    bid_notional: float,
+) -> BookMetrics:
+    """Valide le top of book et derive les indicateurs depuis volumes/notionnels."""
     spread = best_ask - best_bid
     mid_price = (best_ask + best_bid) / 2
     if spread < 0:
@@ -1067,12 +1306,10 @@ def calculate_metrics(
             "absurd book spread "
             f"best_bid={best_bid:g} best_ask={best_ask:g} relative={relative_spread:.4f}"
         )
-    ask_volume = sum(volume for _price, volume in clean_asks)
-    bid_volume = sum(volume for _price, volume in clean_bids)
     total_volume = max(ask_volume + bid_volume, 1e-8)
     return BookMetrics(
-        avg_ask=weighted_average(clean_asks),
-        avg_bid=weighted_average(clean_bids),
+        avg_ask=ask_notional / max(ask_volume, 1e-8),
+        avg_bid=bid_notional / max(bid_volume, 1e-8),
         best_ask=best_ask,
         best_bid=best_bid,
         spread=spread,
@@ -1108,6 +1345,7 @@ def build_market_level_rows(
     snapshot_id: int,
     side: str,
     levels: Sequence[BookLevelT],
+    local_timestamp: datetime | None = None,
 ) -> list[MarketLevel]:
     """Construit les lignes normalisees de niveaux L2."""
     return [
@@ -1117,6 +1355,7 @@ def build_market_level_rows(
             price=price,
             volume=volume,
             level_index=index,
+            local_timestamp=local_timestamp,
         )
         for index, (price, volume) in enumerate(levels)
     ]
@@ -1292,18 +1531,56 @@ def count_levels(
     environment: str | None = None,
     market_type: str | None = None,
 ) -> int:
-    """Compte les niveaux normalises pour un produit."""
-    stmt = (
+    """Compte les niveaux pour un produit, tableaux et lignes historiques."""
+    filters = [MarketSnapshot.exchange == exchange, MarketSnapshot.symbol == pair]
+    if environment is not None:
+        filters.append(MarketSnapshot.environment == environment)
+    if market_type is not None:
+        filters.append(MarketSnapshot.market_type == market_type)
+    array_levels = select(
+        func.coalesce(
+            func.sum(
+                func.coalesce(func.cardinality(MarketSnapshot.ask_prices), 0)
+                + func.coalesce(func.cardinality(MarketSnapshot.bid_prices), 0)
+            ),
+            0,
+        )
+    ).where(*filters)
+    row_levels = (
         select(func.count())
         .select_from(MarketLevel)
         .join(MarketSnapshot)
-        .where(MarketSnapshot.exchange == exchange, MarketSnapshot.symbol == pair)
+        .where(*filters)
+    )
+    return int(session.execute(array_levels).scalar_one()) + int(
+        session.execute(row_levels).scalar_one()
+    )
+
+
+def book_at(
+    session: Session,
+    pair: str,
+    at: datetime,
+    exchange: str = "kraken",
+    environment: str | None = None,
+    market_type: str | None = None,
+) -> tuple[MarketSnapshot, tuple[BookLevelT, ...], tuple[BookLevelT, ...]] | None:
+    """Reconstruit le carnet persiste le plus recent a la date `at`."""
+    stmt = select(MarketSnapshot).where(
+        MarketSnapshot.exchange == exchange,
+        MarketSnapshot.symbol == pair,
+        MarketSnapshot.local_timestamp <= at,
     )
     if environment is not None:
         stmt = stmt.where(MarketSnapshot.environment == environment)
     if market_type is not None:
         stmt = stmt.where(MarketSnapshot.market_type == market_type)
-    return int(session.execute(stmt).scalar_one())
+    stmt = stmt.order_by(MarketSnapshot.local_timestamp.desc(), MarketSnapshot.id.desc())
+    snapshot = session.execute(stmt.limit(1)).scalars().first()
+    if snapshot is None:
+        return None
+    asks, bids = snapshot_levels(session, snapshot)
+    return snapshot, asks, bids
 
 
 def count_indicators(
@@ -1517,6 +1794,10 @@ def build_parser() -> argparse.ArgumentParser:
             formatter_class=argparse.ArgumentDefaultsHelpFormatter,
         )
         command_parser.add_argument("--pair", default=KrakenConfig.pair, help="Futures product id.")
+        command_parser.add_argument(
+            "--pairs",
+            help="Comma-separated product ids served by one process; overrides --pair.",
+        )
         command_parser.add_argument("--depth", type=int, default=KrakenConfig.depth, help="Orderbook depth to keep.")
         command_parser.add_argument("--environment", choices=("demo", "live"), default=KrakenConfig.environment, help="Endpoint family.")
         command_parser.add_argument("--ws-url", help="Override public websocket URL.")
@@ -1568,6 +1849,24 @@ def build_parser() -> argparse.ArgumentParser:
             default=KrakenConfig.retention_minutes,
             help="Retention window for service-managed cleanup.",
         )
+        command_parser.add_argument(
+            "--market-storage",
+            choices=MARKET_STORAGE_LAYOUTS,
+            default=KrakenConfig.market_storage,
+            help="Market table layout; partitioned drops whole time partitions.",
+        )
+        command_parser.add_argument(
+            "--partition-interval-minutes",
+            type=int,
+            default=KrakenConfig.partition_interval_minutes,
+            help="Time span of one market partition.",
+        )
+        command_parser.add_argument(
+            "--level-storage",
+            choices=LEVEL_STORAGE_MODES,
+            default=KrakenConfig.level_storage,
+            help="Level encoding: float8[] arrays on the snapshot, or one row per level.",
+        )
         command_parser.add_argument(
             "--reconnect-seconds",
             type=int,
@@ -1613,6 +1912,9 @@ def config_from_args(args: argparse.Namespace) -> KrakenConfig:
         log_interval_seconds=args.log_interval_seconds,
         maintenance_seconds=args.maintenance_seconds,
         retention_minutes=args.retention_minutes,
+        market_storage=args.market_storage,
+        partition_interval_minutes=args.partition_interval_minutes,
+        level_storage=args.level_storage,
         reconnect_seconds=args.reconnect_seconds,
         trace_ws=args.trace_ws,
         trace_ws_format=args.trace_ws_format,
@@ -1646,7 +1948,7 @@ def print_status(tree: KrakenTree, pair: str) -> None:
     print(json.dumps(tree.latest_status(pair), sort_keys=True))
 
 
-async def run_service(tree: KrakenTree, stop_after_seconds: float | None = None) -> None:
+async def run_service(tree: PublicService, stop_after_seconds: float | None = None) -> None:
     """Lance le service avec gestion simple de SIGINT/SIGTERM."""
     loop = asyncio.get_running_loop()
     task = asyncio.current_task()
@@ -1677,7 +1979,7 @@ async def run_service(tree: KrakenTree, stop_after_seconds: float | None = None)
                 await stopper
 
 
-async def stop_tree_after(tree: KrakenTree, delay_seconds: float) -> None:
+async def stop_tree_after(tree: PublicService, delay_seconds: float) -> None:
     """Arrete le service apres un delai borne pour un probe ou un smoke test."""
     await asyncio.sleep(max(delay_seconds, 0.0))
     tree.stop()
@@ -1685,8 +1987,14 @@ async def stop_tree_after(tree: KrakenTree, delay_seconds: float) -> None:
 
 def main(argv: Sequence[str] | None = None) -> int:
     """Point d'entree CLI de KrakenTree."""
+    # Import local: public_group depend de ce module.
+    from kolabi.tree.public_group import parse_pairs, run_group_command
+
     parser = build_parser()
     args = parser.parse_args(argv)
+    pairs = parse_pairs(args.pairs)
+    if pairs:
+        return run_group_command(KrakenTree, config_from_args(args), pairs, args)
     tree = KrakenTree(config_from_args(args))
     if args.command == "status":
         print_status(tree, args.pair)
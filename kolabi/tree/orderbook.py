@@ -0,0 +1,238 @@
+"""Carnet L2 incremental partage par les trees publics.
+
+Purpose: appliquer snapshots et deltas sans reconstruire/retrier tout un cote.
+Inputs: couples (prix, quantite) deja parses par les adapters Kraken/Binance/BitMEX.
+Outputs: vue top-N triee (tuple cache) et totaux courants pour les metriques.
+Side effects: none (structure mutable en memoire).
+Role: pure core.
+
+`OrderBookSide` garde les prix tries via `bisect` et reste borne a `retain`
+niveaux apres chaque lot (`depth` par defaut, comme `truncate_book_side`). Les
+volumes et notionnels de la vue top-`depth` sont tenus a jour a chaque ecriture
+et recalcules exactement de temps en temps pour eviter la derive flottante.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from datetime import datetime
+from typing import Iterable
+
+BookLevelT = tuple[float, float]
+BookJournalT = list[tuple["OrderBookSide", float, float | None]]
+
+RESYNC_EVERY_WRITES = 4096
+
+
+class OrderBookSide:
+    """Un cote du carnet trie (asks croissants, bids decroissants).
+
+    `depth` borne la vue exposee (et les totaux); `retain` borne les niveaux
+    gardes en reserve sous la vue (par defaut `depth`, comme `truncate_book_side`).
+    """
+
+    __slots__ = (
+        "depth",
+        "retain",
+        "reverse",
+        "_keys",
+        "_quantities",
+        "_volume",
+        "_notional",
+        "_view",
+        "_writes",
+    )
+
+    def __init__(self, depth: int, *, reverse: bool, retain: int | None = None) -> None:
+        self.depth = max(1, int(depth))
+        self.retain = max(self.depth, int(retain or 0))
+        self.reverse = reverse
+        # Cles de tri: prix pour les asks, -prix pour les bids.
+        self._keys: list[float] = []
+        self._quantities: dict[float, float] = {}
+        self._volume = 0.0
+        self._notional = 0.0
+        self._view: tuple[BookLevelT, ...] | None = ()
+        self._writes = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __bool__(self) -> bool:
+        return bool(self._keys)
+
+    @property
+    def best(self) -> float | None:
+        if not self._keys:
+            return None
+        return self._price(self._keys[0])
+
+    @property
+    def volume(self) -> float:
+        """Volume cumule de la vue top-`depth`."""
+        return self._volume
+
+    @property
+    def notional(self) -> float:
+        """Somme prix * volume de la vue top-`depth`."""
+        return self._notional
+
+    def quantity(self, price: float) -> float | None:
+        return self._quantities.get(float(price))
+
+    def levels(self) -> tuple[BookLevelT, ...]:
+        """Vue top-`depth` triee; reconstruite seulement apres une modification."""
+        if self._view is None:
+            quantities = self._quantities
+            self._view = tuple(
+                (price, quantities[price])
+                for price in map(self._price, self._keys[: self.depth])
+            )
+        return self._view
+
+    def replace(self, levels: Iterable[BookLevelT]) -> None:
+        """Remplace tout le cote (snapshot) puis tronque a `retain`."""
+        quantities: dict[float, float] = {}
+        for price, quantity in levels:
+            price = float(price)
+            quantity = float(quantity)
+            if price > 0 and quantity > 0:
+                quantities[price] = quantity
+        keys = sorted(map(self._key, quantities))
+        for key in keys[self.retain :]:
+            del quantities[self._price(key)]
+        del keys[self.retain :]
+        self._keys = keys
+        self._quantities = quantities
+        self._view = None
+        self.resync()
+
+    def update(
+        self,
+        levels: Iterable[BookLevelT],
+        journal: BookJournalT | None = None,
+    ) -> bool:
+        """Applique un lot de deltas (quantite <= 0 supprime) puis tronque a `retain`."""
+        changed = False
+        for price, quantity in levels:
+            changed = self.set(price, quantity, journal) or changed
+        return self.trim(journal) or changed
+
+    def set(
+        self,
+        price: float,
+        quantity: float,
+        journal: BookJournalT | None = None,
+    ) -> bool:
+        """Pose un niveau sans tronquer; utiliser `update` pour un lot complet."""
+        price = float(price)
+        if price <= 0:
+            return False
+        target = float(quantity) if quantity > 0 else None
+        previous = self._write(price, target)
+        if previous == target:
+            return False
+        if journal is not None:
+            journal.append((self, price, previous))
+        return True
+
+    def trim(self, journal: BookJournalT | None = None) -> bool:
+        """Retire les niveaux au-dela de `retain` (les plus eloignes du spread)."""
+        changed = False
+        while len(self._keys) > self.retain:
+            price = self._price(self._keys[-1])
+            previous = self._write(price, None)
+            if journal is not None:
+                journal.append((self, price, previous))
+            changed = True
+        return changed
+
+    def resync(self) -> None:
+        """Recalcule exactement les totaux courants depuis la vue."""
+        levels = self.levels()
+        self._volume = sum(quantity for _price, quantity in levels)
+        self._notional = sum(price * quantity for price, quantity in levels)
+        self._writes = 0
+
+    def _write(self, price: float, quantity: float | None) -> float | None:
+        previous = self._quantities.get(price)
+        if previous == quantity:
+            return previous
+        keys = self._keys
+        depth = self.depth
+        position = bisect_left(keys, self._key(price))
+        if previous is not None and quantity is not None:
+            self._quantities[price] = quantity
+            if position < depth:
+                self._add_total(price, quantity - previous)
+        elif previous is None:
+            assert quantity is not None
+            keys.insert(position, self._key(price))
+            self._quantities[price] = quantity
+            if position < depth:
+                self._add_total(price, quantity)
+                if len(keys) > depth:
+                    pushed = self._price(keys[depth])
+                    self._add_total(pushed, -self._quantities[pushed])
+        else:
+            del keys[position]
+            del self._quantities[price]
+            if position < depth:
+                self._add_total(price, -previous)
+                if len(keys) >= depth:
+                    pulled = self._price(keys[depth - 1])
+                    self._add_total(pulled, self._quantities[pulled])
+        if position >= depth:
+            return previous
+        self._view = None
+        self._writes += 1
+        if not keys:
+            self._volume = 0.0
+            self._notional = 0.0
+            self._writes = 0
+        elif self._writes >= RESYNC_EVERY_WRITES:
+            self.resync()
+        return previous
+
+    def _add_total(self, price: float, quantity: float) -> None:
+        self._volume += quantity
+        self._notional += price * quantity
+
+    def _key(self, price: float) -> float:
+        return -price if self.reverse else price
+
+    def _price(self, key: float) -> float:
+        return -key if self.reverse else key
+
+
+class OrderBook:
+    """Carnet local mutable d'un produit: deux cotes, sequence et horodatage."""
+
+    __slots__ = ("symbol", "depth", "asks", "bids", "sequence", "source_timestamp")
+
+    def __init__(self, symbol: str, depth: int, *, retain: int | None = None) -> None:
+        self.symbol = symbol
+        self.depth = depth
+        self.asks = OrderBookSide(depth, reverse=False, retain=retain)
+        self.bids = OrderBookSide(depth, reverse=True, retain=retain)
+        self.sequence: int | None = None
+        self.source_timestamp: datetime | None = None
+
+    def replace(
+        self,
+        asks: Iterable[BookLevelT],
+        bids: Iterable[BookLevelT],
+        *,
+        sequence: int | None,
+        source_timestamp: datetime | None,
+    ) -> None:
+        self.asks.replace(asks)
+        self.bids.replace(bids)
+        self.sequence = sequence
+        self.source_timestamp = source_timestamp
+
+    @staticmethod
+    def rollback(journal: BookJournalT) -> None:
+        """Annule les ecritures journalisees (delta rejete)."""
+        for side, price, previous in reversed(journal):
+            side._write(price, previous)
+        journal.clear()
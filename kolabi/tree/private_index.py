@@ -0,0 +1,330 @@
+"""Index memoire des ordres ouverts et positions d'un scope prive.
+
+Purpose: calculer les tombstones d'un snapshot `open_orders`/`open_positions`
+par difference d'ensembles en memoire, sans relire toutes les lignes ouvertes
+du compte a chaque snapshot.
+Inputs: lignes `ExchangeOrder`/`AccountPosition` ecrites par `AccountStateStore`
+(appliquees apres commit) et lectures DB de chauffe ou de controle.
+Outputs: dernier ordre ouvert par identite, derniere position non nulle par
+symbole, compteurs de controle et de derive.
+Side effects: aucun hors memoire; un verrou par index.
+Important types: `PrivateStateIndex`, `IndexedOrder`, `IndexedPosition`.
+Role: functional core helper.
+
+Le feeder prive est le seul writer de son scope: l'index est chauffe depuis la
+DB au demarrage puis tenu a jour par chaque ingest. Il garde les lignes ouvertes
+par id (comme la requete DB qu'il remplace) et choisit la plus recente par
+identite a la lecture. `check` compare l'index a la DB sur la boucle de
+maintenance; une derive incremente `drift_alerts` et realigne l'index.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+OPEN_ORDER_STATUSES = (
+    "new",
+    "open",
+    "untouched",
+    "partial_fill",
+    "partially_filled",
+    "living",
+)
+_OPEN_ORDER_STATUS_SET = frozenset(OPEN_ORDER_STATUSES)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class IndexedOrder:
+    """Copie figee des colonnes utiles d'une ligne `exchange_orders`."""
+
+    id: int
+    symbol: str
+    side: str
+    order_type: str
+    status: str
+    quantity: float
+    price: float | None
+    filled_quantity: float
+    reduce_only: bool
+    exchange_order_id: str | None
+    client_order_id: str | None
+    local_timestamp: datetime | None
+
+    @classmethod
+    def from_row(cls, row: Any) -> IndexedOrder:
+        return cls(
+            id=int(row.id),
+            symbol=row.symbol,
+            side=row.side,
+            order_type=row.order_type,
+            status=row.status,
+            quantity=row.quantity,
+            price=row.price,
+            filled_quantity=row.filled_quantity,
+            reduce_only=row.reduce_only,
+            exchange_order_id=row.exchange_order_id,
+            client_order_id=row.client_order_id,
+            local_timestamp=row.local_timestamp,
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in _OPEN_ORDER_STATUS_SET
+
+
+@dataclass(frozen=True)
+class IndexedPosition:
+    """Copie figee des colonnes utiles d'une ligne `account_positions`."""
+
+    id: int
+    symbol: str
+    side: str
+    size: float
+    entry_price: float | None
+    local_timestamp: datetime | None
+
+    @classmethod
+    def from_row(cls, row: Any) -> IndexedPosition:
+        return cls(
+            id=int(row.id),
+            symbol=row.symbol,
+            side=row.side,
+            size=row.size,
+            entry_price=row.entry_price,
+            local_timestamp=row.local_timestamp,
+        )
+
+    @property
+    def is_nonzero(self) -> bool:
+        return abs(float(self.size or 0.0)) > 0.0
+
+
+@dataclass(frozen=True)
+class PrivateIndexStats:
+    """Compteurs exposes par l'index pour statut et alertes."""
+
+    warmed: bool
+    open_orders: int
+    nonzero_positions: int
+    applied: int
+    checks: int
+    drift_alerts: int
+    last_drift: str | None
+
+
+def order_identity_key(row: Any) -> tuple[str, str] | None:
+    """Identite d'un ordre: id bourse, sinon id client."""
+    if row.exchange_order_id:
+        return ("exchange", row.exchange_order_id)
+    if row.client_order_id:
+        return ("client", row.client_order_id)
+    return None
+
+
+def latest_open_by_identity(rows: Iterable[IndexedOrder]) -> tuple[IndexedOrder, ...]:
+    """Ligne ouverte la plus recente par identite, plus recente d'abord."""
+    latest: dict[tuple[str, str], IndexedOrder] = {}
+    for row in sorted(rows, key=_recency, reverse=True):
+        identity = order_identity_key(row)
+        if identity is None or identity in latest or not row.is_open:
+            continue
+        latest[identity] = row
+    return tuple(latest.values())
+
+
+def latest_by_symbol(rows: Iterable[IndexedPosition]) -> dict[str, IndexedPosition]:
+    """Derniere ligne de position par symbole, toutes tailles confondues."""
+    latest: dict[str, IndexedPosition] = {}
+    for row in rows:
+        current = latest.get(row.symbol)
+        if current is None or _recency(row) >= _recency(current):
+            latest[row.symbol] = row
+    return latest
+
+
+class PrivateStateIndex:
+    """Ordres ouverts par id et derniere position par symbole d'un scope."""
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self._orders: dict[int, IndexedOrder] = {}
+        self._positions: dict[str, IndexedPosition] = {}
+        self._warmed = False
+        self._applied = 0
+        self._checks = 0
+        self._drift_alerts = 0
+        self._last_drift: str | None = None
+
+    @property
+    def warmed(self) -> bool:
+        return self._warmed
+
+    def reset(
+        self,
+        orders: Iterable[IndexedOrder],
+        positions: Iterable[IndexedPosition],
+    ) -> None:
+        """Remplace le contenu par une lecture DB (chauffe ou realignement)."""
+        with self.lock:
+            self._orders = {row.id: row for row in orders if row.is_open}
+            self._positions = latest_by_symbol(positions)
+            self._warmed = True
+
+    def apply(self, rows: Iterable[IndexedOrder | IndexedPosition]) -> None:
+        """Applique des lignes commitees, dans l'ordre d'ecriture."""
+        with self.lock:
+            for row in rows:
+                self._applied += 1
+                if isinstance(row, IndexedOrder):
+                    if row.is_open:
+                        self._orders[row.id] = row
+                    else:
+                        self._orders.pop(row.id, None)
+                    continue
+                current = self._positions.get(row.symbol)
+                if current is None or _recency(row) >= _recency(current):
+                    self._positions[row.symbol] = row
+
+    def open_orders(
+        self,
+        pending: Iterable[IndexedOrder] = (),
+    ) -> tuple[IndexedOrder, ...]:
+        """Dernier ordre ouvert par identite, ecritures non commitees comprises."""
+        with self.lock:
+            rows = dict(self._orders)
+        for row in pending:
+            rows[row.id] = row
+        return latest_open_by_identity(rows.values())
+
+    def nonzero_positions(
+        self,
+        pending: Iterable[IndexedPosition] = (),
+    ) -> tuple[IndexedPosition, ...]:
+        """Derniere position par symbole quand elle n'est pas plate."""
+        with self.lock:
+            latest = dict(self._positions)
+        for symbol, row in latest_by_symbol(pending).items():
+            current = latest.get(symbol)
+            if current is None or _recency(row) >= _recency(current):
+                latest[symbol] = row
+        return tuple(row for row in latest.values() if row.is_nonzero)
+
+    def check(
+        self,
+        orders: Iterable[IndexedOrder],
+        positions: Iterable[IndexedPosition],
+    ) -> str | None:
+        """Compare l'index a une lecture DB; realigne et compte une derive."""
+        order_rows = tuple(orders)
+        position_rows = tuple(positions)
+        with self.lock:
+            self._checks += 1
+            expected_orders = _order_fingerprint(latest_open_by_identity(order_rows))
+            actual_orders = _order_fingerprint(self.open_orders())
+            expected_positions = _position_fingerprint(
+                row for row in latest_by_symbol(position_rows).values() if row.is_nonzero
+            )
+            actual_positions = _position_fingerprint(self.nonzero_positions())
+            drift = _describe_drift(
+                expected_orders,
+                actual_orders,
+                expected_positions,
+                actual_positions,
+            )
+            if drift is not None:
+                self._drift_alerts += 1
+                self._last_drift = drift
+            self.reset(order_rows, position_rows)
+            return drift
+
+    def stats(self) -> PrivateIndexStats:
+        with self.lock:
+            return PrivateIndexStats(
+                warmed=self._warmed,
+                open_orders=len(latest_open_by_identity(self._orders.values())),
+                nonzero_positions=sum(
+                    1 for row in self._positions.values() if row.is_nonzero
+                ),
+                applied=self._applied,
+                checks=self._checks,
+                drift_alerts=self._drift_alerts,
+                last_drift=self._last_drift,
+            )
+
+
+_INDEXES: dict[tuple[str, ...], PrivateStateIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def shared_private_index(key: tuple[str, ...]) -> PrivateStateIndex:
+    """Index unique par (db, bourse, env, marche, scope) dans le process.
+
+    Plusieurs `AccountStateStore` peuvent ecrire le meme scope (stream, miroir,
+    reconcileur REST): ils partagent donc le meme index.
+    """
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = PrivateStateIndex()
+        return index
+
+
+def _recency(row: IndexedOrder | IndexedPosition) -> tuple[datetime, int]:
+    timestamp = row.local_timestamp
+    if timestamp is None:
+        return (_EPOCH, row.id)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp, row.id)
+
+
+def _order_fingerprint(
+    rows: Iterable[IndexedOrder],
+) -> dict[tuple[str, str] | None, tuple[object, ...]]:
+    return {
+        order_identity_key(row): (
+            row.id,
+            row.status,
+            row.quantity,
+            row.filled_quantity,
+            row.price,
+        )
+        for row in rows
+    }
+
+
+def _position_fingerprint(
+    rows: Iterable[IndexedPosition],
+) -> dict[str, tuple[object, ...]]:
+    return {row.symbol: (row.id, row.side, row.size) for row in rows}
+
+
+def _describe_drift(
+    expected_orders: dict[Any, tuple[object, ...]],
+    actual_orders: dict[Any, tuple[object, ...]],
+    expected_positions: dict[str, tuple[object, ...]],
+    actual_positions: dict[str, tuple[object, ...]],
+) -> str | None:
+    parts = []
+    missing = expected_orders.keys() - actual_orders.keys()
+    stale = actual_orders.keys() - expected_orders.keys()
+    changed = {
+        key
+        for key in expected_orders.keys() & actual_orders.keys()
+        if expected_orders[key] != actual_orders[key]
+    }
+    if missing or stale or changed:
+        parts.append(
+            f"orders missing={len(missing)} stale={len(stale)} changed={len(changed)}"
+        )
+    if expected_positions != actual_positions:
+        symbols = sorted(
+            symbol
+            for symbol in expected_positions.keys() | actual_positions.keys()
+            if expected_positions.get(symbol) != actual_positions.get(symbol)
+        )
+        parts.append(f"positions={','.join(symbols)}")
+    return " ".join(parts) or None
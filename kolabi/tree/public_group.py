@@ -0,0 +1,177 @@
+"""Feeder public multi-symbole: un process, un websocket, un pool.
+
+Purpose: servir plusieurs symboles d'une meme bourse sans lancer un process,
+une boucle, un pool SQL et un writer brut par symbole.
+Inputs: une classe d'arbre public (`KrakenTree`, `BinanceTree`, `BitmexTree`),
+sa configuration de base et la liste des symboles.
+Outputs: les memes snapshots, niveaux, indicateurs et statuts par symbole que
+les arbres seuls.
+Side effects: une connexion websocket, un thread `RawEventWriter` partage et
+des ecritures PostgreSQL via un seul engine.
+Important types: `PublicTreeGroup`.
+Role: boundary adapter.
+
+Chaque symbole garde son arbre (carnet, cadence de flush, compteurs, lignes de
+statut avec la colonne `pair`). Le groupe ouvre l'abonnement multiplexe
+(`product_ids` Kraken, flux combines Binance, topics BitMEX), route chaque
+message vers l'arbre de son symbole et fait tourner `flush_due` de chaque arbre
+au meme tick. Les messages sans symbole (acks, heartbeats) vont au premier
+arbre; la retention brute et la pression du writer passent une seule fois.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from dataclasses import replace
+from datetime import datetime, timezone
+from typing import Iterable, Sequence
+
+import websockets
+
+from kolabi.shared.redaction import redact_url
+from kolabi.tree.kraken import KrakenConfig, KrakenTree, PendingBook, run_service
+
+
+class PublicTreeGroup:
+    """Plusieurs arbres publics multiplexes sur un websocket et un writer."""
+
+    def __init__(
+        self,
+        tree_cls: type[KrakenTree],
+        config: KrakenConfig,
+        pairs: Iterable[str],
+    ) -> None:
+        names = parse_pairs(pairs)
+        if not names:
+            raise ValueError("at least one public pair is required")
+        primary = tree_cls(replace(config, pair=names[0]))
+        self.primary = primary
+        self.config = primary.config
+        self.logger = primary.logger
+        self.trees: dict[str, KrakenTree] = {names[0]: primary}
+        for name in names[1:]:
+            self.trees[name] = tree_cls(
+                replace(config, pair=name),
+                engine=primary.engine,
+                raw_writer=primary.raw_writer,
+            )
+        self._routes = {name.upper(): tree for name, tree in self.trees.items()}
+        self._running = True
+
+    @property
+    def pairs(self) -> tuple[str, ...]:
+        return tuple(self.trees)
+
+    async def run(self) -> None:
+        """Tourne en continu et relance la session websocket apres erreur."""
+        self.primary.raw_writer.start()
+        try:
+            while self._running:
+                try:
+                    await self.run_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    self.logger.warning(
+                        "public_group reconnecting in %ss after error: %s",
+                        self.config.reconnect_seconds,
+                        exc,
+                    )
+                    await self.primary._wait_or_stop(float(self.config.reconnect_seconds))
+        finally:
+            await asyncio.to_thread(self.primary.raw_writer.stop)
+
+    async def run_once(self) -> None:
+        """Ouvre une session multiplexee et cadence la DB de chaque symbole."""
+        url, subscription = self.primary.public_subscription(self.pairs)
+        async with websockets.connect(url, ping_interval=20) as ws:
+            if subscription is not None:
+                await ws.send(json.dumps(subscription))
+            self.logger.info(
+                "public_group subscribed exchange=%s pairs=%s depth=%s env=%s db=%s ws=%s",
+                self.config.exchange,
+                ",".join(self.pairs),
+                self.config.depth,
+                self.config.environment,
+                redact_url(self.config.db_url),
+                url,
+            )
+            while self._running:
+                try:
+                    raw_message = await asyncio.wait_for(ws.recv(), timeout=0.25)
+                    self.handle_message(raw_message)
+                except TimeoutError:
+                    pass
+                now = datetime.now(timezone.utc)
+                for tree in self.trees.values():
+                    tree.flush_due(now)
+                self.primary._maintenance_due(now)
+
+    def handle_message(self, raw_message: str | bytes) -> PendingBook | None:
+        """Decode une fois puis remet le message a l'arbre de son symbole."""
+        payload = (
+            raw_message.decode("utf-8") if isinstance(raw_message, bytes) else raw_message
+        )
+        message = json.loads(payload)
+        symbol = self.primary.message_symbol(message)
+        if symbol is None:
+            return self.primary.handle_decoded(message, payload)
+        tree = self._routes.get(symbol.upper())
+        if tree is None:
+            # Symbole hors groupe: garde le brut, ne touche aucun carnet.
+            self.primary.raw_writer.submit(message, stream_kind="public_ws")
+            return None
+        return tree.handle_decoded(message, payload)
+
+    def stop(self) -> None:
+        """Demande l'arret de la session et de tous les arbres."""
+        self._running = False
+        for tree in self.trees.values():
+            tree.stop()
+
+    def latest_statuses(self) -> list[dict[str, object]]:
+        """Dernier statut DB de chaque symbole, dans l'ordre du groupe."""
+        return [tree.latest_status() for tree in self.trees.values()]
+
+
+def parse_pairs(values: str | Iterable[str] | None) -> list[str]:
+    """Decoupe `A,B` (ou une liste de tels textes) en symboles uniques ordonnes."""
+    if values is None:
+        return []
+    items = [values] if isinstance(values, str) else list(values)
+    names = (name.strip() for item in items for name in item.split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def print_group_status(group: PublicTreeGroup) -> None:
+    """Imprime une ligne JSON par symbole pour scripts shell."""
+    for status in group.latest_statuses():
+        print(json.dumps(status, sort_keys=True))
+
+
+def run_group_command(
+    tree_cls: type[KrakenTree],
+    config: KrakenConfig,
+    pairs: Sequence[str],
+    args: argparse.Namespace,
+) -> int:
+    """Execute `run`, `probe` ou `status` pour un groupe de symboles."""
+    group = PublicTreeGroup(tree_cls, config, pairs)
+    if args.command == "status":
+        print_group_status(group)
+        return 0
+    if args.command == "probe":
+        try:
+            asyncio.run(run_service(group, stop_after_seconds=args.seconds))
+        except KeyboardInterrupt:
+            group.stop()
+        print_group_status(group)
+        return 0
+    try:
+        asyncio.run(run_service(group))
+    except KeyboardInterrupt:
+        group.stop()
+        print("public market stream stopped by operator")
+        return 0
+    return 0
@@ -0,0 +1,347 @@
+"""Writer asynchrone des payloads bruts publics.
+
+Purpose: sortir `record_raw_event` de la boucle websocket des feeders publics.
+Inputs: messages websocket deja decodes, remis par `submit` depuis la boucle.
+Outputs: lignes `raw_exchange_events` ecrites en INSERT multi-lignes.
+Side effects: un thread worker, une file bornee et des ecritures PostgreSQL.
+Role: boundary adapter.
+
+La boucle asyncio ne fait qu'un `put_nowait`; le worker collapse les doublons
+consecutifs en memoire (meme semantique que `KrakenTree.record_raw_event`) puis
+flush quand le lot atteint `batch_size` ou quand `flush_seconds` est ecoule.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, Callable, Mapping
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+
+from kolabi.shared.persistence import RawExchangeEvent
+
+RawRowValuesT = Callable[[Mapping[str, object], str, datetime], dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class RawEventWriterStats:
+    """Compteurs exposes par le writer pour statut et alertes."""
+
+    submitted: int
+    dropped: int
+    collapsed: int
+    written: int
+    failed: int
+    flushes: int
+    queue_depth: int
+    max_queue_depth: int
+
+
+@dataclass(frozen=True)
+class _QueuedRawEvent:
+    message: dict[str, object]
+    stream_kind: str
+    received_at: datetime
+
+
+@dataclass
+class _PendingRawRow:
+    values: dict[str, Any]
+    row_id: int | None = None
+
+
+@dataclass
+class _LastRawEvent:
+    """Dernier payload connu pour une identite (stream_kind, event_type)."""
+
+    payload: dict[str, object] | None
+    row: _PendingRawRow | None = None
+    row_id: int | None = None
+
+
+@dataclass
+class _DuplicateBump:
+    increment: int = 0
+    last_seen_at: datetime | None = None
+
+
+@dataclass
+class _RawWriterCounters:
+    submitted: int = 0
+    dropped: int = 0
+    collapsed: int = 0
+    written: int = 0
+    failed: int = 0
+    flushes: int = 0
+    max_queue_depth: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class RawEventWriter:
+    """File bornee + worker batch pour les evenements bruts d'un feeder public."""
+
+    def __init__(
+        self,
+        sessionmaker: Callable[[], Session],
+        row_values: RawRowValuesT,
+        *,
+        exchange: str,
+        environment: str,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_seconds: float = 0.5,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._sessionmaker = sessionmaker
+        self._row_values = row_values
+        self.exchange = exchange
+        self.environment = environment
+        self.batch_size = max(1, int(batch_size))
+        self.flush_seconds = max(0.0, float(flush_seconds))
+        self.logger = logger or logging.getLogger("kola")
+        self._queue: queue.Queue[_QueuedRawEvent | None] = queue.Queue(
+            maxsize=max(1, int(max_queue))
+        )
+        self._counters = _RawWriterCounters()
+        self._write_lock = threading.Lock()
+        self._pending_rows: list[_PendingRawRow] = []
+        self._duplicate_bumps: dict[int, _DuplicateBump] = {}
+        self._last_by_identity: dict[tuple[str, str], _LastRawEvent] = {}
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._last_flush_at = monotonic()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(
+        self,
+        message: dict[str, object],
+        *,
+        stream_kind: str = "public_ws",
+        received_at: datetime | None = None,
+    ) -> bool:
+        """Remet un message au writer sans jamais bloquer ni toucher la DB."""
+        item = _QueuedRawEvent(
+            message=dict(message),
+            stream_kind=stream_kind,
+            received_at=received_at or datetime.now(timezone.utc),
+        )
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._counters.lock:
+                self._counters.dropped += 1
+            return False
+        depth = self._queue.qsize()
+        with self._counters.lock:
+            self._counters.submitted += 1
+            if depth > self._counters.max_queue_depth:
+                self._counters.max_queue_depth = depth
+        return True
+
+    def stats(self) -> RawEventWriterStats:
+        with self._counters.lock:
+            return RawEventWriterStats(
+                submitted=self._counters.submitted,
+                dropped=self._counters.dropped,
+                collapsed=self._counters.collapsed,
+                written=self._counters.written,
+                failed=self._counters.failed,
+                flushes=self._counters.flushes,
+                queue_depth=self._queue.qsize(),
+                max_queue_depth=self._counters.max_queue_depth,
+            )
+
+    def start(self) -> None:
+        """Demarre le worker thread si necessaire."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"raw-writer-{self.exchange}-{self.environment}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Arrete le worker apres avoir vide la file (durabilite a l'arret)."""
+        thread = self._thread
+        self._stop.set()
+        if thread is not None and thread.is_alive():
+            # Reveil du worker bloque sur `get`; file pleine = worker deja actif.
+            with suppress(queue.Full):
+                self._queue.put_nowait(None)
+            thread.join(timeout=timeout)
+            if thread.is_alive():
+                self.logger.warning("raw_writer worker still busy after %ss", timeout)
+        self._thread = None
+        self.flush()
+
+    def flush(self) -> int:
+        """Draine la file et ecrit tout ce qui est en attente; retourne les lignes ecrites."""
+        with self._write_lock:
+            self._drain_nowait()
+            return self._write_pending()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            timeout = max(0.01, self.flush_seconds - (monotonic() - self._last_flush_at))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if self._stop.is_set():
+                # `stop` draine et ecrit le reste, y compris `item`.
+                if item is not None:
+                    with self._write_lock:
+                        self._absorb(item)
+                return
+            with self._write_lock:
+                if isinstance(item, _QueuedRawEvent):
+                    self._absorb(item)
+                    self._drain_nowait(limit=self.batch_size)
+                if self._flush_is_due():
+                    self._write_pending()
+
+    def _drain_nowait(self, limit: int | None = None) -> None:
+        drained = 0
+        while limit is None or drained < limit:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, _QueuedRawEvent):
+                self._absorb(item)
+            drained += 1
+
+    def _flush_is_due(self) -> bool:
+        backlog = len(self._pending_rows) + len(self._duplicate_bumps)
+        if backlog == 0:
+            self._last_flush_at = monotonic()
+            return False
+        if backlog >= self.batch_size:
+            return True
+        return monotonic() - self._last_flush_at >= self.flush_seconds
+
+    def _absorb(self, item: _QueuedRawEvent) -> None:
+        payload = item.message
+        try:
+            values = self._row_values(payload, item.stream_kind, item.received_at)
+        except Exception as exc:
+            with self._counters.lock:
+                self._counters.failed += 1
+            self.logger.warning("raw_writer rejected payload: %s", exc)
+            return
+        identity = (item.stream_kind, str(values["event_type"]))
+        last = self._last_by_identity.get(identity)
+        if last is None:
+            last = self._load_last(identity)
+            self._last_by_identity[identity] = last
+        if last.payload is not None and last.payload == payload:
+            with self._counters.lock:
+                self._counters.collapsed += 1
+            if last.row is not None and last.row.row_id is None:
+                last.row.values["duplicate_count"] += 1
+                last.row.values["last_seen_at"] = item.received_at
+                return
+            row_id = last.row_id if last.row is None else last.row.row_id
+            if row_id is not None:
+                bump = self._duplicate_bumps.setdefault(row_id, _DuplicateBump())
+                bump.increment += 1
+                bump.last_seen_at = item.received_at
+                return
+        row = _PendingRawRow(values=values)
+        self._pending_rows.append(row)
+        self._last_by_identity[identity] = _LastRawEvent(payload=payload, row=row)
+
+    def _load_last(self, identity: tuple[str, str]) -> _LastRawEvent:
+        """Rechauffe la memoire de collapse depuis la DB une fois par identite."""
+        stream_kind, event_type = identity
+        try:
+            with self._sessionmaker() as session:
+                previous = session.execute(
+                    select(RawExchangeEvent.id, RawExchangeEvent.payload)
+                    .where(
+                        RawExchangeEvent.exchange == self.exchange,
+                        RawExchangeEvent.environment == self.environment,
+                        RawExchangeEvent.stream_kind == stream_kind,
+                        RawExchangeEvent.event_type == event_type,
+                    )
+                    .order_by(RawExchangeEvent.received_at.desc(), RawExchangeEvent.id.desc())
+                    .limit(1)
+                ).first()
+        except Exception as exc:
+            self.logger.debug("raw_writer warmup skipped for %s: %s", event_type, exc)
+            return _LastRawEvent(payload=None)
+        if previous is None:
+            return _LastRawEvent(payload=None)
+        return _LastRawEvent(payload=previous.payload, row_id=int(previous.id))
+
+    def _write_pending(self) -> int:
+        rows = self._pending_rows
+        bumps = self._duplicate_bumps
+        self._pending_rows = []
+        self._duplicate_bumps = {}
+        self._last_flush_at = monotonic()
+        if not rows and not bumps:
+            return 0
+        table = RawExchangeEvent.__table__
+        try:
+            with self._sessionmaker() as session:
+                if rows:
+                    inserted = session.execute(
+                        insert(RawExchangeEvent).returning(
+                            RawExchangeEvent.id,
+                            sort_by_parameter_order=True,
+                        ),
+                        [row.values for row in rows],
+                    )
+                    for row, row_id in zip(rows, inserted.scalars().all(), strict=True):
+                        row.row_id = int(row_id)
+                if bumps:
+                    session.connection().execute(
+                        update(table)
+                        .where(table.c.id == bindparam("row_id"))
+                        .values(
+                            duplicate_count=table.c.duplicate_count + bindparam("increment"),
+                            last_seen_at=bindparam("seen_at"),
+                        ),
+                        [
+                            {
+                                "row_id": row_id,
+                                "increment": bump.increment,
+                                "seen_at": bump.last_seen_at,
+                            }
+                            for row_id, bump in bumps.items()
+                        ],
+                    )
+                session.commit()
+        except Exception as exc:
+            # Les ids ne sont plus fiables: on oublie la memoire de collapse.
+            self._last_by_identity.clear()
+            with self._counters.lock:
+                self._counters.failed += len(rows) + len(bumps)
+            self.logger.warning(
+                "raw_writer flush failed rows=%s duplicates=%s error=%s",
+                len(rows),
+                len(bumps),
+                exc,
+            )
+            return 0
+        for last in self._last_by_identity.values():
+            if last.row is not None and last.row.row_id is not None:
+                last.row_id = last.row.row_id
+                last.row = None
+        with self._counters.lock:
+            self._counters.written += len(rows)
+            self._counters.flushes += 1
+        return len(rows)
@@ -0,0 +1,270 @@
+"""Microbenchmark du carnet local: fonctions tuple/dict vs OrderBook incremental.
+
+Sans `--replay`, une seconde table compare le chemin BitMEX orderBookL2:
+snapshot de toute la table a chaque message (ancien chemin) contre delta
+prix/quantite applique sur place (chemin actuel de `BitmexTree`).
+
+Usage:
+    PYTHONPATH=. python tests/bench/bench_orderbook.py
+    PYTHONPATH=. python tests/bench/bench_orderbook.py --replay book.jsonl --depth 25
+
+`--replay` lit un flux enregistre (une ligne JSON par message websocket Kraken
+Futures, par exemple `raw_exchange_events.payload` exporte ou les lignes
+`kraken_ws_raw` du mode `--trace-ws json`). Sans fichier, un flux synthetique
+deterministe de deltas autour du spread est genere.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Sequence
+
+from kolabi.tree.bitmex import (
+    BITMEX_L2_LEVELS,
+    BitmexBookState,
+    apply_bitmex_book_message,
+    book_payload_from_state,
+)
+from kolabi.tree.kraken import (
+    BookPayload,
+    apply_book_payload,
+    apply_book_payload_in_place,
+    book_signature,
+    calculate_book_metrics,
+    calculate_metrics,
+    extract_book_payload,
+)
+
+
+def synthetic_stream(count: int, *, seed: int = 7, levels: int = 100) -> list[BookPayload]:
+    rng = random.Random(seed)
+    asks = tuple((100.5 + 0.5 * index, float(rng.randint(1, 20))) for index in range(levels))
+    bids = tuple((100.0 - 0.5 * index, float(rng.randint(1, 20))) for index in range(levels))
+    stream = [
+        BookPayload(
+            message_type="snapshot",
+            symbol="PI_XBTUSD",
+            asks=asks,
+            bids=bids,
+            source_timestamp=None,
+            sequence=1,
+        )
+    ]
+    for sequence in range(2, count + 2):
+        side = rng.choice(("buy", "sell"))
+        # Activite concentree pres du spread, comme sur un carnet reel.
+        offset = 0.5 * min(int(rng.expovariate(0.15)), levels - 1)
+        price = 100.0 - offset if side == "buy" else 100.5 + offset
+        quantity = 0.0 if rng.random() < 0.3 else float(rng.randint(1, 40)) / 2
+        stream.append(
+            BookPayload(
+                message_type="delta",
+                symbol="PI_XBTUSD",
+                asks=(),
+                bids=(),
+                source_timestamp=None,
+                sequence=sequence,
+                side=side,
+                price=price,
+                quantity=quantity,
+            )
+        )
+    return stream
+
+
+def _l2_row(level_id: int, side: str, **fields: float) -> dict[str, object]:
+    return {"symbol": "XBTUSD", "id": level_id, "side": side, **fields}
+
+
+def _l2_message(action: str, *rows: dict[str, object]) -> dict[str, object]:
+    return {"table": "orderBookL2_25", "action": action, "data": list(rows)}
+
+
+def synthetic_bitmex_stream(count: int, *, seed: int = 7) -> list[dict[str, object]]:
+    """Messages orderBookL2_25 deterministes; chaque cote reste sous 25 niveaux."""
+    rng = random.Random(seed)
+    next_id = 0
+    sides: dict[str, dict[float, int]] = {"Buy": {}, "Sell": {}}
+    rows: list[dict[str, object]] = []
+    for side, sign, start in (("Buy", -1, 100.0), ("Sell", 1, 100.5)):
+        for index in range(20):
+            price = start + sign * 0.5 * index
+            next_id += 1
+            sides[side][price] = next_id
+            rows.append(_l2_row(next_id, side, price=price, size=rng.randint(1, 20) * 100))
+    stream = [_l2_message("partial", *rows)]
+    for _ in range(count):
+        side = rng.choice(("Buy", "Sell"))
+        levels = sides[side]
+        roll = rng.random()
+        if roll < 0.2 and len(levels) > 10:
+            price = rng.choice(sorted(levels))
+            stream.append(_l2_message("delete", _l2_row(levels.pop(price), side)))
+            continue
+        if roll < 0.4 and len(levels) < BITMEX_L2_LEVELS:
+            offset = 0.5 * rng.randint(0, 30)
+            price = 100.0 - offset if side == "Buy" else 100.5 + offset
+            if price not in levels:
+                next_id += 1
+                levels[price] = next_id
+                row = _l2_row(next_id, side, price=price, size=rng.randint(1, 20) * 100)
+                stream.append(_l2_message("insert", row))
+                continue
+        price = rng.choice(sorted(levels))
+        row = _l2_row(levels[price], side, size=rng.randint(1, 40) * 50)
+        stream.append(_l2_message("update", row))
+    return stream
+
+
+def recorded_stream(path: Path) -> list[BookPayload]:
+    stream: list[BookPayload] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("kraken_ws_raw "):
+            line = line.removeprefix("kraken_ws_raw ")
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(message, dict) and isinstance(message.get("payload"), dict):
+            message = message["payload"]
+        parsed = extract_book_payload(message) if isinstance(message, dict) else None
+        if parsed is not None:
+            stream.append(parsed)
+    return stream
+
+
+def run_functional(stream: Sequence[BookPayload], depth: int) -> tuple[object, object]:
+    """Chemin historique de `KrakenTree.ingest_payload`."""
+    state = None
+    metrics = None
+    signature = None
+    for payload in stream:
+        try:
+            state = apply_book_payload(state, payload, depth)
+            metrics = calculate_metrics(state.asks, state.bids)
+        except ValueError:
+            continue
+        list(state.asks), list(state.bids)
+        signature = book_signature(state.asks, state.bids)
+    return signature, metrics
+
+
+def run_incremental(stream: Sequence[BookPayload], depth: int) -> tuple[object, object]:
+    """Chemin actuel: OrderBook mute sur place + totaux courants."""
+    book = None
+    metrics = None
+    signature = None
+    for payload in stream:
+        try:
+            book = apply_book_payload_in_place(book, payload, depth)
+            metrics = calculate_book_metrics(book)
+        except ValueError:
+            continue
+        signature = book_signature(book.asks.levels(), book.bids.levels())
+    return signature, metrics
+
+
+def run_bitmex_snapshot(stream: Sequence[dict[str, object]], depth: int) -> tuple[object, object]:
+    """Ancien chemin BitMEX: toute la table re-envoyee en snapshot a chaque message."""
+    table: BitmexBookState | None = None
+    metrics = None
+    signature = None
+    for message in stream:
+        table, changed = apply_bitmex_book_message(table, message, symbol="XBTUSD")
+        if not changed or table is None:
+            continue
+        payload = book_payload_from_state(table)
+        if payload is None:
+            continue
+        state = apply_book_payload(None, payload, depth)
+        metrics = calculate_metrics(state.asks, state.bids)
+        signature = book_signature(state.asks, state.bids)
+    return signature, metrics
+
+
+def run_bitmex_delta(stream: Sequence[dict[str, object]], depth: int) -> tuple[object, object]:
+    """Chemin actuel de `BitmexTree`: delta prix/quantite applique sur place."""
+    table: BitmexBookState | None = None
+    book = None
+    metrics = None
+    signature = None
+    for message in stream:
+        table, changed = apply_bitmex_book_message(table, message, symbol="XBTUSD")
+        if not changed or table is None:
+            continue
+        payload = table.delta if book is not None else None
+        if payload is None:
+            payload = book_payload_from_state(table)
+        if payload is None:
+            continue
+        book = apply_book_payload_in_place(book, payload, depth, retain=BITMEX_L2_LEVELS)
+        metrics = calculate_book_metrics(book)
+        signature = book_signature(book.asks.levels(), book.bids.levels())
+    return signature, metrics
+
+
+def measure(
+    runner: Callable[[Sequence[Any], int], tuple[object, object]],
+    stream: Sequence[Any],
+    depth: int,
+    repeat: int,
+) -> tuple[float, tuple[object, object]]:
+    best = float("inf")
+    result: tuple[object, object] = (None, None)
+    for _ in range(repeat):
+        started = perf_counter()
+        result = runner(stream, depth)
+        best = min(best, perf_counter() - started)
+    return best, result
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replay", type=Path, default=None)
+    parser.add_argument("--count", type=int, default=50_000)
+    parser.add_argument("--depth", type=int, nargs="+", default=[10, 25, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    stream = recorded_stream(args.replay) if args.replay else synthetic_stream(args.count)
+    source = str(args.replay) if args.replay else f"synthetic:{args.count}"
+    print(f"stream={source} messages={len(stream)}")
+    print("depth\tfunctional_us\tincremental_us\tspeedup\tsame_top")
+    for depth in args.depth:
+        old_seconds, old_result = measure(run_functional, stream, depth, args.repeat)
+        new_seconds, new_result = measure(run_incremental, stream, depth, args.repeat)
+        per_message = max(len(stream), 1)
+        print(
+            f"{depth}\t{old_seconds / per_message * 1e6:.2f}\t"
+            f"{new_seconds / per_message * 1e6:.2f}\t"
+            f"{old_seconds / max(new_seconds, 1e-12):.1f}x\t"
+            f"{old_result[0] == new_result[0]}"
+        )
+    if args.replay:
+        return 0
+    bitmex_stream = synthetic_bitmex_stream(args.count)
+    print(f"stream=bitmex-synthetic:{args.count} messages={len(bitmex_stream)}")
+    print("depth\tsnapshot_us\tdelta_us\tspeedup\tsame_top")
+    for depth in args.depth:
+        depth = min(depth, BITMEX_L2_LEVELS)
+        old_seconds, old_result = measure(run_bitmex_snapshot, bitmex_stream, depth, args.repeat)
+        new_seconds, new_result = measure(run_bitmex_delta, bitmex_stream, depth, args.repeat)
+        per_message = max(len(bitmex_stream), 1)
+        print(
+            f"{depth}\t{old_seconds / per_message * 1e6:.2f}\t"
+            f"{new_seconds / per_message * 1e6:.2f}\t"
+            f"{old_seconds / max(new_seconds, 1e-12):.1f}x\t"
+            f"{old_result[0] == new_result[0]}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Gate REST d'Ogun: une file globale vs une voie par route avec seau de poids.
+
+Usage:
+    PYTHONPATH=. python tests/bench/bench_rate_limits.py
+    PYTHONPATH=. python tests/bench/bench_rate_limits.py --kraken-orders 40 --kraken-rtt-ms 250
+
+Un port simule sert deux routes: Kraken Futures lent (`--kraken-rtt-ms` par
+appel) et Binance USD-M rapide (`--binance-rtt-ms`). On lance une rafale de
+`--kraken-orders` placements Kraken, puis `--binance-cancels` annulations
+Binance espacees de `--cancel-every-ms`, avec les reglages par defaut du bot
+(0.1 s entre lancements, 2 en vol). Le mode `global` garde une seule file pour
+toutes les routes (comportement historique); le mode `per_route` donne une voie
+par `(exchange, market_type, account_scope)` et un seau `RateLimitRegistry`.
+On affiche la duree de la rafale Kraken et la latence des annulations Binance.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+from time import perf_counter
+from typing import Hashable, Sequence
+
+from kolabi.bot.ogun_executor import OgunExecutor, RestFlightPolicy
+from kolabi.shared.core.models import OrderAck
+from kolabi.shared.core.runtime_types import (
+    AmendHeadCommand,
+    AmendTailCommand,
+    CancelCommand,
+    CancelOrderCommandRequest,
+    DragonSong,
+    ExchangePort,
+    PlaceHeadCommand,
+    PlaceOrderCommandRequest,
+    PlaceTailCommand,
+    RuntimeCommandKind,
+    Symbol,
+)
+from kolabi.shared.rate_limits import RateLimitRegistry, TokenBucket
+
+
+class _TwoVenuePort(ExchangePort):
+    def __init__(self, *, kraken_rtt: float, binance_rtt: float) -> None:
+        self.rtt = {"kraken": kraken_rtt, "binance": binance_rtt}
+
+    async def _call(self, command: DragonSong, status: str) -> OrderAck:
+        await asyncio.sleep(self.rtt[str(command.exchange)])
+        return OrderAck(order_id=command.pair_name, status=status)
+
+    async def place_head(self, command: PlaceHeadCommand) -> OrderAck:
+        return await self._call(command, "New")
+
+    async def place_tail(self, command: PlaceTailCommand) -> OrderAck:
+        return await self._call(command, "New")
+
+    async def amend_head(self, command: AmendHeadCommand) -> OrderAck:
+        return await self._call(command, "Replaced")
+
+    async def amend_tail(self, command: AmendTailCommand) -> OrderAck:
+        return await self._call(command, "Replaced")
+
+    async def cancel(self, command: CancelCommand) -> OrderAck:
+        return await self._call(command, "Canceled")
+
+
+class _LanedPort(_TwoVenuePort):
+    def __init__(self, registry: RateLimitRegistry, **kwargs: float) -> None:
+        super().__init__(**kwargs)
+        self.registry = registry
+
+    def rate_limit_lane(self, command: DragonSong) -> tuple[Hashable, TokenBucket | None]:
+        key = (str(command.exchange), "futures", "default")
+        return key, self.registry.bucket(*key)
+
+
+def _head(index: int) -> PlaceHeadCommand:
+    pair_name = f"krk-{index}"
+    return PlaceHeadCommand(
+        kind=RuntimeCommandKind.PLACE,
+        exchange="kraken",
+        market_type="futures",
+        symbol=Symbol("PI_XBTUSD"),
+        pair_name=pair_name,
+        request=PlaceOrderCommandRequest(
+            pair_name=pair_name, side="buy", ordType="Limit", orderQty=1, price=100.0
+        ),
+    )
+
+
+def _cancel(index: int) -> CancelCommand:
+    pair_name = f"bin-{index}"
+    return CancelCommand(
+        kind=RuntimeCommandKind.CANCEL,
+        exchange="binance",
+        market_type="futures",
+        symbol=Symbol("BTCUSDT"),
+        pair_name=pair_name,
+        request=CancelOrderCommandRequest(pair_name=pair_name, clOrdID=f"OID-{index}"),
+    )
+
+
+def run_mode(
+    mode: str,
+    *,
+    kraken_orders: int,
+    binance_cancels: int,
+    kraken_rtt: float,
+    binance_rtt: float,
+    cancel_every: float,
+) -> tuple[float, list[float]]:
+    port: ExchangePort
+    if mode == "global":
+        port = _TwoVenuePort(kraken_rtt=kraken_rtt, binance_rtt=binance_rtt)
+    else:
+        port = _LanedPort(
+            RateLimitRegistry(), kraken_rtt=kraken_rtt, binance_rtt=binance_rtt
+        )
+    executor = OgunExecutor(
+        port, flight_policy=RestFlightPolicy(min_interval_seconds=0.1, max_inflight=2)
+    )
+
+    async def _timed(command: DragonSong) -> float:
+        started = perf_counter()
+        await executor.execute(command)
+        return perf_counter() - started
+
+    async def _run() -> tuple[float, list[float]]:
+        started = perf_counter()
+        burst = asyncio.gather(*(_timed(_head(i)) for i in range(kraken_orders)))
+        cancels = []
+        for index in range(binance_cancels):
+            await asyncio.sleep(cancel_every)
+            cancels.append(asyncio.create_task(_timed(_cancel(index))))
+        latencies = list(await asyncio.gather(*cancels))
+        await burst
+        return perf_counter() - started, latencies
+
+    return asyncio.run(_run())
+
+
+def quantiles_ms(values: list[float]) -> str:
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return "\t".join(
+        f"{value * 1e3:.1f}" for value in (cuts[49], cuts[89], cuts[98], max(values))
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kraken-orders", type=int, default=40)
+    parser.add_argument("--binance-cancels", type=int, default=20)
+    parser.add_argument("--kraken-rtt-ms", type=float, default=250.0)
+    parser.add_argument("--binance-rtt-ms", type=float, default=20.0)
+    parser.add_argument("--cancel-every-ms", type=float, default=150.0)
+    args = parser.parse_args(argv)
+
+    print("mode\tkraken_s\tcancels\tp50_ms\tp90_ms\tp99_ms\tmax_ms")
+    for mode in ("global", "per_route"):
+        total, latencies = run_mode(
+            mode,
+            kraken_orders=args.kraken_orders,
+            binance_cancels=args.binance_cancels,
+            kraken_rtt=args.kraken_rtt_ms / 1e3,
+            binance_rtt=args.binance_rtt_ms / 1e3,
+            cancel_every=args.cancel_every_ms / 1e3,
+        )
+        print(f"{mode}\t{total:.2f}\t{len(latencies)}\t{quantiles_ms(latencies)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
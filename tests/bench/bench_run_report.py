@@ -0,0 +1,109 @@
+"""Parsing d'un journal runtime: read_text complet vs lecture en flux + checkpoint.
+
+Usage:
+    PYTHONPATH=. python tests/bench/bench_run_report.py
+    PYTHONPATH=. python tests/bench/bench_run_report.py --pairs 20000 --noise 200
+
+Un journal synthetique de `--pairs` cycles tete/queue (HEAD_SENT, UPDATE,
+METRICS, AMEND_SENT) entrecoupes de `--noise` lignes ignorees par cycle est
+ecrit dans un dossier temporaire. On mesure la duree de l'ancien chemin
+(`read_text` puis `parse_run_log_text`), du parseur en flux sans checkpoint,
+d'une premiere passe `--checkpoint`, puis d'une seconde apres ajout de
+`--tail-pairs` cycles: seule la queue du fichier est relue. Le pic
+`tracemalloc` des deux premiers modes est mesure dans une passe separee.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Sequence
+
+from kolabi.bot.run_report import parse_run_log_file, parse_run_log_text
+
+_PREFIX = "MainThread~20 /strategy_runtime.py@1@x/"
+
+
+def _cycle(index: int, noise: int) -> str:
+    minute = index % 60
+    ts = f"2026-06-17 23:{minute:02d}:38,000"
+    iso = f"2026-06-17T23:{minute:02d}:39.422000+00:00"
+    pair = f"(P{index % 97}#{index})"
+    lines = [
+        f"{ts} {_PREFIX} HEAD_SENT {pair}: H{index} buy L 12.00 0.1667 -",
+        f"{ts} {_PREFIX} UPDATE {pair}: closed--hooked 12.0 0.1645 buy 12.00 0.1667 {iso}",
+        f"{ts} {_PREFIX} UPDATE {pair}: closed--living 12.0 0.1645 0.1645 T{index} "
+        f"a20c4f50 {iso}",
+        f"{ts} {_PREFIX} METRICS {pair}: closed--living 0.1660 0.1645 0 0.0015 0 0",
+        f"{ts} {_PREFIX} AMEND_SENT {pair}: 0.1645 0.1669 0.1671 last T{index} a20c4f50",
+        f"{ts} {_PREFIX} UPDATE {pair}: closed--closed 12.0 0.1669 0.1669 sell 12.00 "
+        f"0.1669 {iso}",
+    ]
+    lines.extend(f"{ts} {_PREFIX} debug noise line {n} for {pair}" for n in range(noise))
+    return "\n".join(lines) + "\n"
+
+
+def _write(path: Path, start: int, count: int, noise: int, mode: str) -> None:
+    with path.open(mode, encoding="utf-8") as handle:
+        for index in range(start, start + count):
+            handle.write(_cycle(index, noise))
+
+
+def _measure(label: str, run: Callable[[], int], *, trace: bool) -> None:
+    started = perf_counter()
+    pairs = run()
+    elapsed = perf_counter() - started
+    peak_mb = "-"
+    if trace:
+        tracemalloc.start()
+        run()
+        peak_mb = f"{tracemalloc.get_traced_memory()[1] / 2**20:.1f}"
+        tracemalloc.stop()
+    print(f"{label}\t{pairs}\t{elapsed:.3f}\t{peak_mb}")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=10000)
+    parser.add_argument("--noise", type=int, default=50)
+    parser.add_argument("--tail-pairs", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "run.log"
+        checkpoint = Path(tmp) / "run.ckpt"
+        _write(log_path, 0, args.pairs, args.noise, "w")
+        size_mb = log_path.stat().st_size / 2**20
+        print(f"log_mb\t{size_mb:.1f}")
+        print("mode\tpairs\tseconds\tpeak_mb")
+        _measure(
+            "read_text",
+            lambda: len(
+                parse_run_log_text(
+                    log_path.read_text(encoding="utf-8", errors="replace")
+                ).lifecycles
+            ),
+            trace=True,
+        )
+        _measure(
+            "stream", lambda: len(parse_run_log_file(log_path).lifecycles), trace=True
+        )
+        _measure(
+            "checkpoint_cold",
+            lambda: len(parse_run_log_file(log_path, checkpoint=checkpoint).lifecycles),
+            trace=False,
+        )
+        _write(log_path, args.pairs, args.tail_pairs, args.noise, "a")
+        _measure(
+            "checkpoint_tail",
+            lambda: len(parse_run_log_file(log_path, checkpoint=checkpoint).lifecycles),
+            trace=False,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
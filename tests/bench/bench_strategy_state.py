@@ -0,0 +1,142 @@
+"""Microbenchmark d'un pas de strategie: copie de la table vs table persistante.
+
+Le chemin historique recopiait `{**state.pairs, name: pair}` (plus la copie
+du `MappingProxyType`) a chaque evenement, et la boucle runtime prenait un
+`dict(state.pairs)` pour comparer toutes les paires dans les passes de log.
+Le chemin actuel passe par `step_strategy_changes`: `PairTable.with_pair`
+partage les seaux intacts et seules les paires changees sont comparees.
+
+Usage:
+    PYTHONPATH=. python tests/bench/bench_strategy_state.py
+    PYTHONPATH=. python tests/bench/bench_strategy_state.py --events 5000 --pairs 10 100 1000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from types import MappingProxyType
+from typing import Mapping, Sequence
+
+from kolabi.bot.domain import (
+    EggMove,
+    EggMoveKind,
+    HeadSpec,
+    OrderPairSpec,
+    PairCycleState,
+    Side,
+    StrategyState,
+    TailSpec,
+    TimeWindow,
+)
+from kolabi.bot.isis import _pair_state_with_supervisor_metadata, step_strategy_changes
+from kolabi.bot.pair_cycle import step_pair
+
+T0 = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def sample_pair(name: str) -> OrderPairSpec:
+    return OrderPairSpec(
+        name=name,
+        window=TimeWindow(start_minutes=0.0, end_minutes=600.0),
+        try_num=1,
+        dr_pause=None,
+        timeout=60,
+        head=HeadSpec(side=Side.BUY, order_type="Limit"),
+        head_price=(100.0, 101.0),
+        head_price_type="pA",
+        head_quantity=1,
+        head_quantity_type="qA",
+        tail=TailSpec(side=Side.SELL, order_type="Stop", delta=0.5),
+        tail_price_spec=99.0,
+        tail_price_spec_type="tA",
+        amount_type="qApD",
+    )
+
+
+def synthetic_events(pair_names: Sequence[str], count: int, *, seed: int = 7) -> list[EggMove]:
+    rng = random.Random(seed)
+    return [
+        EggMove(
+            kind=EggMoveKind.MARKET_TICK,
+            occurred_at=T0 + timedelta(seconds=index),
+            symbol="PI_XBTUSD",
+            event_id=f"public-market:{index}",
+            pair_name=rng.choice(pair_names),
+        )
+        for index in range(count)
+    ]
+
+
+def _diff(
+    current: Mapping[str, PairCycleState],
+    previous: Mapping[str, PairCycleState],
+    names: Sequence[str] | Mapping[str, PairCycleState],
+) -> int:
+    moved = 0
+    for name in names:
+        pair_state = current.get(name)
+        before = previous.get(name)
+        if pair_state is None or before is None:
+            continue
+        # Comparaison de champ, comme les passes `_log_*` du runtime.
+        if pair_state.attempt_index > before.attempt_index:
+            moved += 1
+    return moved
+
+
+def run_copy(pairs: Mapping[str, PairCycleState], events: Sequence[EggMove]) -> float:
+    """Ancien chemin: copie complete de la table puis diff de toutes les paires."""
+    table: Mapping[str, PairCycleState] = MappingProxyType(dict(pairs))
+    started = perf_counter()
+    for event in events:
+        previous = dict(table)
+        name = event.pair_name
+        assert name is not None
+        next_pair, intents = step_pair(table[name], event)
+        next_pair = _pair_state_with_supervisor_metadata(next_pair, event=event, intents=intents)
+        table = MappingProxyType(dict({**table, name: next_pair}))
+        for _ in range(3):
+            _diff(table, previous, table)
+    return perf_counter() - started
+
+
+def run_persistent(pairs: Mapping[str, PairCycleState], events: Sequence[EggMove]) -> float:
+    """Chemin actuel: `step_strategy_changes` puis diff des seules paires changees."""
+    state = StrategyState(launched_at=T0, pairs=pairs)
+    started = perf_counter()
+    for event in events:
+        previous = state
+        state, _intents, changed = step_strategy_changes(state, event)
+        for _ in range(3):
+            _diff(state.pairs, previous.pairs, tuple(changed))
+    return perf_counter() - started
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--pairs", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    print(f"events={args.events}")
+    print("pairs\tcopy_us/evt\tpersistent_us/evt\tspeedup")
+    for count in args.pairs:
+        names = [f"pair-{index}" for index in range(count)]
+        pairs = {name: PairCycleState(pair=sample_pair(name)) for name in names}
+        events = synthetic_events(names, args.events, seed=args.seed)
+        copy_seconds = run_copy(pairs, events)
+        persistent_seconds = run_persistent(pairs, events)
+        print(
+            f"{count}\t{copy_seconds / args.events * 1e6:.1f}\t"
+            f"{persistent_seconds / args.events * 1e6:.1f}\t"
+            f"{copy_seconds / persistent_seconds:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
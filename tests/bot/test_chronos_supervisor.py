@@ -262,6 +262,42 @@ def test_closed_tail_makes_dependent_pair_eligible_without_direct_command() -> N
     assert pair_dependency_satisfied(chronos.state, chronos.state.pairs["pair-y"]) is True
 
 
+def test_chronos_reports_changed_pairs_for_step_and_chain_release() -> None:
+    pair_x = sample_pair("pair-x")
+    pair_y = replace(sample_pair("pair-y"), hook_name="pair-x")
+    state = StrategyState(
+        launched_at=datetime(2026, 5, 21, 12, 0, tzinfo=timezone.utc),
+        strategy_id="strategy-chain",
+        pairs={
+            "pair-x": PairCycleState(
+                pair=pair_x,
+                head_state=HeadState.CLOSED,
+                tail_state=TailState.CLOSED,
+                tail_mode=TailMode.FLYING,
+                played_quantity=Decimal("1"),
+            ),
+            "pair-y": PairCycleState(pair=pair_y),
+            "pair-z": PairCycleState(pair=sample_pair("pair-z")),
+        },
+    )
+    chronos = Chronos(state=state)
+
+    chronos.process_event(
+        EggMove(
+            kind=EggMoveKind.PLAYED_AND_CANCELED,
+            occurred_at=datetime(2026, 5, 21, 12, 6, tzinfo=timezone.utc),
+            symbol="PI_XBTUSD",
+            pair_name="pair-x",
+            event_id="evt-chain",
+            is_private=True,
+        )
+    )
+
+    assert chronos.drain_changed_pairs() == ("pair-x", "pair-y")
+    assert chronos.drain_changed_pairs() == ()
+    assert chronos.state.pairs["pair-z"] is state.pairs["pair-z"]
+
+
 def test_tail_closed_hook_does_not_activate_on_head_close_only() -> None:
     pair_x = sample_pair("pair-x")
     pair_y = replace(sample_pair("pair-y"), hook_name="pair-x-tail-closed")
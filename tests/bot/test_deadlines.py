@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from kolabi.bot.deadlines import DeadlineScheduler
+from kolabi.bot.domain import (
+    HeadSpec,
+    HeadState,
+    OrderPairSpec,
+    PairCycleState,
+    Side,
+    StrategySpec,
+    TailSpec,
+    TailState,
+    TimeWindow,
+)
+from kolabi.bot.runtime_policy import CommandSlot
+from kolabi.bot.strategy_runtime import StrategyRuntime, _TailAmendPending
+from kolabi.bot.tail_tracking import initial_tail_trail
+
+T0 = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = T0
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _pair() -> OrderPairSpec:
+    return OrderPairSpec(
+        name="pair-a",
+        window=TimeWindow(start_minutes=0.0, end_minutes=600.0),
+        try_num=1,
+        dr_pause=None,
+        timeout=60,
+        head=HeadSpec(side=Side.BUY, order_type="Limit"),
+        head_price=(100.0, 101.0),
+        head_price_type="pA",
+        head_quantity=1,
+        head_quantity_type="qA",
+        tail=TailSpec(side=Side.SELL, order_type="Stop", delta=0.5),
+        tail_price_spec=99.0,
+        tail_price_spec_type="tA",
+        amount_type="qApD",
+    )
+
+
+def test_scheduler_fires_in_due_order_and_ties_in_registration_order() -> None:
+    clock = _Clock()
+    scheduler: DeadlineScheduler[str] = DeadlineScheduler(clock=clock)
+    scheduler.schedule("amend", T0 + timedelta(seconds=5))
+    scheduler.schedule("lease", T0 + timedelta(seconds=2))
+    scheduler.schedule("head_fill", T0 + timedelta(seconds=5))
+    scheduler.schedule("repeat", T0 + timedelta(seconds=9))
+
+    assert scheduler.next_due() == T0 + timedelta(seconds=2)
+    assert scheduler.seconds_until_next() == 2.0
+    assert scheduler.pop_due() == ()
+
+    clock.now = T0 + timedelta(seconds=5)
+    assert scheduler.pop_due() == ("lease", "amend", "head_fill")
+    assert scheduler.seconds_until_next(cap=1.0) == 1.0
+    assert len(scheduler) == 1
+
+
+def test_scheduler_reschedule_and_cancel_replace_the_live_due_time() -> None:
+    scheduler: DeadlineScheduler[str] = DeadlineScheduler(clock=_Clock())
+    scheduler.schedule("lease", T0 + timedelta(seconds=1))
+    scheduler.schedule("lease", T0 + timedelta(seconds=30))
+    scheduler.schedule("amend", T0 + timedelta(seconds=10))
+    scheduler.schedule("amend", None)
+
+    assert scheduler.next_due() == T0 + timedelta(seconds=30)
+    assert scheduler.pop_due(T0 + timedelta(seconds=20)) == ()
+    assert scheduler.pop_due(T0 + timedelta(seconds=30)) == ("lease",)
+    assert scheduler.next_due() is None
+    assert scheduler.seconds_until_next(cap=5.0) == 5.0
+
+
+def _living_tail_runtime(*, idle_wake_seconds: float) -> StrategyRuntime:
+    pair = _pair()
+    runtime = StrategyRuntime(
+        strategy=StrategySpec(name="demo", pairs=(pair,)),
+        symbol="PI_XBTUSD",
+        simulate=False,
+        idle_wake_seconds=idle_wake_seconds,
+    )
+    now = datetime.now(timezone.utc)
+    trail = replace(
+        initial_tail_trail(pair, Decimal("100"), now),
+        confirmed_stop_price=Decimal("99.0"),
+        last_confirmed_at=now,
+    )
+    runtime.state = replace(
+        runtime.state,
+        pairs={
+            "pair-a": PairCycleState(
+                pair=pair,
+                head_state=HeadState.CLOSED,
+                tail_state=TailState.LIVING,
+                tail_trail=trail,
+                played_quantity=Decimal("1"),
+            )
+        },
+    )
+    runtime.chronos.state = runtime.state
+    return runtime
+
+
+def test_runtime_sleeps_until_the_next_deadline_instead_of_polling(caplog) -> None:
+    runtime = _living_tail_runtime(idle_wake_seconds=30.0)
+    started = datetime.now(timezone.utc)
+    slot = CommandSlot(pair_name="pair-a", attempt_index=1, role="tail")
+    runtime._pending_tail_amends[slot] = _TailAmendPending(
+        pair_name="pair-a",
+        attempt_index=1,
+        desired_stop_price=Decimal("98.5"),
+        client_order_id="CID-T",
+        exchange_order_id="OID-T",
+        started_at=started,
+        deadline_at=started + timedelta(seconds=0.3),
+    )
+    passes: list[datetime] = []
+    check = runtime._check_tail_amend_deadlines
+
+    def _counting_check(now: datetime) -> None:
+        passes.append(now)
+        check(now)
+
+    runtime._check_tail_amend_deadlines = _counting_check  # type: ignore[method-assign]
+
+    async def _run_for(seconds: float) -> None:
+        task = asyncio.create_task(runtime.run())
+        await asyncio.sleep(seconds)
+        await runtime.stop()
+        await task
+
+    with caplog.at_level("WARNING", logger="kola"):
+        asyncio.run(_run_for(0.8))
+
+    assert "AMEND_PENDING (pair-a#1):" in caplog.text
+    assert slot not in runtime._pending_tail_amends
+    # Un tour au demarrage, un a l'echeance, un au stop: plus de tick de 0.2 s.
+    assert len(passes) <= 3, passes
+    assert passes[1] - started >= timedelta(seconds=0.3)
+
+
+def test_runtime_stop_wakes_an_idle_loop() -> None:
+    runtime = _living_tail_runtime(idle_wake_seconds=60.0)
+
+    async def _run_then_stop() -> float:
+        task = asyncio.create_task(runtime.run())
+        await asyncio.sleep(0.05)
+        loop = asyncio.get_running_loop()
+        stop_at = loop.time()
+        await runtime.stop()
+        await asyncio.wait_for(task, timeout=2.0)
+        return loop.time() - stop_at
+
+    assert asyncio.run(_run_then_stop()) < 1.0
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from kolabi.bot.chronos import CHRONOS_NOTICE_LIMIT, Chronos, ChronosNoticeKind
+from kolabi.bot.dedupe import AttemptDedupe
+from kolabi.bot.domain import (
+    EggMove,
+    EggMoveKind,
+    HeadSpec,
+    HeadState,
+    OrderPairSpec,
+    OrderRole,
+    PairCycleState,
+    Side,
+    StrategySpec,
+    TailSpec,
+    TailState,
+    TimeWindow,
+)
+from kolabi.bot.strategy_runtime import KrakenPublicTriggerSource, StrategyRuntime
+from kolabi.bot.tail_tracking import initial_tail_trail
+
+T0 = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _pair(name: str = "pair-a") -> OrderPairSpec:
+    return OrderPairSpec(
+        name=name,
+        window=TimeWindow(start_minutes=0.0, end_minutes=60.0 * 24 * 8),
+        try_num=1,
+        dr_pause=None,
+        timeout=60,
+        head=HeadSpec(side=Side.BUY, order_type="Limit"),
+        head_price=(100.0, 101.0),
+        head_price_type="pA",
+        head_quantity=1,
+        head_quantity_type="qA",
+        tail=TailSpec(side=Side.SELL, order_type="Stop", delta=0.5),
+        tail_price_spec=99.0,
+        tail_price_spec_type="tA",
+        amount_type="qApD",
+    )
+
+
+def test_dedupe_keeps_recent_keys_and_evicts_the_oldest_past_max_keys() -> None:
+    dedupe: AttemptDedupe[str] = AttemptDedupe(max_keys=3, max_age=None)
+
+    assert [dedupe.seen("pair-a", 1, key, now=T0) for key in "abcd"] == [False] * 4
+    assert dedupe.seen("pair-a", 1, "d", now=T0) is True
+    assert dedupe.seen("pair-a", 1, "a", now=T0) is False
+    assert len(dedupe) == 3
+    assert dedupe.evicted == 2
+
+
+def test_dedupe_repeated_key_is_refreshed_instead_of_evicted() -> None:
+    dedupe: AttemptDedupe[str] = AttemptDedupe(max_keys=2, max_age=timedelta(minutes=5))
+
+    dedupe.seen("pair-a", 1, "snapshot", now=T0)
+    for minute in range(1, 30):
+        now = T0 + timedelta(minutes=minute)
+        assert dedupe.seen("pair-a", 1, "snapshot", now=now) is True
+        dedupe.seen("pair-a", 1, f"other-{minute}", now=now)
+
+    assert dedupe.seen("pair-a", 1, "snapshot", now=T0 + timedelta(minutes=30)) is True
+    assert dedupe.seen("pair-a", 1, "other-1", now=T0 + timedelta(minutes=30)) is False
+
+
+def test_dedupe_expires_keys_older_than_max_age() -> None:
+    dedupe: AttemptDedupe[str] = AttemptDedupe(max_age=timedelta(minutes=10))
+
+    dedupe.seen("pair-a", 1, "old", now=T0)
+    later = T0 + timedelta(minutes=11)
+
+    assert dedupe.seen("pair-a", 1, "new", now=later) is False
+    assert dedupe.seen("pair-a", 1, "old", now=later) is False
+    assert len(dedupe) == 2
+
+
+def test_dedupe_retires_closed_attempts_and_keeps_live_ones() -> None:
+    dedupe: AttemptDedupe[str] = AttemptDedupe(generations=2)
+
+    dedupe.seen("pair-a", 1, "fill", now=T0)
+    dedupe.seen("pair-a", 2, "fill", now=T0)
+    dedupe.seen("pair-b", 1, "fill", now=T0)
+    assert dedupe.seen("pair-a", 1, "fill", now=T0) is True
+
+    dedupe.seen("pair-a", 3, "fill", now=T0)
+
+    assert dedupe.seen("pair-a", 2, "fill", now=T0) is True
+    assert dedupe.seen("pair-b", 1, "fill", now=T0) is True
+    assert dedupe.seen("pair-a", 3, "fill", now=T0) is True
+    dedupe.forget("pair-b")
+    assert len(dedupe) == 2
+
+
+def test_chronos_keeps_dedupe_for_live_attempt_and_bounds_notices() -> None:
+    strategy = StrategySpec(name="demo", pairs=(_pair(),))
+    state = StrategyRuntime(strategy=strategy, symbol="PI_XBTUSD", simulate=False).state
+    chronos = Chronos(state=state)
+    move = EggMove(
+        kind=EggMoveKind.MARKET_TICK,
+        occurred_at=T0,
+        symbol="PI_XBTUSD",
+        event_id="public-market:1",
+        pair_name="pair-a",
+    )
+
+    chronos.process_event(move, now=T0)
+    for _ in range(CHRONOS_NOTICE_LIMIT + 10):
+        assert chronos.process_event(move, now=T0) == ()
+
+    assert len(chronos.notices) == CHRONOS_NOTICE_LIMIT
+    assert chronos.notices[-1].kind == ChronosNoticeKind.DUPLICATE_EVENT_IGNORED
+
+
+def test_public_trigger_dedupe_memory_stays_flat_over_a_week_of_snapshots() -> None:
+    """Soak: one LIVING tail, one fresh snapshot per minute for seven days."""
+    minutes_per_day = 24 * 60
+    days = 7
+    pair = _pair()
+
+    class Market:
+        best_bid = 102.0
+        best_ask = 102.5
+        mid_price = 102.25
+        last_price = 102.0
+        mark_price = None
+        index_price = None
+        tick_size = 0.5
+
+        def __init__(self, minute: int) -> None:
+            self.recorded_at = (T0 + timedelta(minutes=minute)).isoformat()
+
+    class Client:
+        def __init__(self) -> None:
+            self.minute = 0
+
+        def fetch_market_state(self, symbol=None):
+            self.minute += 1
+            return Market(self.minute)
+
+    class Runtime:
+        symbol = "PI_XBTUSD"
+
+        def __init__(self, client: Client) -> None:
+            base_state = StrategyRuntime(
+                strategy=StrategySpec(name="demo", pairs=(pair,)),
+                symbol="PI_XBTUSD",
+                simulate=False,
+            ).state
+            self.state = replace(
+                base_state,
+                pairs={
+                    pair.name: PairCycleState(
+                        pair=pair,
+                        head_state=HeadState.CLOSED,
+                        tail_state=TailState.LIVING,
+                        played_quantity=Decimal("1"),
+                        tail_trail=initial_tail_trail(pair, Decimal("100"), T0),
+                    )
+                },
+            )
+            self.client = client
+            self.events = 0
+            self.samples: dict[int, int] = {}
+
+        @property
+        def running(self) -> bool:
+            minute = self.client.minute
+            if minute and minute % minutes_per_day == 0:
+                self.samples.setdefault(minute // minutes_per_day, _traced_bytes())
+            return minute < minutes_per_day * days
+
+        @property
+        def all_pairs_terminal(self) -> bool:
+            return False
+
+        @property
+        def should_keep_sources_alive(self) -> bool:
+            return True
+
+        async def enqueue(self, event: EggMove) -> None:
+            self.events += 1
+
+        def pair_state_for_record(
+            self, record: object
+        ) -> tuple[PairCycleState, OrderRole] | None:
+            return None
+
+    client = Client()
+    runtime = Runtime(client)
+    source = KrakenPublicTriggerSource(
+        client,
+        poll_seconds=0.0,
+        max_seen_event_ids=minutes_per_day,
+    )
+
+    tracemalloc.start()
+    try:
+        asyncio.run(source.pump(runtime))
+    finally:
+        tracemalloc.stop()
+
+    assert runtime.events == minutes_per_day * days
+    assert len(source._seen_event_ids) == minutes_per_day
+    # Day 1 fills the ring; later days must not grow it.
+    growth = runtime.samples[days - 1] - runtime.samples[2]
+    assert growth < 64 * 1024, runtime.samples
+
+
+def _traced_bytes() -> int:
+    current, _peak = tracemalloc.get_traced_memory()
+    return current
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Protocol, cast
@@ -25,7 +26,11 @@ from kolabi.bot.strategy_runtime import (
 )
 from kolabi.shared.core.runtime_types import PrivateOrderRecord
 from kolabi.shared.persistence import Base, ExchangeOrder
-from kolabi.shared.runtime_state import KrakenRuntimeStateClient
+from kolabi.shared.runtime_state import (
+    AsyncRuntimeStateReader,
+    KrakenRuntimeStateClient,
+    StateReadMetrics,
+)
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
@@ -767,3 +772,142 @@ def test_private_order_poller_emits_from_fill_stream_when_order_stream_empty() -
 
     assert len(emitted) == 1
     assert emitted[0].kind.value == "played_and_canceled"
+
+
+def test_async_state_reader_keeps_event_loop_free_during_slow_reads() -> None:
+    now = datetime.now(timezone.utc)
+
+    class _SlowClient:
+        def __init__(self) -> None:
+            self.read_metrics = StateReadMetrics()
+            self.order_calls = 0
+
+        def fetch_private_orders_since(self, **_kwargs) -> tuple[PrivateOrderRecord, ...]:
+            self.order_calls += 1
+            with self.read_metrics.timed("fetch_private_orders_since"):
+                time.sleep(0.2)
+            return ()
+
+        def fetch_private_fills_since(self, **_kwargs) -> tuple[PrivateOrderRecord, ...]:
+            with self.read_metrics.timed("fetch_private_fills_since"):
+                time.sleep(0.2)
+            return ()
+
+    class _Runtime:
+        symbol = "PI_XBTUSD"
+        state = StrategyState(launched_at=now, strategy_id="demo", pairs={})
+
+        @property
+        def running(self) -> bool:
+            return client.order_calls == 0
+
+        @property
+        def all_pairs_terminal(self) -> bool:
+            return False
+
+        @property
+        def should_keep_sources_alive(self) -> bool:
+            return False
+
+        async def enqueue(self, event) -> None:
+            raise AssertionError(f"unexpected event {event}")
+
+        def pair_state_for_record(self, record):
+            return None
+
+    client = _SlowClient()
+    reader = AsyncRuntimeStateReader(client)  # type: ignore[arg-type]
+    source = KrakenPrivateOrderPollingSource(reader, poll_seconds=0.0)
+    ticks: list[float] = []
+
+    async def _heartbeat() -> None:
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def _run() -> None:
+        heartbeat = asyncio.create_task(_heartbeat())
+        try:
+            await source.pump(_Runtime())
+        finally:
+            heartbeat.cancel()
+
+    try:
+        asyncio.run(_run())
+    finally:
+        reader.close()
+
+    assert len(ticks) >= 20
+    gaps = [later - earlier for earlier, later in zip(ticks, ticks[1:])]
+    assert max(gaps) < 0.1
+    metrics = client.read_metrics.snapshot()
+    assert metrics["fetch_private_orders_since"]["count"] == 1
+    assert metrics["fetch_private_orders_since"]["p50_ms"] == 250.0
+    assert metrics["loop_blocking"]["count"] == 2
+    assert metrics["loop_blocking"]["max_ms"] < 50.0
+
+
+def test_private_order_poller_waits_on_state_wakeup_between_polls() -> None:
+    now = datetime.now(timezone.utc)
+
+    class _Client:
+        def __init__(self) -> None:
+            self.order_calls = 0
+
+        def fetch_private_orders_since(self, **_kwargs) -> tuple[PrivateOrderRecord, ...]:
+            self.order_calls += 1
+            return ()
+
+        def fetch_private_fills_since(self, **_kwargs) -> tuple[PrivateOrderRecord, ...]:
+            return ()
+
+    class _Wakeup:
+        def __init__(self) -> None:
+            self.watched: list[tuple[str, ...]] = []
+            self.timeouts: list[float] = []
+
+        def watch(self, routes) -> None:
+            self.watched.append(tuple(routes))
+
+        async def wait(self, timeout: float) -> bool:
+            self.timeouts.append(timeout)
+            return True
+
+    client = _Client()
+    wakeup = _Wakeup()
+
+    class _Runtime:
+        symbol = "PI_XBTUSD"
+        state = StrategyState(launched_at=now, strategy_id="demo", pairs={})
+
+        @property
+        def running(self) -> bool:
+            return client.order_calls < 3
+
+        @property
+        def all_pairs_terminal(self) -> bool:
+            return False
+
+        @property
+        def should_keep_sources_alive(self) -> bool:
+            return False
+
+        async def enqueue(self, event) -> None:
+            raise AssertionError(f"unexpected event {event}")
+
+        def pair_state_for_record(self, record):
+            return None
+
+    source = KrakenPrivateOrderPollingSource(
+        client,
+        poll_seconds=0.25,
+        wakeup=wakeup,
+        safety_poll_seconds=30.0,
+    )
+    started = time.perf_counter()
+    asyncio.run(source.pump(_Runtime()))
+
+    assert time.perf_counter() - started < 0.2
+    assert client.order_calls == 3
+    assert wakeup.timeouts == [30.0, 30.0, 30.0]
+    assert wakeup.watched[0] == ("kraken:futures:PI_XBTUSD",)
@@ -10,13 +10,16 @@ from sqlalchemy.orm import Session
 from kolabi.bot.run_report import (
     PairKey,
     ReportOptions,
+    RunLogParser,
     build_latent_rows,
     build_living_tail_rows,
     build_report_table,
     build_report_rows,
     fetch_fill_summaries,
     fetch_order_summaries,
+    follow_report,
     main,
+    parse_run_log_file,
     parse_run_log_text,
     parse_log_text,
     render_latent_table,
@@ -450,3 +453,67 @@ def test_cli_requires_db_unless_log_only(tmp_path: Path) -> None:
     assert result == 2
     assert out.getvalue() == ""
     assert "account DB URL is required" in err.getvalue()
+
+
+def test_checkpoint_resumes_from_saved_offset(tmp_path: Path) -> None:
+    lines = SAMPLE_LOG.splitlines()
+    log_path = tmp_path / "sample.log"
+    checkpoint = tmp_path / "sample.ckpt"
+    log_path.write_text("\n".join(lines[:4]) + "\n", encoding="utf-8")
+
+    first = parse_run_log_file(log_path, checkpoint=checkpoint)
+    assert not first.lifecycles[PairKey("MM_BUY", 4)].terminated
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write("\n".join(lines[4:]))
+
+    # la derniere ligne sans fin de ligne est lue mais pas sauvegardee
+    resumed = parse_run_log_file(log_path, checkpoint=checkpoint)
+    parser = RunLogParser.load_checkpoint(checkpoint)
+
+    lifecycle = resumed.lifecycles[PairKey("MM_BUY", 4)]
+    assert lifecycle.amend_count == 2
+    assert lifecycle.terminated
+    assert parser.offset == len("\n".join(lines[:-1]).encode()) + 1
+    assert parser.lifecycles[PairKey("MM_BUY", 4)].amend_count == 2
+
+
+def test_checkpoint_is_dropped_when_log_is_rewritten(tmp_path: Path) -> None:
+    log_path = tmp_path / "sample.log"
+    checkpoint = tmp_path / "sample.ckpt"
+    log_path.write_text(SAMPLE_LOG + "\n", encoding="utf-8")
+    parse_run_log_file(log_path, checkpoint=checkpoint)
+
+    log_path.write_text(SAMPLE_LOG.splitlines()[0] + "\n", encoding="utf-8")
+    snapshot = parse_run_log_file(log_path, checkpoint=checkpoint)
+
+    lifecycle = snapshot.lifecycles[PairKey("MM_BUY", 4)]
+    assert lifecycle.amend_count == 0
+    assert not lifecycle.terminated
+
+
+def test_follow_report_renders_only_when_log_grows(tmp_path: Path) -> None:
+    lines = SAMPLE_LOG.splitlines()
+    log_path = tmp_path / "sample.log"
+    log_path.write_text("\n".join(lines[:4]) + "\n", encoding="utf-8")
+    tables: list[str] = []
+    sleeps: list[float] = []
+
+    def grow_after_idle_pass(seconds: float) -> None:
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            with log_path.open("a", encoding="utf-8") as handle:
+                handle.write("\n".join(lines[4:]) + "\n")
+
+    rendered = follow_report(
+        log_path,
+        tables.append,
+        log_only=True,
+        interval_seconds=0.5,
+        refreshes=2,
+        sleep=grow_after_idle_pass,
+    )
+
+    assert rendered == 2
+    assert sleeps == [0.5, 0.5]
+    assert "No rows." in tables[0].split("** Living")[0]
+    assert "| 06-17 23:05 | 06-17 23:21 | 00:15:52 | MM_BUY #4 |" in tables[1]
@@ -52,6 +52,7 @@ from kolabi.shared.core.runtime_types import (
     RuntimeCommandKind,
     Symbol,
 )
+from kolabi.shared.rate_limits import RateLimitRegistry
 from kolabi.shared.runtime_state import (
     KrakenRuntimeStateClient,
     PrivateFeedState,
@@ -231,6 +232,38 @@ def test_bot_service_builds_runtime_state_for_bitmex(monkeypatch) -> None:
     )
 
 
+def test_bot_service_shares_instrument_cache_and_invalidates_on_notify(
+    monkeypatch,
+) -> None:
+    monkeypatch.setenv("BTX_DEMO_API_KEY", "k")
+    monkeypatch.setenv("BTX_DEMO_API_SECRET", "s")
+    service = BotService(
+        BotConfig(
+            symbol="XBTUSD",
+            exchange="bitmex",
+            require_ready=False,
+            market_db_url="postgresql+psycopg://x/market",
+            account_db_url="postgresql+psycopg://x/account",
+            critical_account_db_url="postgresql+psycopg://x/critical",
+        )
+    )
+    service._ensure_exchange_config()
+    cache = service.instrument_cache
+    assert service.runtime_state is not None
+    assert service.runtime_state.instrument_cache is cache
+    assert service.exchange_config is not None
+    assert service.exchange_config.adapter_kwargs["instrument_cache"] is cache
+
+    environment = service.config.environment
+    cache.put("rest", ("bitmex", environment, "futures", "XBTUSD"), {"tickSize": 0.5})
+    cache.put("rest", ("bitmex", environment, "futures", "ETHUSD"), {"tickSize": 0.05})
+    service._invalidate_instrument_route("bitmex:futures:XBTUSD")
+    assert cache.stats().entries == 1
+
+    service._invalidate_instrument_route(None)
+    assert cache.stats().entries == 0
+
+
 def test_bot_service_defaults_bitmex_account_scoped_lanes(monkeypatch) -> None:
     for name in (
         "KOLABI_MARKET_DB_URL",
@@ -1240,6 +1273,33 @@ def test_symbol_routing_exchange_port_dispatches_by_exchange_and_symbol(monkeypa
     assert created == [("kraken", "PI_XBTUSD"), ("binance", "BTCUSDT")]
 
 
+def test_symbol_routing_exchange_port_rate_limit_lane_is_per_venue_account() -> None:
+    registry = RateLimitRegistry()
+    port = SymbolRoutingExchangePort(
+        exchange="kraken", rate_limits=registry, account_scope="desk-a"
+    )
+
+    def _cancel(exchange: str, symbol: str) -> CancelCommand:
+        return CancelCommand(
+            kind=RuntimeCommandKind.CANCEL,
+            exchange=exchange,
+            market_type="futures",
+            symbol=Symbol(symbol),
+            pair_name="p",
+            request=CancelOrderCommandRequest(pair_name="p", clOrdID="OID"),
+        )
+
+    xbt_key, xbt_bucket = port.rate_limit_lane(_cancel("kraken", "PI_XBTUSD"))
+    eth_key, eth_bucket = port.rate_limit_lane(_cancel("kraken", "PI_ETHUSD"))
+    bin_key, bin_bucket = port.rate_limit_lane(_cancel("binance", "BTCUSDT"))
+
+    # une voie par plateforme et compte, partagee entre symboles
+    assert xbt_key == eth_key == ("kraken", "futures", "desk-a")
+    assert xbt_bucket is eth_bucket is registry.bucket("kraken", "futures", "desk-a")
+    assert bin_key == ("binance", "futures", "desk-a")
+    assert bin_bucket is not xbt_bucket
+
+
 def test_symbol_routing_exchange_port_rejects_unsupported_market_lane() -> None:
     port = SymbolRoutingExchangePort(
         exchange="kraken",
@@ -2,17 +2,19 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 
+from kolabi.shared.core.runtime_types import PrivateDeltaQuery
 from kolabi.shared.persistence import (
     AccountPosition,
     Base,
     ExchangeConnection,
     ExchangeFill,
+    ExchangeInstrument,
     ExchangeOrder,
     MarketIndicator,
     MarketSnapshot,
 )
 from kolabi.shared.runtime_state import KrakenRuntimeStateClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session
 
 
@@ -1180,3 +1182,190 @@ def test_runtime_state_does_not_accept_fresh_account_stream_when_private_ws_stal
     assert state.private_ws.ready is False
     assert "private_ws state is stale" in state.reasons
     assert state.ready is False
+
+
+def test_runtime_state_client_records_per_query_latency(postgres_url_factory) -> None:
+    market_db = postgres_url_factory("latency-pub")
+    account_db = postgres_url_factory("latency-prv")
+    Base.metadata.create_all(create_engine(market_db))
+    Base.metadata.create_all(create_engine(account_db))
+    client = KrakenRuntimeStateClient(
+        market_db_url=market_db,
+        account_db_url=account_db,
+        symbol="PI_XBTUSD",
+    )
+
+    client.fetch_market_state()
+    client.fetch_private_orders_since(after_local_timestamp=datetime.now(timezone.utc))
+
+    metrics = client.read_metrics.snapshot()
+    assert metrics["fetch_market_state"]["count"] == 1
+    assert metrics["fetch_private_orders_since"]["count"] == 1
+    assert sum(metrics["fetch_market_state"]["buckets"].values()) == 1
+    assert any(line.startswith("fetch_market_state n=1") for line in client.read_metrics.summary_lines())
+
+
+def test_bulk_state_reads_match_per_route_reads_in_two_statements(postgres_url_factory) -> None:
+    market_db = postgres_url_factory("bulk-pub")
+    account_db = postgres_url_factory("bulk-prv")
+    market_engine = create_engine(market_db)
+    account_engine = create_engine(account_db)
+    Base.metadata.create_all(market_engine)
+    Base.metadata.create_all(account_engine)
+    now = datetime.now(timezone.utc)
+    symbols = [f"PF_T{index}USD" for index in range(10)]
+    with Session(market_engine) as session:
+        for index, symbol in enumerate(symbols):
+            if index == 9:
+                continue  # one route without any public row
+            for age, mid in ((3, 90.0), (1, 100.0 + index)):
+                session.add(
+                    MarketSnapshot(
+                        local_uuid=f"snap-{symbol}-{age}",
+                        exchange="kraken",
+                        environment="demo",
+                        market_type="futures",
+                        symbol=symbol,
+                        best_bid=mid - 0.5,
+                        best_ask=mid + 0.5,
+                        avg_bid=mid - 0.5,
+                        avg_ask=mid + 0.5,
+                        mid_price=mid,
+                        spread=1.0,
+                        imbalance=0.5,
+                        source_timestamp=now - timedelta(seconds=age),
+                        local_timestamp=now - timedelta(seconds=age),
+                    )
+                )
+                session.add(
+                    MarketIndicator(
+                        exchange="kraken",
+                        environment="demo",
+                        market_type="futures",
+                        symbol=symbol,
+                        indicator_name="mark_price",
+                        value=mid + 0.2,
+                        source_age_seconds=1.0,
+                        computed_at=now - timedelta(seconds=age),
+                    )
+                )
+            session.add(
+                ExchangeInstrument(
+                    exchange="kraken",
+                    environment="demo",
+                    market_type="futures",
+                    symbol=symbol,
+                    tick_size=0.5,
+                )
+            )
+        session.commit()
+    with Session(account_engine) as session:
+        for index, symbol in enumerate(symbols):
+            for step in range(3):
+                order = ExchangeOrder(
+                    local_uuid=f"order-{symbol}-{step}",
+                    exchange="kraken",
+                    environment="demo",
+                    market_type="futures",
+                    account_scope="default",
+                    symbol=symbol,
+                    exchange_order_id=f"OID-{index}-{step}",
+                    client_order_id=f"CID-{index}-{step}",
+                    side="buy",
+                    order_type="limit",
+                    status="filled" if step == 0 else "open",
+                    price=100.0,
+                    quantity=1.0,
+                    filled_quantity=1.0 if step == 0 else 0.0,
+                    raw_payload={},
+                    local_timestamp=now - timedelta(seconds=10 - step),
+                )
+                session.add(order)
+                session.flush()
+                if step == 0:
+                    session.add(
+                        ExchangeFill(
+                            local_uuid=f"fill-{symbol}",
+                            order_id=order.id,
+                            exchange="kraken",
+                            exchange_fill_id=f"FID-{index}",
+                            price=100.0,
+                            quantity=1.0,
+                            raw_payload={"price": 100.0},
+                            local_timestamp=now - timedelta(seconds=10),
+                        )
+                    )
+        session.commit()
+
+    client = KrakenRuntimeStateClient(
+        market_db_url=market_db,
+        account_db_url=account_db,
+        symbol=symbols[0],
+    )
+    routes = [("kraken", "futures", symbol) for symbol in symbols]
+    cursor = now - timedelta(seconds=9, milliseconds=500)
+    queries = [
+        PrivateDeltaQuery(
+            exchange="kraken",
+            market_type="futures",
+            symbol=symbol,
+            after_order_timestamp=cursor,
+            after_fill_timestamp=None,
+            client_order_ids=(f"CID-{index}-0",),
+        )
+        for index, symbol in enumerate(symbols)
+    ]
+    statements: list[str] = []
+
+    def _count(conn, cursor_, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    market_bind = client._market_sessionmaker.kw["bind"]
+    account_bind = client._critical_account_sessionmaker.kw["bind"]
+    event.listen(market_bind, "before_cursor_execute", _count)
+    event.listen(account_bind, "before_cursor_execute", _count)
+    try:
+        client.fetch_market_states(routes)
+        cold_selects = _select_count(statements)
+        statements.clear()
+        markets = client.fetch_market_states(routes)
+        deltas = client.fetch_private_deltas(queries)
+    finally:
+        event.remove(market_bind, "before_cursor_execute", _count)
+        event.remove(account_bind, "before_cursor_execute", _count)
+
+    # Regression guard: the cold read adds one instrument statement; once tick
+    # sizes are cached, two public plus two private statements for ten routes.
+    assert cold_selects == 3
+    assert _select_count(statements) == 4
+    for (exchange, market_type, symbol), market in markets.items():
+        single = client.fetch_market_state(symbol, exchange, market_type)
+        ageless = {"age_seconds", "source_age_seconds"}
+        assert {key: value for key, value in market.as_dict().items() if key not in ageless} == {
+            key: value for key, value in single.as_dict().items() if key not in ageless
+        }
+    assert markets[routes[9]].ready is False
+    assert markets[routes[3]].mid_price == 103.0
+    for index, query in enumerate(queries):
+        delta = deltas[query.route_key]
+        assert delta.orders == client.fetch_private_orders_since(
+            after_local_timestamp=cursor,
+            symbol=query.symbol,
+        )
+        assert delta.fills == client.fetch_private_fills_since(symbol=query.symbol)
+        assert delta.identity_orders == client.fetch_private_orders_for_identities(
+            client_order_ids=query.client_order_ids,
+            symbol=query.symbol,
+        )
+        assert delta.identity_fills == client.fetch_private_fills_for_identities(
+            client_order_ids=query.client_order_ids,
+            symbol=query.symbol,
+        )
+        assert [record.client_order_id for record in delta.orders] == [
+            f"CID-{index}-1",
+            f"CID-{index}-2",
+        ]
+
+
+def _select_count(statements: list[str]) -> int:
+    return len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")])
@@ -23,6 +23,7 @@ from kolabi.bot.domain import (
     TailState,
     TimeWindow,
 )
+from kolabi.bot.exchange_routes import ExchangeRoute
 from kolabi.bot.horus import plan_runtime_commands
 from kolabi.bot.pair_cycle import step_pair
 from kolabi.bot.strategy_runtime import (
@@ -2856,6 +2857,89 @@ def test_tail_telemetry_write_failure_does_not_stop_runtime_source(caplog) -> No
     assert "tail telemetry persistence failed" in caplog.text
 
 
+def test_tail_telemetry_reads_market_state_once_per_route(caplog) -> None:
+    class Market:
+        best_bid = 102.0
+        best_ask = 102.5
+        mid_price = 102.25
+        last_price = 102.0
+        mark_price = None
+        index_price = None
+        tick_size = 0.5
+        recorded_at = "tick-1"
+
+    class Reader:
+        def __init__(self) -> None:
+            self.calls = 0
+
+        def fetch_market_state(self, symbol=None):
+            self.calls += 1
+            return Market()
+
+    class Writer:
+        def __init__(self) -> None:
+            self.batches: list[int] = []
+
+        def record_rows(self, rows):
+            self.batches.append(len(rows))
+
+    base = sample_strategy()[0]
+    pairs = tuple(replace(base, name=f"pair-{index}") for index in range(3))
+    confirmed_at = datetime.now(timezone.utc)
+    trail = replace(
+        initial_tail_trail(base, Decimal("100"), confirmed_at),
+        confirmed_stop_price=Decimal("99.0"),
+        last_confirmed_at=confirmed_at,
+    )
+    reader = Reader()
+    writer = Writer()
+    runtime = StrategyRuntime(
+        strategy=StrategySpec(name="demo", pairs=pairs),
+        symbol="PI_XBTUSD",
+        simulate=False,
+        public_state_reader=reader,
+        tail_telemetry_writer=writer,
+        tail_telemetry_interval_seconds=1.0,
+    )
+    runtime.state = replace(
+        runtime.state,
+        pairs={
+            pair.name: PairCycleState(
+                pair=pair,
+                head_state=HeadState.CLOSED,
+                tail_state=TailState.LIVING,
+                tail_trail=trail,
+                played_quantity=Decimal("1"),
+            )
+            for pair in pairs
+        },
+    )
+
+    async def _tick() -> None:
+        runtime.running = True
+        task = asyncio.create_task(runtime._pump_tail_telemetry())
+        await asyncio.sleep(0.05)
+        runtime.running = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    with caplog.at_level("INFO", logger="kola"):
+        asyncio.run(_tick())
+
+    # 3 queues sur une route: une lecture, un lot, une ligne METRICS par paire
+    assert reader.calls == 1
+    assert writer.batches == [3]
+    assert caplog.text.count("METRICS (pair-") == 3
+
+    # etat deja publie par la source publique: aucune lecture de plus
+    reader.calls = 0
+    runtime.market_states.put_many(
+        {ExchangeRoute("kraken", "futures", "PI_XBTUSD"): Market()}
+    )
+    assert len(runtime._collect_tail_telemetry_rows(datetime.now(timezone.utc))) == 3
+    assert reader.calls == 0
+
+
 def test_update_log_closed_hooked_includes_head_fill_fields(caplog) -> None:
     pair = sample_strategy()[0]
     now = datetime.now(timezone.utc)
@@ -122,5 +122,6 @@ def postgres_url_factory() -> Callable[[str], str]:
                 ),
                 {"db_name": db_name},
             )
-            connection.execute(text(f'DROP DATABASE IF EXISTS "{db_name}"'))
+            # FORCE: background writers may reconnect between terminate and drop.
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{db_name}" WITH (FORCE)'))
     admin_engine.dispose()
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import asyncio
+import threading
 from decimal import Decimal
 from typing import Any
 
 import pytest
+from kolabi.bot.exchange_routes import DEFAULT_MARKET_TYPE, ExchangeRoute
 from kolabi.bot.service import AdapterExchangePort
+from kolabi.bot.tail_verification import TailVerifyMetrics
 from kolabi.shared.config import ExchangeConfig
 from kolabi.shared.core.models import OrderAck
 from kolabi.shared.core.runtime_types import (
     AmendHeadCommand,
     AmendOrderCommandRequest,
     AmendTailCommand,
+    CancelCommand,
+    CancelOrderCommandRequest,
+    PlaceHeadCommand,
     PlaceOrderCommandRequest,
     PlaceTailCommand,
     RuntimeCommandKind,
@@ -435,3 +441,291 @@ def test_place_tail_visible_trigger_is_accepted_even_when_reduce_only_flag_is_fa
 
 async def _raise_timeout(_seconds: float) -> None:
     raise RuntimeError("tail trigger order not visible")
+
+
+class _BatchAdapter(_FakeAdapter):
+    placed: list[dict[str, Any]] = []
+    cancelled: list[str] = []
+
+    def place_orders(self, orders: list[dict[str, Any]]) -> list[OrderAck | Exception]:
+        type(self).placed = list(orders)
+        return [
+            OrderAck(order_id=str(order["clOrdID"]), status="New") for order in orders
+        ]
+
+    def cancel_orders(self, order_ids: list[str]) -> list[OrderAck | Exception]:
+        type(self).cancelled = list(order_ids)
+        return [OrderAck(order_id=order_id, status="Canceled") for order_id in order_ids]
+
+
+def _head(pair_name: str, **request: Any) -> PlaceHeadCommand:
+    return PlaceHeadCommand(
+        kind=RuntimeCommandKind.PLACE,
+        symbol=Symbol("PI_XBTUSD"),
+        pair_name=pair_name,
+        request=PlaceOrderCommandRequest(
+            pair_name=pair_name,
+            side="buy",
+            ordType="Limit",
+            clOrdID=f"H1{pair_name}",
+            **request,
+        ),
+    )
+
+
+def test_execute_batch_maps_heads_and_cancels_to_adapter_batches(monkeypatch) -> None:
+    monkeypatch.setattr("kolabi.bot.service.get_adapter", lambda _exchange: _BatchAdapter)
+    port = AdapterExchangePort(exchange="kraken", exchange_config=_config())
+
+    placed = asyncio.run(
+        port.execute_batch(
+            [
+                _head("a", orderQty=1, price=100.0),
+                _head("b", price=100.0),
+                _head("c", orderQty=2, price=99.5, execInst="ParticipateDoNotInitiate"),
+            ]
+        )
+    )
+    cancelled = asyncio.run(
+        port.execute_batch(
+            [
+                CancelCommand(
+                    kind=RuntimeCommandKind.CANCEL,
+                    symbol=Symbol("PI_XBTUSD"),
+                    pair_name=pair_name,
+                    request=CancelOrderCommandRequest(
+                        pair_name=pair_name, clOrdID=f"OID-{pair_name}"
+                    ),
+                )
+                for pair_name in ("a", "c")
+            ]
+        )
+    )
+
+    # la requete invalide reste locale, les autres partent dans un seul lot
+    assert isinstance(placed[1], ValueError)
+    assert [getattr(ack, "order_id", None) for ack in placed] == ["H1a", None, "H1c"]
+    assert _BatchAdapter.placed == [
+        {
+            "side": "buy",
+            "orderQty": 1,
+            "type_": "Limit",
+            "price": 100.0,
+            "clOrdID": "H1a",
+        },
+        {
+            "side": "buy",
+            "orderQty": 2,
+            "type_": "Limit",
+            "price": 99.5,
+            "clOrdID": "H1c",
+            "execInst": "ParticipateDoNotInitiate",
+        },
+    ]
+    assert _BatchAdapter.cancelled == ["OID-a", "OID-c"]
+    assert [getattr(ack, "status", None) for ack in cancelled] == ["Canceled", "Canceled"]
+    assert port.batch_key(_head("a")) == "PI_XBTUSD"
+
+
+class _NativeAsyncAdapter(_FakeAdapter):
+    calls: list[tuple[str, Any]] = []
+    closed = False
+
+    def __init__(self, **_kwargs: Any) -> None:
+        type(self).calls = []
+        type(self).closed = False
+
+    def amend_order(self, order_id: str, **params: Any) -> OrderAck:
+        raise AssertionError("blocking amend used")
+
+    async def amend_order_async(self, order_id: str, **params: Any) -> OrderAck:
+        type(self).calls.append(("amend", threading.get_ident()))
+        return OrderAck(order_id=order_id, status="Replaced")
+
+    async def cancel_orders_async(self, order_ids: list[str]) -> list[OrderAck | Exception]:
+        type(self).calls.append(("cancel_orders", list(order_ids)))
+        return [OrderAck(order_id=order_id, status="Canceled") for order_id in order_ids]
+
+    async def aclose(self) -> None:
+        type(self).closed = True
+
+
+def test_native_async_adapter_calls_skip_the_worker_thread(monkeypatch) -> None:
+    monkeypatch.setattr(
+        "kolabi.bot.service.get_adapter", lambda _exchange: _NativeAsyncAdapter
+    )
+    port = AdapterExchangePort(
+        exchange="kraken",
+        exchange_config=_config(),
+        run_blocking_calls_in_thread=True,
+    )
+
+    async def scenario() -> list[OrderAck | Exception]:
+        await port.amend_head(
+            AmendHeadCommand(
+                kind=RuntimeCommandKind.AMEND,
+                symbol=Symbol("PI_XBTUSD"),
+                pair_name="pair",
+                request=AmendOrderCommandRequest(
+                    pair_name="pair",
+                    side="buy",
+                    ordType="Limit",
+                    orderID="OID-1",
+                    newPrice=100.0,
+                ),
+            )
+        )
+        acks = await port.execute_batch(
+            [
+                CancelCommand(
+                    kind=RuntimeCommandKind.CANCEL,
+                    symbol=Symbol("PI_XBTUSD"),
+                    pair_name="pair",
+                    request=CancelOrderCommandRequest(pair_name="pair", clOrdID="OID-1"),
+                )
+            ]
+        )
+        await port.aclose()
+        return acks
+
+    acks = asyncio.run(scenario())
+
+    # l'appel natif tourne sur le thread de la boucle, pas dans asyncio.to_thread
+    assert _NativeAsyncAdapter.calls == [
+        ("amend", threading.get_ident()),
+        ("cancel_orders", ["OID-1"]),
+    ]
+    assert [getattr(ack, "status", None) for ack in acks] == ["Canceled"]
+    assert _NativeAsyncAdapter.closed
+
+
+class _FakeListener:
+    def __init__(self) -> None:
+        self.callbacks: list[tuple[str, Any]] = []
+
+    def subscribe(self, channel: str, callback: Any) -> None:
+        self.callbacks.append((channel, callback))
+
+    def notify(self, route: str | None) -> None:
+        # le vrai listener rappelle depuis son propre thread
+        for _channel, callback in self.callbacks:
+            thread = threading.Thread(target=callback, args=(route,))
+            thread.start()
+            thread.join()
+
+
+class _StreamTailAdapter(_TailAdapter):
+    private_orders_in_db = True
+    rest_calls = 0
+    db_reads = 0
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        type(self).rest_calls = 0
+        type(self).db_reads = 0
+
+    def live_trigger_orders(self) -> list[dict[str, Any]]:
+        type(self).rest_calls += 1
+        return type(self).trigger_orders
+
+    def live_trigger_orders_db(self) -> list[dict[str, Any]]:
+        type(self).db_reads += 1
+        return type(self).db_trigger_orders
+
+
+def _tail_command() -> PlaceTailCommand:
+    return PlaceTailCommand(
+        kind=RuntimeCommandKind.PLACE,
+        symbol=Symbol("PI_XBTUSD"),
+        pair_name="pair-a",
+        request=PlaceOrderCommandRequest(
+            pair_name="pair-a",
+            side="sell",
+            ordType="S",
+            orderQty=1.0,
+            stopPx=99.0,
+            execInst="ReduceOnly,LastPrice",
+            clOrdID="CID-T",
+        ),
+    )
+
+
+_TAIL_ROW = {
+    "order_id": "OID-T",
+    "client_order_id": "CID-T",
+    "symbol": "PI_XBTUSD",
+    "side": "sell",
+    "qty": 1.0,
+    "stop_price": 99.0,
+}
+
+
+def test_place_tail_is_verified_by_the_private_stream_without_rest(monkeypatch) -> None:
+    _StreamTailAdapter.trigger_orders = []
+    _StreamTailAdapter.db_trigger_orders = []
+    monkeypatch.setattr(
+        "kolabi.bot.service.get_adapter", lambda _exchange: _StreamTailAdapter
+    )
+    listener = _FakeListener()
+    metrics = TailVerifyMetrics()
+    port = AdapterExchangePort(
+        exchange="kraken",
+        exchange_config=_config(),
+        run_blocking_calls_in_thread=True,
+        private_order_listener=listener,  # type: ignore[arg-type]
+        verify_metrics=metrics,
+        safety_poll_seconds=30.0,
+    )
+    route = ExchangeRoute("kraken", DEFAULT_MARKET_TYPE, "PI_XBTUSD").label
+
+    async def scenario() -> OrderAck:
+        task = asyncio.create_task(port.place_tail(_tail_command()))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        # une autre route ne reveille pas l'attente
+        listener.notify("kraken:futures:PF_ETHUSD")
+        _StreamTailAdapter.db_trigger_orders = [dict(_TAIL_ROW)]
+        listener.notify(route)
+        return await asyncio.wait_for(task, timeout=2.0)
+
+    ack = asyncio.run(scenario())
+
+    assert ack.order_id == "OID-T"
+    assert _StreamTailAdapter.rest_calls == 0
+    # une lecture a l'inscription, une au NOTIFY de la route
+    assert _StreamTailAdapter.db_reads == 2
+    snapshot = metrics.snapshot()
+    assert snapshot["outcomes"] == {"private_stream": 1}
+    assert snapshot["rest_calls"] == 0
+    assert snapshot["rest_calls_saved"] == 1
+
+
+def test_place_tail_stream_falls_back_to_one_rest_listing_at_deadline(
+    monkeypatch,
+) -> None:
+    _StreamTailAdapter.trigger_orders = [dict(_TAIL_ROW)]
+    _StreamTailAdapter.db_trigger_orders = []
+    monkeypatch.setattr(
+        "kolabi.bot.service.get_adapter", lambda _exchange: _StreamTailAdapter
+    )
+    metrics = TailVerifyMetrics()
+    port = AdapterExchangePort(
+        exchange="kraken",
+        exchange_config=_config(),
+        verify_timeout_seconds=0.3,
+        verify_poll_seconds=0.1,
+        private_order_listener=_FakeListener(),  # type: ignore[arg-type]
+        verify_metrics=metrics,
+        safety_poll_seconds=0.1,
+    )
+
+    ack = asyncio.run(port.place_tail(_tail_command()))
+
+    assert ack.order_id == "OID-T"
+    assert _StreamTailAdapter.rest_calls == 1
+    # le filet de securite relit la DB privee sans attendre de NOTIFY
+    assert _StreamTailAdapter.db_reads >= 3
+    snapshot = metrics.snapshot()
+    assert snapshot["outcomes"] == {"deadline_rest_live": 1}
+    # l'ancien sondage aurait liste les ordres environ 4 fois en 0.3 s
+    assert snapshot["rest_calls_saved"] >= 2
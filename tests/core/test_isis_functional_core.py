@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pickle
+from dataclasses import replace
 from datetime import datetime, timezone
 
 from kolabi.bot.domain import (
@@ -10,12 +12,13 @@ from kolabi.bot.domain import (
     PairCycleState,
     PairIntent,
     PairIntentKind,
+    PairTable,
     Side,
     StrategyState,
     TailSpec,
     TimeWindow,
 )
-from kolabi.bot.isis import step_strategy
+from kolabi.bot.isis import step_strategy, step_strategy_changes
 
 
 def sample_pair(name: str) -> OrderPairSpec:
@@ -70,6 +73,54 @@ def test_step_strategy_returns_fresh_strategy_state_and_updates_one_pair() -> No
     assert intents == (PairIntent(PairIntentKind.PLACE_HEAD),)
 
 
+def test_step_strategy_changes_reports_the_moved_pair_and_shares_the_rest() -> None:
+    names = [f"pair-{index}" for index in range(200)]
+    state = replace(
+        sample_state(),
+        pairs={name: PairCycleState(pair=sample_pair(name)) for name in names},
+    )
+    move = EggMove(
+        kind=EggMoveKind.HEAD_HOOKED,
+        occurred_at=datetime(2026, 5, 21, 12, 1, tzinfo=timezone.utc),
+        symbol="PI_XBTUSD",
+        pair_name="pair-42",
+        event_id="evt-1",
+    )
+
+    next_state, intents, changed = step_strategy_changes(state, move)
+    missing_state, _, missing_changed = step_strategy_changes(
+        next_state,
+        replace(move, pair_name="pair-z"),
+    )
+
+    assert changed == frozenset({"pair-42"})
+    assert missing_changed == frozenset()
+    assert missing_state.pairs is next_state.pairs
+    assert list(next_state.pairs) == names
+    assert next_state.pairs["pair-42"].head_state.value == "hooked"
+    assert state.pairs["pair-42"].head_state.value == "latent"
+    shared = [name for name in names if next_state.pairs[name] is state.pairs[name]]
+    assert len(shared) == 199
+    assert intents == (PairIntent(PairIntentKind.PLACE_HEAD),)
+
+
+def test_pair_table_is_an_ordered_immutable_mapping() -> None:
+    pair_a = PairCycleState(pair=sample_pair("pair-a"))
+    pair_b = PairCycleState(pair=sample_pair("pair-b"))
+    table = PairTable({"pair-b": pair_b, "pair-a": pair_a})
+
+    grown = table.with_pairs({"pair-c": pair_a, "pair-b": pair_a})
+
+    assert list(table.items()) == [("pair-b", pair_b), ("pair-a", pair_a)]
+    assert list(grown) == ["pair-b", "pair-a", "pair-c"]
+    assert grown["pair-b"] is pair_a
+    assert grown == {"pair-b": pair_a, "pair-a": pair_a, "pair-c": pair_a}
+    assert table.with_pairs({}) is table
+    assert "pair-c" not in table and table.get("pair-c") is None
+    assert pickle.loads(pickle.dumps(grown)) == grown
+    assert StrategyState(launched_at=sample_state().launched_at, pairs=table).pairs is table
+
+
 def test_step_strategy_does_not_create_missing_pair_and_returns_no_intents() -> None:
     state = sample_state()
     move = EggMove(
@@ -2,9 +2,15 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
+from typing import Hashable, Sequence
 
 import pytest
-from kolabi.bot.ogun_executor import OgunExecutor, RestFlightPolicy, RetryPolicy
+from kolabi.bot.ogun_executor import (
+    OgunExecutor,
+    RestBatchPolicy,
+    RestFlightPolicy,
+    RetryPolicy,
+)
 from kolabi.shared.core.models import OrderAck
 from kolabi.shared.core.runtime_types import (
     AmendHeadCommand,
@@ -12,6 +18,7 @@ from kolabi.shared.core.runtime_types import (
     AmendTailCommand,
     CancelCommand,
     CancelOrderCommandRequest,
+    DragonSong,
     ExchangePort,
     PlaceHeadCommand,
     PlaceOrderCommandRequest,
@@ -19,6 +26,7 @@ from kolabi.shared.core.runtime_types import (
     RuntimeCommandKind,
     Symbol,
 )
+from kolabi.shared.rate_limits import RouteBudget, TokenBucket
 
 
 @dataclass
@@ -323,3 +331,174 @@ def test_rest_flight_gate_spaces_platform_launches() -> None:
 
     assert launches[1] - launches[0] >= 0.015
     assert launches[2] - launches[1] >= 0.015
+
+
+class _LanePort(_FakePort):
+    """Route par prefixe de pair_name: `k-` Kraken, `b-` Binance."""
+
+    def __init__(self, buckets: dict[str, TokenBucket | None]) -> None:
+        super().__init__()
+        self.buckets = buckets
+        self.started_names: list[str] = []
+        self.kraken_started = asyncio.Event()
+        self.release_kraken = asyncio.Event()
+        self.launches: list[float] = []
+
+    def rate_limit_lane(
+        self, command: DragonSong
+    ) -> tuple[Hashable, TokenBucket | None]:
+        venue = command.pair_name.split("-", 1)[0]
+        return venue, self.buckets.get(venue)
+
+    async def _record(self, name: str, pair_name: str) -> OrderAck:
+        self.started_names.append(f"{name}:{pair_name}")
+        self.launches.append(asyncio.get_running_loop().time())
+        if pair_name == "k-first":
+            self.kraken_started.set()
+            await self.release_kraken.wait()
+        return OrderAck(order_id=f"OID-{pair_name}", status="New")
+
+    async def place_head(self, command: PlaceHeadCommand) -> OrderAck:
+        return await self._record("place_head", command.pair_name)
+
+    async def cancel(self, command: CancelCommand) -> OrderAck:
+        return await self._record("cancel", command.pair_name)
+
+
+def test_rest_flight_gate_lanes_do_not_block_each_other() -> None:
+    async def _run() -> list[str]:
+        port = _LanePort({})
+        executor = OgunExecutor(port, flight_policy=RestFlightPolicy(max_inflight=1))
+        first = asyncio.create_task(executor.execute(_place_head("k-first")))
+        await asyncio.wait_for(port.kraken_started.wait(), timeout=0.5)
+        queued = [
+            asyncio.create_task(executor.execute(_place_head("k-second"))),
+            asyncio.create_task(executor.execute(_cancel("k-cancel"))),
+        ]
+        # la voie Binance part pendant que Kraken est bloque
+        await asyncio.wait_for(executor.execute(_cancel("b-cancel")), timeout=0.5)
+        started_while_blocked = list(port.started_names)
+        port.release_kraken.set()
+        await asyncio.gather(first, *queued)
+        return started_while_blocked + ["|"] + port.started_names[2:]
+
+    assert asyncio.run(_run()) == [
+        "place_head:k-first",
+        "cancel:b-cancel",
+        "|",
+        "cancel:k-cancel",
+        "place_head:k-second",
+    ]
+
+
+def test_rest_flight_gate_waits_for_lane_token_bucket() -> None:
+    budget = RouteBudget(capacity=2.0, refill_per_second=50.0)
+    bucket = TokenBucket(budget, headroom=1.0)
+
+    async def _run() -> dict[str, float]:
+        port = _LanePort({"b": bucket})
+        executor = OgunExecutor(port)
+        started = asyncio.get_running_loop().time()
+        await asyncio.gather(
+            *(executor.execute(_place_head(f"b-{index}")) for index in range(3)),
+            executor.execute(_place_head("k-free")),
+        )
+        return {
+            name.split(":", 1)[1]: launch - started
+            for name, launch in zip(port.started_names, port.launches)
+        }
+
+    launches = asyncio.run(_run())
+
+    # 2 jetons de depart, le troisieme attend ~20 ms de recharge
+    assert launches["b-0"] < 0.01
+    assert launches["b-1"] < 0.01
+    assert launches["k-free"] < 0.01
+    assert launches["b-2"] >= 0.015
+    assert bucket.stats().spent == 3.0
+
+
+class _BatchPort(_FakePort):
+    def __init__(self, *, failing_cancels: set[str] | None = None) -> None:
+        super().__init__()
+        self.batches: list[list[str]] = []
+        self.failing_cancels = failing_cancels or set()
+
+    def batch_key(self, command: DragonSong) -> Hashable | None:
+        if isinstance(command, (CancelCommand, PlaceHeadCommand)):
+            return str(command.symbol)
+        return None
+
+    async def execute_batch(
+        self, commands: Sequence[DragonSong]
+    ) -> list[OrderAck | Exception]:
+        self.batches.append([command.pair_name for command in commands])
+        results: list[OrderAck | Exception] = []
+        for command in commands:
+            if command.pair_name in self.failing_cancels:
+                results.append(RuntimeError(f"batch cancel failed {command.pair_name}"))
+            elif command.pair_name == "bad-place":
+                results.append(RuntimeError("place rejected"))
+            else:
+                results.append(OrderAck(order_id=command.pair_name, status="New"))
+        return results
+
+
+def test_batch_policy_coalesces_same_route_commands_and_demultiplexes_acks() -> None:
+    async def _run() -> tuple[_BatchPort, list[object]]:
+        port = _BatchPort(failing_cancels={"cancel-1"})
+        executor = OgunExecutor(
+            port,
+            retry_policy=RetryPolicy(attempts=2, base_delay_seconds=0.0),
+            batch_policy=RestBatchPolicy(window_seconds=0.01, max_size=10),
+        )
+        commands: list[DragonSong] = [
+            *(_cancel(f"cancel-{index}") for index in range(3)),
+            _place_head("head-a"),
+            _place_head("bad-place"),
+            _place_tail("tail-a"),
+        ]
+        results = await asyncio.gather(
+            *(executor.execute(command) for command in commands),
+            return_exceptions=True,
+        )
+        return port, list(results)
+
+    port, results = asyncio.run(_run())
+
+    assert sorted(port.batches) == [
+        ["cancel-0", "cancel-1", "cancel-2"],
+        ["head-a", "bad-place"],
+    ]
+    assert [getattr(result, "order_id", None) for result in results[:4]] == [
+        "cancel-0",
+        "5",
+        "cancel-2",
+        "head-a",
+    ]
+    # le cancel rate repasse par le chemin unitaire, le place rejete ne rejoue pas
+    assert isinstance(results[4], RuntimeError)
+    assert sorted(call.name for call in port.calls) == ["cancel", "place_tail"]
+
+
+def test_batch_lane_closes_at_max_size_and_lone_command_uses_single_call() -> None:
+    async def _run() -> _BatchPort:
+        port = _BatchPort()
+        executor = OgunExecutor(
+            port,
+            batch_policy=RestBatchPolicy(window_seconds=5.0, max_size=2),
+        )
+        await asyncio.wait_for(
+            asyncio.gather(
+                executor.execute(_cancel("a")), executor.execute(_cancel("b"))
+            ),
+            timeout=1.0,
+        )
+        executor.batch_policy = RestBatchPolicy(window_seconds=0.01, max_size=2)
+        await executor.execute(_place_head("alone"))
+        return port
+
+    port = asyncio.run(_run())
+
+    assert port.batches == [["a", "b"]]
+    assert [call.name for call in port.calls] == ["place_head"]
@@ -1,3 +1,6 @@
+import asyncio
+import json
+import uuid
 from urllib.parse import parse_qs, urlparse
 
 import pytest
@@ -8,6 +11,15 @@ from kolabi.shared.exchanges.binance_adapter import (
     BinanceMarginAdapter,
     BinanceSpotAdapter,
 )
+from kolabi.shared.persistence import (
+    Base,
+    ExchangeOrder,
+    ExchangeRestCall,
+    create_persistence_engine,
+)
+from kolabi.shared.rate_limits import RateLimitRegistry
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 EXCHANGE_INFO = {
     "symbols": [
@@ -186,6 +198,22 @@ def test_binance_spot_adapter_lists_and_validates_symbols(postgres_url_factory)
     assert metadata["minNotional"] == 5.0
 
 
+@responses.activate
+def test_instrument_rules_are_cached_per_symbol(postgres_url_factory) -> None:
+    base = "https://test-fapi"
+    audit = postgres_url_factory("audit")
+    responses.add(responses.GET, f"{base}/fapi/v1/exchangeInfo", json=EXCHANGE_INFO)
+    adapter = BinanceAdapter("key", "secret", base, "BTCUSDT", audit_db_url=audit)
+
+    first = adapter.instrument_rules()
+    second = adapter.instrument_rules("BTCUSDT")
+
+    assert first == second
+    assert first["tickSize"] == 0.1
+    assert len(responses.calls) == 1
+    assert adapter.instrument_cache.stats().hits == 1
+
+
 @responses.activate
 def test_spot_stop_order_uses_spot_api_and_stop_loss(postgres_url_factory) -> None:
     base = "https://test-spot"
@@ -243,28 +271,28 @@ def test_spot_amend_replaces_with_fresh_client_id(postgres_url_factory) -> None:
             "side": "BUY",
         },
     )
-    responses.add(
-        responses.DELETE,
-        f"{base}/api/v3/order",
-        json={
-            "symbol": "BTCUSDT",
-            "orderId": 4,
-            "clientOrderId": "H1spot-260601000001",
-            "status": "CANCELED",
-        },
-    )
     responses.add(
         responses.POST,
-        f"{base}/api/v3/order",
+        f"{base}/api/v3/order/cancelReplace",
         json={
-            "symbol": "BTCUSDT",
-            "orderId": 5,
-            "clientOrderId": "replacement-client",
-            "status": "NEW",
-            "price": "10010.00",
-            "origQty": "0.500",
-            "executedQty": "0",
-            "side": "BUY",
+            "cancelResult": "SUCCESS",
+            "newOrderResult": "SUCCESS",
+            "cancelResponse": {
+                "symbol": "BTCUSDT",
+                "orderId": 4,
+                "clientOrderId": "H1spot-260601000001",
+                "status": "CANCELED",
+            },
+            "newOrderResponse": {
+                "symbol": "BTCUSDT",
+                "orderId": 5,
+                "clientOrderId": "replacement-client",
+                "status": "NEW",
+                "price": "10010.00",
+                "origQty": "0.500",
+                "executedQty": "0",
+                "side": "BUY",
+            },
         },
     )
     adapter = BinanceSpotAdapter("key", "secret", base, "BTCUSDT", audit_db_url=audit)
@@ -280,9 +308,22 @@ def test_spot_amend_replaces_with_fresh_client_id(postgres_url_factory) -> None:
 
     assert ack.order_id == "5"
     assert ack.client_order_id == "replacement-client"
-    replace_qs = _body_query(responses.calls[3])
+    # un seul appel signe: annulation et nouvel ordre cote venue
+    assert len(responses.calls) == 3
+    replace_qs = _body_query(responses.calls[2])
+    assert replace_qs["cancelReplaceMode"] == ["STOP_ON_FAILURE"]
+    assert replace_qs["cancelOrderId"] == ["4"]
     assert replace_qs["newClientOrderId"][0] != "H1spot-260601000001"
     assert replace_qs["price"] == ["10010"]
+    assert "signature" in replace_qs
+    adapter.flush_rest_audit()
+    with Session(adapter._audit_engine) as db_session:
+        rows = db_session.execute(
+            select(ExchangeRestCall).order_by(ExchangeRestCall.id)
+        ).scalars().all()
+    assert [row.path for row in rows] == ["/api/v3/order", "/api/v3/order/cancelReplace"]
+    assert rows[1].exchange_order_id == "5"
+    assert str(rows[1].correlation_id).startswith("amend:H1spot-260601000001:")
 
 
 @responses.activate
@@ -663,3 +704,410 @@ def test_binance_margin_permission_status_reports_unsupported_probe(
         "can_place_orders": None,
         "reason": "adapter does not expose a no-order permission probe",
     }
+
+
+@responses.activate
+def test_batch_orders_chunk_and_demultiplex_replies(postgres_url_factory) -> None:
+    base = "https://test-fapi"
+    responses.add(responses.GET, f"{base}/fapi/v1/exchangeInfo", json=EXCHANGE_INFO)
+    responses.add(
+        responses.POST,
+        f"{base}/fapi/v1/batchOrders",
+        json=[
+            {"orderId": 10 + index, "clientOrderId": f"H{index}b", "status": "NEW"}
+            for index in range(5)
+        ],
+    )
+    responses.add(
+        responses.POST,
+        f"{base}/fapi/v1/batchOrders",
+        json=[{"code": -2019, "msg": "Margin is insufficient."}],
+    )
+    responses.add(
+        responses.DELETE,
+        f"{base}/fapi/v1/batchOrders",
+        json=[
+            {"orderId": 10, "clientOrderId": "H0b", "status": "CANCELED"},
+            {"code": -2011, "msg": "Unknown order sent."},
+        ],
+    )
+    responses.add(
+        responses.DELETE,
+        f"{base}/fapi/v1/batchOrders",
+        json=[{"orderId": 14, "clientOrderId": "H4b", "status": "CANCELED"}],
+    )
+    adapter = BinanceAdapter(
+        "key", "secret", base, "BTCUSDT", audit_db_url=postgres_url_factory("audit")
+    )
+
+    placed = adapter.place_orders(
+        [
+            {
+                "side": "buy",
+                "orderQty": 0.01,
+                "price": 10000.0,
+                "type_": "Limit",
+                "clOrdID": f"H{index}b",
+            }
+            for index in range(6)
+        ]
+    )
+    cancelled = adapter.cancel_orders(["10", "11", "H4b"])
+
+    assert [getattr(ack, "order_id", None) for ack in placed[:5]] == [
+        "10",
+        "11",
+        "12",
+        "13",
+        "14",
+    ]
+    assert isinstance(placed[5], RuntimeError)
+    first_batch = json.loads(_body_query(responses.calls[1])["batchOrders"][0])
+    assert [order["newClientOrderId"] for order in first_batch] == [
+        f"H{index}b" for index in range(5)
+    ]
+    assert first_batch[0]["quantity"] == "0.01"
+    assert _url_query(responses.calls[3])["orderIdList"] == ["[10, 11]"]
+    assert _url_query(responses.calls[4])["origClientOrderIdList"] == ['["H4b"]']
+    assert getattr(cancelled[0], "status", None) == "CANCELED"
+    assert isinstance(cancelled[1], RuntimeError)
+    assert getattr(cancelled[2], "order_id", None) == "14"
+    adapter.flush_rest_audit()
+    assert adapter.rest_audit.stats().written == 4
+
+
+@responses.activate
+def test_spot_batch_orders_fall_back_to_single_calls(postgres_url_factory) -> None:
+    base = "https://test-api"
+    responses.add(
+        responses.DELETE,
+        f"{base}/api/v3/order",
+        json={"orderId": 7, "clientOrderId": "H1s", "status": "CANCELED"},
+    )
+    adapter = BinanceSpotAdapter(
+        "key", "secret", base, "BTCUSDT", audit_db_url=postgres_url_factory("audit")
+    )
+
+    acks = adapter.cancel_orders(["7"])
+
+    assert getattr(acks[0], "order_id", None) == "7"
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_used_weight_header_resyncs_shared_bucket(postgres_url_factory) -> None:
+    base = "https://test-fapi"
+    responses.add(
+        responses.DELETE,
+        f"{base}/fapi/v1/order",
+        json={"orderId": 7, "clientOrderId": "H1w", "status": "CANCELED"},
+        headers={"X-MBX-USED-WEIGHT-1M": "2000"},
+    )
+    responses.add(
+        responses.DELETE,
+        f"{base}/fapi/v1/order",
+        json={"code": -1003, "msg": "Too many requests"},
+        status=429,
+        headers={"X-MBX-USED-WEIGHT-1M": "2400", "Retry-After": "30"},
+    )
+    registry = RateLimitRegistry(headroom=1.0)
+    adapter = BinanceAdapter(
+        "key",
+        "secret",
+        base,
+        "BTCUSDT",
+        audit_db_url=postgres_url_factory("audit"),
+        rate_limits=registry,
+    )
+    bucket = registry.bucket("binance", "futures", "default")
+    assert adapter.rate_limit_bucket is bucket
+    assert bucket is not None
+
+    adapter.cancel_order("7")
+    assert bucket.stats().tokens == pytest.approx(400.0, abs=1.0)
+
+    with pytest.raises(RuntimeError, match="429"):
+        adapter.cancel_order("7")
+    assert bucket.delay_for(1.0) >= 29.0
+
+
+def _stop_reply(order_id: int, client_id: str, stop: str, status: str = "NEW") -> dict:
+    return {
+        "symbol": "BTCUSDT",
+        "orderId": order_id,
+        "clientOrderId": client_id,
+        "status": status,
+        "stopPrice": stop,
+        "origQty": "0.500",
+        "executedQty": "0",
+        "side": "SELL",
+    }
+
+
+def _futures_tail(base: str, audit: str) -> BinanceAdapter:
+    adapter = BinanceAdapter("key", "secret", base, "BTCUSDT", audit_db_url=audit)
+    adapter.place_order(
+        "sell",
+        0.5,
+        stopPx=9999.9,
+        type_="Stop",
+        execInst="ReduceOnly,MarkPrice",
+        clOrdID="T1tail-260601000009",
+    )
+    return adapter
+
+
+@responses.activate
+def test_futures_reduce_only_tail_amend_places_before_cancelling(
+    postgres_url_factory,
+) -> None:
+    base = "https://test-fapi"
+    responses.add(responses.GET, f"{base}/fapi/v1/exchangeInfo", json=EXCHANGE_INFO)
+    responses.add(
+        responses.POST,
+        f"{base}/fapi/v1/order",
+        json=_stop_reply(11, "T1tail-260601000009", "9999.90"),
+    )
+    responses.add(
+        responses.POST,
+        f"{base}/fapi/v1/order",
+        json=_stop_reply(12, "T1tail-replacement", "10050.00"),
+    )
+    responses.add(
+        responses.DELETE,
+        f"{base}/fapi/v1/order",
+        json=_stop_reply(11, "T1tail-260601000009", "9999.90", "CANCELED"),
+    )
+    responses.add(
+        responses.DELETE,
+        f"{base}/fapi/v1/order",
+        json=_stop_reply(12, "T1tail-replacement", "10050.00", "CANCELED"),
+    )
+    adapter = _futures_tail(base, postgres_url_factory("audit"))
+
+    ack = adapter.amend_order("11", stopPx=10050.0, clOrdID="T1tail-260601000009")
+
+    assert ack.order_id == "12"
+    # le nouveau trigger est pose avant l'annulation de l'ancien
+    assert [call.request.method for call in responses.calls[1:]] == ["POST", "POST", "DELETE"]
+    new_qs = _body_query(responses.calls[2])
+    assert new_qs["stopPrice"] == ["10050"]
+    assert new_qs["reduceOnly"] == ["true"]
+    assert new_qs["newClientOrderId"][0] != "T1tail-260601000009"
+    assert _url_query(responses.calls[3])["orderId"] == ["11"]
+    # l'appelant garde l'id d'origine: l'annulation vise le remplacant
+    adapter.cancel_order("11")
+    assert _url_query(responses.calls[4])["orderId"] == ["12"]
+    adapter.flush_rest_audit()
+    with Session(adapter._audit_engine) as db_session:
+        rows = db_session.execute(
+            select(ExchangeRestCall).order_by(ExchangeRestCall.id)
+        ).scalars().all()
+    amend_rows = [row for row in rows if str(row.correlation_id).startswith("amend:")]
+    assert [(row.method, row.exchange_order_id) for row in amend_rows] == [
+        ("POST", "12"),
+        ("DELETE", "11"),
+    ]
+    assert len({row.correlation_id for row in amend_rows}) == 1
+
+
+@responses.activate
+def test_futures_tail_amends_in_flight_coalesce_to_latest_stop(
+    postgres_url_factory,
+) -> None:
+    base = "https://test-fapi"
+    responses.add(responses.GET, f"{base}/fapi/v1/exchangeInfo", json=EXCHANGE_INFO)
+    for order_id, client_id, stop in (
+        (21, "T1tail-260601000009", "9999.90"),
+        (22, "T1tail-r1", "10010.00"),
+        (23, "T1tail-r2", "10030.00"),
+    ):
+        responses.add(
+            responses.POST, f"{base}/fapi/v1/order", json=_stop_reply(order_id, client_id, stop)
+        )
+    for order_id, client_id in ((21, "T1tail-260601000009"), (22, "T1tail-r1")):
+        responses.add(
+            responses.DELETE,
+            f"{base}/fapi/v1/order",
+            json=_stop_reply(order_id, client_id, "0", "CANCELED"),
+        )
+    adapter = _futures_tail(base, postgres_url_factory("audit"))
+    # chemin bloquant dans un thread, pour que `responses` voie les appels
+    adapter.http = None
+
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                adapter.amend_order_async(
+                    "21", stopPx=stop, clOrdID="T1tail-260601000009"
+                )
+                for stop in (10010.0, 10020.0, 10030.0)
+            )
+        )
+
+    first, second, third = asyncio.run(scenario())
+
+    assert first.order_id == "22"
+    # 10020 est remplace par 10030 avant d'etre envoye
+    assert second is third
+    assert third.order_id == "23"
+    assert adapter.amends_coalesced == 1
+    placed = [
+        _body_query(call)["stopPrice"]
+        for call in responses.calls[2:]
+        if call.request.method == "POST"
+    ]
+    assert placed == [["10010"], ["10030"]]
+    assert _url_query(responses.calls[5])["orderId"] == ["22"]
+
+
+@responses.activate
+def test_futures_tail_amend_after_restart_rehydrates_from_audit(
+    postgres_url_factory,
+) -> None:
+    base = "https://test-fapi"
+    audit = postgres_url_factory("audit")
+    responses.add(responses.GET, f"{base}/fapi/v1/exchangeInfo", json=EXCHANGE_INFO)
+    responses.add(
+        responses.POST,
+        f"{base}/fapi/v1/order",
+        json=_stop_reply(31, "T1tail-260601000009", "9999.90"),
+    )
+    responses.add(
+        responses.POST,
+        f"{base}/fapi/v1/order",
+        json=_stop_reply(32, "T1tail-replacement", "10050.00"),
+    )
+    responses.add(
+        responses.DELETE,
+        f"{base}/fapi/v1/order",
+        json=_stop_reply(31, "T1tail-260601000009", "9999.90", "CANCELED"),
+    )
+    _futures_tail(base, audit).flush_rest_audit()
+    # redemarrage: nouvel adaptateur, cache memoire vide
+    restarted = BinanceAdapter("key", "secret", base, "BTCUSDT", audit_db_url=audit)
+    before = len(responses.calls)
+
+    ack = restarted.amend_order("31", stopPx=10050.0)
+
+    assert ack.order_id == "32"
+    # aucune lecture d'ordre cote venue: la requete d'origine vient de l'audit
+    assert [
+        call.request.method
+        for call in responses.calls[before:]
+        if "exchangeInfo" not in call.request.url
+    ] == ["POST", "DELETE"]
+    new_qs = _body_query(responses.calls[-2])
+    assert new_qs["type"] == ["STOP_MARKET"]
+    assert new_qs["side"] == ["SELL"]
+    assert new_qs["quantity"] == ["0.5"]
+    assert new_qs["reduceOnly"] == ["true"]
+    assert new_qs["workingType"] == ["MARK_PRICE"]
+    assert restarted.order_cache.stats().rehydrated == 1
+
+
+@responses.activate
+def test_spot_amend_after_restart_rehydrates_from_private_orders(
+    postgres_url_factory,
+) -> None:
+    base = "https://test-spot"
+    account = postgres_url_factory("prv")
+    adapter = BinanceSpotAdapter("key", "secret", base, "BTCUSDT", account_db_url=account)
+    engine = create_persistence_engine(account)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db_session:
+        for status in ("open", "filled"):
+            db_session.add(
+                ExchangeOrder(
+                    local_uuid=str(uuid.uuid4()),
+                    exchange="binance",
+                    environment=adapter.environment,
+                    market_type="spot",
+                    account_scope=adapter.account_scope,
+                    symbol="BTCUSDT",
+                    exchange_order_id="41" if status == "open" else "42",
+                    client_order_id="H1spot-41" if status == "open" else "H1spot-42",
+                    side="BUY",
+                    order_type="LIMIT",
+                    status=status,
+                    price=10000.1,
+                    quantity=0.5,
+                    raw_payload={"type": "LIMIT", "status": status, "price": "10000.1"},
+                )
+            )
+        db_session.commit()
+    responses.add(responses.GET, f"{base}/api/v3/exchangeInfo", json=EXCHANGE_INFO)
+    responses.add(
+        responses.POST,
+        f"{base}/api/v3/order/cancelReplace",
+        json={
+            "cancelResult": "SUCCESS",
+            "newOrderResult": "SUCCESS",
+            "newOrderResponse": {
+                "symbol": "BTCUSDT",
+                "orderId": 43,
+                "clientOrderId": "replacement-client",
+                "status": "NEW",
+                "price": "10010.00",
+                "origQty": "0.500",
+                "executedQty": "0",
+                "side": "BUY",
+            },
+        },
+    )
+
+    ack = adapter.amend_order("41", price=10010.0)
+
+    assert ack.order_id == "43"
+    replace_qs = _body_query(responses.calls[-1])
+    assert replace_qs["cancelOrderId"] == ["41"]
+    assert replace_qs["side"] == ["BUY"]
+    assert replace_qs["quantity"] == ["0.5"]
+    # un ordre termine n'est pas rehydrate
+    with pytest.raises(ValueError, match="original order"):
+        adapter.amend_order("42", price=10010.0)
+
+
+@responses.activate
+def test_order_cache_is_bounded_and_drops_terminal_orders(postgres_url_factory) -> None:
+    base = "https://test-fapi"
+    responses.add(responses.GET, f"{base}/fapi/v1/exchangeInfo", json=EXCHANGE_INFO)
+    for order_id in range(1, 5):
+        responses.add(
+            responses.POST,
+            f"{base}/fapi/v1/order",
+            json=_stop_reply(order_id, f"T1tail-{order_id}", "9999.90"),
+        )
+    responses.add(
+        responses.DELETE,
+        f"{base}/fapi/v1/order",
+        json=_stop_reply(4, "T1tail-4", "9999.90", "CANCELED"),
+    )
+    adapter = BinanceAdapter(
+        "key",
+        "secret",
+        base,
+        "BTCUSDT",
+        audit_db_url=postgres_url_factory("audit"),
+        order_cache_size=2,
+    )
+    for order_id in range(1, 5):
+        adapter.place_order(
+            "sell", 0.5, stopPx=9999.9, type_="Stop", clOrdID=f"T1tail-{order_id}"
+        )
+
+    assert adapter.order_cache.stats().entries == 2
+    assert adapter.order_cache.stats().evictions == 2
+    adapter.cancel_order("4")
+    adapter.flush_rest_audit()
+    assert adapter.order_cache.stats().entries == 1
+    # l'annulation auditee empeche de ressusciter l'ordre
+    assert adapter._lookup_cached_order("T1tail-4") is None
+    # un ordre evince revient de l'audit, sans appel a la venue
+    before = len(responses.calls)
+    rehydrated = adapter._lookup_cached_order("1")
+    assert rehydrated is not None
+    assert rehydrated.client_order_id == "T1tail-1"
+    assert rehydrated.stop_price == 9999.9
+    assert len(responses.calls) == before
+    assert adapter.order_cache.stats().rehydrated == 1
@@ -208,6 +208,39 @@ def test_bitmex_adapter_wraps_client() -> None:
     assert len(adapter.open_orders()) == 2
 
 
+class _CountingBitmexClient(_FakeBitmexClient):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.instrument_calls = 0
+
+    def instrument(self, symbol: str) -> Dict[str, Any]:
+        self.instrument_calls += 1
+        return super().instrument(symbol)
+
+
+def test_bitmex_instrument_rules_are_cached_but_instrument_refetches() -> None:
+    adapter = BitmexAdapter(
+        api_key="k",
+        api_secret="s",
+        base_url="https://example",
+        symbol="XBTUSD",
+        client_factory=_CountingBitmexClient,
+    )
+    client = adapter.client
+    assert isinstance(client, _CountingBitmexClient)
+
+    adapter.instrument_rules()
+    rules = adapter.instrument_rules("XBTUSD")
+    assert rules["tickSize"] == 0.5
+    assert client.instrument_calls == 1
+
+    adapter.instrument("XBTUSD")
+    adapter.instrument("XBTUSD")
+    assert client.instrument_calls == 3
+    adapter.instrument_rules()
+    assert client.instrument_calls == 3
+
+
 def test_bitmex_rest_only_client_accepts_unknown_symbol_precision() -> None:
     client = BitMEX(
         base_url="https://example/api/v1/",
@@ -236,6 +269,7 @@ def test_bitmex_futures_place_order_writes_rest_audit(postgres_url_factory) -> N
 
     adapter.place_order("buy", 1, price=100, type_="limit", clOrdID="CID-1")
 
+    adapter.flush_rest_audit()
     assert adapter._audit_engine is not None
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
@@ -282,6 +316,7 @@ def test_bitmex_futures_reduce_only_maps_to_exec_inst(
     assert client is not None
     assert client.last_place["execInst"] == "ReduceOnly"
     assert "reduceOnly" not in client.last_place
+    adapter.flush_rest_audit()
     assert adapter._audit_engine is not None
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
@@ -328,6 +363,7 @@ def test_bitmex_spot_cancel_order_writes_spot_rest_audit(postgres_url_factory) -
 
     adapter.cancel_order("OID-SPOT")
 
+    adapter.flush_rest_audit()
     assert adapter._audit_engine is not None
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
@@ -369,6 +405,7 @@ def test_bitmex_cancel_client_id_uses_direct_clordid(postgres_url_factory) -> No
     ]
     assert ack.status == "Canceled"
     assert ack.client_order_id == "H1bitmex-260610000000"
+    adapter.flush_rest_audit()
     assert adapter._audit_engine is not None
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
@@ -583,6 +620,7 @@ def test_bitmex_spot_place_uses_direct_rest_without_quantity_rounding(
     assert ack.order_id == "OID-DIRECT"
     assert ack.client_order_id == "H1bitmexspot-260610000000"
     assert ack.orig_qty == 0.125
+    adapter.flush_rest_audit()
     assert adapter._audit_engine is not None
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
@@ -730,3 +768,59 @@ def test_bitmex_spot_position_uses_direct_margin_all_when_available() -> None:
             "query": {"currency": "all"},
         },
     ]
+
+
+class _BulkCancelBitmexClient(_FakeBitmexRestClient):
+    def _curl_bitmex(self, **kwargs: Any) -> Any:
+        if kwargs.get("path") != "order" or kwargs.get("verb") != "DELETE":
+            return super()._curl_bitmex(**kwargs)
+        self.curl_calls.append(dict(kwargs))
+        postdict = kwargs["postdict"]
+        rows = [
+            {"orderID": order_id, "ordStatus": "Canceled"}
+            for order_id in postdict.get("orderID", [])
+        ]
+        rows += [
+            {
+                "orderID": f"OID-{client_id}",
+                "clOrdID": client_id,
+                "ordStatus": "Filled",
+                "error": "Unable to cancel order due to existing state: Filled",
+            }
+            for client_id in postdict.get("clOrdID", [])
+        ]
+        return rows
+
+
+def test_bitmex_cancel_orders_sends_one_bulk_delete(postgres_url_factory) -> None:
+    adapter = BitmexAdapter(
+        api_key="k",
+        api_secret="s",
+        base_url="https://example",
+        symbol="XBTUSD",
+        client_factory=_BulkCancelBitmexClient,
+        environment="demo",
+        market_type="futures",
+        audit_db_url=postgres_url_factory("audit"),
+    )
+
+    results = adapter.cancel_orders(["OID-1", "H1bitmex-260610000000", "OID-2"])
+
+    client = _BulkCancelBitmexClient.last_instance
+    assert isinstance(client, _BulkCancelBitmexClient)
+    deletes = [call for call in client.curl_calls if call.get("verb") == "DELETE"]
+    assert len(deletes) == 1
+    assert deletes[0]["postdict"] == {
+        "orderID": ["OID-1", "OID-2"],
+        "clOrdID": ["H1bitmex-260610000000"],
+    }
+    assert getattr(results[0], "status", None) == "Canceled"
+    assert isinstance(results[1], RuntimeError)
+    assert getattr(results[2], "order_id", None) == "OID-2"
+    adapter.flush_rest_audit()
+    assert adapter._audit_engine is not None
+    with Session(adapter._audit_engine) as db_session:
+        kinds = db_session.execute(
+            select(ExchangeRestCall.result_kind).order_by(ExchangeRestCall.id)
+        ).scalars().all()
+    assert kinds == ["ok", "exchange_error", "ok"]
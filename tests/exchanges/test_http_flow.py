@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, cast
+from urllib.parse import parse_qsl
+
+import pytest
+import requests
+from kolabi.shared.exchanges.binance_adapter import BinanceAdapter
+from kolabi.shared.exchanges.http_flow import (
+    AsyncHttpTransport,
+    Backoff,
+    HttpCall,
+    run_flow,
+)
+from kolabi.shared.exchanges.kraken_adapter import KrakenFuturesAdapter
+from kolabi.shared.persistence import ExchangeRestCall
+from kolabi.tree.account import sign_rest_auth
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+class _Stub(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.replies: list[tuple[int, object]] = []
+        self.default_reply: tuple[int, object] = (200, {})
+        self.delay_seconds = 0.0
+        self.seen: list[dict[str, Any]] = []
+        self.clients: set[int] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _Stub
+
+    def log_message(self, *_args: Any) -> None:
+        return None
+
+    def _answer(self) -> None:
+        stub = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode() if length else ""
+        with stub.lock:
+            stub.seen.append(
+                {
+                    "method": self.command,
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "body": body,
+                }
+            )
+            stub.clients.add(self.client_address[1])
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+            status, payload = stub.replies.pop(0) if stub.replies else stub.default_reply
+        if stub.delay_seconds:
+            time.sleep(stub.delay_seconds)
+        with stub.lock:
+            stub.in_flight -= 1
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _answer
+
+
+@pytest.fixture
+def stub() -> Iterator[_Stub]:
+    server = _Stub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _send_status(order_id: str, client_id: str) -> dict[str, object]:
+    return {
+        "result": "success",
+        "sendStatus": {
+            "order_id": order_id,
+            "cli_ord_id": client_id,
+            "status": "placed",
+            "limit_price": 80000.0,
+            "qty": 1,
+            "filled": 0,
+            "direction": 0,
+        },
+    }
+
+
+def _kraken(stub: _Stub, postgres_url_factory, **kwargs: Any) -> KrakenFuturesAdapter:
+    return KrakenFuturesAdapter(
+        api_key="k",
+        api_secret="c2VjcmV0",
+        base_url=stub.base_url,
+        symbol="PI_XBTUSD",
+        environment="demo",
+        account_db_url=postgres_url_factory("prv"),
+        **kwargs,
+    )
+
+
+def test_run_flow_throws_transport_errors_back_into_the_flow() -> None:
+    def flow():
+        try:
+            yield HttpCall(method="GET", url="http://stub.invalid/a")
+        except requests.exceptions.ConnectionError:
+            yield Backoff(0.5)
+            reply = yield HttpCall(method="GET", url="http://stub.invalid/b")
+            return reply
+        raise AssertionError("no transport error")
+
+    sleeps: list[float] = []
+    calls: list[str] = []
+
+    def send(call: HttpCall) -> str:
+        calls.append(call.url)
+        if call.url.endswith("/a"):
+            raise requests.exceptions.ConnectionError("down")
+        return "ok"
+
+    assert run_flow(flow(), send, sleep=sleeps.append) == "ok"
+    assert calls == ["http://stub.invalid/a", "http://stub.invalid/b"]
+    assert sleeps == [0.5]
+
+
+def test_kraken_async_place_signs_like_blocking_path_and_is_audited(
+    stub, postgres_url_factory
+) -> None:
+    stub.replies = [
+        (200, _send_status("OID-1", "CID-1")),
+        (200, _send_status("OID-2", "CID-2")),
+    ]
+    adapter = _kraken(stub, postgres_url_factory, audit_db_url=postgres_url_factory("audit"))
+
+    async def scenario() -> None:
+        first = await adapter.place_order_async("buy", 1, price=80000, clOrdID="CID-1")
+        second = adapter.place_order("buy", 1, price=80000, clOrdID="CID-2")
+        await adapter.aclose()
+        assert (first.order_id, second.order_id) == ("OID-1", "OID-2")
+
+    asyncio.run(scenario())
+
+    async_call, blocking_call = stub.seen
+    assert async_call["path"] == blocking_call["path"] == "/derivatives/api/v3/sendorder"
+    async_form = dict(parse_qsl(async_call["body"]))
+    blocking_form = dict(parse_qsl(blocking_call["body"]))
+    assert async_form.pop("cliOrdId") == "CID-1"
+    assert blocking_form.pop("cliOrdId") == "CID-2"
+    assert async_form == blocking_form
+    # meme signature que le chemin bloquant, nonce strictement croissant
+    for call in stub.seen:
+        headers = call["headers"]
+        assert headers["APIKey"] == "k"
+        assert headers["Authent"] == sign_rest_auth(
+            post_data=call["body"],
+            nonce=headers["Nonce"],
+            endpoint_path="/api/v3/sendorder",
+            api_secret="c2VjcmV0",
+        )
+    assert int(blocking_call["headers"]["Nonce"]) > int(async_call["headers"]["Nonce"])
+    adapter.flush_rest_audit()
+    with Session(adapter._audit_engine) as db_session:
+        rows = db_session.execute(select(ExchangeRestCall)).scalars().all()
+    assert sorted(row.client_order_id for row in rows) == ["CID-1", "CID-2"]
+    assert {row.result_kind for row in rows} == {"ok"}
+
+
+def test_kraken_async_retry_backs_off_without_blocking_the_loop(
+    stub, postgres_url_factory, monkeypatch
+) -> None:
+    stub.replies = [(503, {"raw_text": "busy"}), (200, _send_status("OID-R", "CID-R"))]
+    adapter = _kraken(stub, postgres_url_factory)
+    monkeypatch.setattr(
+        "time.sleep", lambda _seconds: pytest.fail("blocking sleep in async path")
+    )
+    ticks: list[float] = []
+
+    async def ticker() -> None:
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.05)
+
+    async def scenario():
+        task = asyncio.create_task(ticker())
+        try:
+            return await adapter.place_order_async("buy", 1, price=80000, clOrdID="CID-R")
+        finally:
+            task.cancel()
+            await adapter.aclose()
+
+    ack = asyncio.run(scenario())
+
+    assert ack.order_id == "OID-R"
+    assert len(stub.seen) == 2
+    # la pause de 0.5 s laisse tourner la boucle
+    assert len(ticks) >= 5
+
+
+def test_kraken_async_orders_overlap_on_a_pooled_keep_alive_client(
+    stub, postgres_url_factory
+) -> None:
+    stub.delay_seconds = 0.2
+    stub.default_reply = (200, _send_status("OID-N", "CID-N"))
+    adapter = _kraken(stub, postgres_url_factory)
+    adapter.http = AsyncHttpTransport(max_connections=4)
+
+    async def scenario() -> float:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                adapter.place_order_async("buy", 1, price=80000, clOrdID=f"CID-{index}")
+                for index in range(8)
+            )
+        )
+        elapsed = time.perf_counter() - started
+        for index in range(8, 16):
+            await adapter.cancel_order_async(f"CID-{index}")
+        await adapter.aclose()
+        return elapsed
+
+    elapsed = asyncio.run(scenario())
+
+    assert len(stub.seen) == 16
+    # 8 ordres a 0.2 s sur 4 connexions: deux vagues, pas huit
+    assert stub.max_in_flight == 4
+    assert elapsed < 0.2 * 8 / 2
+    # les connexions restent ouvertes d'une requete a l'autre
+    assert len(stub.clients) <= 4
+    assert adapter.http.requests_sent == 16
+
+
+def test_async_transport_maps_connection_failures_to_requests_errors() -> None:
+    transport = AsyncHttpTransport()
+
+    async def scenario() -> None:
+        try:
+            await transport.send(HttpCall(method="GET", url="http://127.0.0.1:9/down"))
+        finally:
+            await transport.aclose()
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        asyncio.run(scenario())
+
+
+def test_binance_async_place_carries_api_key_and_signature(stub) -> None:
+    stub.replies = [
+        (
+            200,
+            {
+                "symbols": [
+                    {
+                        "symbol": "BTCUSDT",
+                        "status": "TRADING",
+                        "filters": [
+                            {"filterType": "LOT_SIZE", "stepSize": "1", "minQty": "1"},
+                            {"filterType": "PRICE_FILTER", "tickSize": "0.10"},
+                        ],
+                    }
+                ]
+            },
+        ),
+        (
+            200,
+            {
+                "orderId": 7,
+                "clientOrderId": "CID-B",
+                "status": "NEW",
+                "origQty": "1",
+                "executedQty": "0",
+                "side": "BUY",
+                "price": "100",
+            },
+        )
+    ]
+    adapter = BinanceAdapter(
+        api_key="bkey",
+        api_secret="bsecret",
+        base_url=stub.base_url,
+        symbol="BTCUSDT",
+    )
+
+    async def scenario():
+        try:
+            return await adapter.place_order_async(
+                "buy", 1, price=100, clOrdID="CID-B"
+            )
+        finally:
+            await adapter.aclose()
+
+    ack = asyncio.run(scenario())
+
+    assert ack.order_id == "7"
+    # exchangeInfo une fois (cache d'instrument), puis l'ordre
+    assert [call["path"].split("?")[0] for call in stub.seen] == [
+        "/fapi/v1/exchangeInfo",
+        "/fapi/v1/order",
+    ]
+    call = stub.seen[1]
+    assert call["method"] == "POST"
+    assert call["headers"]["X-MBX-APIKEY"] == "bkey"
+    form = dict(parse_qsl(cast(str, call["body"])))
+    assert form["newClientOrderId"] == "CID-B"
+    assert "signature" in form
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import json
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, cast
 
 import pytest
+from kolabi.shared.core.models import OrderAck
 from kolabi.shared.exchanges import get_adapter
 from kolabi.shared.exchanges.kraken_adapter import (
     KrakenFuturesAdapter,
@@ -137,6 +139,7 @@ def test_kraken_spot_add_order_writes_rest_audit(postgres_url_factory) -> None:
         clOrdID="H1spot-260610000000",
     )
 
+    adapter.flush_rest_audit()
     assert adapter._audit_engine is not None
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
@@ -182,6 +185,7 @@ def test_kraken_margin_cancel_order_writes_rest_audit(postgres_url_factory) -> N
     ack = adapter.cancel_order("H1margin-260610000000")
 
     assert ack.status == "Canceled"
+    adapter.flush_rest_audit()
     assert adapter._audit_engine is not None
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
@@ -351,6 +355,65 @@ def test_kraken_spot_amend_cancel_replaces_with_fresh_client_id() -> None:
     assert replacement["cl_ord_id"].startswith("H1spot-260610000000-r")
 
 
+def test_kraken_spot_amend_after_restart_rehydrates_from_audit(postgres_url_factory) -> None:
+    audit = postgres_url_factory("audit")
+    placed = {
+        "error": [],
+        "result": {
+            "txid": ["OID-STOP"],
+            "descr": {"order": "sell 0.1 XBT/USD @ stop loss 90.0 -> limit 89.0"},
+        },
+    }
+    first = KrakenSpotAdapter(
+        api_key="key",
+        api_secret="c2VjcmV0",
+        base_url="https://api.kraken.test",
+        symbol="XBT/USD",
+        audit_db_url=audit,
+        session=cast(Any, DummySession([placed])),
+    )
+    first.place_order(
+        "sell",
+        0.1,
+        price=89.0,
+        stopPx=90.0,
+        type_="StopLimit",
+        clOrdID="T1spot-260610000000",
+    )
+    first.flush_rest_audit()
+    session = DummySession(
+        [
+            {"error": [], "result": {"count": 1}},
+            {"error": [], "result": {"txid": ["OID-STOP-R"], "descr": {"order": ""}}},
+        ]
+    )
+    # redemarrage: le cache memoire est vide, l'audit AddOrder suffit
+    restarted = KrakenSpotAdapter(
+        api_key="key",
+        api_secret="c2VjcmV0",
+        base_url="https://api.kraken.test",
+        symbol="XBT/USD",
+        audit_db_url=audit,
+        session=cast(Any, session),
+    )
+
+    ack = restarted.amend_order("OID-STOP", stopPx=91.0)
+
+    assert ack.order_id == "OID-STOP-R"
+    assert [call["url"].rsplit("/", 1)[-1] for call in session.calls] == [
+        "CancelOrder",
+        "AddOrder",
+    ]
+    replacement = session.calls[1]["data"]
+    assert replacement["type"] == "sell"
+    assert replacement["ordertype"] == "stop-loss-limit"
+    assert replacement["volume"] == 0.1
+    assert replacement["price"] == 91.0
+    assert replacement["price2"] == 89.0
+    assert replacement["cl_ord_id"].startswith("T1spot-260610000000-r")
+    assert restarted.order_cache.stats().rehydrated == 1
+
+
 def test_kraken_margin_amend_preserves_leverage_on_replacement() -> None:
     session = DummySession(
         [
@@ -468,6 +531,7 @@ def test_place_maps_limit_order_to_sendorder(postgres_url_factory):
     sent_payload = dict(session.calls[0]["data"])
     assert sent_payload["orderType"] == "post"
     assert "postOnly" not in sent_payload
+    adapter.flush_rest_audit()
     with Session(adapter._audit_engine) as db_session:
         rows = db_session.execute(select(ExchangeRestCall)).scalars().all()
     assert len(rows) == 1
@@ -511,6 +575,7 @@ def test_sendorder_http_error_is_persisted_for_forensics(postgres_url_factory):
             clOrdID="CID-ERR",
         )
 
+    adapter.flush_rest_audit()
     with Session(adapter._audit_engine) as db_session:
         rows = db_session.execute(select(ExchangeRestCall)).scalars().all()
     assert len(rows) == 1
@@ -538,6 +603,7 @@ def test_openorders_get_is_not_persisted_in_rest_call_audit(postgres_url_factory
     )
 
     assert adapter.live_open_orders() == []
+    adapter.flush_rest_audit()
     with Session(adapter._audit_engine) as db_session:
         rows = db_session.execute(select(ExchangeRestCall)).scalars().all()
     assert rows == []
@@ -566,6 +632,7 @@ def test_record_rest_call_serializes_decimal_request_params(postgres_url_factory
         error_text=None,
     )
 
+    adapter.flush_rest_audit()
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
     assert row.request_params["stopPx"] == "77245.0"
@@ -600,6 +667,7 @@ def test_record_rest_call_serializes_nested_decimal_payload(postgres_url_factory
         error_text=None,
     )
 
+    adapter.flush_rest_audit()
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
     nested = row.response_payload["sendStatus"]["nested"]
@@ -631,6 +699,7 @@ def test_record_rest_call_recovers_order_id_from_request_for_edit_failures(postg
         error_text="503",
     )
 
+    adapter.flush_rest_audit()
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
     assert row.endpoint_order_id == "OID-EDIT-1"
@@ -661,6 +730,7 @@ def test_record_rest_call_recovers_order_id_from_request_for_cancel_failures(pos
         error_text="503",
     )
 
+    adapter.flush_rest_audit()
     with Session(adapter._audit_engine) as db_session:
         row = db_session.execute(select(ExchangeRestCall)).scalars().one()
     assert row.endpoint_order_id == "OID-CANCEL-1"
@@ -686,7 +756,7 @@ def test_record_rest_call_persistence_failure_is_fail_open(postgres_url_factory,
         def __exit__(self, exc_type, exc, tb):
             return False
 
-        def add(self, _obj: object) -> None:
+        def execute(self, *_args: object) -> None:
             return
 
         def commit(self) -> None:
@@ -698,7 +768,7 @@ def test_record_rest_call_persistence_failure_is_fail_open(postgres_url_factory,
     def _fail_sessionmaker():
         return _FailSession()
 
-    adapter._audit_sessionmaker = _fail_sessionmaker  # type: ignore[assignment]
+    adapter.rest_audit._sessionmaker = _fail_sessionmaker  # type: ignore[assignment]
 
     with caplog.at_level("WARNING"):
         adapter._record_rest_call(
@@ -711,6 +781,7 @@ def test_record_rest_call_persistence_failure_is_fail_open(postgres_url_factory,
             result_kind="ok",
             error_text=None,
         )
+        adapter.flush_rest_audit()
     assert "rest call audit persistence failed" in caplog.text
     assert adapter.rest_audit_errors
     assert "forced commit failure" in adapter.rest_audit_errors[0]
@@ -759,6 +830,9 @@ def test_record_rest_call_prunes_audit_history_by_limit(postgres_url_factory) ->
         result_kind="ok",
         error_text=None,
     )
+    adapter.flush_rest_audit()
+    # La retention tourne dans la maintenance du writer, hors du chemin d'ordre.
+    adapter.rest_audit.maintain()
 
     with Session(adapter._audit_engine) as db_session:
         rows = db_session.execute(select(ExchangeRestCall)).scalars().all()
@@ -1543,6 +1617,75 @@ def test_validate_symbol_syncs_instrument_rules_to_public_db(postgres_url_factor
         assert row.min_quantity == 1.0
 
 
+def _instruments_payload(tick_size: float) -> dict[str, Any]:
+    return {
+        "result": "success",
+        "instruments": [
+            {
+                "symbol": "PI_XBTUSD",
+                "type": "futures_inverse",
+                "tradeable": True,
+                "tickSize": tick_size,
+                "contractSize": 1,
+            }
+        ],
+    }
+
+
+def test_instrument_rules_are_cached_until_instrument_sync(postgres_url_factory):
+    session = DummySession([_instruments_payload(0.5), _instruments_payload(1.0)])
+    adapter = KrakenFuturesAdapter(
+        api_key="k",
+        api_secret="c2VjcmV0",
+        base_url="https://demo-futures.kraken.com",
+        symbol="PI_XBTUSD",
+        environment="demo",
+        account_db_url=postgres_url_factory("prv"),
+        public_db_url=postgres_url_factory("pub"),
+        audit_db_url=postgres_url_factory("audit"),
+        session=cast(Any, session),
+    )
+    adapter.validate_symbol("PI_XBTUSD")
+
+    first = adapter.instrument_rules("PI_XBTUSD")
+    second = adapter.instrument_rules("PI_XBTUSD")
+
+    assert first["tickSize"] == second["tickSize"] == 0.5
+    assert adapter.instrument_cache.stats().misses == 1
+    assert adapter.instrument_cache.stats().hits == 1
+
+    adapter.list_instruments()
+
+    assert adapter.instrument_cache.stats().invalidations == 1
+    assert adapter.instrument_rules("PI_XBTUSD")["tickSize"] == 1.0
+    assert len(session.calls) == 2
+
+
+def test_kraken_spot_instrument_rules_hit_rest_once() -> None:
+    pair = {
+        "wsname": "XBT/USD",
+        "status": "online",
+        "pair_decimals": 1,
+        "lot_decimals": 8,
+        "ordermin": "0.0001",
+    }
+    session = DummySession([{"error": [], "result": {"XXBTZUSD": pair}}])
+    adapter = KrakenSpotAdapter(
+        api_key="k",
+        api_secret="c2VjcmV0",
+        base_url="https://api.kraken.test",
+        symbol="XXBTZUSD",
+        session=cast(Any, session),
+    )
+
+    first = adapter.instrument_rules()
+    second = adapter.instrument_rules()
+
+    assert first == second
+    assert first["tickSize"] == 0.1
+    assert len(session.calls) == 1
+
+
 def test_kraken_spot_adapter_lists_and_validates_asset_pairs() -> None:
     session = DummySession(
         [
@@ -1589,3 +1732,83 @@ def test_kraken_spot_adapter_lists_and_validates_asset_pairs() -> None:
     assert metadata["symbol"] == "XXBTZUSD"
     assert metadata["type"] == "spot"
     assert metadata["minQuantity"] == 0.0001
+
+
+def test_place_and_cancel_orders_share_one_batchorder_call(postgres_url_factory):
+    session = DummySession(
+        [
+            {
+                "result": "success",
+                "batchStatus": [
+                    {"status": "placed", "order_tag": "1", "order_id": "OID-B"},
+                    {
+                        "status": "insufficientAvailableFunds",
+                        "order_tag": "0",
+                        "order_id": "OID-A",
+                    },
+                ],
+            },
+            {
+                "result": "success",
+                "batchStatus": [
+                    {"status": "cancelled", "order_id": "OID-Y"},
+                    {"status": "cancelled", "order_id": "OID-X"},
+                ],
+            },
+        ]
+    )
+    adapter = KrakenFuturesAdapter(
+        api_key="k",
+        api_secret="c2VjcmV0",
+        base_url="https://demo-futures.kraken.com",
+        symbol="PI_XBTUSD",
+        environment="demo",
+        account_db_url=postgres_url_factory("prv"),
+        audit_db_url=postgres_url_factory("audit"),
+        session=cast(Any, session),
+    )
+
+    placed = adapter.place_orders(
+        [
+            {
+                "side": "buy",
+                "orderQty": 1,
+                "price": 79000.0,
+                "type_": "Limit",
+                "clOrdID": "CID-A",
+            },
+            {
+                "side": "sell",
+                "orderQty": 2,
+                "price": 81000.0,
+                "type_": "Limit",
+                "clOrdID": "CID-B",
+                "execInst": "ParticipateDoNotInitiate",
+            },
+        ]
+    )
+    cancelled = adapter.cancel_orders(["OID-X", "OID-Y"])
+
+    assert [call["url"].rsplit("/", 1)[-1] for call in session.calls] == [
+        "batchorder",
+        "batchorder",
+    ]
+    sent = json.loads(dict(session.calls[0]["data"])["json"])["batchOrder"]
+    assert [item["order"] for item in sent] == ["send", "send"]
+    assert [item["cliOrdId"] for item in sent] == ["CID-A", "CID-B"]
+    assert sent[1]["orderType"] == "post"
+    assert [cast(OrderAck, ack).status for ack in placed] == ["Rejected", "New"]
+    assert cast(OrderAck, placed[1]).order_id == "OID-B"
+    assert cast(OrderAck, placed[1]).orig_qty == 2
+    cancels = json.loads(dict(session.calls[1]["data"])["json"])["batchOrder"]
+    assert cancels == [
+        {"order": "cancel", "order_id": "OID-X"},
+        {"order": "cancel", "order_id": "OID-Y"},
+    ]
+    assert [
+        (cast(OrderAck, ack).order_id, cast(OrderAck, ack).status) for ack in cancelled
+    ] == [("OID-X", "Canceled"), ("OID-Y", "Canceled")]
+    adapter.flush_rest_audit()
+    with Session(adapter._audit_engine) as db_session:
+        paths = db_session.execute(select(ExchangeRestCall.path)).scalars().all()
+    assert paths == ["/batchorder", "/batchorder"]
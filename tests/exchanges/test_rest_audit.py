@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, cast
+
+from kolabi.shared.exchanges.kraken_adapter import KrakenSpotAdapter
+from kolabi.shared.exchanges.rest_audit import RestAuditSink
+from kolabi.shared.persistence import Base, ExchangeRestCall
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.payload = payload
+
+    def json(self) -> dict[str, Any]:
+        return self.payload
+
+
+class _HttpSession:
+    def request(self, **_kwargs: Any) -> _Response:
+        return _Response({"error": [], "result": {"txid": ["OID-SPOT"]}})
+
+
+def _sink(db_url: str, **kwargs: Any) -> tuple[RestAuditSink, sessionmaker[Session]]:
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    sink = RestAuditSink(
+        factory,
+        exchange="kraken",
+        environment="demo",
+        market_type="futures",
+        account_scope="default",
+        retention_minutes=60,
+        retention_limit=100,
+        maintenance_seconds=3600.0,
+        **kwargs,
+    )
+    return sink, factory
+
+
+def _call(index: int) -> dict[str, Any]:
+    return {
+        "symbol": "PI_XBTUSD",
+        "method": "POST",
+        "path": "/sendorder",
+        "request_params": {"cliOrdId": f"CID-{index}"},
+        "result_kind": "ok",
+        "response_payload": {},
+        "client_order_id": f"CID-{index}",
+    }
+
+
+def _count(factory: sessionmaker[Session]) -> int:
+    with factory() as session:
+        count = session.execute(select(func.count()).select_from(ExchangeRestCall))
+        return count.scalar_one()
+
+
+def test_place_order_hands_audit_to_the_writer_thread(postgres_url_factory) -> None:
+    adapter = KrakenSpotAdapter(
+        api_key="key",
+        api_secret="c2VjcmV0",
+        base_url="https://api.kraken.test",
+        symbol="XBT/USD",
+        audit_db_url=postgres_url_factory("audit"),
+        session=cast(Any, _HttpSession()),
+    )
+    assert adapter.rest_audit is not None
+    real_sessionmaker = adapter.rest_audit._sessionmaker
+    opened_by: list[str] = []
+
+    def tracking_sessionmaker() -> Session:
+        opened_by.append(threading.current_thread().name)
+        return real_sessionmaker()
+
+    adapter.rest_audit._sessionmaker = tracking_sessionmaker  # type: ignore[assignment]
+
+    adapter.place_order(
+        "buy", 0.1, price=100.0, type_="Limit", clOrdID="H1spot-260610000000"
+    )
+
+    # Le chemin d'ordre n'ouvre aucune session: insert et retention sont au worker.
+    assert threading.main_thread().name not in opened_by
+    adapter.flush_rest_audit()
+    assert adapter.rest_audit.stats().written == 1
+    adapter.close()
+    assert not adapter.rest_audit.running
+    with Session(adapter._audit_engine) as db_session:
+        row = db_session.execute(select(ExchangeRestCall)).scalars().one()
+    assert row.client_order_id == "H1spot-260610000000"
+    assert row.exchange_order_id == "OID-SPOT"
+
+
+def test_sink_counts_dropped_and_failed_writes(postgres_url_factory) -> None:
+    sink, factory = _sink(postgres_url_factory("audit"), max_queue=2)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def blocked_sessionmaker() -> Session:
+        entered.set()
+        release.wait(5.0)
+        return factory()
+
+    sink._sessionmaker = blocked_sessionmaker  # type: ignore[assignment]
+    sink.submit(_call(0))
+    assert entered.wait(5.0)
+    index = 1
+    while sink.submit(_call(index)):
+        index += 1
+    release.set()
+    sink._sessionmaker = factory  # type: ignore[assignment]
+    sink.flush()
+
+    stats = sink.stats()
+    assert stats.dropped == 1
+    assert stats.written == stats.submitted == index
+    assert _count(factory) == index
+    assert f"clOrdID=CID-{index} orderID=- dropped" in sink.errors[0]
+
+    def failing_sessionmaker() -> Session:
+        session = factory()
+        session.execute = _raise  # type: ignore[method-assign]
+        return session
+
+    def _raise(*_args: object, **_kwargs: object) -> None:
+        raise RuntimeError("forced insert failure")
+
+    sink._sessionmaker = failing_sessionmaker  # type: ignore[assignment]
+    sink.submit(_call(99))
+    sink.flush()
+
+    assert sink.stats().failed == 1
+    assert "forced insert failure" in sink.errors[-1]
+    sink.stop()
+
+
+def test_stop_drains_queue_and_maintenance_prunes_off_the_write_path(
+    postgres_url_factory,
+) -> None:
+    sink, factory = _sink(postgres_url_factory("audit"), batch_size=3, flush_seconds=60.0)
+    sink.retention_limit = 4
+    for index in range(10):
+        sink.submit(_call(index))
+
+    sink.stop()
+
+    stats = sink.stats()
+    assert stats.written == 10 and stats.queue_depth == 0
+    assert sink.maintain() == 6
+    with factory() as session:
+        kept = session.execute(
+            select(ExchangeRestCall.client_order_id).order_by(ExchangeRestCall.id)
+        ).scalars().all()
+    assert kept == ["CID-6", "CID-7", "CID-8", "CID-9"]
@@ -495,3 +495,40 @@ def test_kolabidb_rejects_bad_public_mode() -> None:
 
     assert result.returncode == 2
     assert "--public must be reuse or spawn" in result.stderr
+
+
+def test_kolabidb_public_pair_list_runs_one_group_feeder_with_symbol_views() -> None:
+    common = (
+        "--dry-run",
+        "--env-file",
+        "docker/postgres/kolabi-postgres.env.example",
+        "public",
+    )
+    start = run_script(*common, "start", "--exchange", "binance", "--pair", "BTCUSDT,ETHUSDT")
+    status = run_script(*common, "status", "--exchange", "binance", "--pair", "BTCUSDT,ETHUSDT")
+    logs = run_script(
+        *common, "logs", "--exchange", "binance", "--pair", "BTCUSDT,ETHUSDT", "--symbol", "ETHUSDT"
+    )
+
+    assert start.returncode == 0
+    assert "python\\ -m\\ kolabi.tree.binance\\ run\\ --pairs\\ BTCUSDT\\\\\\,ETHUSDT" in start.stdout
+    assert "logs/kolabidb-public-binance-futures-postgres-demo-BTCUSDT+ETHUSDT.log" in start.stdout
+    assert "$'\\tBTCUSDT\\t'" in status.stdout
+    assert "$'\\tETHUSDT\\t'" in status.stdout
+    assert "grep --line-buffered -F -e $'\\tETHUSDT\\t'" in logs.stdout
+    assert "BTCUSDT\\t" not in logs.stdout
+
+
+def test_kolabidb_rejects_pair_list_for_private_feeder() -> None:
+    result = run_script(
+        "--dry-run",
+        "--env-file",
+        "docker/postgres/kolabi-postgres.env.example",
+        "private",
+        "start",
+        "--pair",
+        "PI_XBTUSD,PI_ETHUSD",
+    )
+
+    assert result.returncode == 2
+    assert "--pair lists are only supported for the public feeder" in result.stderr
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from kolabi.shared.instrument_cache import (
+    DB_SOURCE,
+    REST_SOURCE,
+    InstrumentMetadataCache,
+)
+
+XBT = ("kraken", "demo", "futures", "PI_XBTUSD")
+ETH = ("kraken", "demo", "futures", "PI_ETHUSD")
+SPOT = ("kraken", "demo", "spot", "XBT/USD")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Loader:
+    def __init__(self, value: object) -> None:
+        self.value = value
+        self.calls = 0
+
+    def __call__(self) -> object:
+        self.calls += 1
+        return self.value
+
+
+def test_cached_value_expires_after_ttl() -> None:
+    clock = _Clock()
+    cache = InstrumentMetadataCache(ttl_seconds=60.0, clock=clock)
+    loader = _Loader({"tickSize": 0.5})
+
+    assert cache.get_or_load(DB_SOURCE, XBT, loader) == {"tickSize": 0.5}
+    clock.now = 59.0
+    assert cache.get_or_load(DB_SOURCE, XBT, loader) == {"tickSize": 0.5}
+    assert loader.calls == 1
+
+    clock.now = 60.0
+    cache.get_or_load(DB_SOURCE, XBT, loader)
+    assert loader.calls == 2
+
+
+def test_missing_instrument_uses_short_ttl() -> None:
+    clock = _Clock()
+    cache = InstrumentMetadataCache(ttl_seconds=3600.0, missing_ttl_seconds=5.0, clock=clock)
+    loader = _Loader(None)
+
+    assert cache.get_or_load(DB_SOURCE, XBT, loader) is None
+    clock.now = 4.0
+    assert cache.get_or_load(DB_SOURCE, XBT, loader) is None
+    assert loader.calls == 1
+
+    clock.now = 5.0
+    loader.value = {"tickSize": 0.5}
+    assert cache.get_or_load(DB_SOURCE, XBT, loader) == {"tickSize": 0.5}
+    assert loader.calls == 2
+
+
+def test_loader_errors_are_not_cached() -> None:
+    cache = InstrumentMetadataCache()
+    calls = []
+
+    def _failing() -> object:
+        calls.append(1)
+        raise RuntimeError("rest down")
+
+    for _ in range(2):
+        try:
+            cache.get_or_load(REST_SOURCE, XBT, _failing)
+        except RuntimeError:
+            pass
+
+    assert len(calls) == 2
+    assert cache.stats().entries == 0
+
+
+def test_invalidate_is_scoped_to_symbol_or_market() -> None:
+    cache = InstrumentMetadataCache()
+    for source in (DB_SOURCE, REST_SOURCE):
+        for key in (XBT, ETH, SPOT):
+            cache.put(source, key, {"symbol": key[3]})
+
+    assert cache.invalidate("kraken", "demo", "futures", "PI_XBTUSD") == 2
+    found, missing = cache.get_many(DB_SOURCE, [XBT, ETH, SPOT])
+    assert missing == [XBT]
+    assert set(found) == {ETH, SPOT}
+
+    assert cache.invalidate("kraken", "live", "futures") == 0
+    assert cache.invalidate("kraken", "demo", "futures") == 2
+    found, missing = cache.get_many(REST_SOURCE, [XBT, ETH, SPOT])
+    assert missing == [XBT, ETH]
+    assert set(found) == {SPOT}
+
+
+def test_stats_count_hits_misses_and_invalidations() -> None:
+    cache = InstrumentMetadataCache()
+    loader = _Loader({"tickSize": 0.5})
+
+    cache.get_or_load(DB_SOURCE, XBT, loader)
+    cache.get_or_load(DB_SOURCE, XBT, loader)
+    cache.get_or_load(REST_SOURCE, XBT, loader)
+    cache.get_many(DB_SOURCE, [XBT, ETH])
+    cache.invalidate("kraken", "demo", "futures")
+
+    stats = cache.stats()
+    assert stats.as_dict() == {
+        "hits": 2,
+        "misses": 3,
+        "invalidations": 2,
+        "entries": 0,
+    }
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import io
+from datetime import datetime, timedelta, timezone
+
+from kolabi.shared.persistence import MarketLevel, MarketSnapshot
+from kolabi.shared.persistence.market_levels import main, snapshot_levels
+from kolabi.tree.kraken import KrakenConfig, KrakenTree, book_at, count_levels
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+T0 = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+
+
+def _write_books(tree: KrakenTree, count: int) -> None:
+    for step in range(count):
+        now = T0 + timedelta(seconds=step)
+        asks = [{"price": 101 + step, "qty": 1}, {"price": 102 + step, "qty": 2}]
+        bids = [{"price": 99 + step, "qty": 3}]
+        tree.persist_market_snapshot(tree.ingest_book(asks, bids, now), now)
+
+
+def test_book_at_reads_arrays_and_legacy_rows_alike(postgres_url_factory):
+    db_url = postgres_url_factory("market-levels")
+    rows_tree = KrakenTree(KrakenConfig(db_url=db_url, depth=2, level_storage="rows"))
+    _write_books(rows_tree, 2)
+    arrays_tree = KrakenTree(KrakenConfig(db_url=db_url, depth=2, pair="PI_ETHUSD"))
+    _write_books(arrays_tree, 2)
+
+    half = timedelta(milliseconds=500)
+    with Session(rows_tree.engine) as session:
+        legacy = book_at(session, "PI_XBTUSD", T0 + timedelta(seconds=1) + half)
+        compact = book_at(session, "PI_ETHUSD", T0 + half)
+        missing = book_at(session, "PI_ETHUSD", T0 - timedelta(seconds=1))
+
+    assert legacy is not None and compact is not None and missing is None
+    assert legacy[0].ask_prices is None
+    assert legacy[1:] == (((102.0, 1.0), (103.0, 2.0)), ((100.0, 3.0),))
+    assert compact[0].ask_prices == [101.0, 102.0]
+    assert compact[1:] == (((101.0, 1.0), (102.0, 2.0)), ((99.0, 3.0),))
+    rows_tree.engine.dispose()
+    arrays_tree.engine.dispose()
+
+
+def test_migration_adds_array_columns_and_folds_level_rows(postgres_url_factory):
+    db_url = postgres_url_factory("market-levels")
+    tree = KrakenTree(KrakenConfig(db_url=db_url, depth=2, level_storage="rows"))
+    _write_books(tree, 5)
+    with tree.engine.begin() as connection:
+        # Base creee avant les colonnes tableaux.
+        connection.execute(
+            text(
+                "ALTER TABLE market_snapshots DROP COLUMN ask_prices, "
+                "DROP COLUMN ask_volumes, DROP COLUMN bid_prices, DROP COLUMN bid_volumes"
+            )
+        )
+    tree.engine.dispose()
+    out = io.StringIO()
+
+    assert main(["--db-url", db_url, "--batch-size", "2"], stdout=out) == 0
+
+    assert "snapshots=5 rows=15 batches=3" in out.getvalue()
+    tree = KrakenTree(KrakenConfig(db_url=db_url, depth=2))
+    with Session(tree.engine) as session:
+        level_rows = session.execute(select(func.count()).select_from(MarketLevel))
+        assert level_rows.scalar_one() == 0
+        assert count_levels(session, "PI_XBTUSD", "kraken") == 15
+        last = session.execute(
+            select(MarketSnapshot).order_by(MarketSnapshot.local_timestamp.desc())
+        ).scalars().first()
+        assert last is not None
+        assert snapshot_levels(session, last) == (
+            ((105.0, 1.0), (106.0, 2.0)),
+            ((103.0, 3.0),),
+        )
+    tree.engine.dispose()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from kolabi.shared.persistence import (
+    MarketIndicator,
+    MarketLevel,
+    MarketSnapshot,
+    ensure_market_storage,
+    maintain_market_partitions,
+    market_storage_layout,
+)
+from kolabi.shared.persistence.partitions import market_partitions, partition_floor
+from kolabi.shared.persistence.purge import DatabaseLane, purge_database
+from kolabi.tree.kraken import KrakenConfig, KrakenTree
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import Session
+
+NOW = datetime(2026, 6, 1, 12, 20, tzinfo=timezone.utc)
+
+
+def _partitioned_tree(db_url: str, level_storage: str = "arrays") -> KrakenTree:
+    return KrakenTree(
+        KrakenConfig(
+            db_url=db_url,
+            depth=2,
+            retention_minutes=60,
+            market_storage="partitioned",
+            level_storage=level_storage,
+            log_interval_seconds=3600.0,
+        )
+    )
+
+
+def test_partition_floor_aligns_buckets_on_utc_interval() -> None:
+    assert partition_floor(NOW, 60) == datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+    assert partition_floor(NOW, 15) == datetime(2026, 6, 1, 12, 15, tzinfo=timezone.utc)
+
+
+def test_maintenance_creates_upcoming_and_drops_expired_buckets(postgres_url_factory):
+    engine = create_engine(postgres_url_factory("market-partitions"))
+    first = ensure_market_storage(engine, "partitioned", premake=1, now=NOW)
+
+    assert market_storage_layout(engine) == "partitioned"
+    assert sorted(first.created)[:2] == [
+        "market_indicators_p202606011200",
+        "market_indicators_p202606011300",
+    ]
+    assert len(first.created) == 6
+
+    later = maintain_market_partitions(
+        engine,
+        interval_minutes=60,
+        retention_minutes=30,
+        premake=1,
+        now=NOW + timedelta(hours=1, minutes=20),
+    )
+
+    # 13:40 - 30 min = 13:10: la tranche 12:00-13:00 est entierement expiree.
+    assert sorted(later.created) == [
+        "market_indicators_p202606011400",
+        "market_levels_p202606011400",
+        "market_snapshots_p202606011400",
+    ]
+    assert sorted(later.dropped) == [
+        "market_indicators_p202606011200",
+        "market_levels_p202606011200",
+        "market_snapshots_p202606011200",
+    ]
+    with engine.connect() as connection:
+        assert sorted(market_partitions(connection, "market_snapshots")) == [
+            "market_snapshots_p202606011300",
+            "market_snapshots_p202606011400",
+        ]
+    engine.dispose()
+
+
+def test_partitioned_feeder_writes_without_retention_deletes(postgres_url_factory):
+    # Encodage une ligne par niveau: la cle de partition des niveaux est posee.
+    tree = _partitioned_tree(postgres_url_factory("market-partitions"), "rows")
+    statements: list[str] = []
+    event.listen(
+        tree.engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement),
+    )
+    now = datetime.now(timezone.utc)
+    pending = tree.ingest_book([[101.0, 1.0], [102.0, 2.0]], [[99.0, 3.0]], now)
+
+    snapshot = tree.persist_market_snapshot(pending, now)
+    tree.persist_indicators(pending, now, include_ticker_prices=False)
+
+    assert not [sql for sql in statements if sql.lstrip().upper().startswith("DELETE")]
+    with Session(tree.engine) as session:
+        levels = session.execute(
+            select(MarketLevel.local_timestamp)
+            .where(MarketLevel.snapshot_id == snapshot.id)
+        ).scalars().all()
+        indicators = session.execute(select(func.count()).select_from(MarketIndicator))
+        assert levels == [now, now, now]
+        assert indicators.scalar_one() > 0
+
+    tree.maintain_partitions(now + timedelta(hours=3))
+
+    with Session(tree.engine) as session:
+        for model in (MarketSnapshot, MarketLevel, MarketIndicator):
+            count = session.execute(select(func.count()).select_from(model))
+            assert count.scalar_one() == 0
+    tree.engine.dispose()
+
+
+def test_layout_mismatch_is_rejected_until_purge_rebuilds(postgres_url_factory):
+    db_url = postgres_url_factory("market-partitions")
+    plain = KrakenTree(KrakenConfig(db_url=db_url))
+    plain.engine.dispose()
+
+    with pytest.raises(ValueError, match="plain layout"):
+        _partitioned_tree(db_url)
+
+    result = purge_database(
+        DatabaseLane(names=("KOLABI_MARKET_DB_URL",), url=db_url),
+        market_storage="partitioned",
+    )
+
+    assert result.endswith("market_storage=partitioned")
+    tree = _partitioned_tree(db_url)
+    assert market_storage_layout(tree.engine) == "partitioned"
+    tree.engine.dispose()
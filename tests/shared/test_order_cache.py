@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from kolabi.shared.order_cache import OrderRequestCache, order_status_is_terminal
+
+
+class _Store:
+    def __init__(self, rows: dict[str, tuple[str, tuple[str, ...]]]) -> None:
+        self.rows = rows
+        self.calls: list[str] = []
+
+    def __call__(self, identity: str) -> tuple[str, tuple[str, ...]] | None:
+        self.calls.append(identity)
+        return self.rows.get(identity)
+
+
+def test_cache_evicts_least_recently_used_past_bound() -> None:
+    cache: OrderRequestCache[str] = OrderRequestCache(max_entries=2)
+    cache.put(("1", "C1"), "first")
+    cache.put(("2", "C2"), "second")
+    # une lecture rafraichit l'entree: c'est "2" qui sort
+    assert cache.get("C1") == "first"
+    cache.put(("3", "C3"), "third")
+
+    assert cache.get("2") is None
+    assert cache.get("1") == "first"
+    assert cache.get("3") == "third"
+    assert cache.stats().evictions == 1
+    assert cache.stats().entries == 2
+
+
+def test_cache_rehydrates_once_under_every_known_id() -> None:
+    store = _Store({"OID-1": ("request", ("OID-1", "CID-1"))})
+    cache: OrderRequestCache[str] = OrderRequestCache(rehydrate=store)
+
+    assert cache.get("OID-1") == "request"
+    assert cache.get("CID-1") == "request"
+    assert cache.get("missing") is None
+
+    assert store.calls == ["OID-1", "missing"]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.rehydrated) == (1, 2, 1)
+
+
+def test_forget_drops_every_id_and_aliases_of_the_order() -> None:
+    cache: OrderRequestCache[str] = OrderRequestCache()
+    cache.put(("2", "C2"), "replacement")
+    cache.alias(("1", "C1"), "2")
+    assert cache.resolve("C1") == "2"
+
+    cache.forget("C1")
+
+    assert cache.get("2") is None
+    assert cache.get("C2") is None
+    assert cache.resolve("1") == "1"
+
+
+def test_terminal_statuses_cover_exchange_spellings() -> None:
+    assert order_status_is_terminal("Canceled")
+    assert order_status_is_terminal("EXPIRED_IN_MATCH")
+    assert order_status_is_terminal("filled")
+    assert not order_status_is_terminal("partial_fill")
+    assert not order_status_is_terminal(None)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+from kolabi.shared.rate_limits import (
+    CANCEL,
+    KNOWN_BUDGETS,
+    PLACE_BATCH,
+    RateLimitRegistry,
+    RouteBudget,
+    TokenBucket,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_refills_continuously_up_to_headroom_capacity() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(RouteBudget(100.0, 10.0), headroom=0.5, clock=clock)
+
+    assert bucket.capacity == 50.0
+    assert bucket.delay_for(50.0) == 0.0
+    bucket.take(50.0)
+    assert bucket.delay_for(10.0) == pytest.approx(2.0)
+    clock.now = 2.0
+    assert bucket.delay_for(10.0) == 0.0
+    clock.now = 100.0
+    assert bucket.stats().tokens == 50.0
+
+
+def test_bucket_resyncs_from_used_weight_and_retry_after() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(RouteBudget(2400.0, 40.0), headroom=1.0, clock=clock)
+
+    bucket.observe_used(2390.0)
+    assert bucket.stats().tokens == pytest.approx(10.0)
+    assert bucket.delay_for(50.0) == pytest.approx(1.0)
+
+    bucket.observe_retry_after(3.0)
+    assert bucket.delay_for(1.0) == pytest.approx(3.025)
+    assert bucket.stats().header_updates == 2
+
+
+def test_known_budget_costs_follow_venue_weights() -> None:
+    kraken = KNOWN_BUDGETS[("kraken", "futures")]
+    binance = KNOWN_BUDGETS[("binance", "futures")]
+
+    assert kraken.cost(CANCEL) == 10.0
+    assert kraken.cost(PLACE_BATCH, 5) == 14.0
+    assert binance.cost(PLACE_BATCH, 5) == 5.0
+    assert binance.cost("unknown") == 1.0
+
+
+def test_registry_shares_one_bucket_per_route_and_scope() -> None:
+    registry = RateLimitRegistry()
+
+    first = registry.bucket("binance", "futures", "default")
+    assert first is registry.bucket("binance", "futures", "default")
+    assert first is not registry.bucket("binance", "futures", "desk-b")
+    assert first is not registry.bucket("binance", "spot", "default")
+    assert registry.bucket("unknown", "futures") is None
+    assert RateLimitRegistry(headroom=0.0).bucket("binance", "futures") is None
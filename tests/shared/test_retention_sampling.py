@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from hypothesis import HealthCheck, given, settings
+from hypothesis import strategies as st
+from kolabi.shared.persistence import (
+    AccountBalance,
+    AccountPosition,
+    Base,
+    TailTelemetry,
+    prune_account_balances,
+    prune_account_positions,
+    prune_tail_telemetry,
+)
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+NOW = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+_SETTINGS = settings(
+    max_examples=60,
+    deadline=None,
+    database=None,
+    suppress_health_check=[HealthCheck.function_scoped_fixture],
+)
+
+# (identite, age en millisecondes, etat): peu de valeurs pour forcer les
+# repetitions d'etat, les egalites de temps et les changements d'etat.
+_rows = st.lists(
+    st.tuples(
+        st.integers(min_value=0, max_value=2),
+        st.integers(min_value=0, max_value=900_000),
+        st.integers(min_value=0, max_value=2),
+    ),
+    max_size=40,
+)
+_retention_minutes = st.sampled_from([0, 5, 12])
+_retention_limit = st.sampled_from([0, 1, 2, 5, 50])
+_sample_interval = st.sampled_from([0.0, 0.25, 30.0, 60.0, 301.5])
+_BALANCE_STATES = ((1.0, 0.0, 1.0), (2.0, 0.0, 2.0), (2.0, 1.0, 3.0))
+_POSITION_STATES = ((1.0, None), (1.0, 100.0), (0.0, None))
+
+
+def _balance(
+    scope: str,
+    ordinal: int,
+    asset: int,
+    age_ms: int,
+    state: int,
+) -> AccountBalance:
+    available, locked, total = _BALANCE_STATES[state]
+    return AccountBalance(
+        exchange="kraken",
+        environment="demo",
+        account_scope=scope,
+        asset=f"A{asset}",
+        available=available,
+        locked=locked,
+        total=total,
+        raw_payload={"n": ordinal},
+        local_timestamp=NOW - timedelta(milliseconds=age_ms),
+    )
+
+
+def _position(
+    scope: str,
+    ordinal: int,
+    symbol: int,
+    age_ms: int,
+    state: int,
+) -> AccountPosition:
+    size, entry_price = _POSITION_STATES[state]
+    return AccountPosition(
+        exchange="kraken",
+        environment="demo",
+        market_type="futures",
+        account_scope=scope,
+        symbol=f"PI_{symbol}",
+        side="long" if symbol < 2 else "short",
+        size=size,
+        entry_price=entry_price,
+        raw_payload={"n": ordinal},
+        local_timestamp=NOW - timedelta(milliseconds=age_ms),
+    )
+
+
+def _survivors(session: Session, model: type, scope: str) -> list[int]:
+    payloads = session.execute(
+        select(model.raw_payload).where(model.account_scope == scope)
+    ).scalars()
+    return sorted(int(payload["n"]) for payload in payloads)
+
+
+def _engine(postgres_url_factory):
+    engine = create_engine(postgres_url_factory("retention-sampling"))
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def test_sql_balance_sampling_matches_python_walk(postgres_url_factory):
+    engine = _engine(postgres_url_factory)
+
+    @_SETTINGS
+    @given(_rows, _retention_minutes, _retention_limit, _sample_interval)
+    def check(rows, retention_minutes, retention_limit, sample_interval):
+        python_scope, sql_scope = f"py-{uuid4().hex[:8]}", f"sql-{uuid4().hex[:8]}"
+        with Session(engine) as session:
+            for scope in (python_scope, sql_scope):
+                session.add_all(
+                    _balance(scope, ordinal, *row) for ordinal, row in enumerate(rows)
+                )
+            session.flush()
+            results = [
+                prune_account_balances(
+                    session,
+                    exchange="kraken",
+                    environment="demo",
+                    account_scope=scope,
+                    retention_minutes=retention_minutes,
+                    retention_limit=retention_limit,
+                    sample_interval_seconds=sample_interval,
+                    now=NOW,
+                    sql_sampling=sql_sampling,
+                )
+                for scope, sql_sampling in ((python_scope, False), (sql_scope, True))
+            ]
+            assert results[0] == results[1]
+            assert _survivors(session, AccountBalance, sql_scope) == _survivors(
+                session, AccountBalance, python_scope
+            )
+            session.rollback()
+
+    try:
+        check()
+    finally:
+        engine.dispose()
+
+
+def test_sql_position_sampling_matches_python_walk(postgres_url_factory):
+    engine = _engine(postgres_url_factory)
+
+    @_SETTINGS
+    @given(_rows, _retention_minutes, _retention_limit, _sample_interval)
+    def check(rows, retention_minutes, retention_limit, sample_interval):
+        python_scope, sql_scope = f"py-{uuid4().hex[:8]}", f"sql-{uuid4().hex[:8]}"
+        with Session(engine) as session:
+            for scope in (python_scope, sql_scope):
+                session.add_all(
+                    _position(scope, ordinal, *row) for ordinal, row in enumerate(rows)
+                )
+            session.flush()
+            results = [
+                prune_account_positions(
+                    session,
+                    exchange="kraken",
+                    environment="demo",
+                    market_type="futures",
+                    account_scope=scope,
+                    retention_minutes=retention_minutes,
+                    retention_limit=retention_limit,
+                    sample_interval_seconds=sample_interval,
+                    now=NOW,
+                    sql_sampling=sql_sampling,
+                )
+                for scope, sql_sampling in ((python_scope, False), (sql_scope, True))
+            ]
+            assert results[0] == results[1]
+            assert _survivors(session, AccountPosition, sql_scope) == _survivors(
+                session, AccountPosition, python_scope
+            )
+            session.rollback()
+
+    try:
+        check()
+    finally:
+        engine.dispose()
+
+
+def test_sql_sampling_prunes_in_one_statement_without_loading_rows(postgres_url_factory):
+    engine = _engine(postgres_url_factory)
+    statements: list[str] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement),
+    )
+    with Session(engine) as session:
+        session.add_all(
+            _balance("default", ordinal, 0, ordinal * 1000, ordinal // 50 % 3)
+            for ordinal in range(500)
+        )
+        session.commit()
+        statements.clear()
+
+        result = prune_account_balances(
+            session,
+            exchange="kraken",
+            environment="demo",
+            account_scope="default",
+            retention_minutes=5,
+            retention_limit=1000,
+            sample_interval_seconds=30.0,
+            now=NOW,
+        )
+        prune_statements = list(statements)
+        session.commit()
+
+        # Une ligne par seconde, etat change toutes les 50 s, fenetre de 300 s:
+        # chaque debut de run plus un echantillon 30 s plus loin.
+        assert _survivors(session, AccountBalance, "default") == [
+            0, 30, 50, 80, 100, 130, 150, 180, 200, 230, 250, 280, 300,
+        ]
+    assert result.deleted_rows == 487
+    assert len(prune_statements) == 1
+    assert prune_statements[0].lstrip().startswith("WITH RECURSIVE")
+    engine.dispose()
+
+
+def test_count_limit_keeps_newest_rows_with_time_ties(postgres_url_factory):
+    engine = _engine(postgres_url_factory)
+    with Session(engine) as session:
+        session.add_all(
+            TailTelemetry(
+                exchange="kraken",
+                environment="demo",
+                market_type="futures",
+                account_scope=scope,
+                pair_name="P",
+                symbol="PI_XBTUSD",
+                head_state="filled",
+                tail_state="armed",
+                reference_price=100.0,
+                stop_price=99.0,
+                initial_distance=1.0,
+                current_distance=float(ordinal),
+                recorded_at=NOW - timedelta(seconds=ordinal // 2),
+            )
+            for scope in ("a", "b")
+            for ordinal in range(10)
+        )
+        session.commit()
+
+        result = prune_tail_telemetry(
+            session,
+            account_scope="a",
+            retention_minutes=0,
+            retention_limit=3,
+            now=NOW,
+        )
+        session.commit()
+        kept = session.execute(
+            select(TailTelemetry.account_scope, TailTelemetry.current_distance)
+            .order_by(TailTelemetry.account_scope, TailTelemetry.current_distance)
+        ).all()
+
+    # Egalite de temps departagee par id: 2 et 3 ont le meme temps, seul 3 reste.
+    assert result.deleted_rows == 7
+    assert [distance for scope, distance in kept if scope == "a"] == [0.0, 1.0, 3.0]
+    assert sum(1 for scope, _distance in kept if scope == "b") == 10
+    engine.dispose()
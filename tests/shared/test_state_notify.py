@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from kolabi.shared.notify import (
+    MARKET_CHANNEL,
+    PRIVATE_CHANNEL,
+    StateChangeListener,
+    StateChangeSignal,
+    notify_state_change,
+)
+from kolabi.tree.account import AccountStateStore, AccountStreamConfig
+from kolabi.tree.kraken import KrakenConfig, KrakenTree
+
+
+def _open_order_message(order_id: str) -> dict[str, object]:
+    return {
+        "feed": "open_orders",
+        "order": {
+            "instrument": "PI_XBTUSD",
+            "direction": 0,
+            "type": "limit",
+            "qty": 1,
+            "filled": 0,
+            "limit_price": 100.0,
+            "order_id": order_id,
+            "cli_ord_id": f"CID-{order_id}",
+            "status": "open",
+            "reduce_only": False,
+        },
+    }
+
+
+def test_state_signal_filters_routes_and_keeps_pending_wakeups() -> None:
+    signal = StateChangeSignal(PRIVATE_CHANNEL)
+    signal.watch(["kraken:futures:PI_XBTUSD"])
+
+    async def _scenario() -> tuple[bool, bool, bool]:
+        ignored = signal.deliver("kraken:futures:PI_ETHUSD")
+        # Delivered while nobody waits: the next wait returns immediately.
+        signal.deliver("kraken:futures:PI_XBTUSD")
+        pending = await signal.wait(0.0)
+        timed_out = await signal.wait(0.01)
+        return ignored, pending, timed_out
+
+    ignored, pending, timed_out = asyncio.run(_scenario())
+
+    assert ignored is False
+    assert pending is True
+    assert timed_out is False
+    assert signal.wakeups == 1
+
+
+def test_account_ingest_notifies_listener_on_commit(postgres_url_factory) -> None:
+    db_url = postgres_url_factory("notify-prv")
+    store = AccountStateStore(AccountStreamConfig(db_url=db_url))
+    listener = StateChangeListener((db_url,), environment="demo", poll_timeout=0.05)
+    signal = listener.signal(PRIVATE_CHANNEL)
+    signal.watch(["kraken:futures:PI_XBTUSD"])
+    listener.start()
+    try:
+        assert listener.wait_listening(timeout=5.0)
+
+        async def _scenario() -> tuple[bool, float]:
+            # Drain the reconnect catch-up wakeup before measuring.
+            await signal.wait(0.2)
+            started = time.perf_counter()
+            await asyncio.to_thread(
+                store.ingest_message,
+                _open_order_message("OID-N1"),
+                stream_kind="private_ws",
+                is_critical=True,
+            )
+            woke = await signal.wait(2.0)
+            return woke, time.perf_counter() - started
+
+        woke, elapsed = asyncio.run(_scenario())
+    finally:
+        listener.stop()
+        store.engine.dispose()
+
+    assert woke is True
+    assert elapsed < 1.0
+    assert listener.received >= 1
+
+
+def test_market_snapshot_notify_only_wakes_matching_route(postgres_url_factory) -> None:
+    db_url = postgres_url_factory("notify-pub")
+    tree = KrakenTree(KrakenConfig(db_url=db_url, pair="PI_XBTUSD", depth=2))
+    listener = StateChangeListener((db_url,), environment="demo", poll_timeout=0.05)
+    signal = listener.signal(MARKET_CHANNEL)
+    signal.watch(["kraken:futures:PI_ETHUSD"])
+    listener.start()
+    try:
+        assert listener.wait_listening(timeout=5.0)
+
+        async def _scenario() -> bool:
+            await signal.wait(0.2)
+            await asyncio.to_thread(
+                tree.process_book,
+                [{"price": 100, "qty": 1}],
+                [{"price": 99, "qty": 2}],
+            )
+            return await signal.wait(0.5)
+
+        woke_other_route = asyncio.run(_scenario())
+    finally:
+        listener.stop()
+        tree.engine.dispose()
+
+    assert woke_other_route is False
+    assert listener.received >= 1
+
+
+def test_notify_is_dropped_with_rolled_back_transaction(postgres_url_factory) -> None:
+    db_url = postgres_url_factory("notify-rollback")
+    store = AccountStateStore(AccountStreamConfig(db_url=db_url))
+    listener = StateChangeListener((db_url,), poll_timeout=0.05)
+    signal = listener.signal(PRIVATE_CHANNEL)
+    listener.start()
+    try:
+        assert listener.wait_listening(timeout=5.0)
+
+        async def _scenario() -> bool:
+            await signal.wait(0.2)
+            with store.sessionmaker() as session:
+                notify_state_change(
+                    session,
+                    PRIVATE_CHANNEL,
+                    route="kraken:futures:PI_XBTUSD",
+                    environment="demo",
+                    row_id=1,
+                )
+                session.rollback()
+            return await signal.wait(0.3)
+
+        woke = asyncio.run(_scenario())
+    finally:
+        listener.stop()
+        store.engine.dispose()
+
+    assert woke is False
+    assert listener.received == 0
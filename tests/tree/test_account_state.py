@@ -48,7 +48,7 @@ from kolabi.tree.account import (
     stream_kind_uses_critical_db,
     subscribe_messages,
 )
-from sqlalchemy import inspect, select
+from sqlalchemy import event, inspect, select
 from sqlalchemy.orm import Session
 
 
@@ -2483,3 +2483,121 @@ def test_map_rest_balances_handles_nested_accounts_payload():
     assert by_asset["USD"].total in {125.5, 126.0}
     assert by_asset["USD"].available in {125.5, 120.0}
     assert by_asset["BTC"].total == 0.02
+
+
+def _snapshot_order(order_id: str | None, cli_ord_id: str | None, **fields: object) -> dict:
+    payload: dict[str, object] = {
+        "instrument": "PI_XBTUSD",
+        "direction": 0,
+        "type": "limit",
+        "qty": 3,
+        "filled": 0,
+        "limit_price": 70000.0,
+        "status": "open",
+    }
+    if order_id is not None:
+        payload["order_id"] = order_id
+    if cli_ord_id is not None:
+        payload["cli_ord_id"] = cli_ord_id
+    payload.update(fields)
+    return payload
+
+
+def _private_rows(store: AccountStateStore) -> tuple[list[tuple], list[tuple]]:
+    with Session(store.engine) as session:
+        orders = session.execute(
+            select(
+                ExchangeOrder.exchange_order_id,
+                ExchangeOrder.client_order_id,
+                ExchangeOrder.status,
+                ExchangeOrder.quantity,
+                ExchangeOrder.filled_quantity,
+                ExchangeOrder.price,
+            ).order_by(ExchangeOrder.exchange_order_id, ExchangeOrder.client_order_id)
+        ).all()
+        fills = session.execute(
+            select(
+                ExchangeFill.exchange_fill_id,
+                ExchangeOrder.exchange_order_id,
+                ExchangeFill.quantity,
+            )
+            .join(ExchangeOrder, ExchangeFill.order_id == ExchangeOrder.id)
+            .order_by(ExchangeFill.exchange_fill_id)
+        ).all()
+    return [tuple(row) for row in orders], [tuple(row) for row in fills]
+
+
+def test_set_based_ingest_matches_row_by_row_ingest(postgres_url_factory):
+    messages = [
+        {"feed": "open_orders", "order": _snapshot_order("OID-1", "CID-1")},
+        {"feed": "open_orders", "order": _snapshot_order("OID-GONE", "CID-GONE")},
+        {
+            "feed": "open_orders_snapshot",
+            "orders": [
+                _snapshot_order("OID-1", "CID-1", filled=2, status="partial_fill"),
+                _snapshot_order("OID-1", None, filled=1, limit_price=70100.0),
+                _snapshot_order("OID-2", "CID-2"),
+                _snapshot_order(None, "CID-3"),
+                _snapshot_order("OID-3", "CID-3", qty=4),
+            ],
+        },
+        {
+            "feed": "fills",
+            "fills": [
+                {"fill_id": "FID-1", "order_id": "OID-1", "instrument": "PI_XBTUSD",
+                 "buy": True, "order_type": "limit", "price": 70000.0, "qty": 1.0},
+                {"fill_id": "FID-1", "order_id": "OID-1", "instrument": "PI_XBTUSD",
+                 "buy": True, "order_type": "limit", "price": 70000.0, "qty": 1.0},
+                {"fill_id": "FID-9", "order_id": "OID-9", "instrument": "PI_XBTUSD",
+                 "buy": False, "order_type": "market", "price": 69990.0, "qty": 2.0},
+            ],
+        },
+    ]
+    rows = []
+    for label, set_based in (("prv-set-based", True), ("prv-row-by-row", False)):
+        store = AccountStateStore(
+            AccountStreamConfig(
+                db_url=postgres_url_factory(label),
+                snapshot_tombstone_grace_seconds=0.0,
+                set_based_ingest=set_based,
+            )
+        )
+        results = [
+            store.ingest_message(message, stream_kind="private_ws", is_critical=True)
+            for message in messages
+        ]
+        fill_rows = _result_items(results[-1], "fills")
+        assert fill_rows[0][1].id == fill_rows[1][1].id
+        assert len(_result_items(results[2], "orders")) == 6
+        rows.append(_private_rows(store))
+
+    set_based_rows, row_by_row_rows = rows
+    assert set_based_rows == row_by_row_rows
+    orders, fills = set_based_rows
+    assert ("OID-1", "CID-1", "filled", 3.0, 2.0, 70100.0) in orders
+    assert ("OID-GONE", "CID-GONE", "canceled", 3.0, 0.0, 70000.0) in orders
+    assert ("OID-3", "CID-3", "open", 4.0, 0.0, 70000.0) in orders
+    assert [fill[0] for fill in fills] == ["FID-1", "FID-9"]
+
+
+def test_set_based_snapshot_ingest_uses_constant_round_trips(postgres_url_factory):
+    store = AccountStateStore(AccountStreamConfig(db_url=postgres_url_factory("prv-bulk")))
+    snapshot = {
+        "feed": "open_orders_snapshot",
+        "orders": [_snapshot_order(f"OID-{index}", f"CID-{index}") for index in range(200)],
+    }
+    statements: list[str] = []
+    event.listen(
+        store.engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_args: statements.append(statement),
+    )
+
+    store.ingest_message(snapshot, stream_kind="private_ws", is_critical=True)
+    first_pass = len(statements)
+    store.ingest_message(snapshot, stream_kind="private_ws", is_critical=True)
+
+    order_statements = [text for text in statements if "exchange_orders" in text]
+    assert first_pass < 20
+    assert len(statements) - first_pass < 20
+    assert len(order_statements) <= 6
@@ -1,13 +1,20 @@
+import time
 from datetime import timezone
+from typing import Any
 
+from kolabi.shared.notify import INSTRUMENT_CHANNEL, StateChangeListener
+from kolabi.shared.persistence import ExchangeInstrument
 from kolabi.tree.binance import (
     BinanceConfig,
+    BinanceTree,
     extract_book_payload,
     parse_binance_time,
     public_stream_url,
     ticker_prices_from_message,
     unwrap_combined_stream,
 )
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 
 def test_public_stream_url_uses_combined_futures_stream() -> None:
@@ -74,3 +81,67 @@ def test_parse_binance_time_is_utc() -> None:
 
     assert parsed is not None
     assert parsed.tzinfo == timezone.utc
+
+
+class _StubResponse:
+    def __init__(self, payload: Any) -> None:
+        self.payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> Any:
+        return self.payload
+
+
+class _StubRestSession:
+    def __init__(self, payload: Any) -> None:
+        self.payload = payload
+        self.urls: list[str] = []
+
+    def get(self, url: str, **_kwargs: Any) -> _StubResponse:
+        self.urls.append(url)
+        return _StubResponse(self.payload)
+
+
+def test_instrument_refresh_writes_rules_and_notifies_bots(
+    postgres_url_factory, monkeypatch
+) -> None:
+    db_url = postgres_url_factory("binance-public")
+    refresh = BinanceTree._refresh_instrument_rules
+    monkeypatch.setattr(BinanceTree, "_refresh_instrument_rules", lambda self: None)
+    tree = BinanceTree(BinanceConfig(db_url=db_url, pair="BTCUSDT", depth=2))
+    tree._rest_session = _StubRestSession(
+        {
+            "symbols": [
+                {
+                    "symbol": "BTCUSDT",
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "tickSize": "0.10"},
+                        {"filterType": "LOT_SIZE", "minQty": "0.001"},
+                    ],
+                }
+            ]
+        }
+    )
+    routes: list[str | None] = []
+    listener = StateChangeListener((db_url,), poll_timeout=0.05)
+    listener.subscribe(INSTRUMENT_CHANNEL, routes.append)
+    listener.start()
+    try:
+        assert listener.wait_listening(timeout=5.0)
+        refresh(tree)
+        deadline = time.monotonic() + 2.0
+        while "binance:futures:BTCUSDT" not in routes and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        listener.stop()
+
+    with Session(tree.engine) as session:
+        row = session.execute(select(ExchangeInstrument)).scalars().one()
+    tree.engine.dispose()
+
+    assert row.tick_size == 0.1
+    assert row.min_quantity == 0.001
+    assert tree._rest_session.urls[0].endswith("/fapi/v1/exchangeInfo")
+    assert "binance:futures:BTCUSDT" in routes
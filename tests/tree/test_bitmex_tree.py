@@ -1,10 +1,11 @@
 import json
+import time
 from datetime import timezone
+from typing import Any
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-
-from kolabi.shared.persistence import MarketLevel, MarketSnapshot
+from kolabi.shared.notify import INSTRUMENT_CHANNEL, StateChangeListener
+from kolabi.shared.persistence import ExchangeInstrument, MarketSnapshot
+from kolabi.shared.persistence.market_levels import snapshot_levels
 from kolabi.tree.bitmex import (
     BitmexConfig,
     BitmexTree,
@@ -15,6 +16,8 @@ from kolabi.tree.bitmex import (
     public_stream_url,
     ticker_prices_from_message,
 )
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 
 def test_public_stream_url_uses_bitmex_realtime_subscriptions() -> None:
@@ -69,10 +72,15 @@ def test_orderbook_table_partial_update_and_delete_build_shared_payload() -> Non
         {"table": "orderBookL2_25", "action": "update", "data": [{"id": 1, "size": 250}]},
         symbol="XBTUSD",
     )
+    by_id = state.by_id
     state, changed = apply_bitmex_book_message(state, update, symbol="XBTUSD")
 
     assert changed is True
     assert state is not None
+    assert state.by_id is by_id
+    assert state.delta is not None
+    assert state.delta.bids == ((9999.5, 250.0),)
+    assert state.delta.asks == ()
     payload = book_payload_from_state(state)
     assert payload is not None
     assert payload.bids == ((9999.5, 250.0),)
@@ -85,6 +93,8 @@ def test_orderbook_table_partial_update_and_delete_build_shared_payload() -> Non
 
     assert changed is True
     assert state is not None
+    assert state.delta is not None
+    assert state.delta.bids == ((9999.5, 0.0),)
     assert book_payload_from_state(state) is None
 
 
@@ -155,10 +165,116 @@ def test_bitmex_tree_persists_normalised_market_snapshot(postgres_url_factory) -
 
     with Session(tree.engine) as session:
         snap = session.get(MarketSnapshot, snapshot.id)
-        levels = session.execute(select(MarketLevel)).scalars().all()
         assert snap is not None
         assert snap.exchange == "bitmex"
         assert snap.symbol == "XBTUSD"
         assert snap.best_bid == 9999.5
         assert snap.best_ask == 10000.0
-        assert len(levels) == 3
+        asks, bids = snapshot_levels(session, snap)
+        assert len(asks) + len(bids) == 3
+
+
+def test_bitmex_tree_applies_l2_deltas_against_full_table(postgres_url_factory) -> None:
+    db_url = postgres_url_factory("bitmex-public")
+    tree = BitmexTree(
+        BitmexConfig(
+            db_url=db_url,
+            pair="XBTUSD",
+            depth=2,
+            instrument_refresh_on_start=False,
+        )
+    )
+    tree.handle_message(
+        json.dumps(
+            {
+                "table": "orderBookL2_25",
+                "action": "partial",
+                "data": [
+                    {"symbol": "XBTUSD", "id": 1, "side": "Buy", "size": 200, "price": 9999.5},
+                    {"symbol": "XBTUSD", "id": 2, "side": "Sell", "size": 100, "price": 10000.0},
+                    {"symbol": "XBTUSD", "id": 3, "side": "Sell", "size": 50, "price": 10000.5},
+                    {"symbol": "XBTUSD", "id": 4, "side": "Sell", "size": 25, "price": 10001.0},
+                ],
+            }
+        )
+    )
+    tree.handle_message(
+        json.dumps(
+            {
+                "table": "orderBookL2_25",
+                "action": "delete",
+                "data": [{"symbol": "XBTUSD", "id": 2, "side": "Sell"}],
+            }
+        )
+    )
+    pending = tree.handle_message(
+        json.dumps(
+            {
+                "table": "orderBookL2_25",
+                "action": "update",
+                "data": [{"symbol": "XBTUSD", "id": 1, "side": "Buy", "size": 150}],
+            }
+        )
+    )
+
+    assert pending is not None
+    assert pending.asks == ((10000.5, 50.0), (10001.0, 25.0))
+    assert pending.bids == ((9999.5, 150.0),)
+    assert pending.sequence == 3
+    assert pending.metrics.avg_ask == (10000.5 * 50 + 10001.0 * 25) / 75
+
+
+class _StubResponse:
+    def __init__(self, payload: Any) -> None:
+        self.payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> Any:
+        return self.payload
+
+
+class _StubRestSession:
+    def __init__(self, payload: Any) -> None:
+        self.payload = payload
+
+    def get(self, _url: str, **_kwargs: Any) -> _StubResponse:
+        return _StubResponse(self.payload)
+
+
+def test_bitmex_instrument_refresh_writes_rules_and_notifies_bots(
+    postgres_url_factory,
+) -> None:
+    db_url = postgres_url_factory("bitmex-public")
+    tree = BitmexTree(
+        BitmexConfig(
+            db_url=db_url,
+            pair="XBTUSD",
+            depth=2,
+            instrument_refresh_on_start=False,
+        )
+    )
+    tree._rest_session = _StubRestSession(
+        [{"symbol": "XBTUSD", "state": "Open", "tickSize": 0.5, "lotSize": 100}]
+    )
+    routes: list[str | None] = []
+    listener = StateChangeListener((db_url,), poll_timeout=0.05)
+    listener.subscribe(INSTRUMENT_CHANNEL, routes.append)
+    listener.start()
+    try:
+        assert listener.wait_listening(timeout=5.0)
+        tree._refresh_instrument_rules()
+        deadline = time.monotonic() + 2.0
+        while "bitmex:futures:XBTUSD" not in routes and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        listener.stop()
+
+    with Session(tree.engine) as session:
+        row = session.execute(select(ExchangeInstrument)).scalars().one()
+    tree.engine.dispose()
+
+    assert row.tick_size == 0.5
+    assert row.min_quantity == 100.0
+    assert "bitmex:futures:XBTUSD" in routes
@@ -13,11 +13,13 @@ from kolabi.shared.persistence import (
     MarketSnapshot,
     RawExchangeEvent,
 )
+from kolabi.shared.persistence.market_levels import snapshot_levels
 from kolabi.tree.kraken import (
     KrakenConfig,
     KrakenTree,
     apply_book_payload,
     calculate_metrics,
+    count_levels,
     extract_book_payload,
     normal_mgf,
     parse_levels,
@@ -41,14 +43,20 @@ def test_process_book_persists_normalized_snapshot_levels_and_indicators(postgre
 
     with Session(tree.engine) as session:
         snap = session.get(MarketSnapshot, snapshot.id)
-        levels = session.execute(select(MarketLevel)).scalars().all()
+        level_rows = session.execute(select(MarketLevel)).scalars().all()
         indicators = session.execute(select(MarketIndicator)).scalars().all()
         assert snap is not None
         assert snap.environment == "demo"
         assert snap.market_type == "futures"
         assert snap.avg_ask == 100.75
         assert snap.avg_bid == 98.5
-        assert len(levels) == 4
+        # Niveaux en tableaux sur le snapshot, plus une ligne par niveau.
+        assert snapshot_levels(session, snap) == (
+            ((100.0, 1.0), (101.0, 3.0)),
+            ((99.0, 2.0), (98.0, 2.0)),
+        )
+        assert level_rows == []
+        assert count_levels(session, "PI_XBTUSD", "kraken") == 4
         assert len(indicators) == 6
 
 
@@ -316,6 +324,7 @@ def test_handle_message_skips_absurd_book_but_keeps_raw_payload(postgres_url_fac
     assert result is None
     assert "invalid_book" in caplog.text
     assert tree.latest_status()["status"] == "empty"
+    tree.raw_writer.flush()
     with Session(tree.engine) as session:
         rows = session.execute(select(RawExchangeEvent)).scalars().all()
     assert len(rows) == 1
@@ -384,9 +393,8 @@ def test_retention_prunes_old_normalized_rows(postgres_url_factory):
 
     with Session(tree.engine) as session:
         snapshots = session.execute(select(MarketSnapshot)).scalars().all()
-        levels = session.execute(select(MarketLevel)).scalars().all()
         assert len(snapshots) == 1
-        assert len(levels) == 2
+        assert count_levels(session, "PI_XBTUSD", "kraken") == 2
 
 
 def test_reader_can_query_while_writer_session_is_open(postgres_url_factory):
@@ -529,6 +537,7 @@ def test_public_raw_event_consecutive_duplicate_is_collapsed(postgres_url_factor
 
     tree.handle_message(json.dumps(message))
     tree.handle_message(json.dumps(message))
+    tree.raw_writer.flush()
 
     with Session(tree.engine) as session:
         rows = (
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+from kolabi.tree.kraken import (
+    BookPayload,
+    apply_book_payload,
+    apply_book_payload_in_place,
+    calculate_book_metrics,
+    calculate_metrics,
+)
+from kolabi.tree.orderbook import OrderBookSide
+
+
+def _snapshot(asks, bids, sequence=1) -> BookPayload:
+    return BookPayload(
+        message_type="snapshot",
+        symbol="PI_XBTUSD",
+        asks=tuple(asks),
+        bids=tuple(bids),
+        source_timestamp=None,
+        sequence=sequence,
+    )
+
+
+def _delta(side: str, price: float, quantity: float, sequence: int) -> BookPayload:
+    return BookPayload(
+        message_type="delta",
+        symbol="PI_XBTUSD",
+        asks=(),
+        bids=(),
+        source_timestamp=None,
+        sequence=sequence,
+        side=side,
+        price=price,
+        quantity=quantity,
+    )
+
+
+def _random_stream(seed: int, count: int) -> list[BookPayload]:
+    rng = random.Random(seed)
+    asks = [(100.0 + 0.5 * index, float(rng.randint(1, 9))) for index in range(1, 40)]
+    bids = [(100.0 - 0.5 * index, float(rng.randint(1, 9))) for index in range(0, 40)]
+    stream = [_snapshot(asks, bids)]
+    for sequence in range(2, count + 2):
+        side = rng.choice(("buy", "sell"))
+        offset = 0.5 * rng.randint(0, 45)
+        price = 100.0 - offset if side == "buy" else 100.5 + offset
+        quantity = 0.0 if rng.random() < 0.35 else float(rng.randint(1, 20)) / 4
+        stream.append(_delta(side, price, quantity, sequence))
+    return stream
+
+
+def test_order_book_side_keeps_sorted_top_n_and_totals():
+    bids = OrderBookSide(3, reverse=True)
+    bids.replace([(99.0, 1.0), (101.0, 2.0), (100.0, 3.0), (98.0, 4.0)])
+
+    assert bids.levels() == ((101.0, 2.0), (100.0, 3.0), (99.0, 1.0))
+    assert bids.best == 101.0
+    assert bids.volume == 6.0
+
+    bids.update([(101.0, 0.0), (100.5, 1.0)])
+
+    assert bids.levels() == ((100.5, 1.0), (100.0, 3.0), (99.0, 1.0))
+    assert bids.volume == 5.0
+    assert bids.notional == pytest.approx(100.5 + 300.0 + 99.0)
+
+
+def test_order_book_side_trims_only_after_whole_batch():
+    asks = OrderBookSide(2, reverse=False)
+    asks.replace([(101.0, 1.0), (102.0, 1.0)])
+
+    asks.update([(100.5, 1.0), (100.5, 0.0)])
+
+    assert asks.levels() == ((101.0, 1.0), (102.0, 1.0))
+
+
+def test_order_book_side_reserve_levels_refill_the_view():
+    asks = OrderBookSide(2, reverse=False, retain=4)
+    asks.replace([(101.0, 1.0), (102.0, 2.0), (103.0, 3.0), (104.0, 4.0), (105.0, 5.0)])
+
+    assert len(asks) == 4
+    assert asks.levels() == ((101.0, 1.0), (102.0, 2.0))
+
+    asks.update([(101.0, 0.0)])
+    assert asks.levels() == ((102.0, 2.0), (103.0, 3.0))
+    assert asks.volume == 5.0
+
+    asks.update([(100.0, 1.0), (103.5, 9.0)])
+    assert asks.levels() == ((100.0, 1.0), (102.0, 2.0))
+    assert asks.volume == 3.0
+    assert asks.notional == 304.0
+
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_incremental_book_matches_functional_apply(seed):
+    state = None
+    book = None
+    for payload in _random_stream(seed, 2000):
+        try:
+            expected = apply_book_payload(state, payload, depth=25)
+        except ValueError:
+            with pytest.raises(ValueError):
+                apply_book_payload_in_place(book, payload, depth=25)
+            continue
+        state = expected
+        book = apply_book_payload_in_place(book, payload, depth=25)
+        assert book.asks.levels() == state.asks
+        assert book.bids.levels() == state.bids
+        assert book.sequence == state.sequence
+        try:
+            reference = calculate_metrics(state.asks, state.bids)
+        except ValueError:
+            with pytest.raises(ValueError):
+                calculate_book_metrics(book)
+            continue
+        metrics = calculate_book_metrics(book)
+        for field in ("avg_ask", "avg_bid", "best_ask", "best_bid", "spread", "imbalance"):
+            assert math.isclose(
+                getattr(metrics, field), getattr(reference, field), rel_tol=1e-9, abs_tol=1e-9
+            ), field
+
+
+def test_rejected_delta_leaves_incremental_book_untouched():
+    book = apply_book_payload_in_place(None, _snapshot([(101.0, 1.0)], [(99.0, 1.0)]), depth=3)
+
+    with pytest.raises(ValueError, match="lost one side"):
+        apply_book_payload_in_place(book, _delta("sell", 101.0, 0.0, 2), depth=3)
+
+    assert book.asks.levels() == ((101.0, 1.0),)
+    assert book.sequence == 1
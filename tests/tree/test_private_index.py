@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from kolabi.shared.persistence import ExchangeOrder
+from kolabi.tree.account import (
+    AccountStateStore,
+    AccountStreamConfig,
+    OrderWrite,
+    PositionWrite,
+)
+from kolabi.tree.private_index import IndexedOrder, IndexedPosition, PrivateStateIndex
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+T0 = datetime(2026, 6, 1, tzinfo=timezone.utc)
+
+
+def _order(
+    row_id: int,
+    status: str,
+    *,
+    oid: str = "OID-1",
+    seconds: int = 0,
+) -> IndexedOrder:
+    return IndexedOrder(
+        id=row_id,
+        symbol="PI_XBTUSD",
+        side="buy",
+        order_type="limit",
+        status=status,
+        quantity=1.0,
+        price=100.0,
+        filled_quantity=0.0,
+        reduce_only=False,
+        exchange_order_id=oid,
+        client_order_id=None,
+        local_timestamp=T0 + timedelta(seconds=seconds),
+    )
+
+
+def _position(row_id: int, size: float, *, seconds: int = 0) -> IndexedPosition:
+    return IndexedPosition(
+        id=row_id,
+        symbol="PI_XBTUSD",
+        side="long",
+        size=size,
+        entry_price=100.0,
+        local_timestamp=T0 + timedelta(seconds=seconds),
+    )
+
+
+def test_index_keeps_latest_open_row_per_identity_like_the_db_query() -> None:
+    index = PrivateStateIndex()
+    index.reset([_order(1, "open"), _order(2, "open", seconds=5)], [_position(1, 2.0)])
+
+    assert [row.id for row in index.open_orders()] == [2]
+
+    index.apply([_order(2, "canceled", seconds=6), _position(2, 0.0, seconds=6)])
+
+    # L'ancienne ligne encore ouverte redevient la plus recente, comme en SQL.
+    assert [row.id for row in index.open_orders()] == [1]
+    assert index.nonzero_positions() == ()
+    assert [row.id for row in index.open_orders([_order(1, "filled")])] == []
+
+
+def test_index_check_counts_drift_and_realigns() -> None:
+    index = PrivateStateIndex()
+    index.reset([_order(1, "open")], [])
+
+    assert index.check([_order(1, "open")], []) is None
+    drift = index.check(
+        [_order(1, "open"), _order(3, "open", oid="OID-3")],
+        [_position(4, 1.0)],
+    )
+
+    assert drift == "orders missing=1 stale=0 changed=0 positions=PI_XBTUSD"
+    open_ids = sorted(row.exchange_order_id for row in index.open_orders())
+    assert open_ids == ["OID-1", "OID-3"]
+    stats = index.stats()
+    assert (stats.checks, stats.drift_alerts, stats.open_orders) == (2, 1, 2)
+
+
+def _open_orders_reads(store: AccountStateStore) -> list[str]:
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        if statement.lstrip().upper().startswith("SELECT") and (
+            "exchange_orders.status IN" in statement
+        ):
+            statements.append(statement)
+
+    event.listen(store.engine, "before_cursor_execute", _record)
+    return statements
+
+
+def test_snapshots_diff_against_the_index_without_rereading_open_orders(
+    postgres_url_factory,
+):
+    store = AccountStateStore(
+        AccountStreamConfig(
+            db_url=postgres_url_factory("prv-index"),
+            snapshot_tombstone_grace_seconds=0.0,
+        )
+    )
+    store.warm_private_index()
+    reads = _open_orders_reads(store)
+    store.ingest_message(
+        {
+            "feed": "open_orders_snapshot",
+            "orders": [
+                {
+                    "instrument": "PI_XBTUSD",
+                    "direction": 0,
+                    "type": "limit",
+                    "qty": 1,
+                    "filled": 0,
+                    "limit_price": 100.0,
+                    "order_id": oid,
+                    "status": "open",
+                }
+                for oid in ("OID-A", "OID-B")
+            ],
+        },
+        stream_kind="private_ws",
+        is_critical=True,
+    )
+    store.record_position(PositionWrite(symbol="PI_XBTUSD", side="long", size=2.0))
+    result = store.ingest_message(
+        {"feed": "open_orders_snapshot", "orders": []},
+        stream_kind="private_ws",
+        is_critical=True,
+    )
+    flats = store.record_position_snapshot([])
+
+    assert reads == []
+    assert sorted(row.status for row in result["orders"]) == ["canceled", "canceled"]
+    assert [(row.symbol, row.size) for row in flats] == [("PI_XBTUSD", 0.0)]
+    assert store.private_index.stats().open_orders == 0
+    assert store.check_private_index() is None
+
+
+def test_check_private_index_alerts_on_rows_written_behind_the_store(
+    postgres_url_factory,
+    caplog,
+):
+    db_url = postgres_url_factory("prv-index")
+    store = AccountStateStore(AccountStreamConfig(db_url=db_url))
+    mirror = AccountStateStore(AccountStreamConfig(db_url=db_url))
+    mirror.record_order(
+        OrderWrite(
+            symbol="PI_XBTUSD",
+            side="buy",
+            order_type="limit",
+            status="open",
+            quantity=1.0,
+            exchange_order_id="OID-1",
+        )
+    )
+
+    # Deux stores du meme scope partagent l'index: pas de derive.
+    assert mirror.private_index is store.private_index
+    assert store.check_private_index() is None
+    assert store.check_private_index() is None
+    with Session(store.engine) as session:
+        row = session.execute(select(ExchangeOrder)).scalar_one()
+        row.status = "filled"
+        session.commit()
+
+    with caplog.at_level("WARNING"):
+        drift = store.check_private_index()
+
+    assert drift == "orders missing=0 stale=1 changed=0"
+    assert "PRIVATE_INDEX_DRIFT" in caplog.text
+    assert store.private_index.stats().drift_alerts == 1
+    assert store.private_index.open_orders() == ()
+    assert store.check_private_index() is None
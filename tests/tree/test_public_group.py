@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+from kolabi.shared.persistence import MarketSnapshot
+from kolabi.tree import binance, bitmex
+from kolabi.tree.binance import BinanceConfig, BinanceTree
+from kolabi.tree.bitmex import BitmexConfig, BitmexTree
+from kolabi.tree.kraken import KrakenConfig, KrakenTree, subscription_message
+from kolabi.tree.public_group import PublicTreeGroup, parse_pairs
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+def fixed_time(offset_seconds: int = 0) -> datetime:
+    return datetime(2026, 5, 10, 0, 0, offset_seconds, tzinfo=timezone.utc)
+
+
+def _kraken_snapshot(product_id: str, bid: float, ask: float) -> str:
+    return json.dumps(
+        {
+            "feed": "book_snapshot",
+            "product_id": product_id,
+            "timestamp": 1778025600000,
+            "seq": 1,
+            "asks": [{"price": ask, "qty": 1.0}],
+            "bids": [{"price": bid, "qty": 2.0}],
+        }
+    )
+
+
+def test_parse_pairs_splits_commas_and_keeps_first_occurrence() -> None:
+    assert parse_pairs("PI_XBTUSD, PI_ETHUSD,,PI_XBTUSD") == ["PI_XBTUSD", "PI_ETHUSD"]
+    assert parse_pairs(["BTCUSDT", "ETHUSDT,SOLUSDT"]) == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert parse_pairs(None) == []
+
+
+def test_subscriptions_multiplex_every_pair_on_one_connection() -> None:
+    kraken = subscription_message(KrakenConfig(), ["PI_XBTUSD", "PI_ETHUSD"])
+    binance_url = binance.public_stream_url(
+        BinanceConfig(ws_url="wss://example/stream", depth=20, market_type="spot"),
+        ["BTCUSDT", "ETHUSDT"],
+    )
+    bitmex_url = bitmex.public_stream_url(
+        BitmexConfig(ws_url="wss://example/realtime", instrument_refresh_on_start=False),
+        ["XBTUSD", "ETHUSD"],
+    )
+
+    assert kraken["product_ids"] == ["PI_XBTUSD", "PI_ETHUSD"]
+    assert binance_url == (
+        "wss://example/stream?streams="
+        "btcusdt@depth20@500ms/btcusdt@ticker/ethusdt@depth20@500ms/ethusdt@ticker"
+    )
+    assert bitmex_url == (
+        "wss://example/realtime?subscribe="
+        "orderBookL2_25:XBTUSD,instrument:XBTUSD,trade:XBTUSD,"
+        "orderBookL2_25:ETHUSD,instrument:ETHUSD,trade:ETHUSD"
+    )
+
+
+def test_message_symbol_reads_each_exchange_shape() -> None:
+    assert KrakenTree.message_symbol({"feed": "book", "product_id": "PI_ETHUSD"}) == "PI_ETHUSD"
+    assert (
+        KrakenTree.message_symbol({"channel": "book", "data": [{"symbol": "ETH/USD"}]})
+        == "ETH/USD"
+    )
+    assert BinanceTree.message_symbol({"stream": "x", "data": {"s": "ETHUSDT"}}) == "ETHUSDT"
+    assert BitmexTree.message_symbol({"table": "trade", "data": [{"symbol": "ETHUSD"}]}) == (
+        "ETHUSD"
+    )
+    assert KrakenTree.message_symbol({"event": "heartbeat"}) is None
+
+
+def test_group_routes_books_per_symbol_and_shares_pool_and_writer(postgres_url_factory):
+    db_url = postgres_url_factory("pub-futures-demo")
+    group = PublicTreeGroup(
+        KrakenTree,
+        KrakenConfig(db_url=db_url, depth=2, log_interval_seconds=3600.0),
+        ["PI_XBTUSD", "PI_ETHUSD"],
+    )
+    xbt = group.trees["PI_XBTUSD"]
+    eth = group.trees["PI_ETHUSD"]
+
+    assert group.pairs == ("PI_XBTUSD", "PI_ETHUSD")
+    assert eth.engine is xbt.engine
+    assert eth.raw_writer is xbt.raw_writer
+
+    group.handle_message(_kraken_snapshot("PI_ETHUSD", 1999.0, 2001.0))
+    group.handle_message(_kraken_snapshot("PI_XBTUSD", 99.0, 101.0))
+    group.handle_message(json.dumps({"event": "heartbeat"}))
+    group.handle_message(_kraken_snapshot("PI_SOLUSD", 9.0, 11.0))
+    for tree in group.trees.values():
+        tree.flush_due(fixed_time())
+
+    assert xbt._latest_book is not None and xbt._latest_book.metrics.best_bid == 99.0
+    assert eth._latest_book is not None and eth._latest_book.metrics.best_bid == 1999.0
+    assert (xbt._raw_message_count, eth._raw_message_count) == (2, 1)
+    assert xbt.raw_writer.stats().submitted == 4
+    with Session(xbt.engine) as session:
+        symbols = session.execute(
+            select(MarketSnapshot.symbol).order_by(MarketSnapshot.symbol)
+        ).scalars().all()
+    assert symbols == ["PI_ETHUSD", "PI_XBTUSD"]
+    statuses = group.latest_statuses()
+    assert [status["pair"] for status in statuses] == ["PI_XBTUSD", "PI_ETHUSD"]
+    assert [status["snapshot_count"] for status in statuses] == [1, 1]
+
+
+def test_group_stop_stops_every_tree(postgres_url_factory):
+    group = PublicTreeGroup(
+        BitmexTree,
+        BitmexConfig(
+            db_url=postgres_url_factory("bitmex-public"),
+            instrument_refresh_on_start=False,
+        ),
+        "XBTUSD,ETHUSD",
+    )
+
+    group.stop()
+
+    assert group._running is False
+    assert all(tree._running is False for tree in group.trees.values())
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+from kolabi.shared.persistence import RawExchangeEvent
+from kolabi.tree.kraken import KrakenConfig, KrakenTree
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+def _book_message(seq: int) -> dict[str, object]:
+    return {
+        "feed": "book_snapshot",
+        "product_id": "PI_XBTUSD",
+        "timestamp": 1778025600000 + seq,
+        "seq": seq,
+        "asks": [{"price": 101.0, "qty": 1.0}],
+        "bids": [{"price": 100.0, "qty": 1.0}],
+    }
+
+
+def _raw_rows(tree: KrakenTree) -> list[RawExchangeEvent]:
+    with Session(tree.engine) as session:
+        return list(
+            session.execute(select(RawExchangeEvent).order_by(RawExchangeEvent.id.asc()))
+            .scalars()
+            .all()
+        )
+
+
+def test_handle_message_never_touches_db_for_raw_events(postgres_url_factory):
+    db_url = postgres_url_factory("pub-futures-demo")
+    tree = KrakenTree(KrakenConfig(db_url=db_url, pair="PI_XBTUSD", depth=2))
+    opened: list[str] = []
+    real_sessionmaker = tree.raw_writer._sessionmaker
+
+    def forbidden_session():
+        opened.append("session")
+        raise AssertionError("websocket loop opened a DB session")
+
+    tree.sessionmaker = forbidden_session
+    tree.raw_writer._sessionmaker = forbidden_session
+
+    tree.handle_message(json.dumps({"event": "heartbeat"}))
+    tree.handle_message(json.dumps(_book_message(1)))
+    tree.handle_message(json.dumps(_book_message(2)))
+
+    assert opened == []
+    assert tree.raw_writer.stats().queue_depth == 3
+    assert tree._latest_book is not None
+
+    tree.raw_writer._sessionmaker = real_sessionmaker
+    assert tree.raw_writer.flush() == 3
+    rows = _raw_rows(tree)
+    assert [row.event_type for row in rows] == ["heartbeat", "book_snapshot", "book_snapshot"]
+    assert [row.exchange_sequence for row in rows] == [None, "1", "2"]
+    assert rows[1].symbol == "PI_XBTUSD"
+    assert rows[1].source_timestamp == datetime(2026, 5, 6, 0, 0, 0, 1000, tzinfo=timezone.utc)
+
+
+def test_raw_writer_collapses_duplicates_across_flushes(postgres_url_factory):
+    db_url = postgres_url_factory("pub-futures-demo")
+    tree = KrakenTree(KrakenConfig(db_url=db_url, pair="PI_XBTUSD"))
+    message = {"feed": "heartbeat", "time": 1778025600000}
+
+    tree.handle_message(json.dumps(message))
+    tree.handle_message(json.dumps(message))
+    assert tree.raw_writer.flush() == 1
+    tree.handle_message(json.dumps(message))
+    tree.handle_message(json.dumps(message))
+    assert tree.raw_writer.flush() == 0
+    tree.handle_message(json.dumps({**message, "time": 1778025601000}))
+    tree.raw_writer.flush()
+
+    rows = _raw_rows(tree)
+    assert [row.duplicate_count for row in rows] == [3, 0]
+    assert tree.raw_writer.stats().collapsed == 3
+
+
+def test_raw_writer_resumes_collapse_from_previous_process(postgres_url_factory):
+    db_url = postgres_url_factory("pub-futures-demo")
+    message = {"feed": "heartbeat", "time": 1778025600000}
+    first = KrakenTree(KrakenConfig(db_url=db_url, pair="PI_XBTUSD"))
+    first.handle_message(json.dumps(message))
+    first.raw_writer.flush()
+
+    second = KrakenTree(KrakenConfig(db_url=db_url, pair="PI_XBTUSD"))
+    second.handle_message(json.dumps(message))
+    second.raw_writer.flush()
+
+    rows = _raw_rows(second)
+    assert len(rows) == 1
+    assert rows[0].duplicate_count == 1
+
+
+def test_raw_writer_drops_and_counts_when_queue_is_full(postgres_url_factory, caplog):
+    db_url = postgres_url_factory("pub-futures-demo")
+    tree = KrakenTree(KrakenConfig(db_url=db_url, pair="PI_XBTUSD", raw_queue_size=2))
+
+    for seq in range(5):
+        tree.handle_message(json.dumps({"event": "heartbeat", "seq": seq}))
+
+    stats = tree.raw_writer.stats()
+    assert stats.submitted == 2
+    assert stats.dropped == 3
+    with caplog.at_level("WARNING"):
+        tree._maintenance_due(datetime.now(timezone.utc))
+    assert "raw_writer pressure dropped=3" in caplog.text
+    assert tree.raw_writer.flush() == 2
+
+
+def test_raw_writer_thread_flushes_in_batches_and_drains_on_stop(postgres_url_factory):
+    db_url = postgres_url_factory("pub-futures-demo")
+    tree = KrakenTree(
+        KrakenConfig(db_url=db_url, pair="PI_XBTUSD", raw_batch_size=4, raw_flush_seconds=30.0)
+    )
+    tree.raw_writer.start()
+    for seq in range(10):
+        tree.handle_message(json.dumps({"event": "heartbeat", "seq": seq}))
+    tree.raw_writer.stop()
+
+    stats = tree.raw_writer.stats()
+    assert not tree.raw_writer.running
+    assert stats.written == 10
+    assert stats.queue_depth == 0
+    assert len(_raw_rows(tree)) == 10
+
+
+def test_raw_writer_stop_with_full_queue_drains_everything(postgres_url_factory):
+    db_url = postgres_url_factory("pub-futures-demo")
+    tree = KrakenTree(
+        KrakenConfig(
+            db_url=db_url,
+            pair="PI_XBTUSD",
+            raw_queue_size=3,
+            raw_batch_size=100,
+            raw_flush_seconds=30.0,
+        )
+    )
+    writer = tree.raw_writer
+    # Worker bloque sur l'ecriture: la file se remplit avant l'arret.
+    writer._write_lock.acquire()
+    writer.start()
+    for seq in range(6):
+        tree.handle_message(json.dumps({"event": "heartbeat", "seq": seq}))
+    writer._write_lock.release()
+    writer.stop()
+
+    stats = writer.stats()
+    assert not writer.running
+    assert stats.failed == 0
+    assert stats.queue_depth == 0
+    assert stats.written == stats.submitted
+    assert len(_raw_rows(tree)) == stats.submitted